@@ -0,0 +1,119 @@
+"""
+Cold start and per-call overhead of OpenAICompatProvider vs LiteLLMProvider,
+against a local OpenAI-compatible stand-in server (keep-alive HTTP/1.1) that
+answers instantly, so the numbers are the client's own cost.
+
+    python benchmarks/provider_overhead.py [calls]
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# Don't let litellm fetch its model cost map over the network on import
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+COMPLETION = json.dumps({
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "bench",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 12, "completion_tokens": 1, "total_tokens": 13},
+}).encode()
+MESSAGES = [
+    {"role": "system", "content": "You are a helpful assistant. " * 40},
+    {"role": "user", "content": "Say ok."},
+]
+COLD_START = {
+    "native": "from friday.providers.openai_compat import OpenAICompatProvider",
+    "litellm": "from friday.providers.litellm_provider import LiteLLMProvider",
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(COMPLETION)))
+        self.end_headers()
+        self.wfile.write(COMPLETION)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def cold_start(code: str) -> tuple[float, float]:
+    """Seconds to import, and max RSS in MB, of a fresh interpreter."""
+    script = (
+        "import resource, time; t = time.perf_counter(); " + code + "; "
+        "print(time.perf_counter() - t, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)"
+    )
+    runs = []
+    for _ in range(3):
+        out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+        seconds, rss = out.stdout.split()
+        runs.append((float(seconds), float(rss)))
+    return min(runs)
+
+
+async def per_call_ms(provider, model: str, calls: int) -> tuple[float, float]:
+    """(median, p95) milliseconds per chat() call after a warm-up call."""
+    await provider.chat(MESSAGES, model=model, max_tokens=16)
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await provider.chat(MESSAGES, model=model, max_tokens=16)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.95)]
+
+
+async def run_calls(base: str, calls: int) -> dict[str, tuple[float, float]]:
+    from friday.providers.litellm_provider import LiteLLMProvider
+    from friday.providers.openai_compat import HTTPClientPool, OpenAICompatProvider
+
+    pool = HTTPClientPool()
+    native = OpenAICompatProvider("sk-bench", base, "vllm/bench", pool=pool, strip_prefixes=("vllm/",))
+    lite = LiteLLMProvider(api_key="sk-bench", api_base=base, default_model="vllm/bench")
+    results = {
+        "native": await per_call_ms(native, "vllm/bench", calls),
+        "litellm": await per_call_ms(lite, "vllm/bench", calls),
+    }
+    await pool.aclose()
+    return results
+
+
+def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    print(f"{'cold start':<12}{'import (s)':>12}{'max RSS (MB)':>14}")
+    for name, code in COLD_START.items():
+        seconds, rss = cold_start(code)
+        print(f"{name:<12}{seconds:>12.3f}{rss:>14.1f}")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    try:
+        results = asyncio.run(run_calls(base, calls))
+    finally:
+        server.shutdown()
+    print(f"\n{'per call':<12}{'p50 (ms)':>12}{'p95 (ms)':>14}   ({calls} calls, local stand-in server)")
+    for name, (p50, p95) in results.items():
+        print(f"{name:<12}{p50:>12.2f}{p95:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
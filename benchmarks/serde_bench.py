@@ -0,0 +1,83 @@
+"""
+Micro-benchmark of the JSON hot paths: stdlib json as the code used it
+before friday.utils.serde vs serde (orjson when installed).
+
+    python benchmarks/serde_bench.py
+"""
+
+import json
+import sys
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from friday.cron.types import CronJob, CronPayload, CronSchedule  # noqa: E402
+from friday.utils import serde  # noqa: E402
+
+MESSAGE = {
+    "role": "assistant",
+    "content": "Here is the summary of the quarterly report you asked for. " * 6,
+    "timestamp": "2025-03-01T09:15:02.123456",
+    "tools_used": ["read_file", "web_search"],
+}
+METADATA = {
+    "history_summary": {"text": "- user prefers short answers\n" * 20, "through": "2025-03-01T09:00:00", "messages": 120},
+    "lang": "en",
+}
+JOBS = [
+    CronJob(id=f"job{i:04d}", name=f"job {i}", schedule=CronSchedule(kind="cron", expr="0 9 * * *"),
+            payload=CronPayload(message="Send the daily report", deliver=True, channel="telegram", to="42"))
+    for i in range(200)
+]
+# A providers.base.ToolCallRequest (importing it would load litellm)
+TOOL_CALL = SimpleNamespace(id="call_1", name="write_file", arguments={"path": "notes/todo.md", "content": "x" * 2000})
+
+
+def old_cron_save() -> str:
+    return json.dumps({"version": 1, "jobs": [serde.encode_cron_job(j) for j in JOBS]}, indent=2)
+
+
+def new_cron_save() -> str:
+    return serde.dumps({"version": 1, "jobs": [serde.encode_cron_job(j) for j in JOBS]})
+
+
+def old_tool_call() -> None:
+    # Once for the assistant message, once for the debug log
+    {"id": TOOL_CALL.id, "type": "function",
+     "function": {"name": TOOL_CALL.name, "arguments": json.dumps(TOOL_CALL.arguments)}}
+    json.dumps(TOOL_CALL.arguments)
+
+
+def new_tool_call() -> None:
+    serde.encode_tool_call(TOOL_CALL)
+
+
+CASES = [
+    ("message encode", lambda: json.dumps(MESSAGE), lambda: serde.dumps(MESSAGE)),
+    ("message decode", lambda: json.loads(LINE), lambda: serde.loads(LINE)),
+    ("metadata sort_keys", lambda: json.dumps(METADATA, sort_keys=True), lambda: serde.dumps(METADATA, sort_keys=True)),
+    ("cron store (200 jobs)", old_cron_save, new_cron_save),
+    ("cron store load", lambda: json.loads(CRON_DOC), lambda: serde.loads(CRON_DOC)),
+    ("tool call", old_tool_call, new_tool_call),
+]
+LINE = json.dumps(MESSAGE)
+CRON_DOC = old_cron_save()
+
+
+def best_us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    print(f"serde backend: {serde.BACKEND}")
+    print(f"{'case':<24}{'json (us)':>12}{'serde (us)':>12}{'speedup':>10}")
+    for name, old, new in CASES:
+        number = 200 if "cron" in name else 20000
+        t_old, t_new = best_us(old, number), best_us(new, number)
+        print(f"{name:<24}{t_old:>12.2f}{t_new:>12.2f}{t_old / t_new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
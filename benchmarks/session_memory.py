@@ -0,0 +1,103 @@
+"""
+Memory of cached session history: plain dict messages vs Message records.
+
+Loads N messages (as the session stores do, one JSON line at a time) into
+sessions of --per-session messages and reports the RSS growth. Each variant
+runs in its own process so the numbers do not interfere.
+
+    python benchmarks/session_memory.py --messages 1000000
+"""
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+ROLES = ("user", "assistant")
+WORDS = "the a to and of meeting invoice report deploy server please thanks tomorrow budget".split()
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def message_lines(count: int, seed: int = 7):
+    """JSONL message records like Session.add_message() writes."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    for i in range(count):
+        yield json.dumps({
+            "role": ROLES[i % 2],
+            "content": " ".join(rng.choices(WORDS, k=rng.randint(5, 30))),
+            "timestamp": (start + timedelta(seconds=i * 7, microseconds=rng.randint(0, 999999))).isoformat(),
+        })
+
+
+def measure(variant: str, count: int, per_session: int) -> dict:
+    from friday.session.message import Message
+    from friday.session.types import Session
+
+    parse = json.loads if variant == "dict" else (lambda line: Message.from_dict(json.loads(line)))
+    lines = message_lines(count)
+    before = rss_bytes()
+    started = time.perf_counter()
+    sessions = []
+    for s in range(0, count, per_session):
+        session = Session(key=f"telegram:{s}")
+        session.messages = [parse(next(lines)) for _ in range(min(per_session, count - s))]
+        sessions.append(session)
+    elapsed = time.perf_counter() - started
+    return {
+        "variant": variant,
+        "messages": count,
+        "rss_mb": (rss_bytes() - before) / 2**20,
+        "load_s": elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--per-session", type=int, default=1000)
+    parser.add_argument("--variant", choices=["dict", "message"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(measure(args.variant, args.messages, args.per_session)))
+        return
+
+    results = []
+    for variant in ("dict", "message"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--variant", variant,
+             "--messages", str(args.messages), "--per-session", str(args.per_session)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(out))
+
+    print(f"{args.messages:,} messages in sessions of {args.per_session}")
+    for r in results:
+        per_msg = r["rss_mb"] * 2**20 / r["messages"]
+        print(f"  {r['variant']:<8} RSS +{r['rss_mb']:8.1f} MB  ({per_msg:5.0f} B/message)  load {r['load_s']:.2f} s")
+    saved = 1 - results[1]["rss_mb"] / results[0]["rss_mb"]
+    print(f"  Message records use {saved:.0%} less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ import makeWASocket, {
   useMultiFileAuthState,
   fetchLatestBaileysVersion,
   makeCacheableSignalKeyStore,
+  downloadMediaMessage,
 } from '@whiskeysockets/baileys';
 
 import { Boom } from '@hapi/boom';
@@ -23,6 +24,7 @@ export interface InboundMessage {
   content: string;
   timestamp: number;
   isGroup: boolean;
+  audio?: { mimetype: string; data: string };  // Voice/audio message, base64
 }
 
 export interface WhatsAppClientOptions {
@@ -119,6 +121,7 @@ export class WhatsAppClient {
         if (!content) continue;
 
         const isGroup = msg.key.remoteJid?.endsWith('@g.us') || false;
+        const audio = msg.message?.audioMessage ? await this.downloadAudio(msg) : undefined;
 
         this.options.onMessage({
           id: msg.key.id || '',
@@ -126,11 +129,25 @@ export class WhatsAppClient {
           content,
           timestamp: msg.messageTimestamp as number,
           isGroup,
+          audio,
         });
       }
     });
   }
 
+  private async downloadAudio(msg: any): Promise<{ mimetype: string; data: string } | undefined> {
+    try {
+      const buffer = await downloadMediaMessage(msg, 'buffer', {});
+      return {
+        mimetype: msg.message.audioMessage.mimetype || 'audio/ogg',
+        data: (buffer as Buffer).toString('base64'),
+      };
+    } catch (err) {
+      console.error('Failed to download audio:', (err as Error).message);
+      return undefined;
+    }
+  }
+
   private extractMessageContent(msg: any): string | null {
     const message = msg.message;
     if (!message) return null;
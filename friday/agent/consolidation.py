@@ -0,0 +1,350 @@
+"""Memory consolidation: roll daily notes into rolling weekly/monthly digests."""
+
+import copy
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from friday.agent.memory import MemoryStore
+from friday.utils.helpers import ensure_dir, estimate_tokens
+
+if TYPE_CHECKING:
+    from friday.providers.base import LLMProvider
+
+# Cron payload message that identifies the consolidation system event
+CONSOLIDATE_EVENT = "memory.consolidate"
+CONSOLIDATE_JOB_NAME = "memory-consolidation"
+
+SUMMARIZE_PROMPT = """Condense each of the memory notes below into a digest.
+Keep facts about the user, decisions, commitments, open tasks and dates. Drop chit-chat,
+duplicates and anything later notes contradict. Use short markdown bullet points.
+Each digest must stay under {max_chars} characters.
+
+Reply with every digest preceded by its header line exactly as given, e.g. "=== 2026-W41 ===".
+
+{sections}"""
+
+_HEADER_RE = re.compile(r"^=== (.+?) ===\s*$", re.MULTILINE)
+_KEYED_BULLET_RE = re.compile(r"^\s*[-*]\s+(?:\*\*)?([^:*\n]{1,60}?)(?:\*\*)?\s*:\s+\S")
+
+
+@dataclass
+class ConsolidationReport:
+    """Outcome of a consolidation run."""
+    namespace: str = "global"
+    weekly: list[str] = field(default_factory=list)
+    monthly: list[str] = field(default_factory=list)
+    archived: int = 0
+    pruned_entries: int = 0
+    llm_calls: int = 0
+    # Memory section of the system prompt (MEMORY.md + today's notes)
+    tokens_before: int = 0
+    tokens_after: int = 0
+    # All live notes under memory/ (daily notes + digests, excluding the archive)
+    notes_tokens_before: int = 0
+    notes_tokens_after: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    def summary(self) -> str:
+        """Human-readable one-line summary."""
+        return (
+            f"Memory consolidated: {len(self.weekly)} weekly / {len(self.monthly)} monthly digests, "
+            f"{self.archived} files archived, {self.pruned_entries} MEMORY.md entries pruned, "
+            f"{self.llm_calls} LLM calls; prompt memory tokens "
+            f"{_reduction(self.tokens_before, self.tokens_after)}, notes tokens "
+            f"{_reduction(self.notes_tokens_before, self.notes_tokens_after)}"
+        )
+
+
+class MemoryConsolidator:
+    """
+    Rolls old daily notes into weekly digests, old weekly digests into monthly
+    digests, and prunes duplicate/superseded entries from MEMORY.md.
+
+    Summaries are produced by the LLM in batches (several digests per call);
+    without a provider, or when the LLM output can't be parsed, an extractive
+    digest is used instead. Every digest is hard-capped at max_digest_chars.
+    """
+
+    def __init__(
+        self,
+        store: MemoryStore,
+        provider: "LLMProvider | None" = None,
+        model: str | None = None,
+        keep_days: int = 7,
+        keep_weeks: int = 4,
+        max_digest_chars: int = 4000,
+        batch_size: int = 8,
+    ):
+        self.store = store
+        self.provider = provider
+        self.model = model
+        self.keep_days = keep_days
+        self.keep_weeks = keep_weeks
+        self.max_digest_chars = max_digest_chars
+        self.batch_size = max(1, batch_size)
+
+    def _notes_tokens(self) -> int:
+        """Estimated tokens across live daily notes and digests."""
+        paths = self.store.list_memory_files()
+        paths += self.store.list_digests("weekly") + self.store.list_digests("monthly")
+        return sum(estimate_tokens(p.read_text(encoding="utf-8")) for p in paths)
+
+    async def run(self, today: date | None = None) -> ConsolidationReport:
+        """Run a full consolidation pass."""
+        today = today or datetime.now().date()
+        report = ConsolidationReport(
+            namespace=self.store.namespace,
+            tokens_before=estimate_tokens(self.store.get_memory_context()),
+            notes_tokens_before=self._notes_tokens(),
+        )
+
+        await self._roll_daily(today, report)
+        await self._roll_weekly(today, report)
+        report.pruned_entries = self.prune_long_term()
+
+        report.tokens_after = estimate_tokens(self.store.get_memory_context())
+        report.notes_tokens_after = self._notes_tokens()
+        logger.info(report.summary())
+        return report
+
+    async def run_all(self, today: date | None = None) -> list[ConsolidationReport]:
+        """Run consolidation for every memory namespace in the workspace."""
+        reports = []
+        for store in MemoryStore.list_namespaces(self.store.workspace):
+            consolidator = copy.copy(self)
+            consolidator.store = store
+            reports.append(await consolidator.run(today))
+        return reports
+
+    # ========== Rolling ==========
+
+    async def _roll_daily(self, today: date, report: ConsolidationReport) -> None:
+        """Fold daily notes older than keep_days into weekly digests."""
+        cutoff = today - timedelta(days=self.keep_days)
+        groups: dict[str, list[Path]] = {}
+        for path in self.store.list_memory_files():
+            day = _parse_date(path.stem)
+            if day is None or day >= cutoff:
+                continue
+            year, week, _ = day.isocalendar()
+            groups.setdefault(f"{year}-W{week:02d}", []).append(path)
+
+        if not groups:
+            return
+
+        weekly_dir = ensure_dir(self.store.digests_dir / "weekly")
+        sources = {
+            key: self._merge_sources(weekly_dir / f"{key}.md", sorted(paths))
+            for key, paths in groups.items()
+        }
+        digests = await self._summarize(sources, report)
+
+        archive = ensure_dir(self.store.archive_dir / "daily")
+        for key, paths in groups.items():
+            self._write_digest(weekly_dir / f"{key}.md", f"# Week {key}", digests[key])
+            for path in paths:
+                path.replace(archive / path.name)
+                report.archived += 1
+            report.weekly.append(key)
+
+    async def _roll_weekly(self, today: date, report: ConsolidationReport) -> None:
+        """Fold weekly digests older than keep_weeks into monthly digests."""
+        cutoff = today - timedelta(weeks=self.keep_weeks)
+        groups: dict[str, list[Path]] = {}
+        for path in self.store.list_digests("weekly"):
+            monday = _parse_iso_week(path.stem)
+            if monday is None or monday + timedelta(days=6) >= cutoff:
+                continue
+            groups.setdefault(monday.strftime("%Y-%m"), []).append(path)
+
+        if not groups:
+            return
+
+        monthly_dir = ensure_dir(self.store.digests_dir / "monthly")
+        sources = {
+            key: self._merge_sources(monthly_dir / f"{key}.md", sorted(paths))
+            for key, paths in groups.items()
+        }
+        digests = await self._summarize(sources, report)
+
+        archive = ensure_dir(self.store.archive_dir / "weekly")
+        for key, paths in groups.items():
+            self._write_digest(monthly_dir / f"{key}.md", f"# Month {key}", digests[key])
+            for path in paths:
+                path.replace(archive / path.name)
+                report.archived += 1
+            report.monthly.append(key)
+
+    def _merge_sources(self, existing_digest: Path, paths: list[Path]) -> str:
+        """Concatenate an existing digest (from an earlier run) with new source files."""
+        parts = []
+        if existing_digest.exists():
+            parts.append(_strip_title(existing_digest.read_text(encoding="utf-8")))
+        for path in paths:
+            parts.append(f"## {path.stem}\n{_strip_title(path.read_text(encoding='utf-8'))}")
+        return "\n\n".join(p for p in parts if p.strip())
+
+    def _write_digest(self, path: Path, title: str, body: str) -> None:
+        body = _cap(body.strip(), self.max_digest_chars)
+        path.write_text(f"{title}\n\n{body}\n", encoding="utf-8")
+
+    # ========== Summarization ==========
+
+    async def _summarize(self, sources: dict[str, str], report: ConsolidationReport) -> dict[str, str]:
+        """Summarize sources in batches; fall back to extractive digests per key."""
+        digests: dict[str, str] = {}
+        if self.provider:
+            keys = list(sources)
+            for i in range(0, len(keys), self.batch_size):
+                batch = {k: sources[k] for k in keys[i:i + self.batch_size]}
+                try:
+                    digests.update(await self._summarize_batch(batch))
+                    report.llm_calls += 1
+                except Exception as e:
+                    logger.warning(f"Memory consolidation: LLM summarization failed: {e}")
+
+        for key, text in sources.items():
+            if not digests.get(key):
+                digests[key] = _extractive_digest(text, self.max_digest_chars)
+        return digests
+
+    async def _summarize_batch(self, batch: dict[str, str]) -> dict[str, str]:
+        sections = "\n\n".join(f"=== {key} ===\n{text}" for key, text in batch.items())
+        prompt = SUMMARIZE_PROMPT.format(max_chars=self.max_digest_chars, sections=sections)
+        response = await self.provider.chat(
+            messages=[{"role": "user", "content": prompt}],
+            model=self.model,
+            temperature=0.2,
+        )
+        if not response.content:
+            raise RuntimeError("empty response")
+        return _parse_sections(response.content, batch.keys())
+
+    # ========== Long-term memory ==========
+
+    def prune_long_term(self) -> int:
+        """
+        Remove duplicate and superseded entries from MEMORY.md.
+
+        Duplicates are bullets that repeat an earlier bullet verbatim (ignoring case
+        and whitespace). Superseded entries are keyed bullets ("- Timezone: UTC+7")
+        followed later in the same section by a bullet with the same key.
+
+        Returns:
+            Number of entries removed.
+        """
+        content = self.store.read_long_term()
+        if not content:
+            return 0
+
+        lines = content.split("\n")
+        drop: set[int] = set()
+        seen: set[str] = set()
+        last_key_line: dict[tuple[int, str], int] = {}
+        section = 0
+
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            if stripped.startswith("#"):
+                section = i
+                continue
+            if not stripped.startswith(("-", "*")) or stripped in ("-", "*", "---"):
+                continue
+
+            norm = " ".join(stripped.lower().split())
+            if norm in seen:
+                drop.add(i)
+                continue
+            seen.add(norm)
+
+            match = _KEYED_BULLET_RE.match(line)
+            if match:
+                key = (section, match.group(1).strip().lower())
+                if key in last_key_line:
+                    drop.add(last_key_line[key])
+                last_key_line[key] = i
+
+        if drop:
+            kept = [line for i, line in enumerate(lines) if i not in drop]
+            self.store.write_long_term("\n".join(kept))
+        return len(drop)
+
+
+async def run_maintenance(consolidator: MemoryConsolidator) -> str:
+    """Maintenance job handler: consolidate every namespace."""
+    reports = await consolidator.run_all()
+    return "\n".join(f"[{r.namespace}] {r.summary()}" for r in reports)
+
+
+def _reduction(before: int, after: int) -> str:
+    pct = (before - after) / before * 100 if before else 0.0
+    return f"{before} -> {after} ({pct:.0f}% reduction)"
+
+
+def _parse_date(stem: str) -> date | None:
+    try:
+        return datetime.strptime(stem, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def _parse_iso_week(stem: str) -> date | None:
+    """Parse "2026-W41" into the Monday of that ISO week."""
+    try:
+        return datetime.strptime(stem + "-1", "%G-W%V-%u").date()
+    except ValueError:
+        return None
+
+
+def _strip_title(text: str) -> str:
+    """Drop a leading "# ..." title line."""
+    text = text.strip()
+    if text.startswith("# "):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+    return text.strip()
+
+
+def _cap(text: str, max_chars: int) -> str:
+    """Hard-cap text at max_chars, cutting at a line boundary where possible."""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    newline = cut.rfind("\n")
+    if newline > max_chars // 2:
+        cut = cut[:newline]
+    return cut.rstrip() + "\n…"
+
+
+def _extractive_digest(text: str, max_chars: int) -> str:
+    """Deduplicate non-empty lines and cap the result (no LLM available)."""
+    seen: set[str] = set()
+    lines = []
+    for line in text.split("\n"):
+        norm = " ".join(line.lower().split())
+        if not norm or (norm in seen and not norm.startswith("#")):
+            continue
+        seen.add(norm)
+        lines.append(line.rstrip())
+    return _cap("\n".join(lines), max_chars)
+
+
+def _parse_sections(content: str, keys) -> dict[str, str]:
+    """Split an LLM response on "=== key ===" headers, keeping only requested keys."""
+    wanted = set(keys)
+    result: dict[str, str] = {}
+    matches = list(_HEADER_RE.finditer(content))
+    for i, m in enumerate(matches):
+        key = m.group(1).strip()
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        body = content[m.end():end].strip()
+        if key in wanted and body:
+            result[key] = body
+    return result
@@ -6,7 +6,7 @@ import platform
 from pathlib import Path
 from typing import Any
 
-from friday.agent.memory import MemoryStore
+from friday.agent.memory import MemoryStore, memory_namespaces
 from friday.agent.skills import SkillsLoader
 
 
@@ -20,17 +20,31 @@ class ContextBuilder:
     
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     
+    # Skills summary: full entries for the best matches only, under a token budget
+    SKILLS_MAX_FULL = 3
+    SKILLS_TOKEN_BUDGET = 600
+    SKILLS_CONTEXT_MESSAGES = 4
+
     def __init__(self, workspace: Path):
         self.workspace = workspace
         self.memory = MemoryStore(workspace)
         self.skills = SkillsLoader(workspace)
     
-    def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
+    def build_system_prompt(
+        self,
+        skill_names: list[str] | None = None,
+        memory_stores: list[MemoryStore] | None = None,
+        skills_query: str | None = None,
+        skills_context: str = "",
+    ) -> str:
         """
         Build the system prompt from bootstrap files, memory, and skills.
         
         Args:
             skill_names: Optional list of skills to include.
+            memory_stores: Memory namespaces to include (defaults to shared memory only).
+            skills_query: Current message; ranks skills so only relevant ones are listed in full.
+            skills_context: Recent conversation text, a weaker ranking signal.
         
         Returns:
             Complete system prompt.
@@ -45,8 +59,12 @@ class ContextBuilder:
         if bootstrap:
             parts.append(bootstrap)
         
-        # Memory context
-        memory = self.memory.get_memory_context()
+        # Memory context (only the namespaces relevant to this conversation)
+        stores = memory_stores or [self.memory]
+        labeled = len(stores) > 1
+        memory = "\n\n".join(
+            m for m in (store.get_memory_context(labeled=labeled) for store in stores) if m
+        )
         if memory:
             parts.append(f"# Memory\n\n{memory}")
         
@@ -59,12 +77,19 @@ class ContextBuilder:
                 parts.append(f"# Active Skills\n\n{always_content}")
         
         # 2. Available skills: only show summary (agent uses read_file to load)
-        skills_summary = self.skills.build_skills_summary()
+        skills_summary = self.skills.build_skills_summary(
+            skills_query,
+            skills_context,
+            max_full=self.SKILLS_MAX_FULL,
+            token_budget=self.SKILLS_TOKEN_BUDGET,
+        )
         if skills_summary:
+            locations = " or ".join(f"{p}/{{name}}/SKILL.md" for p in self.skills.skill_locations())
             parts.append(f"""# Skills
 
 The following skills extend your capabilities. To use a skill, read its SKILL.md file using the read_file tool.
 Skills with available="false" need dependencies installed first - you can try installing them with apt/brew.
+Skills listed only by name under <other-skills> live at {locations}.
 
 {skills_summary}""")
         
@@ -104,7 +129,17 @@ Only use the 'message' tool when you need to send a message to a specific chat c
 For normal conversation, just respond with text - do not call the message tool.
 
 Always be helpful, accurate, and concise. When using tools, explain what you're doing.
-When remembering something, write to {workspace_path}/memory/MEMORY.md"""
+When remembering something shared, write to {workspace_path}/memory/MEMORY.md.
+Facts about a specific user or chat go to the memory files listed under Current Session."""
+
+    def get_memory_stores(
+        self, channel: str, chat_id: str, sender_id: str | None = None
+    ) -> list[MemoryStore]:
+        """Get the memory stores for a conversation, shared namespace first."""
+        return [
+            self.memory if ns == self.memory.namespace else MemoryStore(self.workspace, ns)
+            for ns in memory_namespaces(channel, chat_id, sender_id)
+        ]
     
     def _load_bootstrap_files(self) -> str:
         """Load all bootstrap files from workspace."""
@@ -126,6 +161,8 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         media: list[str] | None = None,
         channel: str | None = None,
         chat_id: str | None = None,
+        sender_id: str | None = None,
+        history_summary: str = "",
     ) -> list[dict[str, Any]]:
         """
         Build the complete message list for an LLM call.
@@ -137,6 +174,8 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
             media: Optional list of local file paths for images/media.
             channel: Current channel (telegram, feishu, etc.).
             chat_id: Current chat/user ID.
+            sender_id: Current sender ID (selects the per-user memory namespace).
+            history_summary: Rolling summary of turns older than the history.
 
         Returns:
             List of messages including system prompt.
@@ -144,9 +183,21 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         messages = []
 
         # System prompt
-        system_prompt = self.build_system_prompt(skill_names)
+        memory_stores = self.get_memory_stores(channel, chat_id, sender_id) if channel and chat_id else None
+        recent = history[-self.SKILLS_CONTEXT_MESSAGES:]
+        skills_context = "\n".join(m["content"] for m in recent if isinstance(m.get("content"), str))
+        system_prompt = self.build_system_prompt(
+            skill_names,
+            memory_stores,
+            skills_query=current_message,
+            skills_context=skills_context,
+        )
         if channel and chat_id:
             system_prompt += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
+            for store in memory_stores[1:]:
+                system_prompt += f"\nMemory ({store.label}): {store.memory_file}"
+        if history_summary:
+            system_prompt += f"\n\n## Earlier in This Conversation\n\n{history_summary}"
         messages.append({"role": "system", "content": system_prompt})
 
         # History
@@ -0,0 +1,214 @@
+"""Token-budgeted conversation history with a rolling summary."""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable
+
+from loguru import logger
+
+from friday.session.types import Session
+from friday.utils.helpers import estimate_tokens
+
+if TYPE_CHECKING:
+    from friday.providers.base import LLMProvider
+
+# Session metadata key holding {"text", "through", "messages"}
+SUMMARY_KEY = "history_summary"
+
+# Per-message token overhead (role, separators) on top of the content estimate
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = """Update the running summary of a conversation between a user and an assistant.
+Merge the earlier summary with the new messages below. Keep facts about the user, decisions,
+commitments, open questions and anything the assistant promised to do; drop greetings and
+small talk. Use short markdown bullet points, under {max_chars} characters in total.
+
+Earlier summary:
+{summary}
+
+New messages:
+{messages}"""
+
+
+def history_budget(model: str | None, default: int, model_budgets: dict[str, int] | None = None) -> int:
+    """
+    Resolve the history token budget for a model.
+
+    model_budgets maps model-name keywords to budgets (e.g. {"gpt-4o-mini": 4000});
+    the longest keyword contained in the model name wins.
+    """
+    model = (model or "").lower()
+    matches = [k for k in (model_budgets or {}) if k.lower() in model]
+    return model_budgets[max(matches, key=len)] if matches else default
+
+
+def message_tokens(message: dict[str, Any]) -> int:
+    """Estimated prompt tokens of a stored message."""
+    content = message.get("content")
+    return MESSAGE_OVERHEAD_TOKENS + (estimate_tokens(content) if isinstance(content, str) else 0)
+
+
+@dataclass
+class HistoryWindow:
+    """The part of a session that goes into the prompt."""
+    messages: list[dict[str, Any]] = field(default_factory=list)  # LLM format (role, content)
+    summary: str = ""  # Rolling summary of older turns
+    tokens: int = 0  # Estimated tokens of messages + summary
+
+
+class RollingHistory:
+    """
+    Builds the prompt history from a per-model token budget instead of a fixed
+    message count.
+
+    The newest messages are taken until the budget (minus the rolling summary)
+    is full, capped at max_messages (the messages a session keeps in memory).
+    Messages that fall out of a slightly smaller window (fold_ratio of both
+    limits) are folded into a rolling summary stored in session metadata,
+    so they reach the summary while still visible in the prompt. Folding runs
+    in a background task after the turn; without a provider, or if the LLM
+    call fails, an extractive summary is used instead.
+    """
+
+    def __init__(
+        self,
+        provider: "LLMProvider | None" = None,
+        model: str | None = None,
+        token_budget: int = 12000,
+        max_messages: int = 100,
+        max_summary_chars: int = 2000,
+        fold_ratio: float = 0.75,
+        min_fold_messages: int = 4,
+    ):
+        self.provider = provider
+        self.model = model
+        self.token_budget = token_budget
+        self.max_messages = max_messages
+        self.max_summary_chars = max_summary_chars
+        self.fold_ratio = fold_ratio
+        self.min_fold_messages = min_fold_messages
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def get_summary(session: Session) -> dict[str, Any]:
+        return session.metadata.get(SUMMARY_KEY) or {}
+
+    def build(self, session: Session) -> HistoryWindow:
+        """Select the newest messages that fit the budget, plus the rolling summary."""
+        summary = self.get_summary(session).get("text", "")
+        used = estimate_tokens(summary) if summary else 0
+        start = self._window_start(session.messages, self.token_budget - used, self.max_messages)
+        window = session.messages[start:]
+        used += sum(message_tokens(m) for m in window)
+        return HistoryWindow(
+            messages=[m.to_llm() for m in window],
+            summary=summary,
+            tokens=used,
+        )
+
+    @staticmethod
+    def _window_start(messages: list[dict[str, Any]], budget: int, max_messages: int) -> int:
+        used = 0
+        for i in range(len(messages) - 1, max(len(messages) - max_messages, 0) - 1, -1):
+            used += message_tokens(messages[i])
+            if used > budget:
+                return i + 1
+        return max(len(messages) - max_messages, 0)
+
+    def pending(self, session: Session) -> list[dict[str, Any]]:
+        """Messages outside the fold window that the summary does not cover yet."""
+        summary = self.get_summary(session)
+        budget = int(self.token_budget * self.fold_ratio) - estimate_tokens(summary.get("text", ""))
+        end = self._window_start(session.messages, max(budget, 0), int(self.max_messages * self.fold_ratio))
+        through = summary.get("through") or ""
+        return [m for m in session.messages[:end] if (m.get("timestamp") or "") > through]
+
+    # ========== Folding ==========
+
+    def schedule(self, session: Session, on_update: Callable[[Session], None]) -> None:
+        """
+        Fold pending messages into the summary in the background.
+
+        on_update is called with the session after its summary changed (e.g. to
+        save it). At most one fold per session runs at a time.
+        """
+        running = self._tasks.get(session.key)
+        if running and not running.done():
+            return
+        if len(self.pending(session)) < self.min_fold_messages:
+            return
+
+        async def _run() -> None:
+            try:
+                if await self.update(session):
+                    on_update(session)
+            except Exception as e:
+                logger.error(f"Failed to update history summary for {session.key}: {e}")
+            finally:
+                self._tasks.pop(session.key, None)
+
+        self._tasks[session.key] = asyncio.create_task(_run())
+
+    async def update(self, session: Session) -> bool:
+        """
+        Fold pending messages into the session's rolling summary.
+
+        Returns:
+            True if the summary changed.
+        """
+        pending = self.pending(session)
+        if not pending:
+            return False
+        previous = self.get_summary(session)
+        text = await self._summarize(previous.get("text", ""), pending)
+        session.metadata[SUMMARY_KEY] = {
+            "text": text,
+            "through": pending[-1].get("timestamp"),
+            "messages": previous.get("messages", 0) + len(pending),
+        }
+        return True
+
+    async def wait(self) -> None:
+        """Wait for all running folds (shutdown, tests)."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def _summarize(self, previous: str, messages: list[dict[str, Any]]) -> str:
+        if self.provider:
+            prompt = SUMMARY_PROMPT.format(
+                max_chars=self.max_summary_chars,
+                summary=previous or "(none)",
+                messages="\n".join(_format_message(m) for m in messages),
+            )
+            try:
+                response = await self.provider.chat(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=self.model,
+                    temperature=0.2,
+                )
+                if response.content:
+                    return _keep_tail(response.content.strip(), self.max_summary_chars)
+                logger.warning(f"History summary: LLM returned no summary: {response.content}")
+            except Exception as e:
+                logger.warning(f"History summary: LLM summarization failed: {e}")
+
+        lines = [_format_message(m, 200) for m in messages]
+        return _keep_tail("\n".join([previous, *lines]).strip(), self.max_summary_chars)
+
+
+def _format_message(message: dict[str, Any], max_chars: int = 2000) -> str:
+    content = message.get("content")
+    text = " ".join(content.split()) if isinstance(content, str) else "[non-text content]"
+    if len(text) > max_chars:
+        text = text[:max_chars] + "..."
+    return f"- {message.get('role', 'user')}: {text}"
+
+
+def _keep_tail(text: str, max_chars: int) -> str:
+    """Cap a summary at max_chars, dropping its oldest (first) lines first."""
+    if len(text) <= max_chars:
+        return text
+    lines = text.split("\n")
+    while lines and len("\n".join(lines)) > max_chars:
+        lines.pop(0)
+    return "\n".join(lines) if lines else text[-max_chars:]
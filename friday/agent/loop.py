@@ -1,16 +1,18 @@
 """Agent loop: the core processing engine."""
 
 import asyncio
-import json
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
 from friday.bus.events import InboundMessage, OutboundMessage
 from friday.bus.queue import MessageBus
 from friday.providers.base import LLMProvider
+from friday.providers.context import call_context, current_call
+from friday.providers.errors import BudgetExceededError, LLMError
 from friday.agent.context import ContextBuilder
+from friday.agent.history import RollingHistory, history_budget
 from friday.agent.tools.registry import ToolRegistry
 from friday.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
 from friday.agent.tools.shell import ExecTool
@@ -18,8 +20,14 @@ from friday.agent.tools.web import WebSearchTool, WebFetchTool
 from friday.agent.tools.message import MessageTool
 from friday.agent.tools.spawn import SpawnTool
 from friday.agent.tools.cron import CronTool
+from friday.agent.tools.docs import SearchDocsTool
+from friday.agent.tools.history import SearchHistoryTool
 from friday.agent.subagent import SubagentManager
 from friday.session.manager import SessionManager
+from friday.utils import serde
+
+if TYPE_CHECKING:
+    from friday.config.schema import HistoryConfig
 
 
 class AgentLoop:
@@ -41,31 +49,50 @@ class AgentLoop:
         workspace: Path,
         model: str | None = None,
         max_iterations: int = 20,
+        max_tokens: int = 8192,
+        temperature: float = 0.7,
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         cron_service: "CronService | None" = None,
         restrict_to_workspace: bool = False,
+        session_manager: SessionManager | None = None,
+        history_config: "HistoryConfig | None" = None,
+        search_all_chats: bool = False,
     ):
-        from friday.config.schema import ExecToolConfig
+        from friday.config.schema import ExecToolConfig, HistoryConfig
         from friday.cron.service import CronService
         self.bus = bus
         self.provider = provider
         self.workspace = workspace
         self.model = model or provider.get_default_model()
         self.max_iterations = max_iterations
+        self.max_tokens = max_tokens
+        self.temperature = temperature
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
+        self.search_all_chats = search_all_chats
         
         self.context = ContextBuilder(workspace)
-        self.sessions = SessionManager(workspace)
+        self.sessions = session_manager or SessionManager(workspace)
+        history_config = history_config or HistoryConfig()
+        self.history = RollingHistory(
+            provider=provider,
+            model=self.model,
+            token_budget=history_budget(self.model, history_config.token_budget, history_config.model_budgets),
+            max_messages=self.sessions.tail_messages,
+            max_summary_chars=history_config.max_summary_chars,
+            min_fold_messages=history_config.min_fold_messages,
+        )
         self.tools = ToolRegistry()
         self.subagents = SubagentManager(
             provider=provider,
             workspace=workspace,
             bus=bus,
             model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
@@ -94,6 +121,13 @@ class AgentLoop:
         self.tools.register(WebSearchTool(api_key=self.brave_api_key))
         self.tools.register(WebFetchTool())
         
+        # Document search over the workspace
+        self.tools.register(SearchDocsTool(self.workspace))
+
+        # Past conversation search (when sessions are indexed)
+        if self.sessions.index is not None:
+            self.tools.register(SearchHistoryTool(self.sessions.index, allow_all_chats=self.search_all_chats))
+
         # Message tool
         message_tool = MessageTool(send_callback=self.bus.publish_outbound)
         self.tools.register(message_tool)
@@ -121,9 +155,23 @@ class AgentLoop:
                 
                 # Process it
                 try:
-                    response = await self._process_message(msg)
+                    response = await self._handle(msg)
                     if response:
                         await self.bus.publish_outbound(response)
+                except BudgetExceededError as e:
+                    logger.warning(f"LLM call refused for {msg.session_key}: {e}")
+                    await self.bus.publish_outbound(OutboundMessage(
+                        channel=msg.channel,
+                        chat_id=msg.chat_id,
+                        content="Sorry, the spending budget for this conversation is used up. Please try again later."
+                    ))
+                except LLMError as e:
+                    logger.error(f"LLM call failed for {msg.session_key}: {e}")
+                    await self.bus.publish_outbound(OutboundMessage(
+                        channel=msg.channel,
+                        chat_id=msg.chat_id,
+                        content="Sorry, I can't reach the language model right now. Please try again in a moment."
+                    ))
                 except Exception as e:
                     logger.error(f"Error processing message: {e}")
                     # Send error response
@@ -139,7 +187,23 @@ class AgentLoop:
         """Stop the agent loop."""
         self._running = False
         logger.info("Agent loop stopping")
+
+    async def aclose(self) -> None:
+        """Finish summary folds still running, then flush and close the sessions."""
+        await self.history.wait()
+        self.sessions.close()
     
+    async def _handle(self, msg: InboundMessage) -> OutboundMessage | None:
+        """Process a message with the CallContext of its session set."""
+        if msg.channel == "system":
+            session_key = msg.chat_id if ":" in msg.chat_id else f"cli:{msg.chat_id}"
+            source = "system"
+        else:
+            session_key = msg.session_key
+            source = current_call().source  # e.g. cron or heartbeat via process_direct
+        with call_context(source=source, session_key=session_key, channel=session_key.split(":", 1)[0]):
+            return await self._process_message(msg)
+
     async def _process_message(self, msg: InboundMessage) -> OutboundMessage | None:
         """
         Process a single inbound message.
@@ -159,6 +223,9 @@ class AgentLoop:
         
         # Get or create session
         session = self.sessions.get_or_create(msg.session_key)
+        # Remember the sender so background announces use the same memory namespaces
+        if session.metadata.get("sender_id") != msg.sender_id:
+            session.metadata["sender_id"] = msg.sender_id
         
         # Update tool contexts
         message_tool = self.tools.get("message")
@@ -173,13 +240,20 @@ class AgentLoop:
         if isinstance(cron_tool, CronTool):
             cron_tool.set_context(msg.channel, msg.chat_id)
         
-        # Build initial messages (use get_history for LLM-formatted messages)
+        history_tool = self.tools.get("search_history")
+        if isinstance(history_tool, SearchHistoryTool):
+            history_tool.set_context(msg.channel, msg.chat_id)
+
+        # Build initial messages from the token-budgeted history window
+        window = self.history.build(session)
         messages = self.context.build_messages(
-            history=session.get_history(),
+            history=window.messages,
             current_message=msg.content,
             media=msg.media if msg.media else None,
             channel=msg.channel,
             chat_id=msg.chat_id,
+            sender_id=msg.sender_id,
+            history_summary=window.summary,
         )
         
         # Agent loop
@@ -193,31 +267,23 @@ class AgentLoop:
             response = await self.provider.chat(
                 messages=messages,
                 tools=self.tools.get_definitions(),
-                model=self.model
+                model=self.model,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
             )
             
             # Handle tool calls
             if response.has_tool_calls:
                 # Add assistant message with tool calls
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)  # Must be JSON string
-                        }
-                    }
-                    for tc in response.tool_calls
-                ]
+                tool_call_dicts = [serde.encode_tool_call(tc) for tc in response.tool_calls]
                 messages = self.context.add_assistant_message(
                     messages, response.content, tool_call_dicts
                 )
                 
                 # Execute tools
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments)
-                    logger.debug(f"Executing tool: {tool_call.name} with arguments: {args_str}")
+                for tool_call, call in zip(response.tool_calls, tool_call_dicts):
+                    # Reuse the arguments encoded for the assistant message
+                    logger.debug(f"Executing tool: {tool_call.name} with arguments: {call['function']['arguments']}")
                     result = await self.tools.execute(tool_call.name, tool_call.arguments)
                     messages = self.context.add_tool_result(
                         messages, tool_call.id, tool_call.name, result
@@ -234,6 +300,8 @@ class AgentLoop:
         session.add_message("user", msg.content)
         session.add_message("assistant", final_content)
         self.sessions.save(session)
+        # Fold turns leaving the window into the rolling summary, off the critical path
+        self.history.schedule(session, self.sessions.save)
         
         return OutboundMessage(
             channel=msg.channel,
@@ -277,12 +345,19 @@ class AgentLoop:
         if isinstance(cron_tool, CronTool):
             cron_tool.set_context(origin_channel, origin_chat_id)
         
+        history_tool = self.tools.get("search_history")
+        if isinstance(history_tool, SearchHistoryTool):
+            history_tool.set_context(origin_channel, origin_chat_id)
+
         # Build messages with the announce content
+        window = self.history.build(session)
         messages = self.context.build_messages(
-            history=session.get_history(),
+            history=window.messages,
             current_message=msg.content,
             channel=origin_channel,
             chat_id=origin_chat_id,
+            sender_id=session.metadata.get("sender_id"),
+            history_summary=window.summary,
         )
         
         # Agent loop (limited for announce handling)
@@ -295,28 +370,20 @@ class AgentLoop:
             response = await self.provider.chat(
                 messages=messages,
                 tools=self.tools.get_definitions(),
-                model=self.model
+                model=self.model,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
             )
             
             if response.has_tool_calls:
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)
-                        }
-                    }
-                    for tc in response.tool_calls
-                ]
+                tool_call_dicts = [serde.encode_tool_call(tc) for tc in response.tool_calls]
                 messages = self.context.add_assistant_message(
                     messages, response.content, tool_call_dicts
                 )
                 
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments)
-                    logger.debug(f"Executing tool: {tool_call.name} with arguments: {args_str}")
+                for tool_call, call in zip(response.tool_calls, tool_call_dicts):
+                    # Reuse the arguments encoded for the assistant message
+                    logger.debug(f"Executing tool: {tool_call.name} with arguments: {call['function']['arguments']}")
                     result = await self.tools.execute(tool_call.name, tool_call.arguments)
                     messages = self.context.add_tool_result(
                         messages, tool_call.id, tool_call.name, result
@@ -332,6 +399,8 @@ class AgentLoop:
         session.add_message("user", f"[System: {msg.sender_id}] {msg.content}")
         session.add_message("assistant", final_content)
         self.sessions.save(session)
+        # Fold turns leaving the window into the rolling summary, off the critical path
+        self.history.schedule(session, self.sessions.save)
         
         return OutboundMessage(
             channel=origin_channel,
@@ -365,5 +434,5 @@ class AgentLoop:
             content=content
         )
         
-        response = await self._process_message(msg)
+        response = await self._handle(msg)
         return response.content if response else ""
@@ -3,7 +3,37 @@
 from pathlib import Path
 from datetime import datetime
 
-from friday.utils.helpers import ensure_dir, today_date
+from friday.utils.helpers import ensure_dir, safe_filename, today_date
+
+GLOBAL_NAMESPACE = "global"
+
+# Namespace kind -> subdirectory of memory/ holding one directory per channel/id
+_NAMESPACE_DIRS = {"user": "users", "chat": "chats"}
+
+
+def memory_namespaces(channel: str, chat_id: str, sender_id: str | None = None) -> list[str]:
+    """
+    Get the memory namespaces relevant to a conversation, broadest first.
+
+    Group chats get the shared namespace, the sender's user namespace and the
+    chat namespace. In a direct chat (sender == chat) the user namespace covers
+    the chat, so no separate chat namespace is used.
+
+    Args:
+        channel: Channel name (telegram, whatsapp, ...).
+        chat_id: Chat identifier.
+        sender_id: Sender identifier ("id|username" senders use the stable id part).
+
+    Returns:
+        Namespaces such as ["global", "user:telegram:42", "chat:telegram:-100"].
+    """
+    namespaces = [GLOBAL_NAMESPACE]
+    user_id = sender_id.split("|", 1)[0] if sender_id else ""
+    if user_id:
+        namespaces.append(f"user:{channel}:{user_id}")
+    if user_id != chat_id.split("@", 1)[0]:
+        namespaces.append(f"chat:{channel}:{chat_id}")
+    return namespaces
 
 
 class MemoryStore:
@@ -11,13 +41,60 @@ class MemoryStore:
     Memory system for the agent.
     
     Supports daily notes (memory/YYYY-MM-DD.md) and long-term memory (MEMORY.md).
+    Old daily notes are rolled into weekly/monthly digests (memory/digests/)
+    by the consolidation job, with the originals moved to memory/archive/.
+
+    Memory is split into namespaces, each with its own directory so that reading
+    one never touches another:
+    - "global": shared memory in memory/
+    - "user:<channel>:<id>": per-user memory in memory/users/<channel>/<id>/
+    - "chat:<channel>:<id>": per-chat memory in memory/chats/<channel>/<id>/
     """
     
-    def __init__(self, workspace: Path):
+    def __init__(self, workspace: Path, namespace: str = GLOBAL_NAMESPACE):
         self.workspace = workspace
-        self.memory_dir = ensure_dir(workspace / "memory")
+        self.namespace = namespace
+        self.memory_dir = self._namespace_dir(workspace, namespace)
+        if namespace == GLOBAL_NAMESPACE:
+            ensure_dir(self.memory_dir)
         self.memory_file = self.memory_dir / "MEMORY.md"
+        self.digests_dir = self.memory_dir / "digests"
+        self.archive_dir = self.memory_dir / "archive"
     
+    @staticmethod
+    def _namespace_dir(workspace: Path, namespace: str) -> Path:
+        """Map a namespace to its directory."""
+        root = workspace / "memory"
+        if namespace == GLOBAL_NAMESPACE:
+            return root
+        kind, _, rest = namespace.partition(":")
+        channel, _, ident = rest.partition(":")
+        if kind not in _NAMESPACE_DIRS or not channel or not ident:
+            raise ValueError(f"Invalid memory namespace: {namespace}")
+        return root / _NAMESPACE_DIRS[kind] / safe_filename(channel) / safe_filename(ident)
+
+    @classmethod
+    def list_namespaces(cls, workspace: Path) -> list["MemoryStore"]:
+        """List stores for every namespace that has memory on disk (global first)."""
+        stores = [cls(workspace)]
+        root = workspace / "memory"
+        for kind, dirname in _NAMESPACE_DIRS.items():
+            kind_dir = root / dirname
+            if not kind_dir.is_dir():
+                continue
+            for channel_dir in sorted(p for p in kind_dir.iterdir() if p.is_dir()):
+                for ident_dir in sorted(p for p in channel_dir.iterdir() if p.is_dir()):
+                    stores.append(cls(workspace, f"{kind}:{channel_dir.name}:{ident_dir.name}"))
+        return stores
+
+    @property
+    def label(self) -> str:
+        """Short label used in prompt headings."""
+        if self.namespace == GLOBAL_NAMESPACE:
+            return "shared"
+        kind, _, rest = self.namespace.partition(":")
+        return f"{kind} {rest}"
+
     def get_today_file(self) -> Path:
         """Get path to today's memory file."""
         return self.memory_dir / f"{today_date()}.md"
@@ -32,6 +109,7 @@ class MemoryStore:
     def append_today(self, content: str) -> None:
         """Append content to today's memory notes."""
         today_file = self.get_today_file()
+        ensure_dir(self.memory_dir)
         
         if today_file.exists():
             existing = today_file.read_text(encoding="utf-8")
@@ -51,6 +129,7 @@ class MemoryStore:
     
     def write_long_term(self, content: str) -> None:
         """Write to long-term memory (MEMORY.md)."""
+        ensure_dir(self.memory_dir)
         self.memory_file.write_text(content, encoding="utf-8")
     
     def get_recent_memories(self, days: int = 7) -> str:
@@ -87,23 +166,34 @@ class MemoryStore:
         files = list(self.memory_dir.glob("????-??-??.md"))
         return sorted(files, reverse=True)
     
-    def get_memory_context(self) -> str:
+    def list_digests(self, kind: str) -> list[Path]:
+        """List digest files of a kind ("weekly" or "monthly"), newest first."""
+        digest_dir = self.digests_dir / kind
+        if not digest_dir.exists():
+            return []
+        return sorted(digest_dir.glob("*.md"), reverse=True)
+
+    def get_memory_context(self, labeled: bool = False) -> str:
         """
         Get memory context for the agent.
         
+        Args:
+            labeled: If True, tag section headings with the namespace label.
+
         Returns:
             Formatted memory context including long-term and recent memories.
         """
         parts = []
+        suffix = f" ({self.label})" if labeled else ""
         
         # Long-term memory
         long_term = self.read_long_term()
         if long_term:
-            parts.append("## Long-term Memory\n" + long_term)
+            parts.append(f"## Long-term Memory{suffix}\n" + long_term)
         
         # Today's notes
         today = self.read_today()
         if today:
-            parts.append("## Today's Notes\n" + today)
+            parts.append(f"## Today's Notes{suffix}\n" + today)
         
         return "\n\n".join(parts) if parts else ""
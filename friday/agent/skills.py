@@ -4,11 +4,66 @@ import json
 import os
 import re
 import shutil
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from friday.utils.helpers import estimate_tokens
+
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
+# How long shutil.which() results are trusted before $PATH is searched again
+WHICH_CACHE_TTL_S = 300.0
+
+_which_cache: dict[str, tuple[float, str | None]] = {}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from how i in is it me my of on or please "
+    "so that the this to use using what when with you your".split()
+)
+
+
+def cached_which(binary: str, ttl: float = WHICH_CACHE_TTL_S) -> str | None:
+    """shutil.which() with results memoized for ttl seconds."""
+    now = time.monotonic()
+    hit = _which_cache.get(binary)
+    if hit and now - hit[0] < ttl:
+        return hit[1]
+    path = shutil.which(binary)
+    _which_cache[binary] = (now, path)
+    return path
+
+
+@dataclass
+class SkillEntry:
+    """A parsed skill in the catalog."""
+    name: str
+    path: Path
+    source: str  # "workspace" or "builtin"
+    content: str  # Full SKILL.md content
+    body: str  # Content without frontmatter
+    metadata: dict[str, str] = field(default_factory=dict)  # Raw frontmatter fields
+    friday_meta: dict = field(default_factory=dict)  # Parsed metadata.friday JSON
+    triggers: list[str] = field(default_factory=list)  # Normalized trigger phrases (see _words)
+    name_terms: frozenset[str] = frozenset()
+    description_terms: frozenset[str] = frozenset()
+
+
+def _escape_xml(s: str) -> str:
+    return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _words(text: str) -> str:
+    """Lowercased words joined by single spaces and padded, for whole-phrase matching."""
+    return " " + " ".join(_WORD_RE.findall(text.lower())) + " "
+
+
+def _terms(text: str) -> list[str]:
+    """Lowercased word tokens without stopwords."""
+    return [t for t in _WORD_RE.findall(text.lower().replace("_", " ")) if t not in _STOPWORDS]
+
 
 class SkillsLoader:
     """
@@ -16,12 +71,90 @@ class SkillsLoader:
     
     Skills are markdown files (SKILL.md) that teach the agent how to use
     specific tools or perform certain tasks.
+
+    Every SKILL.md is read and parsed once into a catalog, which is rebuilt only
+    when the skills directories or files change (checked via stat).
     """
     
     def __init__(self, workspace: Path, builtin_skills_dir: Path | None = None):
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
+        self._catalog: dict[str, SkillEntry] = {}
+        self._catalog_signature: tuple | None = None
+
+    # ========== Catalog ==========
+
+    def _signature(self) -> tuple:
+        """
+        Cheap fingerprint of the skills directories.
+
+        Covers the roots, every skill directory and every SKILL.md (mtime + size),
+        so adding, removing or editing a skill invalidates the catalog.
+        """
+        parts: list[tuple] = []
+        for root in (self.workspace_skills, self.builtin_skills):
+            if not root:
+                continue
+            try:
+                parts.append((str(root), root.stat().st_mtime_ns))
+                with os.scandir(root) as it:
+                    for entry in it:
+                        if not entry.is_dir():
+                            continue
+                        parts.append((entry.path, entry.stat().st_mtime_ns))
+                        try:
+                            st = os.stat(os.path.join(entry.path, "SKILL.md"))
+                            parts.append((st.st_mtime_ns, st.st_size))
+                        except OSError:
+                            pass
+            except OSError:
+                parts.append((str(root), None))
+        return tuple(sorted(parts, key=repr))
+
+    def _get_catalog(self) -> dict[str, SkillEntry]:
+        """Get the skills catalog, rebuilding it only if the directories changed."""
+        signature = self._signature()
+        if signature != self._catalog_signature:
+            self._catalog = self._build_catalog()
+            self._catalog_signature = signature
+        return self._catalog
+
+    def _build_catalog(self) -> dict[str, SkillEntry]:
+        """Read and parse every SKILL.md once (workspace skills shadow builtins)."""
+        catalog: dict[str, SkillEntry] = {}
+        for root, source in ((self.workspace_skills, "workspace"), (self.builtin_skills, "builtin")):
+            if not root or not root.exists():
+                continue
+            for skill_dir in sorted(root.iterdir()):
+                skill_file = skill_dir / "SKILL.md"
+                if skill_dir.name in catalog or not skill_dir.is_dir() or not skill_file.exists():
+                    continue
+                try:
+                    content = skill_file.read_text(encoding="utf-8")
+                except OSError:
+                    continue
+                metadata = self._parse_frontmatter(content) or {}
+                friday_meta = self._parse_friday_metadata(metadata.get("metadata", ""))
+                catalog[skill_dir.name] = SkillEntry(
+                    name=skill_dir.name,
+                    path=skill_file,
+                    source=source,
+                    content=content,
+                    body=self._strip_frontmatter(content),
+                    metadata=metadata,
+                    friday_meta=friday_meta,
+                    triggers=self._parse_triggers(metadata.get("triggers"), friday_meta.get("triggers")),
+                    name_terms=frozenset(_terms(skill_dir.name.replace("-", " "))),
+                    description_terms=frozenset(_terms(metadata.get("description", ""))),
+                )
+        return catalog
+
+    def get_entry(self, name: str) -> SkillEntry | None:
+        """Get a parsed skill from the catalog."""
+        return self._get_catalog().get(name)
+
+    # ========== Public API ==========
     
     def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
         """
@@ -33,28 +166,11 @@ class SkillsLoader:
         Returns:
             List of skill info dicts with 'name', 'path', 'source'.
         """
-        skills = []
-        
-        # Workspace skills (highest priority)
-        if self.workspace_skills.exists():
-            for skill_dir in self.workspace_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists():
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "workspace"})
-        
-        # Built-in skills
-        if self.builtin_skills and self.builtin_skills.exists():
-            for skill_dir in self.builtin_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists() and not any(s["name"] == skill_dir.name for s in skills):
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "builtin"})
-        
-        # Filter by requirements
+        # Workspace skills come first in the catalog (highest priority), then built-in
+        entries = list(self._get_catalog().values())
         if filter_unavailable:
-            return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
-        return skills
+            entries = [e for e in entries if self._check_requirements(e.friday_meta)]
+        return [{"name": e.name, "path": str(e.path), "source": e.source} for e in entries]
     
     def load_skill(self, name: str) -> str | None:
         """
@@ -66,18 +182,8 @@ class SkillsLoader:
         Returns:
             Skill content or None if not found.
         """
-        # Check workspace first
-        workspace_skill = self.workspace_skills / name / "SKILL.md"
-        if workspace_skill.exists():
-            return workspace_skill.read_text(encoding="utf-8")
-        
-        # Check built-in
-        if self.builtin_skills:
-            builtin_skill = self.builtin_skills / name / "SKILL.md"
-            if builtin_skill.exists():
-                return builtin_skill.read_text(encoding="utf-8")
-        
-        return None
+        entry = self.get_entry(name)
+        return entry.content if entry else None
     
     def load_skills_for_context(self, skill_names: list[str]) -> str:
         """
@@ -91,60 +197,134 @@ class SkillsLoader:
         """
         parts = []
         for name in skill_names:
-            content = self.load_skill(name)
-            if content:
-                content = self._strip_frontmatter(content)
-                parts.append(f"### Skill: {name}\n\n{content}")
+            entry = self.get_entry(name)
+            if entry and entry.body:
+                parts.append(f"### Skill: {name}\n\n{entry.body}")
         
         return "\n\n---\n\n".join(parts) if parts else ""
     
-    def build_skills_summary(self) -> str:
+    def rank_skills(self, query: str, context: str = "") -> list[tuple[float, SkillEntry]]:
+        """
+        Rank skills by lexical relevance to a message.
+
+        Scores name matches highest, then trigger phrases from the frontmatter,
+        then description words. Words from the recent context count half.
+
+        Args:
+            query: The current user message.
+            context: Recent conversation text.
+
+        Returns:
+            (score, entry) pairs, best first; zero scores are included.
+        """
+        query_words, context_words = _words(query), _words(context)
+        query_terms, context_terms = set(_terms(query)), set(_terms(context))
+
+        ranked = []
+        for entry in self._get_catalog().values():
+            score = 0.0
+            for terms, weight in ((query_terms, 1.0), (context_terms, 0.5)):
+                score += weight * 3 * len(entry.name_terms & terms)
+                score += weight * len(entry.description_terms & terms)
+            for phrase in entry.triggers:
+                if phrase in query_words:
+                    score += 2
+                elif phrase in context_words:
+                    score += 1
+            ranked.append((score, entry))
+        ranked.sort(key=lambda x: -x[0])
+        return ranked
+
+    def build_skills_summary(
+        self,
+        query: str | None = None,
+        context: str = "",
+        max_full: int = 3,
+        token_budget: int = 600,
+    ) -> str:
         """
         Build a summary of all skills (name, description, path, availability).
         
         This is used for progressive loading - the agent can read the full
         skill content using read_file when needed.
         
+        With a query, only the best-matching skills (at most max_full, within
+        token_budget) get a full entry; the rest are listed by name only, so
+        the summary stays roughly the same size as more skills are installed.
+
+        Args:
+            query: Current user message to rank skills against (None lists all in full).
+            context: Recent conversation text, used as a weaker ranking signal.
+            max_full: Maximum number of full entries when ranking.
+            token_budget: Approximate token budget for the summary when ranking.
+
         Returns:
             XML-formatted skills summary.
         """
-        all_skills = self.list_skills(filter_unavailable=False)
-        if not all_skills:
+        if query is None:
+            entries = list(self._get_catalog().values())
+            if not entries:
+                return ""
+            return "\n".join(["<skills>", *(self._skill_xml(e) for e in entries), "</skills>"])
+
+        ranked = self.rank_skills(query, context)
+        if not ranked:
             return ""
         
-        def escape_xml(s: str) -> str:
-            return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        blocks: list[str] = []
+        used = estimate_tokens("<skills>\n</skills>")
+        rest: list[str] = []
+        for score, entry in ranked:
+            block = self._skill_xml(entry)
+            if score > 0 and len(blocks) < max_full and used + estimate_tokens(block) <= token_budget:
+                blocks.append(block)
+                used += estimate_tokens(block)
+            else:
+                rest.append(entry.name)
         
-        lines = ["<skills>"]
-        for s in all_skills:
-            name = escape_xml(s["name"])
-            path = s["path"]
-            desc = escape_xml(self._get_skill_description(s["name"]))
-            skill_meta = self._get_skill_meta(s["name"])
-            available = self._check_requirements(skill_meta)
-            
-            lines.append(f"  <skill available=\"{str(available).lower()}\">")
-            lines.append(f"    <name>{name}</name>")
-            lines.append(f"    <description>{desc}</description>")
-            lines.append(f"    <location>{path}</location>")
-            
-            # Show missing requirements for unavailable skills
-            if not available:
-                missing = self._get_missing_requirements(skill_meta)
-                if missing:
-                    lines.append(f"    <requires>{escape_xml(missing)}</requires>")
-            
-            lines.append(f"  </skill>")
-        lines.append("</skills>")
+        lines = ["<skills>", *blocks, "</skills>"] if blocks else []
+        if rest:
+            names, omitted = [], 0
+            for name in rest:
+                if used + estimate_tokens(name) + 1 > token_budget:
+                    omitted += 1
+                    continue
+                names.append(name)
+                used += estimate_tokens(name) + 1
+            listing = ", ".join(names) + (f" (+{omitted} more)" if omitted else "")
+            lines.append(f"<other-skills>{_escape_xml(listing)}</other-skills>")
         
         return "\n".join(lines)
     
+    def _skill_xml(self, entry: SkillEntry) -> str:
+        """Render one full <skill> entry."""
+        available = self._check_requirements(entry.friday_meta)
+        lines = [
+            f"  <skill available=\"{str(available).lower()}\">",
+            f"    <name>{_escape_xml(entry.name)}</name>",
+            f"    <description>{_escape_xml(entry.metadata.get('description') or entry.name)}</description>",
+            f"    <location>{entry.path}</location>",
+        ]
+
+        # Show missing requirements for unavailable skills
+        if not available:
+            missing = self._get_missing_requirements(entry.friday_meta)
+            if missing:
+                lines.append(f"    <requires>{_escape_xml(missing)}</requires>")
+
+        lines.append("  </skill>")
+        return "\n".join(lines)
+
+    def skill_locations(self) -> list[Path]:
+        """Directories that hold <name>/SKILL.md files, highest priority first."""
+        return [p for p in (self.workspace_skills, self.builtin_skills) if p]
+
     def _get_missing_requirements(self, skill_meta: dict) -> str:
         """Get a description of missing requirements."""
         missing = []
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not cached_which(b):
                 missing.append(f"CLI: {b}")
         for env in requires.get("env", []):
             if not os.environ.get(env):
@@ -174,11 +354,25 @@ class SkillsLoader:
         except (json.JSONDecodeError, TypeError):
             return {}
     
+    def _parse_triggers(self, raw: str | None, meta_triggers: list | None) -> list[str]:
+        """Parse trigger phrases from frontmatter (comma list or JSON array) and metadata."""
+        triggers: list[str] = []
+        if raw:
+            try:
+                parsed = json.loads(raw)
+                triggers.extend(parsed if isinstance(parsed, list) else [str(parsed)])
+            except json.JSONDecodeError:
+                triggers.extend(raw.split(","))
+        if isinstance(meta_triggers, list):
+            triggers.extend(meta_triggers)
+        phrases = (_words(t) for t in map(str, triggers))
+        return [p for p in phrases if p.strip()]
+
     def _check_requirements(self, skill_meta: dict) -> bool:
         """Check if skill requirements are met (bins, env vars)."""
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not cached_which(b):
                 return False
         for env in requires.get("env", []):
             if not os.environ.get(env):
@@ -187,18 +381,16 @@ class SkillsLoader:
     
     def _get_skill_meta(self, name: str) -> dict:
         """Get friday metadata for a skill (cached in frontmatter)."""
-        meta = self.get_skill_metadata(name) or {}
-        return self._parse_friday_metadata(meta.get("metadata", ""))
+        entry = self.get_entry(name)
+        return entry.friday_meta if entry else {}
     
     def get_always_skills(self) -> list[str]:
         """Get skills marked as always=true that meet requirements."""
-        result = []
-        for s in self.list_skills(filter_unavailable=True):
-            meta = self.get_skill_metadata(s["name"]) or {}
-            skill_meta = self._parse_friday_metadata(meta.get("metadata", ""))
-            if skill_meta.get("always") or meta.get("always"):
-                result.append(s["name"])
-        return result
+        return [
+            e.name for e in self._get_catalog().values()
+            if (e.friday_meta.get("always") or e.metadata.get("always"))
+            and self._check_requirements(e.friday_meta)
+        ]
     
     def get_skill_metadata(self, name: str) -> dict | None:
         """
@@ -210,10 +402,11 @@ class SkillsLoader:
         Returns:
             Metadata dict or None.
         """
-        content = self.load_skill(name)
-        if not content:
-            return None
-        
+        entry = self.get_entry(name)
+        return dict(entry.metadata) if entry and entry.metadata else None
+
+    def _parse_frontmatter(self, content: str) -> dict[str, str] | None:
+        """Parse simple `key: value` YAML frontmatter."""
         if content.startswith("---"):
             match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
             if match:
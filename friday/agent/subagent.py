@@ -1,7 +1,6 @@
 """Subagent manager for background task execution."""
 
 import asyncio
-import json
 import uuid
 from pathlib import Path
 from typing import Any
@@ -11,10 +10,12 @@ from loguru import logger
 from friday.bus.events import InboundMessage
 from friday.bus.queue import MessageBus
 from friday.providers.base import LLMProvider
+from friday.providers.context import task_context
 from friday.agent.tools.registry import ToolRegistry
 from friday.agent.tools.filesystem import ReadFileTool, WriteFileTool, ListDirTool
 from friday.agent.tools.shell import ExecTool
 from friday.agent.tools.web import WebSearchTool, WebFetchTool
+from friday.utils import serde
 
 
 class SubagentManager:
@@ -32,6 +33,8 @@ class SubagentManager:
         workspace: Path,
         bus: MessageBus,
         model: str | None = None,
+        max_tokens: int = 8192,
+        temperature: float = 0.7,
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         restrict_to_workspace: bool = False,
@@ -41,6 +44,8 @@ class SubagentManager:
         self.workspace = workspace
         self.bus = bus
         self.model = model or provider.get_default_model()
+        self.max_tokens = max_tokens
+        self.temperature = temperature
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.restrict_to_workspace = restrict_to_workspace
@@ -75,7 +80,8 @@ class SubagentManager:
         
         # Create background task
         bg_task = asyncio.create_task(
-            self._run_subagent(task_id, task, display_label, origin)
+            self._run_subagent(task_id, task, display_label, origin),
+            context=task_context(source="subagent", subagent_id=task_id),
         )
         self._running_tasks[task_id] = bg_task
         
@@ -129,21 +135,13 @@ class SubagentManager:
                     messages=messages,
                     tools=tools.get_definitions(),
                     model=self.model,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
                 )
                 
                 if response.has_tool_calls:
                     # Add assistant message with tool calls
-                    tool_call_dicts = [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.name,
-                                "arguments": json.dumps(tc.arguments),
-                            },
-                        }
-                        for tc in response.tool_calls
-                    ]
+                    tool_call_dicts = [serde.encode_tool_call(tc) for tc in response.tool_calls]
                     messages.append({
                         "role": "assistant",
                         "content": response.content or "",
@@ -151,8 +149,8 @@ class SubagentManager:
                     })
                     
                     # Execute tools
-                    for tool_call in response.tool_calls:
-                        args_str = json.dumps(tool_call.arguments)
+                    for tool_call, call in zip(response.tool_calls, tool_call_dicts):
+                        args_str = call["function"]["arguments"]
                         logger.debug(f"Subagent [{task_id}] executing: {tool_call.name} with arguments: {args_str}")
                         result = await tools.execute(tool_call.name, tool_call.arguments)
                         messages.append({
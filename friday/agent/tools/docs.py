@@ -0,0 +1,53 @@
+"""Document search tool: search_docs."""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from friday.agent.tools.base import Tool
+
+
+class SearchDocsTool(Tool):
+    """Search workspace documents through a local hybrid index."""
+
+    name = "search_docs"
+    description = (
+        "Search documents in the workspace (notes, markdown, text, CSV, PDF, spreadsheets) "
+        "and return the most relevant passages with file and line references. "
+        "Prefer this over reading whole files; use read_file on a reference for more context."
+    )
+    parameters = {
+        "type": "object",
+        "properties": {
+            "query": {"type": "string", "description": "What to look for", "minLength": 1},
+            "top_k": {"type": "integer", "description": "Passages to return (1-20)", "minimum": 1, "maximum": 20},
+            "path": {"type": "string", "description": "Only search under this workspace-relative path"},
+        },
+        "required": ["query"]
+    }
+
+    def __init__(self, workspace: Path, max_passage_chars: int = 600):
+        self.workspace = workspace
+        self.max_passage_chars = max_passage_chars
+        self._index = None
+
+    def _get_index(self):
+        # Imported lazily: NumPy is only needed once the tool is actually used
+        if self._index is None:
+            from friday.retrieval.index import DocumentIndex
+            self._index = DocumentIndex(self.workspace)
+        return self._index
+
+    async def execute(self, query: str, top_k: int = 5, path: str | None = None, **kwargs: Any) -> str:
+        # Indexing and scoring are CPU-bound; keep them off the event loop
+        results = await asyncio.to_thread(self._get_index().search, query, top_k, path)
+        if not results:
+            return f"No matching passages for: {query}"
+
+        lines = [f"Results for: {query}\n"]
+        for i, r in enumerate(results, 1):
+            text = r.chunk.text
+            if len(text) > self.max_passage_chars:
+                text = text[:self.max_passage_chars] + "..."
+            lines.append(f"{i}. {r.chunk.ref} (score {r.score:.2f})\n{text}\n")
+        return "\n".join(lines)
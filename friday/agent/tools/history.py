@@ -0,0 +1,58 @@
+"""History search tool: search_history."""
+
+import asyncio
+from contextvars import ContextVar
+from typing import Any
+
+from friday.agent.tools.base import Tool
+from friday.session.search import HistoryIndex
+
+
+class SearchHistoryTool(Tool):
+    """Search past conversation messages through the full-text history index."""
+
+    name = "search_history"
+    description = (
+        "Search past conversations (including messages no longer in context) and return "
+        "matching snippets with session and timestamp. Use for questions like "
+        "'what did we decide about X last month?'."
+    )
+
+    def __init__(self, index: HistoryIndex, allow_all_chats: bool = False, max_results: int = 20):
+        self.index = index
+        self.allow_all_chats = allow_all_chats
+        self.max_results = max_results
+        # Per task, so turns running concurrently each search their own chat
+        self._session_key: ContextVar[str] = ContextVar("search_history_session", default="")
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        properties: dict[str, Any] = {
+            "query": {"type": "string", "description": "Words to look for", "minLength": 1},
+            "limit": {"type": "integer", "description": "Results (1-20)", "minimum": 1, "maximum": 20},
+        }
+        if self.allow_all_chats:
+            properties["scope"] = {
+                "type": "string",
+                "enum": ["chat", "all"],
+                "description": "Search this chat only (default) or every chat",
+            }
+        return {"type": "object", "properties": properties, "required": ["query"]}
+
+    def set_context(self, channel: str, chat_id: str) -> None:
+        """Set the current chat; searches are limited to it unless scope is "all"."""
+        self._session_key.set(f"{channel}:{chat_id}")
+
+    async def execute(self, query: str, limit: int = 8, scope: str = "chat", **kwargs: Any) -> str:
+        session_key = None if scope == "all" and self.allow_all_chats else self._session_key.get()
+        hits = await asyncio.to_thread(
+            self.index.search, query, min(limit, self.max_results), session_key
+        )
+        if not hits:
+            return f"No past messages found for: {query}"
+
+        lines = [f"Past messages for: {query}\n"]
+        for i, hit in enumerate(hits, 1):
+            when = (hit.timestamp or "")[:16].replace("T", " ")
+            lines.append(f"{i}. [{hit.session_key} {when}] {hit.role}: {hit.snippet}")
+        return "\n".join(lines)
@@ -1,7 +1,8 @@
 """Base channel interface for chat platforms."""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Coroutine
 
 from loguru import logger
 
@@ -30,6 +31,7 @@ class BaseChannel(ABC):
         self.config = config
         self.bus = bus
         self._running = False
+        self._tasks: set[asyncio.Task] = set()
     
     @abstractmethod
     async def start(self) -> None:
@@ -121,6 +123,22 @@ class BaseChannel(ABC):
         
         await self.bus.publish_inbound(msg)
     
+    def _in_background(self, coro: Coroutine[Any, Any, None]) -> None:
+        """Handle a message as a task (e.g. voice transcription), so it does not hold up the ones after it."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error handling {self.name} message: {task.exception()}")
+
+    def _cancel_background(self) -> None:
+        """Cancel messages still being handled in the background (on stop)."""
+        for task in self._tasks:
+            task.cancel()
+
     @property
     def is_running(self) -> bool:
         """Check if the channel is running."""
@@ -1,6 +1,7 @@
 """Channel manager for coordinating chat channels."""
 
 import asyncio
+from pathlib import Path
 from typing import Any
 
 from loguru import logger
@@ -9,6 +10,11 @@ from friday.bus.events import OutboundMessage
 from friday.bus.queue import MessageBus
 from friday.channels.base import BaseChannel
 from friday.config.schema import Config
+from friday.providers.transcription import (
+    GroqTranscriptionProvider,
+    TranscriptionPipeline,
+    TranscriptionProvider,
+)
 
 
 class ChannelManager:
@@ -21,43 +27,63 @@ class ChannelManager:
     - Route outbound messages
     """
     
-    def __init__(self, config: Config, bus: MessageBus):
+    def __init__(self, config: Config, bus: MessageBus, only: list[str] | None = None):
         self.config = config
         self.bus = bus
+        self.only = only  # Restrict to these channels (e.g. one node of a cluster)
         self.channels: dict[str, BaseChannel] = {}
         self._dispatch_task: asyncio.Task | None = None
+        self.transcriber = self._make_transcriber()
         
         self._init_channels()
     
+    def _enabled(self, name: str) -> bool:
+        if self.only is not None and name not in self.only:
+            return False
+        return getattr(self.config.channels, name).enabled
+
+    def _make_transcriber(self) -> TranscriptionProvider | None:
+        """One transcription pipeline shared by the voice-capable channels."""
+        config = self.config.transcription
+        if not config.enabled or not (self._enabled("telegram") or self._enabled("whatsapp")):
+            return None
+        return TranscriptionPipeline(
+            GroqTranscriptionProvider(api_key=self.config.providers.groq.api_key, model=config.model),
+            cache_dir=Path(config.cache_dir).expanduser() if config.cache_dir else None,
+            chunk_s=config.chunk_seconds,
+            max_parallel=config.max_parallel,
+            trim_silence=config.trim_silence,
+        )
+
     def _init_channels(self) -> None:
         """Initialize channels based on config."""
         
         # Telegram channel
-        if self.config.channels.telegram.enabled:
+        if self._enabled("telegram"):
             try:
                 from friday.channels.telegram import TelegramChannel
                 self.channels["telegram"] = TelegramChannel(
                     self.config.channels.telegram,
                     self.bus,
-                    groq_api_key=self.config.providers.groq.api_key,
+                    transcriber=self.transcriber,
                 )
                 logger.info("Telegram channel enabled")
             except ImportError as e:
                 logger.warning(f"Telegram channel not available: {e}")
         
         # WhatsApp channel
-        if self.config.channels.whatsapp.enabled:
+        if self._enabled("whatsapp"):
             try:
                 from friday.channels.whatsapp import WhatsAppChannel
                 self.channels["whatsapp"] = WhatsAppChannel(
-                    self.config.channels.whatsapp, self.bus
+                    self.config.channels.whatsapp, self.bus, transcriber=self.transcriber
                 )
                 logger.info("WhatsApp channel enabled")
             except ImportError as e:
                 logger.warning(f"WhatsApp channel not available: {e}")
 
         # Discord channel
-        if self.config.channels.discord.enabled:
+        if self._enabled("discord"):
             try:
                 from friday.channels.discord import DiscordChannel
                 self.channels["discord"] = DiscordChannel(
@@ -68,7 +94,7 @@ class ChannelManager:
                 logger.warning(f"Discord channel not available: {e}")
         
         # Feishu channel
-        if self.config.channels.feishu.enabled:
+        if self._enabled("feishu"):
             try:
                 from friday.channels.feishu import FeishuChannel
                 self.channels["feishu"] = FeishuChannel(
@@ -115,6 +141,9 @@ class ChannelManager:
                 logger.info(f"Stopped {name} channel")
             except Exception as e:
                 logger.error(f"Error stopping {name}: {e}")
+
+        if self.transcriber:
+            await self.transcriber.aclose()
     
     async def _dispatch_outbound(self) -> None:
         """Dispatch outbound messages to the appropriate channel."""
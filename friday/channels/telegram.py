@@ -2,6 +2,8 @@
 
 import asyncio
 import re
+from pathlib import Path
+from typing import Any
 
 from loguru import logger
 from telegram import Update
@@ -11,6 +13,7 @@ from friday.bus.events import OutboundMessage
 from friday.bus.queue import MessageBus
 from friday.channels.base import BaseChannel
 from friday.config.schema import TelegramConfig
+from friday.providers.transcription import TranscriptionProvider
 
 
 def _markdown_to_telegram_html(text: str) -> str:
@@ -85,10 +88,10 @@ class TelegramChannel(BaseChannel):
     
     name = "telegram"
     
-    def __init__(self, config: TelegramConfig, bus: MessageBus, groq_api_key: str = ""):
+    def __init__(self, config: TelegramConfig, bus: MessageBus, transcriber: TranscriptionProvider | None = None):
         super().__init__(config, bus)
         self.config: TelegramConfig = config
-        self.groq_api_key = groq_api_key
+        self.transcriber = transcriber
         self._app: Application | None = None
         self._chat_ids: dict[str, int] = {}  # Map sender_id to chat_id for replies
     
@@ -143,6 +146,7 @@ class TelegramChannel(BaseChannel):
     async def stop(self) -> None:
         """Stop the Telegram bot."""
         self._running = False
+        self._cancel_background()
         
         if self._app:
             logger.info("Stopping Telegram bot...")
@@ -236,13 +240,13 @@ class TelegramChannel(BaseChannel):
             media_type = "file"
         
         # Download media if present
+        voice_path = None
         if media_file and self._app:
             try:
                 file = await self._app.bot.get_file(media_file.file_id)
                 ext = self._get_extension(media_type, getattr(media_file, 'mime_type', None))
                 
                 # Save to workspace/media/
-                from pathlib import Path
                 media_dir = Path.home() / ".friday" / "media"
                 media_dir.mkdir(parents=True, exist_ok=True)
                 
@@ -251,16 +255,9 @@ class TelegramChannel(BaseChannel):
                 
                 media_paths.append(str(file_path))
                 
-                # Handle voice transcription
-                if media_type == "voice" or media_type == "audio":
-                    from friday.providers.transcription import GroqTranscriptionProvider
-                    transcriber = GroqTranscriptionProvider(api_key=self.groq_api_key)
-                    transcription = await transcriber.transcribe(file_path)
-                    if transcription:
-                        logger.info(f"Transcribed {media_type}: {transcription[:50]}...")
-                        content_parts.append(f"[transcription: {transcription}]")
-                    else:
-                        content_parts.append(f"[{media_type}: {file_path}]")
+                # Voice transcription happens when forwarding
+                if (media_type == "voice" or media_type == "audio") and self.transcriber:
+                    voice_path = file_path
                 else:
                     content_parts.append(f"[{media_type}: {file_path}]")
                     
@@ -269,6 +266,21 @@ class TelegramChannel(BaseChannel):
                 logger.error(f"Failed to download media: {e}")
                 content_parts.append(f"[{media_type}: download failed]")
         
+        metadata = {
+            "message_id": message.message_id,
+            "user_id": user.id,
+            "username": user.username,
+            "first_name": user.first_name,
+            "is_group": message.chat.type != "private"
+        }
+
+        if voice_path is not None:
+            # Transcribing can take a while: don't hold up the updates after this one
+            self._in_background(
+                self._handle_voice(sender_id, str(chat_id), media_type, voice_path, content_parts, media_paths, metadata)
+            )
+            return
+
         content = "\n".join(content_parts) if content_parts else "[empty message]"
         
         logger.debug(f"Telegram message from {sender_id}: {content[:50]}...")
@@ -279,13 +291,32 @@ class TelegramChannel(BaseChannel):
             chat_id=str(chat_id),
             content=content,
             media=media_paths,
-            metadata={
-                "message_id": message.message_id,
-                "user_id": user.id,
-                "username": user.username,
-                "first_name": user.first_name,
-                "is_group": message.chat.type != "private"
-            }
+            metadata=metadata
+        )
+
+    async def _handle_voice(
+        self,
+        sender_id: str,
+        chat_id: str,
+        media_type: str,
+        file_path: Path,
+        content_parts: list[str],
+        media_paths: list[str],
+        metadata: dict[str, Any],
+    ) -> None:
+        """Transcribe a voice or audio message and forward it."""
+        transcription = await self.transcriber.transcribe(file_path)
+        if transcription:
+            logger.info(f"Transcribed {media_type}: {transcription[:50]}...")
+            content_parts.append(f"[transcription: {transcription}]")
+        else:
+            content_parts.append(f"[{media_type}: {file_path}]")
+        await self._handle_message(
+            sender_id=sender_id,
+            chat_id=chat_id,
+            content="\n".join(content_parts),
+            media=media_paths,
+            metadata=metadata,
         )
     
     def _get_extension(self, media_type: str, mime_type: str | None) -> str:
@@ -1,7 +1,8 @@
 """WhatsApp channel implementation using Node.js bridge."""
 
 import asyncio
-import json
+import base64
+from pathlib import Path
 from typing import Any
 
 from loguru import logger
@@ -10,6 +11,11 @@ from friday.bus.events import OutboundMessage
 from friday.bus.queue import MessageBus
 from friday.channels.base import BaseChannel
 from friday.config.schema import WhatsAppConfig
+from friday.providers.transcription import TranscriptionProvider
+from friday.utils import serde
+
+# Voice messages arrive base64 encoded in one frame (WhatsApp allows audio up to 16 MB)
+MAX_BRIDGE_FRAME = 32 * 1024 * 1024
 
 
 class WhatsAppChannel(BaseChannel):
@@ -22,9 +28,11 @@ class WhatsAppChannel(BaseChannel):
     
     name = "whatsapp"
     
-    def __init__(self, config: WhatsAppConfig, bus: MessageBus):
+    def __init__(self, config: WhatsAppConfig, bus: MessageBus, transcriber: TranscriptionProvider | None = None):
         super().__init__(config, bus)
         self.config: WhatsAppConfig = config
+        self.transcriber = transcriber
+        self.media_dir = Path.home() / ".friday" / "media"
         self._ws = None
         self._connected = False
     
@@ -40,7 +48,7 @@ class WhatsAppChannel(BaseChannel):
         
         while self._running:
             try:
-                async with websockets.connect(bridge_url) as ws:
+                async with websockets.connect(bridge_url, max_size=MAX_BRIDGE_FRAME) as ws:
                     self._ws = ws
                     self._connected = True
                     logger.info("Connected to WhatsApp bridge")
@@ -67,6 +75,7 @@ class WhatsAppChannel(BaseChannel):
         """Stop the WhatsApp channel."""
         self._running = False
         self._connected = False
+        self._cancel_background()
         
         if self._ws:
             await self._ws.close()
@@ -84,15 +93,40 @@ class WhatsAppChannel(BaseChannel):
                 "to": msg.chat_id,
                 "text": msg.content
             }
-            await self._ws.send(json.dumps(payload))
+            await self._ws.send(serde.dumps(payload))
         except Exception as e:
             logger.error(f"Error sending WhatsApp message: {e}")
     
+    def _save_audio(self, message_id: str, audio: dict[str, Any]) -> Path:
+        """Write a voice message from the bridge to the media directory."""
+        mimetype = audio.get("mimetype", "").split(";")[0].strip()
+        ext = {"audio/ogg": ".ogg", "audio/mpeg": ".mp3", "audio/mp4": ".m4a", "audio/aac": ".aac"}.get(mimetype, ".ogg")
+        self.media_dir.mkdir(parents=True, exist_ok=True)
+        file_path = self.media_dir / f"wa_{message_id[:32]}{ext}"
+        file_path.write_bytes(base64.b64decode(audio.get("data", "")))
+        return file_path
+
+    async def _handle_voice(self, sender_id: str, chat_id: str, file_path: Path, metadata: dict[str, Any]) -> None:
+        """Transcribe a voice message and forward it."""
+        transcription = await self.transcriber.transcribe(file_path) if self.transcriber else ""
+        if transcription:
+            logger.info(f"Transcribed voice message from {sender_id}: {transcription[:50]}...")
+            content = f"[transcription: {transcription}]"
+        else:
+            content = f"[voice: {file_path}]"
+        await self._handle_message(
+            sender_id=sender_id,
+            chat_id=chat_id,
+            content=content,
+            media=[str(file_path)],
+            metadata=metadata,
+        )
+
     async def _handle_bridge_message(self, raw: str) -> None:
         """Handle a message from the bridge."""
         try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
+            data = serde.loads(raw)
+        except serde.JSONDecodeError:
             logger.warning(f"Invalid JSON from bridge: {raw[:100]}")
             return
         
@@ -107,20 +141,24 @@ class WhatsAppChannel(BaseChannel):
             # Extract just the phone number as chat_id
             chat_id = sender.split("@")[0] if "@" in sender else sender
             
-            # Handle voice transcription if it's a voice message
-            if content == "[Voice Message]":
-                logger.info(f"Voice message received from {chat_id}, but direct download from bridge is not yet supported.")
-                content = "[Voice Message: Transcription not available for WhatsApp yet]"
+            metadata = {
+                "message_id": data.get("id"),
+                "timestamp": data.get("timestamp"),
+                "is_group": data.get("isGroup", False)
+            }
+
+            # Voice messages come with their audio (base64) from the bridge
+            if data.get("audio"):
+                file_path = self._save_audio(data.get("id") or str(data.get("timestamp")), data["audio"])
+                # Transcribing can take a while: don't hold up the bridge connection
+                self._in_background(self._handle_voice(chat_id, sender, file_path, metadata))
+                return
             
             await self._handle_message(
                 sender_id=chat_id,
                 chat_id=sender,  # Use full JID for replies
                 content=content,
-                metadata={
-                    "message_id": data.get("id"),
-                    "timestamp": data.get("timestamp"),
-                    "is_group": data.get("isGroup", False)
-                }
+                metadata=metadata
             )
         
         elif msg_type == "status":
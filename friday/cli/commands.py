@@ -1,6 +1,7 @@
 """CLI commands for friday."""
 
 import asyncio
+import time
 from pathlib import Path
 
 import typer
@@ -147,6 +148,304 @@ This file stores important information that should persist across sessions.
         console.print("  [dim]Created memory/MEMORY.md[/dim]")
 
 
+def _make_session_manager(config, backfill: bool = True):
+    """Create the session manager on the configured store, migrating JSONL sessions into SQLite once."""
+    from friday.session.archive import SessionArchive
+    from friday.session.manager import SessionManager
+    from friday.session.store import JsonlSessionStore
+
+    cfg = config.sessions
+    sessions_dir = Path(cfg.path).expanduser()
+    store = JsonlSessionStore(sessions_dir)
+    if cfg.backend == "sqlite":
+        from friday.session.sqlite_store import SqliteSessionStore, migrate_jsonl
+        jsonl, store = store, SqliteSessionStore(sessions_dir / "sessions.db")
+        migrated = migrate_jsonl(jsonl, store)
+        if migrated:
+            console.print(f"[green]✓[/green] Migrated {migrated} sessions to SQLite")
+
+    index = None
+    if cfg.search_index:
+        import threading
+
+        from friday.session.search import HistoryIndex
+        index = HistoryIndex(sessions_dir / "history_index.db")
+        if backfill:
+            # One-time indexing of sessions saved before the index existed
+            threading.Thread(target=index.backfill, args=(store,), name="history-backfill", daemon=True).start()
+
+    return SessionManager(
+        config.workspace_path,
+        store=store,
+        max_sessions=cfg.cache_max_sessions,
+        max_bytes=cfg.cache_max_mb * 1024 * 1024,
+        tail_messages=cfg.tail_messages,
+        index=index,
+        flush_interval_s=cfg.flush_interval_ms / 1000 if cfg.flush_interval_ms > 0 else None,
+        archive=SessionArchive(sessions_dir / "archive"),
+    )
+
+
+def _make_http_pool(config):
+    from friday.providers.openai_compat import HTTPClientPool
+
+    return HTTPClientPool(http2=config.llm.http2)
+
+
+def _make_client(config, name: str | None, model: str, api_key: str | None, api_base: str | None, http_pool=None):
+    """
+    A provider client: the native OpenAI-compatible client for the endpoints
+    it knows (unless llm.native is off), LiteLLMProvider for everything else.
+    """
+    from friday.providers.openai_compat import NATIVE_ENDPOINTS, OpenAICompatProvider
+
+    # Same endpoint detection as LiteLLMProvider
+    if (api_key or "").startswith("sk-or-") or "openrouter" in (api_base or ""):
+        name = "openrouter"
+    elif api_base and name in (None, "vllm"):
+        name = "vllm"
+    if config.llm.native and name in NATIVE_ENDPOINTS:
+        default_base, prefixes = NATIVE_ENDPOINTS[name]
+        base = api_base or default_base
+        if base:
+            return OpenAICompatProvider(
+                api_key=api_key,
+                api_base=base,
+                default_model=model,
+                pool=http_pool,
+                strip_prefixes=prefixes,
+                name=name,
+            )
+    from friday.providers.litellm_provider import LiteLLMProvider
+
+    return LiteLLMProvider(api_key=api_key, api_base=api_base, default_model=model)
+
+
+def _make_named_client(config, name: str, model: str, http_pool=None):
+    """A client for a named provider under config.providers (None if not configured)."""
+    provider_cfg = getattr(config.providers, name, None)
+    if provider_cfg is None or not (provider_cfg.api_key or provider_cfg.api_base):
+        return None
+    api_base = provider_cfg.api_base
+    if name == "openrouter":
+        api_base = api_base or "https://openrouter.ai/api/v1"
+    return _make_client(config, name, model, provider_cfg.api_key or None, api_base, http_pool)
+
+
+def _make_provider_pool(config, http_pool=None):
+    """
+    Clients for the default model's provider and every other configured
+    one, each model resolved to its provider's client.
+    """
+    from functools import partial
+
+    from friday.providers.pool import ModelSettings, ProviderPool
+
+    cfg = config.llm
+    http_pool = http_pool or _make_http_pool(config)
+    default_model = config.agents.defaults.model
+    default_endpoint = config.get_provider_name() or "default"
+    factories = {
+        name: partial(_make_named_client, config, name, default_model, http_pool)
+        for name in type(config.providers).model_fields
+    }
+    # The default provider keeps the key/base fallbacks of get_api_key() and get_api_base()
+    factories[default_endpoint] = partial(
+        _make_client,
+        config,
+        config.get_provider_name(),
+        default_model,
+        api_key=config.get_api_key(),
+        api_base=config.get_api_base(),
+        http_pool=http_pool,
+    )
+    pool = ProviderPool(
+        factories,
+        resolve=config.get_provider_name,
+        default_endpoint=default_endpoint,
+        default_model=default_model,
+        settings={key: ModelSettings(**s.model_dump()) for key, s in cfg.models.items()},
+    )
+    pool.prepare([
+        default_model,
+        cfg.hedge.model if not cfg.hedge.provider else "",
+        *(m for rule in cfg.routing.rules for m in (rule.model, rule.escalate_to)),
+        *(budget.degrade_to for budget in cfg.ledger.budgets.values()),
+    ])
+    return pool
+
+
+def _make_provider(config, cache: bool = True, http_pool=None, ledger=None):
+    """
+    Create the LLM provider: the default model's provider, then the failover
+    chain (each client under its rate limits), optionally hedged, with batch
+    turns going through the batch API, recorded in the usage ledger under its
+    budgets, behind the response cache and the model router. Native clients
+    share http_pool.
+    """
+    from friday.providers.resilient import ProviderRoute, ResilientProvider, RetryPolicy
+
+    cfg = config.llm
+    http_pool = http_pool or _make_http_pool(config)
+    limiter = _make_rate_limiter(config)
+    primary = _make_provider_pool(config, http_pool)
+    routes = [ProviderRoute(primary.default_endpoint, _limited(primary, limiter))]
+    for target in cfg.failover:
+        backup = _make_named_client(config, target.provider, target.model, http_pool)
+        if backup is None:
+            console.print(f"[yellow]Skipping failover provider {target.provider}: not configured[/yellow]")
+            continue
+        name = target.provider
+        if any(route.name == name for route in routes):
+            name = f"{name}:{target.model}"
+        routes.append(ProviderRoute(name, _limited(backup, limiter), model=target.model))
+    provider = ResilientProvider(
+        routes,
+        retry=RetryPolicy(cfg.max_attempts, cfg.retry_base_ms / 1000, cfg.retry_max_ms / 1000),
+        breaker_failures=cfg.breaker_failures,
+        breaker_reset_s=cfg.breaker_reset_s,
+    )
+    if cfg.hedge.enabled:
+        provider = _make_hedged(config, provider, limiter, http_pool)
+    if cfg.batch.enabled:
+        provider = _make_batching(config, provider, http_pool)
+    if ledger is not None:
+        from friday.providers.ledger import Budget, LedgerProvider
+        provider = LedgerProvider(
+            provider,
+            ledger,
+            budgets={key: Budget(**budget.model_dump()) for key, budget in cfg.ledger.budgets.items()},
+            prices=cfg.prices,
+        )
+    if cache and cfg.cache.enabled:
+        from friday.providers.cache import CachingProvider
+        provider = CachingProvider(provider, _make_response_cache(config), sources=cfg.cache.sources)
+    if cfg.routing.enabled and cfg.routing.rules:
+        from friday.providers.routing import RouteRule, RoutingProvider
+        provider = RoutingProvider(
+            provider,
+            [RouteRule(**rule.model_dump()) for rule in cfg.routing.rules],
+            escalate=cfg.routing.escalate,
+            prices=cfg.prices,
+        )
+    return provider
+
+
+def _make_rate_limiter(config):
+    if not config.llm.limits:
+        return None
+    from friday.providers.limits import Limits, RateLimiter
+
+    return RateLimiter({
+        key: Limits(lim.max_concurrent, lim.requests_per_minute, lim.tokens_per_minute)
+        for key, lim in config.llm.limits.items()
+    })
+
+
+def _limited(provider, limiter):
+    """Put a provider client under the shared rate limits (if any are configured)."""
+    if limiter is None:
+        return provider
+    from friday.providers.limits import RateLimitedProvider
+
+    return RateLimitedProvider(provider, limiter)
+
+
+def _make_hedged(config, provider, limiter=None, http_pool=None):
+    from friday.providers.hedging import HedgedProvider
+
+    cfg = config.llm.hedge
+    secondary = provider
+    if cfg.provider:
+        secondary = _make_named_client(config, cfg.provider, cfg.model or config.agents.defaults.model, http_pool)
+        if secondary is None:
+            console.print(f"[yellow]Hedging disabled: provider {cfg.provider} is not configured[/yellow]")
+            return provider
+        secondary = _limited(secondary, limiter)
+    return HedgedProvider(
+        provider,
+        secondary,
+        secondary_model=cfg.model or None,
+        percentile=cfg.percentile,
+        initial_delay_s=cfg.initial_delay_ms / 1000,
+        min_delay_s=cfg.min_delay_ms / 1000,
+        max_delay_s=cfg.max_delay_ms / 1000,
+        budget_ratio=cfg.budget_percent / 100,
+        burst=cfg.burst,
+    )
+
+
+def _make_batching(config, provider, http_pool=None):
+    from friday.providers.batch import BatchingProvider, OpenAIBatchClient
+    from friday.providers.openai_compat import OpenAICompatProvider
+
+    cfg = config.llm.batch
+    client = _make_named_client(config, cfg.provider, cfg.model or config.agents.defaults.model, http_pool)
+    if not isinstance(client, OpenAICompatProvider):
+        console.print(f"[yellow]Batch API disabled: provider {cfg.provider} is not configured for it[/yellow]")
+        return provider
+    return BatchingProvider(
+        provider,
+        OpenAIBatchClient(client),
+        model=cfg.model or None,
+        window_s=cfg.window_s,
+        max_requests=cfg.max_requests,
+        poll_interval_s=cfg.poll_interval_s,
+        timeout_s=cfg.timeout_minutes * 60,
+    )
+
+
+def _make_usage_ledger(config):
+    """The usage ledger, or None if it is disabled."""
+    if not config.llm.ledger.enabled:
+        return None
+    from friday.providers.ledger import UsageLedger
+
+    return UsageLedger(Path(config.llm.ledger.path).expanduser())
+
+
+def _make_response_cache(config):
+    from friday.providers.cache import ResponseCache
+
+    cfg = config.llm.cache
+    return ResponseCache(
+        Path(cfg.path).expanduser(),
+        ttl_s=cfg.ttl_hours * 3600,
+        max_bytes=cfg.max_mb * 1024 * 1024,
+    )
+
+
+def _make_cluster_bus(config, node_id: str | None = None):
+    """Create this node's cluster bus; sessions move to the shared directory."""
+    from friday.cluster import ClusterBus, ClusterState, default_node_id
+
+    cfg = config.cluster
+    shared_dir = Path(cfg.shared_dir).expanduser()
+    # All nodes read and write the same sessions
+    config.sessions.backend = "sqlite"
+    config.sessions.path = str(shared_dir / "sessions")
+    return ClusterBus(
+        ClusterState(shared_dir / "cluster.db"),
+        node_id or cfg.node_id or default_node_id(),
+        shared_dir=shared_dir,
+        heartbeat_s=cfg.heartbeat_s,
+        node_ttl_s=cfg.node_ttl_s,
+        poll_s=cfg.poll_ms / 1000,
+    )
+
+
+def _make_archiver(config, manager):
+    from friday.session.archive import SessionArchiver
+
+    cfg = config.sessions
+    return SessionArchiver(
+        manager,
+        manager.archive,
+        idle_days=cfg.archive_after_days,
+        retention_days=cfg.archive_retention_days,
+    )
+
+
 # ============================================================================
 # Gateway / Server
 # ============================================================================
@@ -156,16 +455,28 @@ This file stores important information that should persist across sessions.
 def gateway(
     port: int = typer.Option(18790, "--port", "-p", help="Gateway port"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    node_id: str = typer.Option(None, "--node-id", help="Cluster node ID (cluster mode)"),
+    node_channels: str = typer.Option(
+        None, "--channels", help="Comma-separated channels this node connects, or 'none' (cluster mode)"
+    ),
+    no_llm_cache: bool = typer.Option(False, "--no-llm-cache", help="Disable the LLM response cache"),
+    bypass_llm_cache: str = typer.Option(
+        None, "--bypass-llm-cache",
+        help="Comma-separated turn sources (cron, heartbeat) that always call the LLM, refreshing the cache",
+    ),
 ):
     """Start the friday gateway."""
     from friday.config.loader import load_config, get_data_dir
     from friday.bus.queue import MessageBus
-    from friday.providers.litellm_provider import LiteLLMProvider
     from friday.agent.loop import AgentLoop
     from friday.channels.manager import ChannelManager
     from friday.cron.service import CronService
     from friday.cron.types import CronJob
-    from friday.heartbeat.service import HeartbeatService
+    from friday.heartbeat.service import HEARTBEAT_OK_TOKEN, HeartbeatService
+    from friday.providers.context import call_context
+    from friday.agent import consolidation
+    from friday.cron.maintenance import MaintenanceJobs
+    from friday.session import archive
     
     if verbose:
         import logging
@@ -176,11 +487,16 @@ def gateway(
     config = load_config()
     
     # Create components
-    bus = MessageBus()
+    cluster = None
+    if config.cluster.enabled:
+        cluster = _make_cluster_bus(config, node_id)
+        bus = cluster
+        console.print(f"[green]✓[/green] Cluster node {cluster.node_id} ({cluster.shared_dir})")
+    else:
+        bus = MessageBus()
     
     # Create provider (supports OpenRouter, Anthropic, OpenAI, Bedrock)
     api_key = config.get_api_key()
-    api_base = config.get_api_base()
     model = config.agents.defaults.model
     is_bedrock = model.startswith("bedrock/")
 
@@ -189,15 +505,21 @@ def gateway(
         console.print("Set one in ~/.friday/config.json under providers.openrouter.apiKey")
         raise typer.Exit(1)
     
-    provider = LiteLLMProvider(
-        api_key=api_key,
-        api_base=api_base,
-        default_model=config.agents.defaults.model
-    )
+    http_pool = _make_http_pool(config)
+    ledger = _make_usage_ledger(config)
+    provider = _make_provider(config, cache=not no_llm_cache, http_pool=http_pool, ledger=ledger)
     
     # Create cron service first (callback set after agent creation)
-    cron_store_path = get_data_dir() / "cron" / "jobs.json"
-    cron = CronService(cron_store_path)
+    if cluster is not None:
+        # Every node schedules the shared jobs; a lease picks the one that runs each due job
+        from friday.cluster.bus import cron_claim_name
+        cron = CronService(
+            cluster.shared_dir / "cron" / "jobs.json",
+            claim=lambda job, now_ms: cluster.claim(cron_claim_name(job, now_ms), ttl_s=24 * 3600),
+            max_sleep_s=30,
+        )
+    else:
+        cron = CronService(get_data_dir() / "cron" / "jobs.json")
     
     # Create agent with cron service
     agent = AgentLoop(
@@ -206,15 +528,47 @@ def gateway(
         workspace=config.workspace_path,
         model=config.agents.defaults.model,
         max_iterations=config.agents.defaults.max_tool_iterations,
+        max_tokens=config.agents.defaults.max_tokens,
+        temperature=config.agents.defaults.temperature,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        session_manager=_make_session_manager(
+            config, backfill=cluster is None or cluster.claim("history-backfill", ttl_s=24 * 3600)
+        ),
+        history_config=config.agents.history,
+        search_all_chats=config.sessions.search_all_chats,
     )
     
+    # Maintenance (memory consolidation, session archival) runs as cron system events
+    maintenance = MaintenanceJobs(cron)
+    mem_cfg = config.agents.memory
+    consolidator = consolidation.MemoryConsolidator(
+        agent.context.memory,
+        provider=provider,
+        model=config.agents.defaults.model,
+        keep_days=mem_cfg.keep_days,
+        keep_weeks=mem_cfg.keep_weeks,
+        max_digest_chars=mem_cfg.max_digest_chars,
+        batch_size=mem_cfg.batch_size,
+    )
+    maintenance.register(
+        consolidation.CONSOLIDATE_EVENT, consolidation.CONSOLIDATE_JOB_NAME, mem_cfg.schedule,
+        lambda: consolidation.run_maintenance(consolidator), schedule=mem_cfg.consolidate,
+    )
+    archiver = _make_archiver(config, agent.sessions)
+    maintenance.register(
+        archive.ARCHIVE_EVENT, archive.ARCHIVE_JOB_NAME, config.sessions.archive_schedule,
+        lambda: archive.run_maintenance(archiver), schedule=config.sessions.archive_after_days > 0,
+    )
+
     # Set cron callback (needs agent)
-    async def on_cron_job(job: CronJob) -> str | None:
+    async def run_cron_job(job: CronJob) -> str | None:
         """Execute a cron job through the agent."""
+        if job.payload.kind == "system_event":
+            return await maintenance.run(job)
+
         response = await agent.process_direct(
             job.payload.message,
             session_key=f"cron:{job.id}",
@@ -229,22 +583,51 @@ def gateway(
                 content=response or ""
             ))
         return response
+
+    bypass_sources = {s.strip() for s in (bypass_llm_cache or "").split(",") if s.strip()}
+
+    async def on_cron_job(job: CronJob) -> str | None:
+        batch_turn = f"{job.id}:{time.time_ns()}" if job.payload.batch else None
+        bypass = job.payload.no_cache or "cron" in bypass_sources
+        with call_context(source="cron", job_id=job.id, batch_turn=batch_turn, bypass_cache=bypass):
+            return await run_cron_job(job)
     cron.on_job = on_cron_job
     
     # Create heartbeat service
+    heartbeat_interval_s = 30 * 60
+
     async def on_heartbeat(prompt: str) -> str:
         """Execute heartbeat through the agent."""
-        return await agent.process_direct(prompt, session_key="heartbeat")
+        if cluster is not None:
+            slot = int(time.time()) // heartbeat_interval_s
+            if not cluster.claim(f"heartbeat:{slot}", ttl_s=heartbeat_interval_s * 2):
+                return HEARTBEAT_OK_TOKEN  # Another node handles this one
+        with call_context(source="heartbeat", bypass_cache="heartbeat" in bypass_sources):
+            return await agent.process_direct(prompt, session_key="heartbeat")
     
     heartbeat = HeartbeatService(
         workspace=config.workspace_path,
         on_heartbeat=on_heartbeat,
-        interval_s=30 * 60,  # 30 minutes
+        interval_s=heartbeat_interval_s,  # 30 minutes
         enabled=True
     )
     
     # Create channel manager
-    channels = ChannelManager(config, bus)
+    only = None
+    if cluster is not None:
+        only = config.cluster.channels
+        if node_channels is not None:
+            only = [] if node_channels == "none" else [c.strip() for c in node_channels.split(",") if c.strip()]
+    channels = ChannelManager(config, bus, only=only)
+    if cluster is not None:
+        cluster.channels = channels.enabled_channels
+
+        def drop_moved_sessions() -> None:
+            # Sessions that moved to another node are reloaded there; drop our copies
+            for key in agent.sessions.cached_keys():
+                if not cluster.owns(key):
+                    agent.sessions.evict(key)
+        cluster.on_ownership_change = drop_moved_sessions
     
     if channels.enabled_channels:
         console.print(f"[green]✓[/green] Channels enabled: {', '.join(channels.enabled_channels)}")
@@ -258,9 +641,14 @@ def gateway(
     console.print(f"[green]✓[/green] Heartbeat: every 30m")
     
     async def run():
+        warmup: asyncio.Task | None = None
         try:
+            if cluster is not None:
+                await cluster.start()
             await cron.start()
             await heartbeat.start()
+            # Connections are opened in the background; the first turn reuses them
+            warmup = asyncio.create_task(http_pool.warmup())
             await asyncio.gather(
                 agent.run(),
                 channels.start_all(),
@@ -271,8 +659,22 @@ def gateway(
             cron.stop()
             agent.stop()
             await channels.stop_all()
+            if cluster is not None:
+                await cluster.stop()
+        finally:
+            # Warmup requests may still be in flight
+            if warmup is not None:
+                warmup.cancel()
+                await asyncio.gather(warmup, return_exceptions=True)
+            # Summary folds still call the provider; they finish before the sessions close
+            await agent.aclose()
+            await http_pool.aclose()
     
-    asyncio.run(run())
+    try:
+        asyncio.run(run())
+    finally:
+        if ledger is not None:
+            ledger.close()
 
 
 
@@ -290,13 +692,12 @@ def agent(
     """Interact with the agent directly."""
     from friday.config.loader import load_config
     from friday.bus.queue import MessageBus
-    from friday.providers.litellm_provider import LiteLLMProvider
     from friday.agent.loop import AgentLoop
+    from friday.providers.errors import LLMError
     
     config = load_config()
     
     api_key = config.get_api_key()
-    api_base = config.get_api_base()
     model = config.agents.defaults.model
     is_bedrock = model.startswith("bedrock/")
 
@@ -305,46 +706,69 @@ def agent(
         raise typer.Exit(1)
 
     bus = MessageBus()
-    provider = LiteLLMProvider(
-        api_key=api_key,
-        api_base=api_base,
-        default_model=config.agents.defaults.model
-    )
+    http_pool = _make_http_pool(config)
+    ledger = _make_usage_ledger(config)
+    provider = _make_provider(config, http_pool=http_pool, ledger=ledger)
     
     agent_loop = AgentLoop(
         bus=bus,
         provider=provider,
         workspace=config.workspace_path,
+        model=config.agents.defaults.model,
+        max_iterations=config.agents.defaults.max_tool_iterations,
+        max_tokens=config.agents.defaults.max_tokens,
+        temperature=config.agents.defaults.temperature,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        session_manager=_make_session_manager(config),
+        history_config=config.agents.history,
+        search_all_chats=config.sessions.search_all_chats,
     )
     
-    if message:
-        # Single message mode
-        async def run_once():
-            response = await agent_loop.process_direct(message, session_id)
-            console.print(f"\n{__logo__} {response}")
-        
-        asyncio.run(run_once())
-    else:
-        # Interactive mode
-        console.print(f"{__logo__} Interactive mode (Ctrl+C to exit)\n")
-        
-        async def run_interactive():
-            while True:
+    try:
+        if message:
+            # Single message mode
+            async def run_once():
                 try:
-                    user_input = console.input("[bold blue]You:[/bold blue] ")
-                    if not user_input.strip():
-                        continue
-                    
-                    response = await agent_loop.process_direct(user_input, session_id)
-                    console.print(f"\n{__logo__} {response}\n")
-                except KeyboardInterrupt:
-                    console.print("\nGoodbye!")
-                    break
-        
-        asyncio.run(run_interactive())
+                    response = await agent_loop.process_direct(message, session_id)
+                    console.print(f"\n{__logo__} {response}")
+                except LLMError as e:
+                    console.print(f"[red]LLM error: {e}[/red]")
+                    raise typer.Exit(1)
+                finally:
+                    # Like the gateway: finish summary folds, then flush and close the sessions
+                    await agent_loop.aclose()
+
+            asyncio.run(run_once())
+        else:
+            # Interactive mode
+            console.print(f"{__logo__} Interactive mode (Ctrl+C to exit)\n")
+
+            async def run_interactive():
+                # Open connections before the first turn
+                await http_pool.warmup()
+                try:
+                    while True:
+                        try:
+                            user_input = console.input("[bold blue]You:[/bold blue] ")
+                            if not user_input.strip():
+                                continue
+
+                            response = await agent_loop.process_direct(user_input, session_id)
+                            console.print(f"\n{__logo__} {response}\n")
+                        except LLMError as e:
+                            console.print(f"[red]LLM error: {e}[/red]\n")
+                        except KeyboardInterrupt:
+                            console.print("\nGoodbye!")
+                            break
+                finally:
+                    await agent_loop.aclose()
+
+            asyncio.run(run_interactive())
+    finally:
+        if ledger is not None:
+            ledger.close()
 
 
 # ============================================================================
@@ -479,15 +903,24 @@ cron_app = typer.Typer(help="Manage scheduled tasks")
 app.add_typer(cron_app, name="cron")
 
 
+def _cron_store_path() -> Path:
+    """The jobs file the gateway uses (shared by all nodes in cluster mode)."""
+    from friday.config.loader import get_data_dir, load_config
+
+    config = load_config()
+    if config.cluster.enabled:
+        return Path(config.cluster.shared_dir).expanduser() / "cron" / "jobs.json"
+    return get_data_dir() / "cron" / "jobs.json"
+
+
 @cron_app.command("list")
 def cron_list(
     all: bool = typer.Option(False, "--all", "-a", help="Include disabled jobs"),
 ):
     """List scheduled jobs."""
-    from friday.config.loader import get_data_dir
     from friday.cron.service import CronService
     
-    store_path = get_data_dir() / "cron" / "jobs.json"
+    store_path = _cron_store_path()
     service = CronService(store_path)
     
     jobs = service.list_jobs(include_disabled=all)
@@ -536,9 +969,10 @@ def cron_add(
     deliver: bool = typer.Option(False, "--deliver", "-d", help="Deliver response to channel"),
     to: str = typer.Option(None, "--to", help="Recipient for delivery"),
     channel: str = typer.Option(None, "--channel", help="Channel for delivery (e.g. 'telegram', 'whatsapp')"),
+    batch: bool = typer.Option(False, "--batch", help="Not urgent: run through the provider batch API when enabled"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always call the LLM, never answer from the response cache"),
 ):
     """Add a scheduled job."""
-    from friday.config.loader import get_data_dir
     from friday.cron.service import CronService
     from friday.cron.types import CronSchedule
     
@@ -555,7 +989,7 @@ def cron_add(
         console.print("[red]Error: Must specify --every, --cron, or --at[/red]")
         raise typer.Exit(1)
     
-    store_path = get_data_dir() / "cron" / "jobs.json"
+    store_path = _cron_store_path()
     service = CronService(store_path)
     
     job = service.add_job(
@@ -565,6 +999,8 @@ def cron_add(
         deliver=deliver,
         to=to,
         channel=channel,
+        batch=batch,
+        no_cache=no_cache,
     )
     
     console.print(f"[green]✓[/green] Added job '{job.name}' ({job.id})")
@@ -575,10 +1011,9 @@ def cron_remove(
     job_id: str = typer.Argument(..., help="Job ID to remove"),
 ):
     """Remove a scheduled job."""
-    from friday.config.loader import get_data_dir
     from friday.cron.service import CronService
     
-    store_path = get_data_dir() / "cron" / "jobs.json"
+    store_path = _cron_store_path()
     service = CronService(store_path)
     
     if service.remove_job(job_id):
@@ -593,10 +1028,9 @@ def cron_enable(
     disable: bool = typer.Option(False, "--disable", help="Disable instead of enable"),
 ):
     """Enable or disable a job."""
-    from friday.config.loader import get_data_dir
     from friday.cron.service import CronService
     
-    store_path = get_data_dir() / "cron" / "jobs.json"
+    store_path = _cron_store_path()
     service = CronService(store_path)
     
     job = service.enable_job(job_id, enabled=not disable)
@@ -613,10 +1047,9 @@ def cron_run(
     force: bool = typer.Option(False, "--force", "-f", help="Run even if disabled"),
 ):
     """Manually run a job."""
-    from friday.config.loader import get_data_dir
     from friday.cron.service import CronService
     
-    store_path = get_data_dir() / "cron" / "jobs.json"
+    store_path = _cron_store_path()
     service = CronService(store_path)
     
     async def run():
@@ -628,6 +1061,79 @@ def cron_run(
         console.print(f"[red]Failed to run job {job_id}[/red]")
 
 
+# ============================================================================
+# Session Commands
+# ============================================================================
+
+sessions_app = typer.Typer(help="Manage conversation sessions")
+app.add_typer(sessions_app, name="sessions")
+
+
+@sessions_app.command("prune")
+def sessions_prune(
+    idle_days: int = typer.Option(None, "--idle-days", help="Archive sessions idle this many days (default: config)"),
+    retention_days: int = typer.Option(None, "--retention-days", help="Delete archives older than this (default: config)"),
+):
+    """Archive idle sessions and delete expired archives."""
+    from friday.config.loader import load_config
+
+    config = load_config()
+    manager = _make_session_manager(config, backfill=False)
+    archiver = _make_archiver(config, manager)
+    if idle_days is not None:
+        archiver.idle_days = idle_days
+    if retention_days is not None:
+        archiver.retention_days = retention_days
+
+    try:
+        report = archiver.run()
+    finally:
+        manager.close()
+    console.print(f"[green]✓[/green] {report.summary()}")
+
+
+@sessions_app.command("compact")
+def sessions_compact():
+    """Compact the session store and the history index."""
+    from friday.config.loader import load_config
+
+    manager = _make_session_manager(load_config(), backfill=False)
+    try:
+        reclaimed = manager.store.compact_all()
+        if manager.index is not None:
+            reclaimed += manager.index.optimize()
+    finally:
+        manager.close()
+    console.print(f"[green]✓[/green] Reclaimed {reclaimed / 1024:.1f} KiB")
+
+
+@sessions_app.command("stats")
+def sessions_stats():
+    """Show session storage usage."""
+    from friday.config.loader import load_config
+
+    config = load_config()
+    manager = _make_session_manager(config, backfill=False)
+    try:
+        active = len(manager.list_sessions())
+        active_bytes = manager.store.disk_usage()
+        archived = _make_archiver(config, manager).stats()
+        indexed = manager.index.count() if manager.index is not None else None
+    finally:
+        manager.close()
+
+    table = Table(title="Sessions")
+    table.add_column("Tier", style="cyan")
+    table.add_column("Sessions", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_row(f"active ({config.sessions.backend})", str(active), f"{active_bytes / 1024:.1f} KiB")
+    table.add_row("archived (gzip)", str(archived["archived_sessions"]),
+                  f"{archived['archived_bytes'] / 1024:.1f} KiB")
+    console.print(table)
+    if indexed is not None:
+        console.print(f"History index: {indexed} messages")
+
+
 # ============================================================================
 # Status Commands
 # ============================================================================
@@ -664,6 +1170,37 @@ def status():
         vllm_status = f"[green]✓ {config.providers.vllm.api_base}[/green]" if has_vllm else "[dim]not set[/dim]"
         console.print(f"vLLM/Local: {vllm_status}")
 
+        if config.llm.cache.enabled:
+            stats = _make_response_cache(config).stats()
+            rates = ", ".join(
+                f"{source} {s['hit_rate']:.0%} of {s['hits'] + s['misses']}" for source, s in stats["sources"].items()
+            )
+            console.print(
+                f"LLM cache: {stats['entries']} responses, {stats['bytes'] / 1024 / 1024:.1f} MB"
+                + (f" (hit rate: {rates})" if rates else "")
+            )
+
+        ledger = _make_usage_ledger(config)
+        if ledger is not None:
+            from friday.providers.ledger import period_start
+
+            for label, period in (("today", "day"), ("this month", "month")):
+                total = ledger.summary(period_start(period), "total")
+                if not total:
+                    console.print(f"LLM spend {label}: [dim]none[/dim]")
+                    continue
+                t = total[0]
+                console.print(
+                    f"LLM spend {label}: ${t['cost_usd']:.4f} ({t['calls']} calls, "
+                    f"{t['prompt_tokens']} prompt / {t['completion_tokens']} completion tokens, "
+                    f"{t['cached_tokens']} cached)"
+                )
+            for scope in ("model", "channel", "session", "job", "subagent"):
+                rows = [r for r in ledger.summary(period_start("day"), scope) if r["key"] is not None]
+                if rows:
+                    console.print(f"  by {scope}: " + ", ".join(f"{r['key']} ${r['cost_usd']:.4f}" for r in rows))
+            ledger.close()
+
 
 if __name__ == "__main__":
     app()
@@ -0,0 +1,7 @@
+"""Multi-node gateway: consistent-hash session routing over shared state."""
+
+from friday.cluster.bus import ClusterBus, cron_claim_name, default_node_id, routing_key
+from friday.cluster.ring import HashRing
+from friday.cluster.state import ClusterState
+
+__all__ = ["ClusterBus", "ClusterState", "HashRing", "cron_claim_name", "default_node_id", "routing_key"]
@@ -0,0 +1,184 @@
+"""Message bus that routes sessions across gateway nodes."""
+
+import asyncio
+import os
+import shutil
+import socket
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from loguru import logger
+
+from friday.bus.events import InboundMessage, OutboundMessage
+from friday.bus.queue import MessageBus
+from friday.cluster.ring import HashRing
+from friday.cluster.state import ClusterState
+from friday.utils import serde
+from friday.utils.helpers import ensure_dir
+
+if TYPE_CHECKING:
+    from friday.cron.types import CronJob
+
+
+def default_node_id() -> str:
+    """hostname-pid, unique per process on a box."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def routing_key(msg: InboundMessage) -> str:
+    """Session key a message is routed by (system messages carry their origin chat)."""
+    return msg.chat_id if msg.channel == "system" and ":" in msg.chat_id else msg.session_key
+
+
+def cron_claim_name(job: "CronJob", now_ms: int) -> str:
+    """
+    Lease name identifying one run of a cron job, the same on every node.
+
+    Runs are keyed by their scheduled time, which every node computes
+    identically (interval jobs run on a grid anchored at their creation).
+    """
+    return f"cron:{job.id}:{job.state.next_run_at_ms or now_ms}"
+
+
+class ClusterBus(MessageBus):
+    """
+    MessageBus for one node of a multi-node gateway.
+
+    Inbound messages are routed by consistent hashing on the session key:
+    the owner queues them locally, other nodes forward them through the
+    shared inbox. Outbound messages for a channel connected on another node
+    go through the shared outbox. Each node therefore processes a disjoint
+    set of sessions, so SessionManager caches never hold stale copies; when
+    membership changes, on_ownership_change is called so the node can drop
+    sessions it no longer owns (see owns()).
+
+    Nodes poll the shared state every poll_s, and are considered gone when
+    their heartbeat is older than node_ttl_s.
+    """
+
+    def __init__(
+        self,
+        state: ClusterState,
+        node_id: str,
+        shared_dir: Path | None = None,
+        heartbeat_s: float = 2.0,
+        node_ttl_s: float = 10.0,
+        poll_s: float = 0.2,
+        vnodes: int = 64,
+    ):
+        super().__init__()
+        self.state = state
+        self.node_id = node_id
+        self.shared_dir = shared_dir
+        self.heartbeat_s = heartbeat_s
+        self.node_ttl_s = node_ttl_s
+        self.poll_s = poll_s
+        self.vnodes = vnodes
+        self.channels: list[str] = []  # Channels connected on this node
+        self.ring = HashRing([node_id], vnodes)
+        self.on_ownership_change: Callable[[], None] | None = None
+        self._remote_channels: set[str] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    def owns(self, session_key: str) -> bool:
+        return self.ring.owner(session_key) == self.node_id
+
+    # ========== Routing ==========
+
+    async def publish_inbound(self, msg: InboundMessage) -> None:
+        key = routing_key(msg)
+        owner = self.ring.owner(key)
+        if owner == self.node_id:
+            await super().publish_inbound(msg)
+            return
+        payload = serde.dumps(serde.encode_inbound(self._share_media(msg)))
+        await asyncio.to_thread(self.state.push_inbound, owner, key, payload)
+        logger.debug(f"Cluster: forwarded {key} to {owner}")
+
+    async def publish_outbound(self, msg: OutboundMessage) -> None:
+        if msg.channel in self.channels or msg.channel not in self._remote_channels:
+            await super().publish_outbound(msg)
+            return
+        payload = serde.dumps(serde.encode_outbound(msg))
+        await asyncio.to_thread(self.state.push_outbound, msg.channel, payload)
+
+    def _share_media(self, msg: InboundMessage) -> InboundMessage:
+        """Copy local media files into the shared directory so the owner can read them."""
+        if not msg.media or self.shared_dir is None:
+            return msg
+        media_dir = ensure_dir(self.shared_dir / "media")
+        shared = []
+        for item in msg.media:
+            path = Path(item)
+            if path.is_file() and not path.resolve().is_relative_to(self.shared_dir.resolve()):
+                target = media_dir / f"{self.node_id}_{path.name}"
+                shutil.copyfile(path, target)
+                item = str(target)
+            shared.append(item)
+        msg.media = shared
+        return msg
+
+    # ========== Membership ==========
+
+    def claim(self, name: str, ttl_s: float) -> bool:
+        """Take a one-off lease (e.g. a cron run); True on exactly one node."""
+        return self.state.acquire(name, self.node_id, ttl_s)
+
+    def refresh(self) -> None:
+        """Heartbeat, rebuild the ring from live nodes and adopt orphaned messages."""
+        self.state.heartbeat(self.node_id, self.channels)
+        live = self.state.live_nodes(self.node_ttl_s)
+        self._remote_channels = {c for node, chans in live.items() if node != self.node_id for c in chans}
+        if set(live) != set(self.ring.nodes):
+            self.ring = HashRing(live, self.vnodes)
+            logger.info(f"Cluster: {len(live)} live nodes ({', '.join(live)})")
+            if self.on_ownership_change is not None:
+                self.on_ownership_change()
+        orphans = self.state.orphaned_inbound(list(live))
+        mine = [(self.node_id, row_id) for row_id, key in orphans if self.owns(key)]
+        if mine:
+            self.state.readdress_inbound(mine)
+        self.state.expire_leases()
+
+    async def start(self) -> None:
+        """Join the cluster and start polling the shared state."""
+        self.refresh()
+        self._tasks = [
+            asyncio.create_task(self._membership_loop()),
+            asyncio.create_task(self._pump_loop()),
+        ]
+
+    async def stop(self) -> None:
+        """Leave the cluster."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.state.leave(self.node_id)
+
+    async def _membership_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_s)
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Cluster: membership refresh failed: {e}")
+
+    async def _pump_loop(self) -> None:
+        while True:
+            try:
+                await self.pump()
+            except Exception as e:
+                logger.error(f"Cluster: failed to read shared queues: {e}")
+            await asyncio.sleep(self.poll_s)
+
+    async def pump(self) -> int:
+        """Move messages addressed to this node from the shared queues to the local ones."""
+        inbound = await asyncio.to_thread(self.state.take_inbound, self.node_id)
+        outbound = await asyncio.to_thread(self.state.take_outbound, self.channels)
+        for payload in inbound:
+            await super().publish_inbound(serde.decode_inbound(serde.loads(payload)))
+        for payload in outbound:
+            await super().publish_outbound(serde.decode_outbound(serde.loads(payload)))
+        return len(inbound) + len(outbound)
+
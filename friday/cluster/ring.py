@@ -0,0 +1,42 @@
+"""Consistent hash ring mapping session keys to gateway nodes."""
+
+import bisect
+import hashlib
+from typing import Iterable
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    Consistent hashing with virtual nodes.
+
+    Every node owns `vnodes` points on a 64-bit ring; a key belongs to the
+    first point at or after its hash. Adding or removing a node only moves
+    the keys of that node (about 1/N of them), and every process that sees
+    the same node list computes the same owners.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 64):
+        self.vnodes = vnodes
+        self.nodes: tuple[str, ...] = tuple(sorted(set(nodes)))
+        points = sorted(
+            (_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes)
+        )
+        self._hashes = [h for h, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key: str) -> str | None:
+        """Node owning a key (None for an empty ring)."""
+        if not self._hashes:
+            return None
+        i = bisect.bisect_left(self._hashes, _hash(key))
+        return self._owners[i % len(self._owners)]
+
+    def __contains__(self, node: str) -> bool:
+        return node in self.nodes
+
+    def __len__(self) -> int:
+        return len(self.nodes)
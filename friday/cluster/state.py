@@ -0,0 +1,197 @@
+"""Shared cluster state: node membership, leases and the cross-node inbox/outbox."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from friday.utils import serde
+from friday.utils.helpers import ensure_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    node_id TEXT PRIMARY KEY,
+    channels TEXT NOT NULL DEFAULT '[]',
+    started_at REAL NOT NULL,
+    heartbeat_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS inbox (
+    id INTEGER PRIMARY KEY,
+    node_id TEXT NOT NULL,
+    session_key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_inbox_node ON inbox(node_id, id);
+
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    channel TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_channel ON outbox(channel, id);
+"""
+
+
+class ClusterState:
+    """
+    Cluster coordination in one SQLite (WAL) database on storage all nodes
+    can reach: a shared directory for local processes, or a network volume
+    with working locks.
+
+    - nodes: membership by heartbeat; a node is live while its last
+      heartbeat is younger than the node TTL.
+    - leases: named, expiring ownership (e.g. one cron run). The holder may
+      renew; anyone may take over an expired lease.
+    - inbox: inbound messages forwarded to the node owning their session.
+    - outbox: outbound messages for channels connected on another node.
+
+    Queue rows are deleted when they are taken, so a node that crashes while
+    handling a message loses that message (at-most-once delivery).
+    """
+
+    def __init__(self, path: Path, busy_timeout_ms: int = 10000):
+        self.path = path
+        ensure_dir(path.parent)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(path), check_same_thread=False, isolation_level=None, timeout=busy_timeout_ms / 1000
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def _transaction(self, fn, *args: Any) -> Any:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(*args)
+                self._conn.execute("COMMIT")
+                return result
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # ========== Membership ==========
+
+    def heartbeat(self, node_id: str, channels: list[str]) -> None:
+        """Register or refresh a node."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO nodes (node_id, channels, started_at, heartbeat_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(node_id) DO UPDATE SET channels = excluded.channels, heartbeat_at = excluded.heartbeat_at",
+                (node_id, serde.dumps(sorted(channels)), now, now),
+            )
+
+    def live_nodes(self, ttl_s: float) -> dict[str, list[str]]:
+        """Live nodes and the channels each one has connected."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT node_id, channels FROM nodes WHERE heartbeat_at >= ? ORDER BY node_id",
+                (time.time() - ttl_s,),
+            ).fetchall()
+        return {node_id: serde.loads(channels) for node_id, channels in rows}
+
+    def leave(self, node_id: str) -> None:
+        """Remove a node so the others take over its sessions immediately."""
+        with self._lock:
+            self._conn.execute("DELETE FROM nodes WHERE node_id = ?", (node_id,))
+
+    # ========== Leases ==========
+
+    def acquire(self, name: str, owner: str, ttl_s: float) -> bool:
+        """
+        Take or renew a lease.
+
+        Returns:
+            True if `owner` holds the lease for the next ttl_s seconds.
+        """
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.expires_at < ? OR leases.owner = excluded.owner",
+                (name, owner, now + ttl_s, now),
+            )
+        return cur.rowcount == 1
+
+    def release(self, name: str, owner: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+    def expire_leases(self) -> int:
+        """Delete expired leases. Returns the count."""
+        with self._lock:
+            return self._conn.execute("DELETE FROM leases WHERE expires_at < ?", (time.time(),)).rowcount
+
+    # ========== Queues ==========
+
+    def push_inbound(self, node_id: str, session_key: str, payload: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO inbox (node_id, session_key, payload, created_at) VALUES (?, ?, ?, ?)",
+                (node_id, session_key, payload, time.time()),
+            )
+
+    def take_inbound(self, node_id: str, limit: int = 100) -> list[str]:
+        """Remove and return the oldest inbound payloads addressed to a node."""
+        def take() -> list[str]:
+            rows = self._conn.execute(
+                "SELECT id, payload FROM inbox WHERE node_id = ? ORDER BY id LIMIT ?", (node_id, limit)
+            ).fetchall()
+            if rows:
+                self._conn.execute("DELETE FROM inbox WHERE node_id = ? AND id <= ?", (node_id, rows[-1][0]))
+            return [payload for _, payload in rows]
+        return self._transaction(take)
+
+    def orphaned_inbound(self, live: list[str]) -> list[tuple[int, str]]:
+        """(id, session_key) of inbound rows addressed to nodes that are gone."""
+        marks = ",".join("?" * len(live))
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT id, session_key FROM inbox WHERE node_id NOT IN ({marks})", live
+            ).fetchall()
+
+    def readdress_inbound(self, moves: list[tuple[str, int]]) -> None:
+        """Point inbound rows at new owners: [(node_id, row id)]."""
+        def readdress() -> None:
+            self._conn.executemany("UPDATE inbox SET node_id = ? WHERE id = ?", moves)
+        self._transaction(readdress)
+
+    def push_outbound(self, channel: str, payload: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO outbox (channel, payload, created_at) VALUES (?, ?, ?)",
+                (channel, payload, time.time()),
+            )
+
+    def take_outbound(self, channels: list[str], limit: int = 100) -> list[str]:
+        """Remove and return the oldest outbound payloads for the given channels."""
+        if not channels:
+            return []
+        marks = ",".join("?" * len(channels))
+
+        def take() -> list[str]:
+            rows = self._conn.execute(
+                f"SELECT id, payload FROM outbox WHERE channel IN ({marks}) ORDER BY id LIMIT ?",
+                (*channels, limit),
+            ).fetchall()
+            if rows:
+                self._conn.executemany("DELETE FROM outbox WHERE id = ?", [(row_id,) for row_id, _ in rows])
+            return [payload for _, payload in rows]
+        return self._transaction(take)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
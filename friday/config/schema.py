@@ -1,6 +1,8 @@
 """Configuration schema using Pydantic."""
 
 from pathlib import Path
+from typing import Literal
+
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
@@ -56,9 +58,29 @@ class AgentDefaults(BaseModel):
     max_tool_iterations: int = 20
 
 
+class MemoryConfig(BaseModel):
+    """Memory consolidation configuration."""
+    consolidate: bool = True  # Run the background consolidation job in the gateway
+    schedule: str = "0 3 * * *"  # Cron expression for the consolidation job
+    keep_days: int = 7  # Daily notes newer than this stay as-is
+    keep_weeks: int = 4  # Weekly digests newer than this stay as-is
+    max_digest_chars: int = 4000  # Hard size cap per digest
+    batch_size: int = 8  # Digests summarized per LLM call
+
+
+class HistoryConfig(BaseModel):
+    """Conversation history window."""
+    token_budget: int = 12000  # Prompt tokens for history (rolling summary + recent messages)
+    model_budgets: dict[str, int] = Field(default_factory=dict)  # Model-name keyword -> token budget
+    max_summary_chars: int = 2000  # Hard size cap for the rolling summary
+    min_fold_messages: int = 4  # Fold older messages into the summary once this many are pending
+
+
 class AgentsConfig(BaseModel):
     """Agent configuration."""
     defaults: AgentDefaults = Field(default_factory=AgentDefaults)
+    memory: MemoryConfig = Field(default_factory=MemoryConfig)
+    history: HistoryConfig = Field(default_factory=HistoryConfig)
 
 
 class ProviderConfig(BaseModel):
@@ -81,6 +103,114 @@ class ProvidersConfig(BaseModel):
     moonshot: ProviderConfig = Field(default_factory=ProviderConfig)
 
 
+class FailoverTarget(BaseModel):
+    """A provider to fall back to, with the model to request there."""
+    provider: str  # Name under providers, e.g. "openrouter"
+    model: str  # e.g. "openrouter/anthropic/claude-opus-4-5"
+
+
+class LLMCacheConfig(BaseModel):
+    """Disk cache of LLM responses for repeated prompts."""
+    enabled: bool = False
+    path: str = "~/.friday/llm_cache.db"
+    sources: list[str] = Field(default_factory=lambda: ["cron", "heartbeat", "subagent"])  # Turn sources that use it
+    ttl_hours: float = 24.0
+    max_mb: int = 256
+
+
+class ModelSettingsConfig(BaseModel):
+    """Settings applied to every call of a model."""
+    max_tokens: int | None = None  # Cap on the completion allowance
+    temperature: float | None = None  # Fixed sampling temperature
+
+
+class LLMBatchConfig(BaseModel):
+    """Provider batch API for the first call of non-urgent cron jobs (payload.batch)."""
+    enabled: bool = False
+    provider: str = "openai"  # Name under providers; must offer the OpenAI batch API (/files, /batches)
+    model: str = ""  # Model for batched calls (default: the one requested)
+    window_s: float = 2.0  # Calls are collected this long before a batch is submitted
+    max_requests: int = 500
+    poll_interval_s: float = 30.0
+    timeout_minutes: float = 60.0  # Then the batch is cancelled and its calls are made live
+
+
+class BudgetConfig(BaseModel):
+    """A spending limit, in estimated USD."""
+    usd: float
+    period: Literal["day", "month", "total"] = "day"
+    action: Literal["degrade", "refuse"] = "refuse"
+    degrade_to: str = ""  # Model used once the budget is spent (action "degrade")
+
+
+class LedgerConfig(BaseModel):
+    """Token and cost ledger of LLM calls, and spending budgets."""
+    enabled: bool = True
+    path: str = "~/.friday/usage.db"
+    # Scope ("total", "model", "channel", "session", "job", "subagent") -> budget for each key of it,
+    # or "scope:key" (e.g. "session:telegram:42", "job:ab12cd34") -> budget for that one
+    budgets: dict[str, BudgetConfig] = Field(default_factory=dict)
+
+
+class LLMHedgeConfig(BaseModel):
+    """Hedged requests: race a second request when the first is slower than usual."""
+    enabled: bool = False
+    provider: str = ""  # Name under providers for the hedge; empty uses the primary chain
+    model: str = ""  # Model for the hedge; empty uses the requested model
+    percentile: float = 95.0  # Hedge once a request is slower than this latency percentile of its model
+    initial_delay_ms: int = 10000  # Hedge delay until a model has enough latency samples
+    min_delay_ms: int = 1000
+    max_delay_ms: int = 60000
+    budget_percent: float = 5.0  # At most this many extra requests per 100 requests
+    burst: int = 3  # Hedges allowed in a row once budget has accumulated
+
+
+class LLMLimitsConfig(BaseModel):
+    """Client-side limits for a provider or model; 0 means unlimited."""
+    max_concurrent: int = 0
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0  # Prompt + completion tokens, estimated up front and corrected from usage
+
+
+class RouteRuleConfig(BaseModel):
+    """A model routing rule; empty criteria match any call."""
+    name: str
+    model: str  # Model for matching calls
+    sources: list[str] = Field(default_factory=list)  # user, cron, heartbeat, subagent, system
+    channels: list[str] = Field(default_factory=list)
+    max_prompt_tokens: int = 0  # 0: no limit
+    max_difficulty: float = 1.0  # Heuristic 0..1 from message length, code and wording
+    tools: Literal["any", "yes", "no"] = "any"  # Only calls that look like they need tools ("yes") or not ("no")
+    escalate_to: str = ""  # Model when the routed one fails (default: agents.defaults.model)
+
+
+class RoutingConfig(BaseModel):
+    """Per-call model routing; the first matching rule picks the model."""
+    enabled: bool = False
+    rules: list[RouteRuleConfig] = Field(default_factory=list)
+    escalate: bool = True  # Retry failed routed calls (errors, empty answers, bad tool calls) on the stronger model
+
+
+class LLMConfig(BaseModel):
+    """Resilience, caching, hedging, rate limiting and routing of LLM calls."""
+    max_attempts: int = 3  # Calls per provider on transient errors (429, 5xx, timeouts), including the first
+    retry_base_ms: int = 500  # Backoff base; delays are jittered up to base * 2^attempt
+    retry_max_ms: int = 8000
+    breaker_failures: int = 5  # Consecutive failures that open a provider's circuit breaker
+    breaker_reset_s: float = 30.0  # Open breakers let a probe call through after this long
+    failover: list[FailoverTarget] = Field(default_factory=list)  # Tried in order after the primary provider
+    cache: LLMCacheConfig = Field(default_factory=LLMCacheConfig)
+    hedge: LLMHedgeConfig = Field(default_factory=LLMHedgeConfig)
+    limits: dict[str, LLMLimitsConfig] = Field(default_factory=dict)  # Model-name keyword (e.g. "anthropic") -> limits
+    routing: RoutingConfig = Field(default_factory=RoutingConfig)
+    ledger: LedgerConfig = Field(default_factory=LedgerConfig)
+    batch: LLMBatchConfig = Field(default_factory=LLMBatchConfig)
+    models: dict[str, ModelSettingsConfig] = Field(default_factory=dict)  # Model-name keyword -> settings
+    prices: dict[str, tuple[float, float]] = Field(default_factory=dict)  # Model keyword -> USD per 1M (input, output) tokens
+    native: bool = True  # Call OpenRouter, DeepSeek, Moonshot, OpenAI and vLLM directly instead of through litellm
+    http2: bool = True  # For native clients, when the h2 package is installed
+
+
 class GatewayConfig(BaseModel):
     """Gateway/server configuration."""
     host: str = "0.0.0.0"
@@ -110,6 +240,42 @@ class ToolsConfig(BaseModel):
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
 
 
+class SessionsConfig(BaseModel):
+    """Conversation session storage."""
+    backend: Literal["jsonl", "sqlite"] = "jsonl"  # "sqlite" keeps all sessions in one WAL database
+    path: str = "~/.friday/sessions"  # JSONL directory; the SQLite database is <path>/sessions.db
+    cache_max_sessions: int = 256  # Sessions kept in memory (least recently used are evicted)
+    cache_max_mb: int = 64  # Approximate memory cap for cached sessions
+    tail_messages: int = 100  # Recent messages loaded per session; older ones are read on demand
+    flush_interval_ms: int = 100  # Write-behind delay for coalescing saves; 0 writes synchronously
+    search_index: bool = True  # Full-text index of all messages for the search_history tool
+    search_all_chats: bool = False  # Let search_history look across every chat (single-user setups only)
+    archive_after_days: int = 30  # Move sessions idle this long to the gzip archive; 0 disables
+    archive_retention_days: int = 0  # Delete archives older than this; 0 keeps them forever
+    archive_schedule: str = "30 3 * * *"  # Cron expression of the archival job
+
+
+class TranscriptionConfig(BaseModel):
+    """Voice message transcription (Groq Whisper) for Telegram and WhatsApp."""
+    enabled: bool = True  # Needs a Groq API key
+    model: str = "whisper-large-v3"
+    cache_dir: str = "~/.friday/transcripts"  # Transcripts by audio content hash; "" disables the cache
+    chunk_seconds: int = 600  # Long audio is split into chunks this long, transcribed in parallel
+    max_parallel: int = 4
+    trim_silence: bool = True  # Drop long silences before upload (needs ffmpeg, like chunking)
+
+
+class ClusterConfig(BaseModel):
+    """Multi-node gateway: several processes share sessions and cron jobs."""
+    enabled: bool = False
+    node_id: str = ""  # Unique per process (default hostname-pid); gateway --node-id overrides
+    shared_dir: str = "~/.friday/cluster"  # Reachable by every node: cluster.db, sessions, cron jobs, media
+    channels: list[str] | None = None  # Channels this node connects (None: all enabled); gateway --channels overrides
+    heartbeat_s: float = 2.0
+    node_ttl_s: float = 10.0  # Nodes silent this long are dropped and their sessions move
+    poll_ms: int = 200  # Shared inbox/outbox polling interval
+
+
 class Config(BaseSettings):
     """Root configuration for friday."""
     agents: AgentsConfig = Field(default_factory=AgentsConfig)
@@ -117,6 +283,10 @@ class Config(BaseSettings):
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
+    sessions: SessionsConfig = Field(default_factory=SessionsConfig)
+    cluster: ClusterConfig = Field(default_factory=ClusterConfig)
+    llm: LLMConfig = Field(default_factory=LLMConfig)
+    transcription: TranscriptionConfig = Field(default_factory=TranscriptionConfig)
     
     @property
     def workspace_path(self) -> Path:
@@ -125,29 +295,34 @@ class Config(BaseSettings):
     
     def _match_provider(self, model: str | None = None) -> ProviderConfig | None:
         """Match a provider based on model name."""
+        name = self.get_provider_name(model)
+        return getattr(self.providers, name) if name else None
+
+    def get_provider_name(self, model: str | None = None) -> str | None:
+        """Name of the configured provider (with an API key) serving a model."""
         model = (model or self.agents.defaults.model).lower()
-        # Map of keywords to provider configs
+        # Map of keywords to provider names
         providers = {
-            "openrouter": self.providers.openrouter,
-            "deepseek": self.providers.deepseek,
-            "anthropic": self.providers.anthropic,
-            "claude": self.providers.anthropic,
-            "openai": self.providers.openai,
-            "gpt": self.providers.openai,
-            "gemini": self.providers.gemini,
-            "zhipu": self.providers.zhipu,
-            "glm": self.providers.zhipu,
-            "zai": self.providers.zhipu,
-            "dashscope": self.providers.dashscope,
-            "qwen": self.providers.dashscope,
-            "groq": self.providers.groq,
-            "moonshot": self.providers.moonshot,
-            "kimi": self.providers.moonshot,
-            "vllm": self.providers.vllm,
+            "openrouter": "openrouter",
+            "deepseek": "deepseek",
+            "anthropic": "anthropic",
+            "claude": "anthropic",
+            "openai": "openai",
+            "gpt": "openai",
+            "gemini": "gemini",
+            "zhipu": "zhipu",
+            "glm": "zhipu",
+            "zai": "zhipu",
+            "dashscope": "dashscope",
+            "qwen": "dashscope",
+            "groq": "groq",
+            "moonshot": "moonshot",
+            "kimi": "moonshot",
+            "vllm": "vllm",
         }
-        for keyword, provider in providers.items():
-            if keyword in model and provider.api_key:
-                return provider
+        for keyword, name in providers.items():
+            if keyword in model and getattr(self.providers, name).api_key:
+                return name
         return None
 
     def get_api_key(self, model: str | None = None) -> str | None:
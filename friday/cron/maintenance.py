@@ -0,0 +1,65 @@
+"""Internal maintenance jobs: cron system events run by the gateway itself."""
+
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from friday.cron.service import CronService
+from friday.cron.types import CronJob, CronSchedule
+
+
+class MaintenanceJobs:
+    """
+    Maintenance tasks (memory consolidation, session archival, ...) scheduled
+    as cron jobs with a system_event payload naming the task.
+
+    register() adds a task's handler and its job (once; an existing job keeps
+    its schedule and enabled state); run() dispatches a system event to its
+    handler.
+    """
+
+    def __init__(self, cron: CronService):
+        self.cron = cron
+        self._handlers: dict[str, Callable[[], Awaitable[str | None]]] = {}
+
+    def register(
+        self,
+        event: str,
+        name: str,
+        expr: str,
+        handler: Callable[[], Awaitable[str | None]],
+        schedule: bool = True,
+    ) -> CronJob | None:
+        """
+        Register a maintenance task.
+
+        Args:
+            event: System event message that identifies the task's job.
+            name: Job name, shown by `friday cron list`.
+            expr: Cron expression of a new job.
+            handler: Runs the task; returns a short report.
+            schedule: Create the job if missing (False only handles an existing one).
+
+        Returns:
+            The task's job, or None if it has none.
+        """
+        self._handlers[event] = handler
+        for job in self.cron.list_jobs(include_disabled=True):
+            if job.payload.kind == "system_event" and job.payload.message == event:
+                return job
+        if not schedule:
+            return None
+        return self.cron.add_job(
+            name=name,
+            schedule=CronSchedule(kind="cron", expr=expr),
+            message=event,
+            kind="system_event",
+        )
+
+    async def run(self, job: CronJob) -> str | None:
+        """Run the task of a system event job."""
+        handler = self._handlers.get(job.payload.message)
+        if handler is None:
+            logger.warning(f"Cron: no handler for system event '{job.payload.message}' (job {job.id})")
+            raise ValueError(f"Unknown system event: {job.payload.message}")
+        return await handler()
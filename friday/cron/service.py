@@ -1,31 +1,39 @@
 """Cron service for scheduling agent tasks."""
 
 import asyncio
-import json
+import os
 import time
 import uuid
 from pathlib import Path
-from typing import Any, Callable, Coroutine
+from typing import Any, Callable, Coroutine, Literal
 
 from loguru import logger
 
 from friday.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
+from friday.utils import serde
 
 
 def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
-def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
-    """Compute next run time in ms."""
+def _compute_next_run(schedule: CronSchedule, now_ms: int, anchor_ms: int | None = None) -> int | None:
+    """
+    Compute next run time in ms.
+
+    Interval jobs with an anchor (their creation time) run on a fixed grid
+    from it, so every process sharing the store computes the same times.
+    """
     if schedule.kind == "at":
         return schedule.at_ms if schedule.at_ms and schedule.at_ms > now_ms else None
     
     if schedule.kind == "every":
         if not schedule.every_ms or schedule.every_ms <= 0:
             return None
-        # Next interval from now
-        return now_ms + schedule.every_ms
+        if anchor_ms is None:
+            return now_ms + schedule.every_ms
+        # Next grid point after now
+        return anchor_ms + ((now_ms - anchor_ms) // schedule.every_ms + 1) * schedule.every_ms
     
     if schedule.kind == "cron" and schedule.expr:
         try:
@@ -40,17 +48,31 @@ def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
 
 
 class CronService:
-    """Service for managing and executing scheduled jobs."""
+    """
+    Service for managing and executing scheduled jobs.
+
+    Several services (e.g. gateway nodes) can share one store file: each
+    timer tick first reloads the file if another process changed it, and
+    with a claim callback a due job only runs where claim(job, now_ms)
+    returns True; elsewhere it is just rescheduled. max_sleep_s bounds the
+    timer so jobs added by other processes are noticed.
+    """
     
     def __init__(
         self,
         store_path: Path,
-        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None
+        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None,
+        claim: Callable[[CronJob, int], bool] | None = None,
+        max_sleep_s: float | None = None,
     ):
         self.store_path = store_path
         self.on_job = on_job  # Callback to execute job, returns response text
+        self.claim = claim
+        self.max_sleep_s = max_sleep_s
         self._store: CronStore | None = None
+        self._store_mtime_ns: int | None = None  # Of the file as last loaded or saved
         self._timer_task: asyncio.Task | None = None
+        self._background: set[asyncio.Task] = set()  # Batch jobs still running
         self._running = False
     
     def _load_store(self) -> CronStore:
@@ -60,37 +82,9 @@ class CronService:
         
         if self.store_path.exists():
             try:
-                data = json.loads(self.store_path.read_text())
-                jobs = []
-                for j in data.get("jobs", []):
-                    jobs.append(CronJob(
-                        id=j["id"],
-                        name=j["name"],
-                        enabled=j.get("enabled", True),
-                        schedule=CronSchedule(
-                            kind=j["schedule"]["kind"],
-                            at_ms=j["schedule"].get("atMs"),
-                            every_ms=j["schedule"].get("everyMs"),
-                            expr=j["schedule"].get("expr"),
-                            tz=j["schedule"].get("tz"),
-                        ),
-                        payload=CronPayload(
-                            kind=j["payload"].get("kind", "agent_turn"),
-                            message=j["payload"].get("message", ""),
-                            deliver=j["payload"].get("deliver", False),
-                            channel=j["payload"].get("channel"),
-                            to=j["payload"].get("to"),
-                        ),
-                        state=CronJobState(
-                            next_run_at_ms=j.get("state", {}).get("nextRunAtMs"),
-                            last_run_at_ms=j.get("state", {}).get("lastRunAtMs"),
-                            last_status=j.get("state", {}).get("lastStatus"),
-                            last_error=j.get("state", {}).get("lastError"),
-                        ),
-                        created_at_ms=j.get("createdAtMs", 0),
-                        updated_at_ms=j.get("updatedAtMs", 0),
-                        delete_after_run=j.get("deleteAfterRun", False),
-                    ))
+                self._store_mtime_ns = self.store_path.stat().st_mtime_ns
+                data = serde.loads(self.store_path.read_bytes())
+                jobs = [serde.decode_cron_job(j) for j in data.get("jobs", [])]
                 self._store = CronStore(jobs=jobs)
             except Exception as e:
                 logger.warning(f"Failed to load cron store: {e}")
@@ -109,40 +103,24 @@ class CronService:
         
         data = {
             "version": self._store.version,
-            "jobs": [
-                {
-                    "id": j.id,
-                    "name": j.name,
-                    "enabled": j.enabled,
-                    "schedule": {
-                        "kind": j.schedule.kind,
-                        "atMs": j.schedule.at_ms,
-                        "everyMs": j.schedule.every_ms,
-                        "expr": j.schedule.expr,
-                        "tz": j.schedule.tz,
-                    },
-                    "payload": {
-                        "kind": j.payload.kind,
-                        "message": j.payload.message,
-                        "deliver": j.payload.deliver,
-                        "channel": j.payload.channel,
-                        "to": j.payload.to,
-                    },
-                    "state": {
-                        "nextRunAtMs": j.state.next_run_at_ms,
-                        "lastRunAtMs": j.state.last_run_at_ms,
-                        "lastStatus": j.state.last_status,
-                        "lastError": j.state.last_error,
-                    },
-                    "createdAtMs": j.created_at_ms,
-                    "updatedAtMs": j.updated_at_ms,
-                    "deleteAfterRun": j.delete_after_run,
-                }
-                for j in self._store.jobs
-            ]
+            "jobs": [serde.encode_cron_job(j) for j in self._store.jobs],
         }
         
-        self.store_path.write_text(json.dumps(data, indent=2))
+        # Atomic replace: other processes may read the file at any time
+        tmp = self.store_path.with_suffix(".json.tmp")
+        tmp.write_text(serde.dumps(data), encoding="utf-8")
+        os.replace(tmp, self.store_path)
+        self._store_mtime_ns = self.store_path.stat().st_mtime_ns
+
+    def _reload_if_changed(self) -> None:
+        """Drop the in-memory store if another process rewrote the file."""
+        try:
+            mtime_ns = self.store_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if self._store is not None and mtime_ns != self._store_mtime_ns:
+            self._store = None
+            self._load_store()
     
     async def start(self) -> None:
         """Start the cron service."""
@@ -159,6 +137,8 @@ class CronService:
         if self._timer_task:
             self._timer_task.cancel()
             self._timer_task = None
+        for task in list(self._background):
+            task.cancel()
     
     def _recompute_next_runs(self) -> None:
         """Recompute next run times for all enabled jobs."""
@@ -167,7 +147,7 @@ class CronService:
         now = _now_ms()
         for job in self._store.jobs:
             if job.enabled:
-                job.state.next_run_at_ms = _compute_next_run(job.schedule, now)
+                job.state.next_run_at_ms = _compute_next_run(job.schedule, now, job.created_at_ms)
     
     def _get_next_wake_ms(self) -> int | None:
         """Get the earliest next run time across all jobs."""
@@ -183,11 +163,12 @@ class CronService:
             self._timer_task.cancel()
         
         next_wake = self._get_next_wake_ms()
-        if not next_wake or not self._running:
+        if not self._running or (not next_wake and self.max_sleep_s is None):
             return
         
-        delay_ms = max(0, next_wake - _now_ms())
-        delay_s = delay_ms / 1000
+        delay_s = max(0, next_wake - _now_ms()) / 1000 if next_wake else self.max_sleep_s
+        if self.max_sleep_s is not None:
+            delay_s = min(delay_s, self.max_sleep_s)
         
         async def tick():
             await asyncio.sleep(delay_s)
@@ -198,6 +179,7 @@ class CronService:
     
     async def _on_timer(self) -> None:
         """Handle timer tick - run due jobs."""
+        self._reload_if_changed()
         if not self._store:
             return
         
@@ -207,15 +189,32 @@ class CronService:
             if j.enabled and j.state.next_run_at_ms and now >= j.state.next_run_at_ms
         ]
         
+        executed = False
         for job in due_jobs:
-            await self._execute_job(job)
+            if self.claim is None or self.claim(job, now):
+                if job.payload.batch and job.payload.kind == "agent_turn":
+                    self._execute_in_background(job)
+                else:
+                    await self._execute_job(job)
+                executed = True
+            else:
+                # Another process runs it and saves the outcome; just move on locally
+                logger.debug(f"Cron: job '{job.name}' claimed elsewhere")
+                self._reschedule(job)
         
-        self._save_store()
+        if executed or self.claim is None:
+            self._save_store()
         self._arm_timer()
     
     async def _execute_job(self, job: CronJob) -> None:
         """Execute a single job."""
         start_ms = _now_ms()
+        await self._run(job)
+        job.state.last_run_at_ms = start_ms
+        job.updated_at_ms = _now_ms()
+        self._reschedule(job)
+
+    async def _run(self, job: CronJob) -> None:
         logger.info(f"Cron: executing job '{job.name}' ({job.id})")
         
         try:
@@ -231,11 +230,35 @@ class CronService:
             job.state.last_status = "error"
             job.state.last_error = str(e)
             logger.error(f"Cron: job '{job.name}' failed: {e}")
-        
+
+    def _execute_in_background(self, job: CronJob) -> None:
+        """
+        Run a batch job as a task, so jobs due together run concurrently (and
+        their LLM calls can be batched) without holding up the timer. The job
+        is rescheduled up front; its outcome is saved when it finishes.
+        """
+        start_ms = _now_ms()
         job.state.last_run_at_ms = start_ms
-        job.updated_at_ms = _now_ms()
-        
-        # Handle one-shot jobs
+        job.updated_at_ms = start_ms
+        self._reschedule(job)
+
+        async def run() -> None:
+            await self._run(job)
+            # The store may have been reloaded meanwhile
+            self._reload_if_changed()
+            for current in self._load_store().jobs:
+                if current.id == job.id and current.state.last_run_at_ms == start_ms:
+                    current.state.last_status = job.state.last_status
+                    current.state.last_error = job.state.last_error
+                    current.updated_at_ms = _now_ms()
+                    self._save_store()
+
+        task = asyncio.create_task(run())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _reschedule(self, job: CronJob) -> None:
+        """Set the next run after a run (one-shot jobs are disabled or deleted)."""
         if job.schedule.kind == "at":
             if job.delete_after_run:
                 self._store.jobs = [j for j in self._store.jobs if j.id != job.id]
@@ -244,7 +267,7 @@ class CronService:
                 job.state.next_run_at_ms = None
         else:
             # Compute next run
-            job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+            job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms(), job.created_at_ms)
     
     # ========== Public API ==========
     
@@ -263,6 +286,9 @@ class CronService:
         channel: str | None = None,
         to: str | None = None,
         delete_after_run: bool = False,
+        kind: Literal["system_event", "agent_turn"] = "agent_turn",
+        batch: bool = False,
+        no_cache: bool = False,
     ) -> CronJob:
         """Add a new job."""
         store = self._load_store()
@@ -274,11 +300,13 @@ class CronService:
             enabled=True,
             schedule=schedule,
             payload=CronPayload(
-                kind="agent_turn",
+                kind=kind,
                 message=message,
                 deliver=deliver,
                 channel=channel,
                 to=to,
+                batch=batch,
+                no_cache=no_cache,
             ),
             state=CronJobState(next_run_at_ms=_compute_next_run(schedule, now)),
             created_at_ms=now,
@@ -315,7 +343,7 @@ class CronService:
                 job.enabled = enabled
                 job.updated_at_ms = _now_ms()
                 if enabled:
-                    job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+                    job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms(), job.created_at_ms)
                 else:
                     job.state.next_run_at_ms = None
                 self._save_store()
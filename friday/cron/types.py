@@ -27,6 +27,11 @@ class CronPayload:
     deliver: bool = False
     channel: str | None = None  # e.g. "whatsapp"
     to: str | None = None  # e.g. phone number
+    # Not urgent: the turn runs in the background and its first LLM call may
+    # go through the provider's batch API (answers can take minutes)
+    batch: bool = False
+    # Always call the LLM, never answer from the response cache (refreshes its entries)
+    no_cache: bool = False
 
 
 @dataclass
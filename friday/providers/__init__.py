@@ -1,6 +1,50 @@
 """LLM provider abstraction module."""
 
 from friday.providers.base import LLMProvider, LLMResponse
-from friday.providers.litellm_provider import LiteLLMProvider
+from friday.providers.batch import BatchingProvider, OpenAIBatchClient
+from friday.providers.cache import CachingProvider, ResponseCache
+from friday.providers.context import CallContext, call_context, current_call
+from friday.providers.errors import LLMError
+from friday.providers.hedging import HedgedProvider
+from friday.providers.ledger import LedgerProvider, UsageLedger
+from friday.providers.limits import RateLimitedProvider, RateLimiter
+from friday.providers.openai_compat import HTTPClientPool, OpenAICompatProvider
+from friday.providers.pool import ModelSettings, ProviderPool
+from friday.providers.resilient import ProviderRoute, ResilientProvider
+from friday.providers.routing import RouteRule, RoutingProvider
 
-__all__ = ["LLMProvider", "LLMResponse", "LiteLLMProvider"]
+
+def __getattr__(name: str):
+    # litellm takes seconds and hundreds of MB to import: only load it when asked for
+    if name == "LiteLLMProvider":
+        from friday.providers.litellm_provider import LiteLLMProvider
+        return LiteLLMProvider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "LLMProvider",
+    "LLMResponse",
+    "LLMError",
+    "LiteLLMProvider",
+    "OpenAICompatProvider",
+    "HTTPClientPool",
+    "ProviderPool",
+    "ModelSettings",
+    "ProviderRoute",
+    "ResilientProvider",
+    "CachingProvider",
+    "HedgedProvider",
+    "RateLimitedProvider",
+    "RateLimiter",
+    "RouteRule",
+    "RoutingProvider",
+    "ResponseCache",
+    "LedgerProvider",
+    "BatchingProvider",
+    "OpenAIBatchClient",
+    "UsageLedger",
+    "CallContext",
+    "call_context",
+    "current_call",
+]
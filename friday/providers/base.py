@@ -20,6 +20,11 @@ class LLMResponse:
     tool_calls: list[ToolCallRequest] = field(default_factory=list)
     finish_reason: str = "stop"
     usage: dict[str, int] = field(default_factory=dict)
+    cached: bool = False  # Answered from the response cache, not the provider
+    queue_wait_s: float = 0.0  # Time spent waiting for client-side rate limits
+    model: str | None = None  # Model that answered, when not the one requested (failover, hedge, batch)
+    # (model, usage) of other billed requests made for this call, e.g. a cancelled hedge
+    extra_usage: list[tuple[str, dict[str, int]]] = field(default_factory=list)
     
     @property
     def has_tool_calls(self) -> bool:
@@ -60,6 +65,9 @@ class LLMProvider(ABC):
         
         Returns:
             LLMResponse with content and/or tool calls.
+
+        Raises:
+            LLMError: The call failed.
         """
         pass
     
@@ -0,0 +1,213 @@
+"""Provider batch APIs for non-urgent calls, with live fallback."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+from friday.providers.base import LLMProvider, LLMResponse
+from friday.providers.context import current_call
+from friday.providers.errors import LLMError, classify_error
+from friday.providers.openai_compat import (
+    OpenAICompatProvider,
+    parse_chat_completion,
+    raise_for_status,
+)
+from friday.utils import serde
+
+# Batch states that are not final yet
+_RUNNING = frozenset({"validating", "in_progress", "finalizing", "cancelling"})
+
+
+class OpenAIBatchClient:
+    """
+    The OpenAI batch API (/files and /batches), as also offered by other
+    OpenAI-compatible endpoints, on the connection pool of an
+    OpenAICompatProvider.
+    """
+
+    def __init__(self, provider: OpenAICompatProvider, completion_window: str = "24h"):
+        self.provider = provider
+        self.completion_window = completion_window
+        self.base = provider.api_base
+        self.auth = {k: v for k, v in provider.headers.items() if k != "Content-Type"}
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> Any:
+        try:
+            response = await self.provider.pool.client.request(
+                method, f"{self.base}{path}", headers=self.auth, **kwargs
+            )
+            raise_for_status(response, self.provider.name)
+        except Exception as e:
+            raise classify_error(e, provider=self.provider.name) from e
+        return response
+
+    async def submit(self, bodies: dict[str, dict[str, Any]]) -> str:
+        """Upload chat completion request bodies (by custom id) and start a batch. Returns its id."""
+        lines = "\n".join(
+            serde.dumps({"custom_id": cid, "method": "POST", "url": "/v1/chat/completions", "body": body})
+            for cid, body in bodies.items()
+        )
+        upload = await self._request(
+            "POST", "/files",
+            files={"file": ("batch.jsonl", lines.encode("utf-8"), "application/jsonl")},
+            data={"purpose": "batch"},
+        )
+        batch = await self._request("POST", "/batches", json={
+            "input_file_id": serde.loads(upload.content)["id"],
+            "endpoint": "/v1/chat/completions",
+            "completion_window": self.completion_window,
+        })
+        return serde.loads(batch.content)["id"]
+
+    async def results(self, batch_id: str) -> dict[str, LLMResponse] | None:
+        """
+        Responses by custom id once the batch is finished (None while it runs).
+        Requests that failed inside the batch are left out.
+        """
+        batch = serde.loads((await self._request("GET", f"/batches/{batch_id}")).content)
+        status = batch.get("status")
+        if status in _RUNNING:
+            return None
+        if not batch.get("output_file_id"):
+            raise LLMError(f"Batch {batch_id} {status} without output", provider=self.provider.name)
+
+        content = await self._request("GET", f"/files/{batch['output_file_id']}/content")
+        responses = {}
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            item = serde.loads(line)
+            response = item.get("response") or {}
+            if item.get("error") or response.get("status_code") != 200:
+                continue
+            try:
+                responses[item["custom_id"]] = parse_chat_completion(response["body"])
+            except (KeyError, IndexError, TypeError) as e:
+                logger.debug(f"LLM batch: unparseable result for {item.get('custom_id')}: {e}")
+        return responses
+
+    async def cancel(self, batch_id: str) -> None:
+        await self._request("POST", f"/batches/{batch_id}/cancel")
+
+
+@dataclass
+class _Waiting:
+    custom_id: str
+    body: dict[str, Any]
+    future: asyncio.Future
+
+
+class BatchingProvider(LLMProvider):
+    """
+    Sends the first call of each batch turn (CallContext.batch_turn, set for
+    non-urgent cron jobs) through a provider batch API instead of live.
+
+    Calls are collected for window_s (or until max_requests) and submitted
+    as one batch, which is polled every poll_interval_s; each caller resumes
+    with its own answer. Later calls of the turn, calls the batch could not
+    answer, and every call when the batch API fails or takes longer than
+    timeout_s, are made live through `inner`.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        client: OpenAIBatchClient,
+        model: str | None = None,
+        window_s: float = 2.0,
+        max_requests: int = 500,
+        poll_interval_s: float = 30.0,
+        timeout_s: float = 3600.0,
+    ):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.client = client
+        self.model = model
+        self.window_s = window_s
+        self.max_requests = max_requests
+        self.poll_interval_s = poll_interval_s
+        self.timeout_s = timeout_s
+        self.stats = {"batches": 0, "batched": 0, "fallbacks": 0}
+        self._waiting: list[_Waiting] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._turns: OrderedDict[str, None] = OrderedDict()  # Turns whose first call was taken
+        self._tasks: set[asyncio.Task] = set()
+
+    def _first_call(self, turn: str | None) -> bool:
+        if turn is None or turn in self._turns:
+            return False
+        self._turns[turn] = None
+        if len(self._turns) > 10000:
+            self._turns.popitem(last=False)
+        return True
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        model = model or self.inner.get_default_model()
+        kwargs = {"messages": messages, "tools": tools, "max_tokens": max_tokens, "temperature": temperature}
+        turn = current_call().batch_turn
+        if self._first_call(turn):
+            body = self.client.provider.request_body(model=self.model or model, **kwargs)
+            future = asyncio.get_running_loop().create_future()
+            self._waiting.append(_Waiting(turn, body, future))
+            if len(self._waiting) >= self.max_requests:
+                self._submit()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.window_s, self._submit)
+            response = await future
+            if response is not None:
+                response.model = self.model or model
+                return response
+            self.stats["fallbacks"] += 1
+        return await self.inner.chat(model=model, **kwargs)
+
+    def _submit(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        waiting, self._waiting = self._waiting, []
+        if waiting:
+            task = asyncio.create_task(self._run(waiting))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, waiting: list[_Waiting]) -> None:
+        """Submit and wait for one batch; callers get None to go live."""
+        results: dict[str, LLMResponse] = {}
+        batch_id = None
+        try:
+            batch_id = await self.client.submit({w.custom_id: w.body for w in waiting})
+            self.stats["batches"] += 1
+            logger.info(f"LLM batch: submitted {len(waiting)} calls as {batch_id}")
+            deadline = time.monotonic() + self.timeout_s
+            while (done := await self.client.results(batch_id)) is None:
+                if time.monotonic() >= deadline:
+                    raise asyncio.TimeoutError(f"batch not finished after {self.timeout_s:.0f}s")
+                await asyncio.sleep(self.poll_interval_s)
+            results = done
+            self.stats["batched"] += len(results)
+            logger.info(f"LLM batch: {batch_id} answered {len(results)}/{len(waiting)} calls")
+        except Exception as e:
+            logger.warning(f"LLM batch: {type(e).__name__}: {e}; making {len(waiting) - len(results)} calls live")
+            if batch_id is not None and isinstance(e, asyncio.TimeoutError):
+                try:
+                    await self.client.cancel(batch_id)
+                except LLMError as cancel_error:
+                    logger.debug(f"LLM batch: cancelling {batch_id} failed: {cancel_error}")
+        finally:
+            for w in waiting:
+                if not w.future.done():
+                    w.future.set_result(results.get(w.custom_id))
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
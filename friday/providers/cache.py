@@ -0,0 +1,247 @@
+"""Disk-backed cache of LLM responses for repeated, deterministic prompts."""
+
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from friday.providers.base import LLMProvider, LLMResponse
+from friday.providers.context import current_call
+from friday.utils import serde
+from friday.utils.helpers import ensure_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_used ON responses(used_at);
+
+CREATE TABLE IF NOT EXISTS counters (
+    source TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    bypassed INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+# Parts of the agent's system prompt (see ContextBuilder) that change from one
+# run of a background job to the next: the clock, kept to the day, and the
+# rolling summary of earlier turns (always the last section)
+_CLOCK = re.compile(r"(## Current Time\n\d{4}-\d{2}-\d{2}) \d{2}:\d{2}")
+_SUMMARY = re.compile(r"\n\n## Earlier in This Conversation\n.*\Z", re.DOTALL)
+
+
+def turn_request(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    The messages of a background turn that identify its request: the system
+    prompt without its volatile parts, then the turn itself from its user
+    message on. Earlier turns of the session (previous runs of the same cron
+    job or heartbeat) are left out, so a run that sends the same prompt and
+    gets the same tool results as the last one is answered from the cache.
+    """
+    start = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=0)
+    system = []
+    for message in messages[:start]:
+        if message.get("role") != "system":
+            continue
+        if isinstance(message.get("content"), str):
+            message = {**message, "content": _SUMMARY.sub("", _CLOCK.sub(r"\1", message["content"]))}
+        system.append(message)
+    return system + messages[start:]
+
+
+def cache_key(
+    model: str,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    max_tokens: int,
+    temperature: float,
+) -> str | None:
+    """
+    Canonical hash of a request: the same model, messages, tools and sampling
+    parameters give the same key regardless of dict key order. None if the
+    request is not JSON-serializable.
+    """
+    request = {
+        "model": model,
+        "messages": messages,
+        "tools": tools or [],
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+    }
+    try:
+        canonical = serde.dumps(request, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    LLM responses in one SQLite (WAL) database, expiring after ttl_s and
+    evicted least recently used first once they exceed max_bytes. Also keeps
+    hit/miss counters per turn source.
+    """
+
+    def __init__(self, path: Path, ttl_s: float = 24 * 3600, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        ensure_dir(path.parent)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> LLMResponse | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ? AND created_at >= ?", (key, now - self.ttl_s)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+        response = serde.decode_llm_response(serde.loads(row[0]))
+        response.cached = True
+        return response
+
+    def put(self, key: str, model: str, response: LLMResponse) -> None:
+        data = serde.dumps(serde.encode_llm_response(response))
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, data, size, now, now),
+            )
+            self._bytes += size - (old[0] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then the least recently used down to 90% of max_bytes."""
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_s,))
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        if self._bytes <= target:
+            return
+        freed, victims = 0, []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY used_at"):
+            victims.append((key,))
+            freed += size
+            if self._bytes - freed <= target:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._bytes -= freed
+        logger.debug(f"LLM cache: evicted {len(victims)} responses ({freed} bytes)")
+
+    def count(self, source: str, outcome: str) -> None:
+        """Bump a counter: outcome is hits, misses or bypassed."""
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO counters (source, {outcome}) VALUES (?, 1) "
+                f"ON CONFLICT(source) DO UPDATE SET {outcome} = {outcome} + 1",
+                (source,),
+            )
+
+    def stats(self) -> dict[str, Any]:
+        """Entries, bytes and hit rate per source."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            rows = self._conn.execute("SELECT source, hits, misses, bypassed FROM counters ORDER BY source").fetchall()
+        sources = {
+            source: {
+                "hits": hits,
+                "misses": misses,
+                "bypassed": bypassed,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            }
+            for source, hits, misses, bypassed in rows
+        }
+        return {"entries": entries, "bytes": self._bytes, "sources": sources}
+
+    def clear(self) -> int:
+        """Delete all cached responses and counters. Returns the number of responses."""
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM responses").rowcount
+            self._conn.execute("DELETE FROM counters")
+            self._bytes = 0
+        return deleted
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachingProvider(LLMProvider):
+    """
+    Answers repeated requests from a ResponseCache.
+
+    Only calls whose CallContext source is in `sources` (by default cron,
+    heartbeat and subagent turns) use the cache; interactive turns always go
+    to the provider. They are keyed on turn_request(), so repeated runs of a
+    job share entries. With CallContext.bypass_cache set, the provider is
+    called and its answer replaces the cached one.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        cache: ResponseCache,
+        sources: tuple[str, ...] | list[str] = ("cron", "heartbeat", "subagent"),
+    ):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.cache = cache
+        self.sources = set(sources)
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        ctx = current_call()
+        model = model or self.inner.get_default_model()
+        key = None
+        if ctx.source in self.sources:
+            key = cache_key(model, turn_request(messages), tools, max_tokens, temperature)
+        if key is not None and not ctx.bypass_cache:
+            cached = await asyncio.to_thread(self.cache.get, key)
+            await asyncio.to_thread(self.cache.count, ctx.source, "hits" if cached else "misses")
+            if cached is not None:
+                logger.debug(f"LLM cache: hit for {ctx.source} ({model})")
+                return cached
+        elif key is not None:
+            await asyncio.to_thread(self.cache.count, ctx.source, "bypassed")
+
+        response = await self.inner.chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature
+        )
+        if key is not None and (response.content or response.tool_calls):
+            await asyncio.to_thread(self.cache.put, key, model, response)
+        return response
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
@@ -0,0 +1,49 @@
+"""Per-call context: who an LLM call is made for."""
+
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+from dataclasses import dataclass, replace
+from typing import Any, Iterator
+
+
+@dataclass(frozen=True)
+class CallContext:
+    """
+    Where the current LLM calls come from.
+
+    Set with call_context() around a turn; provider wrappers read it with
+    current_call(). It lives in a ContextVar, so it follows asyncio tasks
+    (a subagent spawned during a turn starts with that turn's context).
+    """
+    source: str = "user"  # user, cron, heartbeat, subagent or system
+    session_key: str | None = None
+    channel: str | None = None
+    job_id: str | None = None  # Cron job
+    subagent_id: str | None = None
+    bypass_cache: bool = False  # Always call the provider, never answer from the response cache
+    batch_turn: str | None = None  # Set for a non-urgent turn whose first call may go through a batch API
+
+
+_current: ContextVar[CallContext] = ContextVar("friday_call_context", default=CallContext())
+
+
+def current_call() -> CallContext:
+    return _current.get()
+
+
+@contextmanager
+def call_context(**fields: Any) -> Iterator[CallContext]:
+    """Override fields of the current CallContext for the duration of the block."""
+    ctx = replace(_current.get(), **fields)
+    token = _current.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current.reset(token)
+
+
+def task_context(**fields: Any) -> Context:
+    """A copy of the current context with CallContext fields overridden, for asyncio.create_task(context=...)."""
+    ctx = copy_context()
+    ctx.run(_current.set, replace(_current.get(), **fields))
+    return ctx
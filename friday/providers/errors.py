@@ -0,0 +1,165 @@
+"""Typed LLM call failures."""
+
+import asyncio
+
+
+class LLMError(Exception):
+    """
+    An LLM call that failed.
+
+    `retryable` errors are transient (rate limits, overload, timeouts) and
+    worth repeating against the same provider; `failover` errors may succeed
+    on a different provider.
+    """
+
+    retryable = False
+    failover = False
+
+    def __init__(
+        self,
+        message: str,
+        provider: str | None = None,
+        model: str | None = None,
+        status: int | None = None,
+        retry_after: float | None = None,
+    ):
+        super().__init__(message)
+        self.provider = provider
+        self.model = model
+        self.status = status
+        self.retry_after = retry_after
+
+
+class RateLimitError(LLMError):
+    """HTTP 429: too many requests or tokens."""
+    retryable = True
+    failover = True
+
+
+class OverloadedError(LLMError):
+    """HTTP 503/529: the provider is shedding load."""
+    retryable = True
+    failover = True
+
+
+class ServerError(LLMError):
+    """Other HTTP 5xx responses."""
+    retryable = True
+    failover = True
+
+
+class LLMTimeoutError(LLMError):
+    """The request timed out."""
+    retryable = True
+    failover = True
+
+
+class LLMConnectionError(LLMError):
+    """The provider could not be reached."""
+    retryable = True
+    failover = True
+
+
+class AuthenticationError(LLMError):
+    """HTTP 401/403: bad or missing credentials."""
+    failover = True
+
+
+class BadRequestError(LLMError):
+    """HTTP 400/404/422: the request itself is invalid (e.g. unknown model, context too long)."""
+
+
+class CircuitOpenError(LLMError):
+    """The provider's circuit breaker is open; it was not called."""
+    failover = True
+
+
+class BudgetExceededError(LLMError):
+    """A spending budget is used up and the call was refused."""
+
+
+class AllProvidersFailedError(LLMError):
+    """Every provider in the failover chain failed."""
+
+    def __init__(self, errors: list[LLMError]):
+        summary = "; ".join(f"{e.provider or '?'}: {e}" for e in errors) or "no provider available"
+        last = errors[-1] if errors else None
+        super().__init__(
+            f"All LLM providers failed ({summary})",
+            model=last.model if last else None,
+            status=last.status if last else None,
+        )
+        self.errors = errors
+
+
+# Exception class names used by litellm and the OpenAI/Anthropic SDKs
+_BY_NAME: dict[str, type[LLMError]] = {
+    "RateLimitError": RateLimitError,
+    "ServiceUnavailableError": OverloadedError,
+    "InternalServerError": ServerError,
+    "APIError": ServerError,
+    "Timeout": LLMTimeoutError,
+    "APITimeoutError": LLMTimeoutError,
+    "TimeoutException": LLMTimeoutError,
+    "APIConnectionError": LLMConnectionError,
+    "ConnectError": LLMConnectionError,
+    "AuthenticationError": AuthenticationError,
+    "PermissionDeniedError": AuthenticationError,
+    "BadRequestError": BadRequestError,
+    "ContextWindowExceededError": BadRequestError,
+    "NotFoundError": BadRequestError,
+    "UnprocessableEntityError": BadRequestError,
+}
+
+
+def _error_for_status(status: int) -> type[LLMError]:
+    if status == 429:
+        return RateLimitError
+    if status in (503, 529):
+        return OverloadedError
+    if status >= 500:
+        return ServerError
+    if status in (401, 403):
+        return AuthenticationError
+    if status == 408:
+        return LLMTimeoutError
+    return BadRequestError
+
+
+def classify_error(exc: BaseException, provider: str | None = None, model: str | None = None) -> LLMError:
+    """Map an exception raised by a provider client to an LLMError."""
+    if isinstance(exc, LLMError):
+        return exc
+    status = getattr(exc, "status_code", None)
+    if not isinstance(status, int):
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+        status = status if isinstance(status, int) else None
+
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        cls: type[LLMError] = LLMTimeoutError
+    elif status is not None:
+        cls = _error_for_status(status)
+    else:
+        cls = next(
+            (_BY_NAME[k.__name__] for k in type(exc).__mro__ if k.__name__ in _BY_NAME),
+            LLMConnectionError if isinstance(exc, (ConnectionError, OSError)) else LLMError,
+        )
+    return cls(
+        str(exc) or type(exc).__name__,
+        provider=provider,
+        model=model,
+        status=status,
+        retry_after=_retry_after(exc),
+    )
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    """Seconds from a Retry-After response header, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return max(0.0, float(headers.get("retry-after") or headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
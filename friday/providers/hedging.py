@@ -0,0 +1,182 @@
+"""Hedged LLM requests: race a second request when the first is slow."""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from friday.providers.base import LLMProvider, LLMResponse
+
+
+class LatencyTracker:
+    """Recent successful request latencies per model."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, model: str, seconds: float) -> None:
+        self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, model: str, pct: float) -> float | None:
+        """The pct-th percentile latency, or None until min_samples are recorded."""
+        samples = self._samples.get(model)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+@dataclass
+class HedgeStats:
+    requests: int = 0
+    hedged: int = 0  # Hedge requests sent
+    hedge_wins: int = 0  # Hedges that answered first
+    budget_denied: int = 0  # Slow requests not hedged because the budget was spent
+    by_model: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "budget_denied": self.budget_denied,
+            "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+            "win_rate": self.hedge_wins / self.hedged if self.hedged else 0.0,
+            "by_model": self.by_model,
+        }
+
+
+class HedgedProvider(LLMProvider):
+    """
+    Sends the same request to a secondary provider (or model) when the
+    primary has not answered within its recent latency percentile, and
+    returns whichever answers first; the other request is cancelled.
+
+    Until a model has enough latency samples, initial_delay_s is used. The
+    delay is clamped to [min_delay_s, max_delay_s]. Hedges are paid for, so
+    they are capped by a budget: at most budget_ratio extra requests per
+    request on average, with up to `burst` in a row.
+
+    Counters are kept in `stats` and logged every log_every requests.
+    """
+
+    def __init__(
+        self,
+        primary: LLMProvider,
+        secondary: LLMProvider,
+        secondary_model: str | None = None,
+        percentile: float = 95.0,
+        initial_delay_s: float = 10.0,
+        min_delay_s: float = 1.0,
+        max_delay_s: float = 60.0,
+        budget_ratio: float = 0.05,
+        burst: float = 3.0,
+        tracker: LatencyTracker | None = None,
+        log_every: int = 100,
+    ):
+        super().__init__(primary.api_key, primary.api_base)
+        self.primary = primary
+        self.secondary = secondary
+        self.secondary_model = secondary_model
+        self.percentile = percentile
+        self.initial_delay_s = initial_delay_s
+        self.min_delay_s = min_delay_s
+        self.max_delay_s = max_delay_s
+        self.budget_ratio = budget_ratio
+        self.burst = burst
+        self.tracker = tracker or LatencyTracker()
+        self.log_every = log_every
+        self.stats = HedgeStats()
+        self._budget = burst
+
+    def hedge_delay(self, model: str) -> float:
+        delay = self.tracker.percentile(model, self.percentile)
+        if delay is None:
+            delay = self.initial_delay_s
+        return min(self.max_delay_s, max(self.min_delay_s, delay))
+
+    def _take_budget(self) -> bool:
+        if self._budget >= 1:
+            self._budget -= 1
+            return True
+        return False
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        model = model or self.primary.get_default_model()
+        kwargs = {"messages": messages, "tools": tools, "max_tokens": max_tokens, "temperature": temperature}
+        self.stats.requests += 1
+        per_model = self.stats.by_model.setdefault(model, {"requests": 0, "hedged": 0, "hedge_wins": 0})
+        per_model["requests"] += 1
+        self._budget = min(self.burst, self._budget + self.budget_ratio)
+        if self.log_every and self.stats.requests % self.log_every == 0:
+            stats = self.stats.as_dict()
+            logger.info(
+                f"LLM hedge: {stats['hedged']}/{stats['requests']} requests hedged ({stats['hedge_rate']:.1%}), "
+                f"{stats['win_rate']:.0%} of hedges won, {stats['budget_denied']} denied by budget"
+            )
+
+        start = time.monotonic()
+        primary = asyncio.create_task(self.primary.chat(model=model, **kwargs))
+        pending = {primary}
+        try:
+            delay = self.hedge_delay(model)
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done or not self._take_budget():
+                if not done:
+                    self.stats.budget_denied += 1
+                response = await primary
+                self.tracker.record(model, time.monotonic() - start)
+                return response
+
+            self.stats.hedged += 1
+            per_model["hedged"] += 1
+            hedge_model = self.secondary_model or model
+            logger.debug(f"LLM hedge: {model} slower than {delay:.1f}s, also asking {hedge_model}")
+            hedge = asyncio.create_task(self.secondary.chat(model=hedge_model, **kwargs))
+            pending.add(hedge)
+            models = {primary: model, hedge: hedge_model}
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                answered = [task for task in done if task.exception() is None]
+                if not answered:
+                    error = error or next(iter(done)).exception()
+                    continue
+                task = answered[0]
+                # Latency is what the caller saw, so the percentile keeps tracking the tail
+                self.tracker.record(model, time.monotonic() - start)
+                if task is hedge:
+                    self.stats.hedge_wins += 1
+                    per_model["hedge_wins"] += 1
+                    logger.debug(f"LLM hedge: {hedge_model} answered first")
+                response = task.result()
+                response.model = response.model or models[task]
+                # Both requests are paid for: the other one's usage, or its prompt if it is cancelled
+                for other in answered[1:]:
+                    loser = other.result()
+                    response.extra_usage.append((loser.model or models[other], loser.usage))
+                for other in pending:
+                    prompt = {"prompt_tokens": response.usage.get("prompt_tokens", 0), "completion_tokens": 0}
+                    response.extra_usage.append((models[other], prompt))
+                return response
+            raise error
+        finally:
+            # The loser, or everything if the caller was cancelled
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+
+    def get_default_model(self) -> str:
+        return self.primary.get_default_model()
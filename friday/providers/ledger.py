@@ -0,0 +1,300 @@
+"""Persistent token and cost ledger of LLM calls, with spending budgets."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from dataclasses import astuple, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Literal
+
+from loguru import logger
+
+from friday.providers.base import LLMProvider, LLMResponse
+from friday.providers.context import CallContext, current_call
+from friday.providers.errors import BudgetExceededError
+from friday.providers.pricing import estimate_cost
+from friday.utils.helpers import ensure_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    ts REAL NOT NULL,
+    source TEXT NOT NULL,
+    session_key TEXT,
+    channel TEXT,
+    job_id TEXT,
+    subagent_id TEXT,
+    model TEXT NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    cached_tokens INTEGER NOT NULL,
+    cost_usd REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_usage_ts ON usage(ts);
+CREATE INDEX IF NOT EXISTS idx_usage_session ON usage(session_key, ts);
+CREATE INDEX IF NOT EXISTS idx_usage_job ON usage(job_id, ts);
+"""
+
+# Budget scope -> usage column it aggregates (None: every call)
+SCOPES: dict[str, str | None] = {
+    "total": None,
+    "model": "model",
+    "channel": "channel",
+    "session": "session_key",
+    "job": "job_id",
+    "subagent": "subagent_id",
+}
+
+
+@dataclass
+class UsageEntry:
+    """One provider call, in usage table column order."""
+    ts: float
+    source: str
+    session_key: str | None
+    channel: str | None
+    job_id: str | None
+    subagent_id: str | None
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    cost_usd: float
+
+    def key(self, scope: str) -> str | None:
+        column = SCOPES[scope]
+        return "*" if column is None else getattr(self, column)
+
+
+def period_start(period: str, now: float | None = None) -> float:
+    """Start (epoch seconds, local time) of the current day or month; 0 for "total"."""
+    if period == "total":
+        return 0.0
+    start = datetime.fromtimestamp(time.time() if now is None else now).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    if period == "month":
+        start = start.replace(day=1)
+    return start.timestamp()
+
+
+class UsageLedger:
+    """
+    Usage entries in one SQLite (WAL) database.
+
+    record() only appends to an in-memory batch, written with one
+    executemany() once flush_every entries or flush_interval_s have
+    accumulated (see due()) and on close(). spend() totals used for budget
+    checks are read from the database once per scope, key and period, then
+    kept current in memory.
+    """
+
+    def __init__(self, path: Path, flush_every: int = 50, flush_interval_s: float = 10.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval_s = flush_interval_s
+        ensure_dir(path.parent)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._pending: list[UsageEntry] = []
+        self._flushed_at = time.monotonic()
+        self._totals: dict[tuple[str, str, float], float] = {}  # (scope, key, period start) -> USD
+
+    def record(self, entry: UsageEntry) -> None:
+        with self._lock:
+            self._pending.append(entry)
+            for (scope, key, since) in self._totals:
+                if entry.ts >= since and entry.key(scope) == key:
+                    self._totals[(scope, key, since)] += entry.cost_usd
+
+    def due(self) -> bool:
+        """Whether the pending batch should be written now."""
+        return bool(self._pending) and (
+            len(self._pending) >= self.flush_every
+            or time.monotonic() - self._flushed_at >= self.flush_interval_s
+        )
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._flushed_at = time.monotonic()
+        if not self._pending:
+            return
+        rows = [astuple(entry) for entry in self._pending]
+        self._pending = []
+        self._conn.executemany(f"INSERT INTO usage VALUES ({', '.join('?' * 11)})", rows)
+
+    def spend(self, scope: str, key: str, since: float) -> float:
+        """USD spent since `since` by one key of a scope (e.g. "session", "telegram:42")."""
+        with self._lock:
+            total = self._totals.get((scope, key, since))
+            if total is not None:
+                return total
+            self._flush()
+            column = SCOPES[scope]
+            where, params = "ts >= ?", [since]
+            if column is not None:
+                where += f" AND {column} = ?"
+                params.append(key)
+            total = self._conn.execute(
+                f"SELECT COALESCE(SUM(cost_usd), 0) FROM usage WHERE {where}", params
+            ).fetchone()[0]
+            if len(self._totals) > 10000:
+                self._totals.clear()
+            self._totals[(scope, key, since)] = total
+            return total
+
+    def summary(self, since: float, by: str, limit: int = 5) -> list[dict[str, Any]]:
+        """Calls, tokens and USD per key of a scope since a time, most expensive first."""
+        column = SCOPES[by] or "'*'"
+        with self._lock:
+            self._flush()
+            rows = self._conn.execute(
+                f"SELECT {column}, COUNT(*), SUM(prompt_tokens), SUM(completion_tokens), SUM(cached_tokens), "
+                f"SUM(cost_usd) FROM usage WHERE ts >= ? GROUP BY 1 ORDER BY 6 DESC LIMIT ?",
+                (since, limit),
+            ).fetchall()
+        return [
+            {
+                "key": key,
+                "calls": calls,
+                "prompt_tokens": prompt,
+                "completion_tokens": completion,
+                "cached_tokens": cached,
+                "cost_usd": cost,
+            }
+            for key, calls, prompt, completion, cached, cost in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+
+@dataclass
+class Budget:
+    """A spending limit for a scope, or for one key of it."""
+    usd: float
+    period: Literal["day", "month", "total"] = "day"
+    action: Literal["degrade", "refuse"] = "refuse"
+    degrade_to: str = ""  # Model used once the budget is spent (action "degrade")
+
+
+class LedgerProvider(LLMProvider):
+    """
+    Records every provider call (tokens and estimated cost, attributed by
+    the CallContext) in a UsageLedger, and enforces budgets.
+
+    `budgets` are keyed by scope ("total", "model", "channel", "session",
+    "job", "subagent"), applying to each key of the scope separately, or by
+    "scope:key" for one in particular, which takes precedence. A spent
+    budget either refuses the call with BudgetExceededError or sends it to
+    its degrade_to model; refusals win over degrading.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        ledger: UsageLedger,
+        budgets: dict[str, Budget] | None = None,
+        prices: dict[str, tuple[float, float]] | None = None,
+    ):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.ledger = ledger
+        self.budgets = budgets or {}
+        self.prices = prices
+        self._warned: set[str] = set()
+
+    def _budgets_for(self, ctx: CallContext, model: str) -> list[tuple[str, str, Budget]]:
+        keys = {
+            "total": "*",
+            "model": model,
+            "channel": ctx.channel,
+            "session": ctx.session_key,
+            "job": ctx.job_id,
+            "subagent": ctx.subagent_id,
+        }
+        found = []
+        for scope, key in keys.items():
+            if key is None:
+                continue
+            budget = self.budgets.get(f"{scope}:{key}") or self.budgets.get(scope)
+            if budget is not None:
+                found.append((scope, key, budget))
+        return found
+
+    async def check(self, ctx: CallContext, model: str) -> str:
+        """The model to use under the budgets; raises BudgetExceededError if one refuses the call."""
+        chosen = model
+        for scope, key, budget in self._budgets_for(ctx, model):
+            spent = await asyncio.to_thread(self.ledger.spend, scope, key, period_start(budget.period))
+            if spent < budget.usd:
+                continue
+            label = f"{scope}:{key}"
+            if budget.action == "refuse" or not budget.degrade_to:
+                raise BudgetExceededError(
+                    f"The {budget.period} budget for {label} is spent (${spent:.2f} of ${budget.usd:.2f})",
+                    model=model,
+                )
+            if chosen == model:
+                chosen = budget.degrade_to
+            if label not in self._warned:
+                self._warned.add(label)
+                logger.warning(
+                    f"LLM budget: {label} spent ${spent:.2f} of ${budget.usd:.2f} this {budget.period}, "
+                    f"using {budget.degrade_to}"
+                )
+        return chosen
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        ctx = current_call()
+        model = model or self.inner.get_default_model()
+        if self.budgets:
+            model = await self.check(ctx, model)
+        response = await self.inner.chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature
+        )
+        if not response.cached:
+            # Priced at the model that answered (failover, hedge), plus any other billed requests
+            self.ledger.record(self.entry(ctx, response.model or model, response.usage))
+            for extra_model, usage in response.extra_usage:
+                self.ledger.record(self.entry(ctx, extra_model, usage))
+            if self.ledger.due():
+                await asyncio.to_thread(self.ledger.flush)
+        return response
+
+    def entry(self, ctx: CallContext, model: str, usage: dict[str, int]) -> UsageEntry:
+        prompt = usage.get("prompt_tokens", 0)
+        completion = usage.get("completion_tokens", 0)
+        cached = usage.get("cached_tokens", 0)
+        return UsageEntry(
+            ts=time.time(),
+            source=ctx.source,
+            session_key=ctx.session_key,
+            channel=ctx.channel,
+            job_id=ctx.job_id,
+            subagent_id=ctx.subagent_id,
+            model=model,
+            prompt_tokens=prompt,
+            completion_tokens=completion,
+            cached_tokens=cached,
+            cost_usd=estimate_cost(model, prompt, completion, cached, prices=self.prices),
+        )
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
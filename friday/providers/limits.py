@@ -0,0 +1,237 @@
+"""Client-side admission control: concurrency and RPM/TPM limits per provider and model."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Callable
+
+from loguru import logger
+
+from friday.providers.base import LLMProvider, LLMResponse
+from friday.providers.context import current_call
+from friday.utils import serde
+from friday.utils.helpers import estimate_tokens
+
+# Turn sources served before background work when a limit is saturated
+INTERACTIVE_SOURCES = frozenset({"user", "system"})
+
+
+def estimate_request_tokens(
+    messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None, max_tokens: int
+) -> int:
+    """Prompt tokens (rough, from the serialized request) plus the completion allowance."""
+    try:
+        prompt = serde.dumps(messages) + (serde.dumps(tools) if tools else "")
+    except (TypeError, ValueError):
+        prompt = str(messages)
+    return estimate_tokens(prompt) + max_tokens
+
+
+class TokenBucket:
+    """
+    `capacity` tokens, refilled continuously at capacity per `period_s`.
+
+    The level may go negative when a reservation is reconciled upwards; the
+    debt is paid back by the refill.
+    """
+
+    def __init__(self, capacity: float, period_s: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.rate = capacity / period_s
+        self._clock = clock
+        self._level = capacity
+        self._updated = clock()
+
+    @property
+    def level(self) -> float:
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+        return self._level
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (amounts above capacity wait for a full bucket)."""
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        """Remove tokens (negative amounts give them back)."""
+        self._level = min(self.capacity, self.level - amount)
+
+
+@dataclass
+class Limits:
+    """Limits for one provider or model; 0 means unlimited."""
+    max_concurrent: int = 0
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+
+
+@dataclass
+class LimiterStats:
+    admitted: int = 0
+    queued: int = 0  # Admissions that had to wait
+    wait_s_total: float = 0.0
+    wait_s_max: float = 0.0
+
+
+class AdmissionController:
+    """
+    Admits requests under a concurrency cap and RPM/TPM token buckets.
+
+    Waiters are served by priority (lower first), then in arrival order; the
+    head of the queue waits for capacity while everyone behind it waits for
+    the head, so background work never overtakes queued interactive turns.
+    """
+
+    def __init__(self, limits: Limits, clock: Callable[[], float] = time.monotonic):
+        self.limits = limits
+        self.active = 0
+        self.stats = LimiterStats()
+        self._rpm = TokenBucket(limits.requests_per_minute, clock=clock) if limits.requests_per_minute else None
+        self._tpm = TokenBucket(limits.tokens_per_minute, clock=clock) if limits.tokens_per_minute else None
+        self._queue: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._cond = asyncio.Condition()
+
+    def _wait_time(self, tokens: int) -> float | None:
+        """Seconds until the head can go (0: now), or None while the concurrency cap is reached."""
+        if self.limits.max_concurrent and self.active >= self.limits.max_concurrent:
+            return None
+        wait = 0.0
+        if self._rpm is not None:
+            wait = max(wait, self._rpm.wait_time(1))
+        if self._tpm is not None:
+            wait = max(wait, self._tpm.wait_time(tokens))
+        return wait
+
+    async def acquire(self, tokens: int, priority: int = 0) -> float:
+        """Wait for admission. Returns the seconds spent queued."""
+        start = time.monotonic()
+        entry = (priority, next(self._seq))
+        queued = False
+        async with self._cond:
+            heapq.heappush(self._queue, entry)
+            try:
+                while True:
+                    wait = self._wait_time(tokens) if self._queue[0] == entry else None
+                    if wait == 0:
+                        break
+                    queued = True
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+            self.active += 1
+            if self._rpm is not None:
+                self._rpm.take(1)
+            if self._tpm is not None:
+                self._tpm.take(tokens)
+
+        waited = time.monotonic() - start
+        self.stats.admitted += 1
+        if queued:
+            self.stats.queued += 1
+        self.stats.wait_s_total += waited
+        self.stats.wait_s_max = max(self.stats.wait_s_max, waited)
+        return waited
+
+    async def release(self, reserved_tokens: int, used_tokens: int | None = None) -> None:
+        """Finish a request; the TPM bucket is corrected to the tokens actually used."""
+        async with self._cond:
+            self.active -= 1
+            if self._tpm is not None and used_tokens is not None:
+                self._tpm.take(used_tokens - reserved_tokens)
+            self._cond.notify_all()
+
+
+class RateLimiter:
+    """
+    AdmissionControllers by limit key, shared by every client of a provider.
+
+    `limits` maps model-name keywords (a provider prefix like "anthropic",
+    or a full model name) to Limits; the longest keyword contained in the
+    model name wins, and models matching no keyword are not limited.
+    """
+
+    def __init__(self, limits: dict[str, Limits]):
+        self.limits = limits
+        self._controllers: dict[str, AdmissionController] = {}
+
+    def controller(self, model: str) -> AdmissionController | None:
+        model_lower = model.lower()
+        matches = [k for k in self.limits if k.lower() in model_lower]
+        if not matches:
+            return None
+        key = max(matches, key=len)
+        if key not in self._controllers:
+            self._controllers[key] = AdmissionController(self.limits[key])
+        return self._controllers[key]
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Admissions and queueing per limit key."""
+        return {
+            key: {
+                "active": c.active,
+                "admitted": c.stats.admitted,
+                "queued": c.stats.queued,
+                "wait_s_avg": c.stats.wait_s_total / c.stats.admitted if c.stats.admitted else 0.0,
+                "wait_s_max": c.stats.wait_s_max,
+            }
+            for key, c in self._controllers.items()
+        }
+
+
+class RateLimitedProvider(LLMProvider):
+    """
+    Puts every call through the RateLimiter's AdmissionController for its model.
+
+    The token cost is estimated before the call and reconciled from `usage`
+    afterwards. Interactive turns (see INTERACTIVE_SOURCES) are admitted
+    before background work, and the response's queue_wait_s says how long
+    the call waited.
+    """
+
+    def __init__(self, inner: LLMProvider, limiter: RateLimiter):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.limiter = limiter
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        model = model or self.inner.get_default_model()
+        controller = self.limiter.controller(model)
+        if controller is None:
+            return await self.inner.chat(
+                messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature
+            )
+
+        reserved = estimate_request_tokens(messages, tools, max_tokens)
+        source = current_call().source
+        waited = await controller.acquire(reserved, priority=0 if source in INTERACTIVE_SOURCES else 1)
+        if waited > 1:
+            logger.debug(f"LLM limits: {source} call to {model} queued {waited:.1f}s")
+        used = None
+        try:
+            response = await self.inner.chat(
+                messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature
+            )
+            used = response.usage.get("total_tokens")
+        finally:
+            await controller.release(reserved, used)
+        return replace(response, queue_wait_s=response.queue_wait_s + waited)
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
@@ -1,12 +1,13 @@
 """LiteLLM provider implementation for multi-provider support."""
 
-import os
 from typing import Any
 
 import litellm
 from litellm import acompletion
 
 from friday.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from friday.providers.errors import classify_error
+from friday.utils import serde
 
 
 class LiteLLMProvider(LLMProvider):
@@ -35,61 +36,20 @@ class LiteLLMProvider(LLMProvider):
         # Track if using custom endpoint (vLLM, etc.)
         self.is_vllm = bool(api_base) and not self.is_openrouter
         
-        # Configure LiteLLM based on provider
-        if api_key:
-            if self.is_openrouter:
-                # OpenRouter mode - set key
-                os.environ["OPENROUTER_API_KEY"] = api_key
-            elif self.is_vllm:
-                # vLLM/custom endpoint - uses OpenAI-compatible API
-                os.environ["HOSTED_VLLM_API_KEY"] = api_key
-            elif "deepseek" in default_model:
-                os.environ.setdefault("DEEPSEEK_API_KEY", api_key)
-            elif "anthropic" in default_model:
-                os.environ.setdefault("ANTHROPIC_API_KEY", api_key)
-            elif "openai" in default_model or "gpt" in default_model:
-                os.environ.setdefault("OPENAI_API_KEY", api_key)
-            elif "gemini" in default_model.lower():
-                os.environ.setdefault("GEMINI_API_KEY", api_key)
-            elif "zhipu" in default_model or "glm" in default_model or "zai" in default_model:
-                os.environ.setdefault("ZAI_API_KEY", api_key)
-            elif "dashscope" in default_model or "qwen" in default_model.lower():
-                os.environ.setdefault("DASHSCOPE_API_KEY", api_key)
-            elif "groq" in default_model:
-                os.environ.setdefault("GROQ_API_KEY", api_key)
-            elif "moonshot" in default_model or "kimi" in default_model:
-                os.environ.setdefault("MOONSHOT_API_KEY", api_key)
-                os.environ.setdefault("MOONSHOT_API_BASE", api_base or "https://api.moonshot.cn/v1")
-        
-        if api_base:
-            litellm.api_base = api_base
+        # Keys and bases are passed with each call rather than through
+        # os.environ, so several clients with their own endpoints can coexist
+        self._resolved: dict[str, tuple[str, str | None]] = {}
         
         # Disable LiteLLM logging noise
         litellm.suppress_debug_info = True
     
-    async def chat(
-        self,
-        messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
-        model: str | None = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-    ) -> LLMResponse:
-        """
-        Send a chat completion request via LiteLLM.
-        
-        Args:
-            messages: List of message dicts with 'role' and 'content'.
-            tools: Optional list of tool definitions in OpenAI format.
-            model: Model identifier (e.g., 'anthropic/claude-sonnet-4-5').
-            max_tokens: Maximum tokens in response.
-            temperature: Sampling temperature.
-        
-        Returns:
-            LLMResponse with content and/or tool calls.
-        """
-        model = model or self.default_model
-        
+    def resolve(self, model: str) -> tuple[str, str | None]:
+        """LiteLLM model name and API base for a model (computed once per model)."""
+        if model not in self._resolved:
+            self._resolved[model] = self._resolve(model)
+        return self._resolved[model]
+
+    def _resolve(self, model: str) -> tuple[str, str | None]:
         # For OpenRouter, prefix model name if not already prefixed
         if self.is_openrouter and not model.startswith("openrouter/"):
             model = f"openrouter/{model}"
@@ -126,6 +86,37 @@ class LiteLLMProvider(LLMProvider):
         if self.is_vllm:
             model = f"hosted_vllm/{model}"
         
+        api_base = self.api_base
+        if api_base is None and model.startswith("moonshot/"):
+            api_base = "https://api.moonshot.cn/v1"
+        return model, api_base
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """
+        Send a chat completion request via LiteLLM.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions in OpenAI format.
+            model: Model identifier (e.g., 'anthropic/claude-sonnet-4-5').
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+
+        Returns:
+            LLMResponse with content and/or tool calls.
+
+        Raises:
+            LLMError: The call failed (typed by cause, see providers.errors).
+        """
+        model, api_base = self.resolve(model or self.default_model)
+
         # kimi-k2.5 only supports temperature=1.0
         if "kimi-k2.5" in model.lower():
             temperature = 1.0
@@ -137,9 +128,11 @@ class LiteLLMProvider(LLMProvider):
             "temperature": temperature,
         }
         
+        if self.api_key:
+            kwargs["api_key"] = self.api_key
         # Pass api_base directly for custom endpoints (vLLM, etc.)
-        if self.api_base:
-            kwargs["api_base"] = self.api_base
+        if api_base:
+            kwargs["api_base"] = api_base
         
         if tools:
             kwargs["tools"] = tools
@@ -147,13 +140,9 @@ class LiteLLMProvider(LLMProvider):
         
         try:
             response = await acompletion(**kwargs)
-            return self._parse_response(response)
         except Exception as e:
-            # Return error as content for graceful handling
-            return LLMResponse(
-                content=f"Error calling LLM: {str(e)}",
-                finish_reason="error",
-            )
+            raise classify_error(e, model=model) from e
+        return self._parse_response(response)
     
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
@@ -166,10 +155,9 @@ class LiteLLMProvider(LLMProvider):
                 # Parse arguments from JSON string if needed
                 args = tc.function.arguments
                 if isinstance(args, str):
-                    import json
                     try:
-                        args = json.loads(args)
-                    except json.JSONDecodeError:
+                        args = serde.loads(args)
+                    except serde.JSONDecodeError:
                         args = {"raw": args}
                 
                 tool_calls.append(ToolCallRequest(
@@ -185,6 +173,10 @@ class LiteLLMProvider(LLMProvider):
                 "completion_tokens": response.usage.completion_tokens,
                 "total_tokens": response.usage.total_tokens,
             }
+            details = getattr(response.usage, "prompt_tokens_details", None)
+            cached = getattr(details, "cached_tokens", None) if details is not None else None
+            if cached:
+                usage["cached_tokens"] = cached
         
         return LLMResponse(
             content=message.content,
@@ -0,0 +1,204 @@
+"""Native provider for OpenAI-compatible chat completion endpoints."""
+
+import asyncio
+import importlib.util
+from typing import Any
+
+import httpx
+from loguru import logger
+
+from friday.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from friday.providers.errors import classify_error
+from friday.utils import serde
+
+# Provider name -> (default API base, model prefixes stripped before sending)
+NATIVE_ENDPOINTS: dict[str, tuple[str | None, tuple[str, ...]]] = {
+    "openrouter": ("https://openrouter.ai/api/v1", ("openrouter/",)),
+    "deepseek": ("https://api.deepseek.com/v1", ("deepseek/",)),
+    "moonshot": ("https://api.moonshot.cn/v1", ("moonshot/",)),
+    "openai": ("https://api.openai.com/v1", ("openai/",)),
+    "vllm": (None, ("hosted_vllm/", "vllm/")),  # api_base is required
+}
+
+
+class HTTPClientPool:
+    """
+    One pooled httpx.AsyncClient (keep-alive, HTTP/2 when the h2 package is
+    installed) shared by every native provider, plus the endpoints they use
+    so connections can be opened before the first request.
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        max_connections: int = 64,
+        max_keepalive: int = 16,
+        keepalive_expiry_s: float = 120.0,
+        timeout_s: float = 600.0,
+    ):
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry_s,
+        )
+        self.timeout = httpx.Timeout(timeout_s, connect=10.0)
+        self.endpoints: dict[str, dict[str, str]] = {}  # base URL -> auth headers
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(http2=self.http2, limits=self.limits, timeout=self.timeout)
+        return self._client
+
+    def register(self, base_url: str, headers: dict[str, str]) -> None:
+        self.endpoints.setdefault(base_url, headers)
+
+    async def warmup(self) -> None:
+        """Open a connection (DNS, TCP, TLS) to every registered endpoint."""
+        async def touch(base_url: str, headers: dict[str, str]) -> None:
+            try:
+                await self.client.get(f"{base_url}/models", headers=headers, timeout=10.0)
+            except httpx.HTTPError as e:
+                logger.debug(f"HTTP warmup of {base_url} failed: {e}")
+
+        await asyncio.gather(*(touch(url, headers) for url, headers in self.endpoints.items()))
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class OpenAICompatProvider(LLMProvider):
+    """
+    LLM provider speaking the OpenAI chat completions API directly over a
+    shared HTTPClientPool: OpenRouter, DeepSeek, Moonshot, OpenAI and vLLM
+    without importing litellm.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None,
+        api_base: str,
+        default_model: str,
+        pool: HTTPClientPool | None = None,
+        strip_prefixes: tuple[str, ...] = (),
+        name: str = "openai-compatible",
+        extra_headers: dict[str, str] | None = None,
+    ):
+        super().__init__(api_key, api_base.rstrip("/"))
+        self.default_model = default_model
+        self.pool = pool or HTTPClientPool()
+        self.strip_prefixes = strip_prefixes
+        self.name = name
+        self.headers = {"Content-Type": "application/json", **(extra_headers or {})}
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+        self.url = f"{self.api_base}/chat/completions"
+        self.pool.register(self.api_base, self.headers)
+
+    def wire_model(self, model: str) -> str:
+        """Model name as the endpoint expects it (without our routing prefix)."""
+        for prefix in self.strip_prefixes:
+            if model.startswith(prefix):
+                return model[len(prefix):]
+        return model
+
+    def request_body(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str,
+        max_tokens: int,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """The chat completions request body."""
+        # kimi-k2.5 only supports temperature=1.0
+        if "kimi-k2.5" in model.lower():
+            temperature = 1.0
+        body: dict[str, Any] = {
+            "model": self.wire_model(model),
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        if tools:
+            body["tools"] = tools
+            body["tool_choice"] = "auto"
+        return body
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        model = model or self.default_model
+        body = self.request_body(messages, tools, model, max_tokens, temperature)
+        try:
+            response = await self.pool.client.post(self.url, content=serde.dumps(body), headers=self.headers)
+            raise_for_status(response, self.name)
+            data = serde.loads(response.content)
+        except Exception as e:
+            raise classify_error(e, provider=self.name, model=model) from e
+        return parse_chat_completion(data)
+
+    def get_default_model(self) -> str:
+        return self.default_model
+
+
+def raise_for_status(response: httpx.Response, name: str) -> None:
+    """Raise httpx.HTTPStatusError, with the endpoint's error message, for error responses."""
+    if response.status_code >= 400:
+        raise httpx.HTTPStatusError(
+            f"{response.status_code} from {name}: {_error_message(response)}",
+            request=response.request,
+            response=response,
+        )
+
+
+def _error_message(response: httpx.Response) -> str:
+    try:
+        error = serde.loads(response.content).get("error")
+    except (serde.JSONDecodeError, AttributeError, ValueError):
+        return response.text[:500]
+    if isinstance(error, dict):
+        return str(error.get("message") or error)
+    return str(error or response.text[:500])
+
+
+def parse_chat_completion(data: dict[str, Any]) -> LLMResponse:
+    """Parse an OpenAI-format chat completion into an LLMResponse."""
+    choice = data["choices"][0]
+    message = choice.get("message") or {}
+
+    tool_calls = []
+    for tc in message.get("tool_calls") or []:
+        function = tc.get("function") or {}
+        args = function.get("arguments") or {}
+        if isinstance(args, str):
+            try:
+                args = serde.loads(args) if args.strip() else {}
+            except serde.JSONDecodeError:
+                args = {"raw": args}
+        tool_calls.append(ToolCallRequest(id=tc.get("id", ""), name=function.get("name", ""), arguments=args))
+
+    usage: dict[str, int] = {}
+    raw_usage = data.get("usage") or {}
+    for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        if raw_usage.get(key) is not None:
+            usage[key] = raw_usage[key]
+    cached = (raw_usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+    if cached:
+        usage["cached_tokens"] = cached
+
+    return LLMResponse(
+        content=message.get("content"),
+        tool_calls=tool_calls,
+        finish_reason=choice.get("finish_reason") or "stop",
+        usage=usage,
+    )
@@ -0,0 +1,110 @@
+"""A pool of isolated provider clients, one per endpoint."""
+
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from loguru import logger
+
+from friday.providers.base import LLMProvider, LLMResponse
+
+
+@dataclass
+class ModelSettings:
+    """Per-model overrides applied to every call."""
+    max_tokens: int | None = None  # Cap on the completion allowance
+    temperature: float | None = None  # Fixed sampling temperature
+
+
+@dataclass
+class ResolvedModel:
+    endpoint: str
+    client: LLMProvider
+    settings: ModelSettings
+
+
+class ProviderPool(LLMProvider):
+    """
+    Sends each call to the client for its model's endpoint.
+
+    `factories` create the client of each endpoint (a provider name) with
+    its own key, base and defaults; a factory runs the first time its
+    endpoint is needed and may return None if the endpoint is not
+    configured. `resolve(model)` names a model's endpoint (None: the
+    default one). `settings` are matched by the longest model-name keyword.
+
+    A model is resolved to its client and settings once, not on every call;
+    resolve the models known at startup with prepare().
+    """
+
+    def __init__(
+        self,
+        factories: dict[str, Callable[[], LLMProvider | None]],
+        resolve: Callable[[str], str | None],
+        default_endpoint: str,
+        default_model: str,
+        settings: dict[str, ModelSettings] | None = None,
+    ):
+        super().__init__()
+        self.factories = factories
+        self.resolve_endpoint = resolve
+        self.default_endpoint = default_endpoint
+        self.default_model = default_model
+        self.settings = settings or {}
+        self.clients: dict[str, LLMProvider] = {}
+        self._models: dict[str, ResolvedModel] = {}
+        default = self._client(default_endpoint)
+        if default is None:
+            raise ValueError(f"Default LLM endpoint {default_endpoint} is not configured")
+        self.api_key, self.api_base = default.api_key, default.api_base
+
+    def _client(self, endpoint: str) -> LLMProvider | None:
+        if endpoint not in self.clients:
+            factory = self.factories.get(endpoint)
+            client = factory() if factory else None
+            if client is None:
+                return None
+            self.clients[endpoint] = client
+        return self.clients[endpoint]
+
+    def resolve(self, model: str) -> ResolvedModel:
+        resolved = self._models.get(model)
+        if resolved is None:
+            endpoint = self.resolve_endpoint(model) or self.default_endpoint
+            client = self._client(endpoint)
+            if client is None:
+                logger.warning(f"LLM pool: endpoint {endpoint} for {model} is not configured, using the default")
+                endpoint, client = self.default_endpoint, self.clients[self.default_endpoint]
+            model_lower = model.lower()
+            matches = [k for k in self.settings if k.lower() in model_lower]
+            settings = self.settings[max(matches, key=len)] if matches else ModelSettings()
+            resolved = self._models[model] = ResolvedModel(endpoint, client, settings)
+            logger.debug(f"LLM pool: {model} -> {endpoint}")
+        return resolved
+
+    def prepare(self, models: list[str]) -> None:
+        """Resolve models ahead of the first call."""
+        for model in models:
+            if model:
+                self.resolve(model)
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        model = model or self.default_model
+        resolved = self.resolve(model)
+        settings = resolved.settings
+        if settings.max_tokens is not None:
+            max_tokens = min(max_tokens, settings.max_tokens)
+        if settings.temperature is not None:
+            temperature = settings.temperature
+        return await resolved.client.chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature
+        )
+
+    def get_default_model(self) -> str:
+        return self.default_model
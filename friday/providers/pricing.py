@@ -0,0 +1,58 @@
+"""Approximate model prices for spend estimates."""
+
+# USD per million tokens (input, output), matched by the longest keyword contained
+# in the model name. List prices at the time of writing; override with llm.prices.
+DEFAULT_PRICES: dict[str, tuple[float, float]] = {
+    "claude-opus-4-5": (5.0, 25.0),
+    "claude-opus": (15.0, 75.0),
+    "claude-sonnet": (3.0, 15.0),
+    "claude-haiku-4": (1.0, 5.0),
+    "claude-haiku": (0.8, 4.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4.1-nano": (0.1, 0.4),
+    "gpt-4.1-mini": (0.4, 1.6),
+    "gpt-4.1": (2.0, 8.0),
+    "gpt-5-mini": (0.25, 2.0),
+    "gpt-5": (1.25, 10.0),
+    "deepseek": (0.28, 1.1),
+    "gemini-2.5-pro": (1.25, 10.0),
+    "gemini-2.5-flash": (0.3, 2.5),
+    "gemini": (0.1, 0.4),
+    "kimi": (0.6, 2.5),
+    "moonshot": (0.6, 2.5),
+    "glm": (0.6, 2.2),
+    "qwen": (0.4, 1.2),
+    "llama": (0.59, 0.79),
+}
+
+# Cached prompt tokens are billed at roughly this fraction of the input price
+CACHED_INPUT_DISCOUNT = 0.1
+
+
+def model_price(model: str, prices: dict[str, tuple[float, float]] | None = None) -> tuple[float, float] | None:
+    """(input, output) USD per million tokens, or None for unknown (e.g. local) models."""
+    table = {**DEFAULT_PRICES, **(prices or {})}
+    model = model.lower()
+    matches = [k for k in table if k.lower() in model]
+    return tuple(table[max(matches, key=len)]) if matches else None
+
+
+def estimate_cost(
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    cached_tokens: int = 0,
+    prices: dict[str, tuple[float, float]] | None = None,
+) -> float:
+    """Estimated USD cost of a call (0 for unknown models)."""
+    price = model_price(model, prices)
+    if price is None:
+        return 0.0
+    input_price, output_price = price
+    uncached = max(0, prompt_tokens - cached_tokens)
+    return (
+        uncached * input_price
+        + cached_tokens * input_price * CACHED_INPUT_DISCOUNT
+        + completion_tokens * output_price
+    ) / 1_000_000
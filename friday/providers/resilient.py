@@ -0,0 +1,199 @@
+"""Retry, circuit breaking and failover across LLM providers."""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+
+from friday.providers.base import LLMProvider, LLMResponse
+from friday.providers.errors import (
+    AllProvidersFailedError,
+    CircuitOpenError,
+    LLMError,
+    classify_error,
+)
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+    max_attempts: int = 3  # Calls per provider, including the first
+    base_delay_s: float = 0.5
+    max_delay_s: float = 8.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Seconds to wait after failed attempt number `attempt` (0-based)."""
+        delay = random.uniform(0, min(self.max_delay_s, self.base_delay_s * 2 ** attempt))
+        if retry_after is not None:
+            # Honour the provider's hint, within reason
+            delay = max(delay, min(retry_after, self.max_delay_s))
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Stops calling a provider after consecutive failures.
+
+    Closed: calls pass. After failure_threshold consecutive failures it opens
+    and calls are refused for reset_timeout_s; then one probe call is let
+    through (half-open), which closes it on success or reopens it on failure.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._clock = clock
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._probing or self._clock() - self._opened_at >= self.reset_timeout_s:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go through now (claims the probe when half-open)."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def release(self) -> None:
+        """Give back a probe whose call ended without an outcome (e.g. cancelled)."""
+        self._probing = False
+
+    def record_failure(self) -> bool:
+        """Count a failure. Returns True if this opened the breaker."""
+        self.failures += 1
+        if self._probing or (self._opened_at is None and self.failures >= self.failure_threshold):
+            self._opened_at = self._clock()
+            self._probing = False
+            return True
+        return False
+
+
+@dataclass
+class ProviderRoute:
+    """One provider in the failover chain."""
+    name: str
+    provider: LLMProvider
+    model: str | None = None  # Model to ask this provider for (default: the requested model)
+
+
+class ResilientProvider(LLMProvider):
+    """
+    LLMProvider that retries transient errors with jittered backoff, keeps a
+    circuit breaker per provider and fails over along an ordered chain
+    (e.g. anthropic -> openrouter -> deepseek).
+
+    The first route serves the requested model; later routes use their own
+    model, since the same name rarely exists on another provider. Only
+    LLMErrors marked `failover` move on to the next route; invalid requests
+    are raised immediately.
+    """
+
+    def __init__(
+        self,
+        routes: list[ProviderRoute],
+        retry: RetryPolicy | None = None,
+        breaker_failures: int = 5,
+        breaker_reset_s: float = 30.0,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        if not routes:
+            raise ValueError("ResilientProvider needs at least one provider")
+        super().__init__()
+        self.routes = routes
+        self.retry = retry or RetryPolicy()
+        self.breakers = {route.name: CircuitBreaker(breaker_failures, breaker_reset_s) for route in routes}
+        self._sleep = sleep
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        errors: list[LLMError] = []
+        for index, route in enumerate(self.routes):
+            route_model = route.model or (model if index == 0 else None) or route.provider.get_default_model()
+            breaker = self.breakers[route.name]
+            for attempt in range(self.retry.max_attempts):
+                probe = breaker.state == "half_open"
+                if not breaker.allow():
+                    errors.append(CircuitOpenError("circuit open", provider=route.name, model=route_model))
+                    break
+                try:
+                    response = await route.provider.chat(
+                        messages=messages,
+                        tools=tools,
+                        model=route_model,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                    )
+                except Exception as e:
+                    error = classify_error(e, route.name, route_model)
+                    error.provider = error.provider or route.name
+                    if not error.failover:
+                        # The provider answered; the request itself is at fault
+                        breaker.record_success()
+                        if error is e:
+                            raise
+                        raise error from e
+                    if breaker.record_failure():
+                        logger.warning(f"LLM: circuit opened for {route.name} after {breaker.failures} failures")
+                    errors.append(error)
+                    if not error.retryable or attempt + 1 == self.retry.max_attempts:
+                        break
+                    delay = self.retry.delay(attempt, error.retry_after)
+                    logger.warning(
+                        f"LLM: {route.name} failed ({type(error).__name__}: {error}); "
+                        f"retry {attempt + 1} in {delay:.1f}s"
+                    )
+                    await self._sleep(delay)
+                    continue
+                except BaseException:
+                    # Cancelled (e.g. the losing side of a hedge): no verdict on the provider
+                    if probe:
+                        breaker.release()
+                    raise
+                breaker.record_success()
+                response.model = response.model or route_model
+                if index:
+                    logger.info(f"LLM: served by failover provider {route.name} ({route_model})")
+                return response
+            if index + 1 < len(self.routes):
+                logger.warning(f"LLM: failing over from {route.name} to {self.routes[index + 1].name}")
+        raise AllProvidersFailedError(errors)
+
+    def get_default_model(self) -> str:
+        return self.routes[0].provider.get_default_model()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Breaker state per provider."""
+        return {
+            name: {"state": breaker.state, "failures": breaker.failures}
+            for name, breaker in self.breakers.items()
+        }
@@ -0,0 +1,212 @@
+"""Cost-aware model routing: cheap models for easy calls, escalation when they fail."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from loguru import logger
+
+from friday.providers.base import LLMProvider, LLMResponse
+from friday.providers.context import current_call
+from friday.providers.errors import LLMError
+from friday.providers.limits import estimate_request_tokens
+from friday.providers.pricing import estimate_cost
+
+_HARD_WORDS = re.compile(
+    r"\b(analy[sz]e|architect|compare|debug|design|derive|explain why|investigate|optimi[sz]e|plan|"
+    r"proof|prove|refactor|research|step by step|trade-?offs?)\b",
+    re.IGNORECASE,
+)
+_ACTION_WORDS = re.compile(
+    r"\b(create|delete|download|edit|fetch|file|folder|install|open|read|remind|run|schedule|search|"
+    r"send|write)\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class CallFeatures:
+    """What a routing rule can look at."""
+    source: str
+    channel: str | None
+    prompt_tokens: int  # Estimated, without the completion allowance
+    difficulty: float  # 0 (trivial) .. 1 (hard), see estimate_difficulty()
+    needs_tools: bool  # Tools are offered and the turn looks like it will use them
+
+
+def _last_user_text(messages: list[dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            content = message.get("content")
+            if isinstance(content, list):
+                return " ".join(p.get("text", "") for p in content if isinstance(p, dict))
+            return content if isinstance(content, str) else ""
+    return ""
+
+
+def estimate_difficulty(messages: list[dict[str, Any]]) -> float:
+    """
+    Cheap heuristic for how hard the latest request is: long messages, code
+    or stack traces, analytical wording and multi-step tool loops score higher.
+    """
+    text = _last_user_text(messages)
+    score = min(len(text) / 6000, 0.4)
+    if "```" in text or "Traceback" in text:
+        score += 0.3
+    if _HARD_WORDS.search(text):
+        score += 0.3
+    tool_results = sum(1 for m in messages if m.get("role") == "tool")
+    score += min(tool_results / 20, 0.2)
+    return min(score, 1.0)
+
+
+def call_features(
+    messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None, max_tokens: int
+) -> CallFeatures:
+    ctx = current_call()
+    in_tool_loop = bool(messages) and messages[-1].get("role") == "tool"
+    return CallFeatures(
+        source=ctx.source,
+        channel=ctx.channel,
+        prompt_tokens=estimate_request_tokens(messages, tools, max_tokens) - max_tokens,
+        difficulty=estimate_difficulty(messages),
+        needs_tools=bool(tools) and (in_tool_loop or bool(_ACTION_WORDS.search(_last_user_text(messages)))),
+    )
+
+
+@dataclass
+class RouteRule:
+    """Send matching calls to `model`; empty criteria match anything."""
+    name: str
+    model: str
+    sources: list[str] = field(default_factory=list)
+    channels: list[str] = field(default_factory=list)
+    max_prompt_tokens: int = 0  # 0: no limit
+    max_difficulty: float = 1.0
+    tools: Literal["any", "yes", "no"] = "any"  # Match only calls that need tools ("yes") or don't ("no")
+    escalate_to: str = ""  # Model when this one fails (default: the requested model)
+
+    def matches(self, f: CallFeatures) -> bool:
+        return (
+            (not self.sources or f.source in self.sources)
+            and (not self.channels or f.channel in self.channels)
+            and (not self.max_prompt_tokens or f.prompt_tokens <= self.max_prompt_tokens)
+            and f.difficulty <= self.max_difficulty
+            and (self.tools == "any" or f.needs_tools == (self.tools == "yes"))
+        )
+
+
+@dataclass
+class RouteStats:
+    calls: int = 0
+    escalations: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+
+
+def invalid_reason(response: LLMResponse, tools: list[dict[str, Any]] | None) -> str | None:
+    """Why a response is not usable (None if it is)."""
+    if not response.tool_calls and not (response.content or "").strip():
+        return "empty response"
+    names = {t.get("function", {}).get("name") for t in tools or []}
+    for call in response.tool_calls:
+        if call.name not in names:
+            return f"unknown tool {call.name}"
+        if not isinstance(call.arguments, dict) or set(call.arguments) == {"raw"}:
+            return f"malformed arguments for {call.name}"
+    return None
+
+
+class RoutingProvider(LLMProvider):
+    """
+    Picks the model for each call from ordered rules over the call's source,
+    channel, prompt size, estimated difficulty and tool needs; the first
+    matching rule wins and calls matching none use the requested model.
+
+    A routed call that fails (an LLMError, an empty answer, or a tool call
+    that is unknown or unparseable) is retried once on the rule's
+    escalate_to model, or the requested one. Decisions are logged at debug
+    level; calls, escalations, tokens and estimated spend per route are kept
+    in `stats` and logged every log_every calls.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        rules: list[RouteRule],
+        escalate: bool = True,
+        prices: dict[str, tuple[float, float]] | None = None,
+        log_every: int = 50,
+    ):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.rules = rules
+        self.escalate = escalate
+        self.prices = prices
+        self.log_every = log_every
+        self.stats: dict[str, RouteStats] = {}
+        self._calls = 0
+
+    def route(self, features: CallFeatures) -> RouteRule | None:
+        return next((rule for rule in self.rules if rule.matches(features)), None)
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        requested = model or self.inner.get_default_model()
+        kwargs = {"messages": messages, "tools": tools, "max_tokens": max_tokens, "temperature": temperature}
+        features = call_features(messages, tools, max_tokens)
+        rule = self.route(features)
+        if rule is None or rule.model == requested:
+            response = await self.inner.chat(model=requested, **kwargs)
+            self._record("default" if rule is None else rule.name, requested, response)
+            return response
+
+        logger.debug(
+            f"LLM route: {rule.name} -> {rule.model} (source={features.source}, channel={features.channel}, "
+            f"tokens~{features.prompt_tokens}, difficulty={features.difficulty:.2f}, tools={features.needs_tools})"
+        )
+        try:
+            response = await self.inner.chat(model=rule.model, **kwargs)
+            reason = invalid_reason(response, tools)
+            self._record(rule.name, rule.model, response)
+        except LLMError as e:
+            if not self.escalate:
+                raise
+            reason = f"{type(e).__name__}: {e}"
+            self._record(rule.name, rule.model, None)
+        if reason is None or not self.escalate:
+            return response
+
+        target = rule.escalate_to or requested
+        self.stats[rule.name].escalations += 1
+        logger.info(f"LLM route: escalating {rule.name} from {rule.model} to {target} ({reason})")
+        response = await self.inner.chat(model=target, **kwargs)
+        self._record(f"{rule.name}:escalated", target, response)
+        return response
+
+    def _record(self, route: str, model: str, response: LLMResponse | None) -> None:
+        stats = self.stats.setdefault(route, RouteStats())
+        stats.calls += 1
+        if response is not None and not response.cached:
+            prompt = response.usage.get("prompt_tokens", 0)
+            completion = response.usage.get("completion_tokens", 0)
+            stats.prompt_tokens += prompt
+            stats.completion_tokens += completion
+            stats.cost_usd += estimate_cost(model, prompt, completion, prices=self.prices)
+        self._calls += 1
+        if self.log_every and self._calls % self.log_every == 0:
+            logger.info("LLM routes: " + "; ".join(
+                f"{name} {s.calls} calls, {s.escalations} escalated, "
+                f"{s.prompt_tokens + s.completion_tokens} tokens, ${s.cost_usd:.4f}"
+                for name, s in self.stats.items()
+            ))
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
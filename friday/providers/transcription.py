@@ -1,65 +1,209 @@
-"""Voice transcription provider using Groq."""
+"""Voice transcription: providers and the preprocessing/caching pipeline."""
 
+import asyncio
+import hashlib
 import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any
 
 import httpx
 from loguru import logger
 
+from friday.utils.helpers import ensure_dir
 
-class GroqTranscriptionProvider:
+# Drop silences longer than a second (keeping a short pause) at the start, end and in between
+SILENCE_FILTER = (
+    "silenceremove=start_periods=1:start_threshold=-45dB:start_silence=0.2:"
+    "stop_periods=-1:stop_duration=1:stop_threshold=-45dB:stop_silence=0.3"
+)
+
+
+class TranscriptionProvider(ABC):
+    """Turns an audio file into text; "" when it cannot."""
+
+    @abstractmethod
+    async def transcribe(self, file_path: str | Path) -> str:
+        pass
+
+    async def aclose(self) -> None:
+        """Release connections."""
+
+
+class GroqTranscriptionProvider(TranscriptionProvider):
     """
     Voice transcription provider using Groq's Whisper API.
-    
+
     Groq offers extremely fast transcription with a generous free tier.
+    Requests share one pooled HTTP client.
     """
-    
-    def __init__(self, api_key: str | None = None):
+
+    def __init__(self, api_key: str | None = None, model: str = "whisper-large-v3", timeout_s: float = 60.0):
         self.api_key = api_key or os.environ.get("GROQ_API_KEY")
         self.api_url = "https://api.groq.com/openai/v1/audio/transcriptions"
-    
+        self.model = model
+        self.timeout_s = timeout_s
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout_s)
+        return self._client
+
     async def transcribe(self, file_path: str | Path) -> str:
         """
         Transcribe an audio file using Groq.
-        
+
         Args:
             file_path: Path to the audio file.
-            
+
         Returns:
             Transcribed text.
         """
         if not self.api_key:
             logger.warning("Groq API key not configured for transcription")
             return ""
-        
+
         path = Path(file_path)
         if not path.exists():
             logger.error(f"Audio file not found: {file_path}")
             return ""
-        
+
         try:
-            async with httpx.AsyncClient() as client:
-                with open(path, "rb") as f:
-                    files = {
-                        "file": (path.name, f),
-                        "model": (None, "whisper-large-v3"),
-                    }
-                    headers = {
-                        "Authorization": f"Bearer {self.api_key}",
-                    }
-                    
-                    response = await client.post(
-                        self.api_url,
-                        headers=headers,
-                        files=files,
-                        timeout=60.0
-                    )
-                    
-                    response.raise_for_status()
-                    data = response.json()
-                    return data.get("text", "")
-                    
+            response = await self.client.post(
+                self.api_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                files={"file": (path.name, path.read_bytes())},
+                data={"model": self.model},
+            )
+            response.raise_for_status()
+            return response.json().get("text", "")
         except Exception as e:
             logger.error(f"Groq transcription error: {e}")
             return ""
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class TranscriptionPipeline(TranscriptionProvider):
+    """
+    Transcription in front of a TranscriptionProvider.
+
+    Audio is transcoded with ffmpeg to 16 kHz mono FLAC, with long silences
+    trimmed, and cut into chunk_s chunks transcribed up to max_parallel at a
+    time. Transcripts are cached by a hash of the original file's content,
+    and the same audio arriving twice at once is transcribed once. Without
+    ffmpeg the original file is sent as is.
+    """
+
+    def __init__(
+        self,
+        provider: TranscriptionProvider,
+        cache_dir: Path | None = None,
+        chunk_s: int = 600,
+        max_parallel: int = 4,
+        trim_silence: bool = True,
+        ffmpeg: str | None = None,
+    ):
+        self.provider = provider
+        self.cache_dir = ensure_dir(cache_dir) if cache_dir else None
+        self.chunk_s = chunk_s
+        self.max_parallel = max_parallel
+        self.trim_silence = trim_silence
+        self.ffmpeg = ffmpeg or shutil.which("ffmpeg")
+        self._inflight: dict[str, asyncio.Future[str]] = {}
+        if self.ffmpeg is None:
+            logger.info("ffmpeg not found: voice messages are transcribed without preprocessing")
+
+    async def transcribe(self, file_path: str | Path) -> str:
+        path = Path(file_path)
+        try:
+            digest = hashlib.sha256(await asyncio.to_thread(path.read_bytes)).hexdigest()
+        except OSError as e:
+            logger.error(f"Cannot read audio file {file_path}: {e}")
+            return ""
+
+        cached = self._cached(digest)
+        if cached is not None:
+            logger.debug(f"Transcription cache hit for {path.name}")
+            return cached
+        if digest in self._inflight:
+            return await asyncio.shield(self._inflight[digest])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[digest] = future
+        text = ""
+        try:
+            text, complete = await self._transcribe(path)
+            if complete and text:
+                self._store(digest, text)
+        finally:
+            self._inflight.pop(digest, None)
+            future.set_result(text)
+        return text
+
+    async def _transcribe(self, path: Path) -> tuple[str, bool]:
+        """The transcript, and whether every chunk was transcribed."""
+        if self.ffmpeg is None:
+            text = await self.provider.transcribe(path)
+            return text, bool(text)
+
+        with tempfile.TemporaryDirectory(prefix="friday-audio-") as tmp:
+            chunks = await self._preprocess(path, Path(tmp))
+            if chunks is None:
+                text = await self.provider.transcribe(path)
+                return text, bool(text)
+            if not chunks:
+                return "", True  # Nothing but silence
+
+            semaphore = asyncio.Semaphore(self.max_parallel)
+
+            async def one(chunk: Path) -> str:
+                async with semaphore:
+                    return await self.provider.transcribe(chunk)
+
+            texts = await asyncio.gather(*(one(chunk) for chunk in chunks))
+        if len(chunks) > 1:
+            logger.info(f"Transcribed {path.name} in {len(chunks)} chunks")
+        return " ".join(t.strip() for t in texts if t.strip()), all(texts)
+
+    async def _preprocess(self, path: Path, out_dir: Path) -> list[Path] | None:
+        """16 kHz mono FLAC chunks of the audio (None if ffmpeg failed)."""
+        args = [self.ffmpeg, "-hide_banner", "-loglevel", "error", "-nostdin", "-i", str(path), "-vn", "-ac", "1", "-ar", "16000"]
+        if self.trim_silence:
+            args += ["-af", SILENCE_FILTER]
+        args += [
+            "-c:a", "flac", "-f", "segment", "-segment_time", str(self.chunk_s), "-reset_timestamps", "1",
+            str(out_dir / "chunk_%04d.flac"),
+        ]
+        process = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            logger.warning(f"ffmpeg could not convert {path.name}: {stderr.decode(errors='replace').strip()[:300]}")
+            return None
+        return sorted(p for p in out_dir.glob("chunk_*.flac") if p.stat().st_size > 0)
+
+    async def aclose(self) -> None:
+        await self.provider.aclose()
+
+    def _cached(self, digest: str) -> str | None:
+        if self.cache_dir is None:
+            return None
+        try:
+            return (self.cache_dir / f"{digest}.txt").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _store(self, digest: str, text: str) -> None:
+        if self.cache_dir is None:
+            return
+        tmp = self.cache_dir / f"{digest}.tmp"
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, self.cache_dir / f"{digest}.txt")
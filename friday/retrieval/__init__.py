@@ -0,0 +1,6 @@
+"""Local document retrieval over the workspace."""
+
+from friday.retrieval.chunking import Chunk
+from friday.retrieval.index import DocumentIndex, SearchResult
+
+__all__ = ["Chunk", "DocumentIndex", "SearchResult"]
@@ -0,0 +1,110 @@
+"""Text extraction and chunking for workspace documents."""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+TEXT_EXTENSIONS = {
+    ".md", ".markdown", ".txt", ".rst", ".csv", ".tsv", ".json", ".yaml", ".yml",
+    ".toml", ".ini", ".log", ".html", ".htm", ".xml", ".py", ".js", ".ts", ".sql", ".sh",
+}
+PDF_EXTENSIONS = {".pdf"}
+SHEET_EXTENSIONS = {".xlsx", ".xlsm"}
+SUPPORTED_EXTENSIONS = TEXT_EXTENSIONS | PDF_EXTENSIONS | SHEET_EXTENSIONS
+
+
+@dataclass
+class Chunk:
+    """A passage of a document with its location."""
+    path: str  # Path relative to the indexed root
+    start_line: int  # 1-based, inclusive
+    end_line: int
+    text: str
+    page: int | None = None  # PDF page, 1-based
+    sheet: str | None = None  # Spreadsheet sheet name
+
+    @property
+    def ref(self) -> str:
+        """Human-readable reference, e.g. "notes/plan.md:12-30"."""
+        where = f"{self.path}:{self.start_line}-{self.end_line}"
+        if self.page is not None:
+            where += f" (page {self.page})"
+        if self.sheet is not None:
+            where += f" (sheet {self.sheet})"
+        return where
+
+
+def extract_segments(path: Path) -> list[tuple[list[str], int | None, str | None]]:
+    """
+    Extract text lines from a file.
+
+    Returns:
+        Segments of (lines, page, sheet). Text files give one segment; PDFs one per
+        page; spreadsheets one per sheet with one line per row. Unsupported or
+        unreadable files (including PDFs/sheets without pypdf/openpyxl) give [].
+    """
+    suffix = path.suffix.lower()
+    try:
+        if suffix in TEXT_EXTENSIONS:
+            return [(path.read_text(encoding="utf-8", errors="replace").splitlines(), None, None)]
+        if suffix in PDF_EXTENSIONS:
+            return _extract_pdf(path)
+        if suffix in SHEET_EXTENSIONS:
+            return _extract_sheet(path)
+    except ImportError as e:
+        logger.debug(f"Skipping {path.name}: {e}")
+    except Exception as e:
+        logger.warning(f"Failed to extract text from {path}: {e}")
+    return []
+
+
+def _extract_pdf(path: Path) -> list[tuple[list[str], int | None, str | None]]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(str(path))
+    return [
+        ((page.extract_text() or "").splitlines(), i, None)
+        for i, page in enumerate(reader.pages, 1)
+    ]
+
+
+def _extract_sheet(path: Path) -> list[tuple[list[str], int | None, str | None]]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(str(path), read_only=True, data_only=True)
+    segments = []
+    try:
+        for sheet in workbook.worksheets:
+            rows = [
+                " | ".join("" if v is None else str(v) for v in row)
+                for row in sheet.iter_rows(values_only=True)
+            ]
+            segments.append((rows, None, sheet.title))
+    finally:
+        workbook.close()
+    return segments
+
+
+def chunk_file(path: Path, rel_path: str, max_chars: int = 1000, overlap_lines: int = 2) -> list[Chunk]:
+    """
+    Split a file into line-aligned chunks of roughly max_chars.
+
+    Consecutive chunks share overlap_lines lines so passages spanning a
+    boundary can still be found.
+    """
+    chunks: list[Chunk] = []
+    for lines, page, sheet in extract_segments(path):
+        start = 0
+        while start < len(lines):
+            end, size = start, 0
+            while end < len(lines) and (size == 0 or size + len(lines[end]) <= max_chars):
+                size += len(lines[end]) + 1
+                end += 1
+            text = "\n".join(lines[start:end]).strip()
+            if text:
+                chunks.append(Chunk(rel_path, start + 1, end, text, page=page, sheet=sheet))
+            if end >= len(lines):
+                break
+            start = max(start + 1, end - overlap_lines)
+    return chunks
@@ -0,0 +1,278 @@
+"""Offline hybrid (BM25 + hashed-vector) document index."""
+
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from friday.retrieval.chunking import SUPPORTED_EXTENSIONS, Chunk, chunk_file
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Directories never indexed
+SKIP_DIRS = {"node_modules", "__pycache__", ".git", ".venv", "venv"}
+# Per-user and per-chat memory (workspace-relative); private to their namespace
+PRIVATE_DIRS = {"memory/users", "memory/chats"}
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def hash_embed(tokens: list[str], dim: int) -> np.ndarray:
+    """
+    Embed tokens with the hashing trick (unigrams + bigrams, signed buckets).
+
+    Fully offline and deterministic; the vector is L2-normalized so dot
+    products are cosine similarities.
+    """
+    vec = np.zeros(dim, dtype=np.float32)
+    features = Counter(tokens)
+    features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    if not features:
+        return vec
+    hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint32, count=len(features))
+    weights = 1.0 + np.log(np.fromiter(features.values(), dtype=np.float32, count=len(features)))
+    signs = np.where(hashes & 0x80000000, 1.0, -1.0).astype(np.float32)
+    np.add.at(vec, hashes % dim, signs * weights)
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+@dataclass
+class SearchResult:
+    """A ranked passage."""
+    chunk: Chunk
+    score: float
+
+
+class DocumentIndex:
+    """
+    Incremental local index over the documents in a directory.
+
+    Each file is split into line-aligned chunks that are scored with BM25 over
+    an inverted index and with cosine similarity over hashed embeddings held in
+    a NumPy matrix; the two scores are min-max normalized and blended.
+
+    Files are re-chunked only when their mtime or size changes; refreshes are
+    throttled to once per refresh_interval_s. Everything runs on CPU, offline.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        dim: int = 512,
+        chunk_chars: int = 1000,
+        max_file_bytes: int = 10 * 1024 * 1024,
+        refresh_interval_s: float = 2.0,
+        vector_weight: float = 0.4,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.root = root
+        self.dim = dim
+        self.chunk_chars = chunk_chars
+        self.max_file_bytes = max_file_bytes
+        self.refresh_interval_s = refresh_interval_s
+        self.vector_weight = vector_weight
+        self.k1 = k1
+        self.b = b
+
+        self._lock = threading.Lock()
+        self._files: dict[str, tuple[int, int]] = {}  # rel path -> (mtime_ns, size)
+        self._file_chunks: dict[str, list[int]] = {}  # rel path -> chunk ids
+        self._chunks: dict[int, Chunk] = {}
+        self._term_counts: dict[int, Counter] = {}
+        self._lengths: dict[int, int] = {}
+        self._postings: dict[str, dict[int, int]] = {}  # term -> {chunk id: tf}
+        self._vectors: dict[int, np.ndarray] = {}
+        self._total_len = 0
+        self._next_id = 0
+        self._last_refresh = 0.0
+        # Dense matrix of live vectors, rebuilt lazily after changes
+        self._matrix: np.ndarray | None = None
+        self._matrix_ids: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    # ========== Maintenance ==========
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Sync the index with the files on disk.
+
+        Returns:
+            Number of files (re)indexed or removed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_refresh < self.refresh_interval_s:
+                return 0
+            self._last_refresh = now
+
+            seen: dict[str, tuple[int, int]] = {}
+            for path in self._walk():
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                if st.st_size > self.max_file_bytes:
+                    continue
+                seen[path.relative_to(self.root).as_posix()] = (st.st_mtime_ns, st.st_size)
+
+            changed = 0
+            for rel in [r for r in self._files if r not in seen]:
+                self._remove_file(rel)
+                changed += 1
+            for rel, sig in seen.items():
+                if self._files.get(rel) != sig:
+                    self._remove_file(rel)
+                    self._add_file(rel, sig)
+                    changed += 1
+            if changed:
+                logger.debug(f"Document index: {changed} files updated, {len(self._chunks)} chunks")
+            return changed
+
+    def _walk(self):
+        if not self.root.exists():
+            return
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            rel_dir = Path(dirpath).relative_to(self.root).as_posix()
+            dirnames[:] = [
+                d for d in dirnames
+                if not d.startswith(".") and d not in SKIP_DIRS
+                and (d if rel_dir == "." else f"{rel_dir}/{d}") not in PRIVATE_DIRS
+            ]
+            for name in filenames:
+                if not name.startswith(".") and os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                    yield Path(dirpath) / name
+
+    def _add_file(self, rel: str, sig: tuple[int, int]) -> None:
+        ids = []
+        for chunk in chunk_file(self.root / rel, rel, max_chars=self.chunk_chars):
+            chunk_id = self._next_id
+            self._next_id += 1
+            tokens = tokenize(chunk.text)
+            counts = Counter(tokens)
+            self._chunks[chunk_id] = chunk
+            self._term_counts[chunk_id] = counts
+            self._lengths[chunk_id] = len(tokens)
+            for term, tf in counts.items():
+                self._postings.setdefault(term, {})[chunk_id] = tf
+            self._vectors[chunk_id] = hash_embed(tokens, self.dim)
+            self._total_len += len(tokens)
+            ids.append(chunk_id)
+        self._files[rel] = sig
+        self._file_chunks[rel] = ids
+        self._matrix = None
+
+    def _remove_file(self, rel: str) -> None:
+        for chunk_id in self._file_chunks.pop(rel, []):
+            counts = self._term_counts.pop(chunk_id)
+            for term in counts:
+                postings = self._postings[term]
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self._postings[term]
+            self._total_len -= self._lengths.pop(chunk_id)
+            del self._chunks[chunk_id]
+            del self._vectors[chunk_id]
+        if self._files.pop(rel, None) is not None:
+            self._matrix = None
+
+    def _ensure_matrix(self) -> None:
+        if self._matrix is None:
+            ids = list(self._vectors)
+            self._matrix_ids = np.array(ids, dtype=np.int64)
+            self._matrix = (
+                np.vstack([self._vectors[i] for i in ids]) if ids
+                else np.zeros((0, self.dim), dtype=np.float32)
+            )
+
+    # ========== Search ==========
+
+    def search(self, query: str, top_k: int = 5, path_prefix: str | None = None) -> list[SearchResult]:
+        """
+        Find the passages most relevant to a query.
+
+        Args:
+            query: Natural-language query.
+            top_k: Number of passages to return.
+            path_prefix: Only return passages from files under this relative path.
+
+        Returns:
+            Results, best first.
+        """
+        self.refresh()
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            if not self._chunks:
+                return []
+            pool = max(top_k * 5, 50)
+            bm25 = self._bm25(tokens)
+            vector = self._vector_scores(tokens, pool)
+
+            candidates = set(sorted(bm25, key=bm25.__getitem__, reverse=True)[:pool]) | set(vector)
+            if path_prefix:
+                prefix = path_prefix.strip("/")
+                candidates = {
+                    c for c in candidates
+                    if self._chunks[c].path == prefix or self._chunks[c].path.startswith(prefix + "/")
+                }
+            if not candidates:
+                return []
+
+            bm25_n = _min_max({c: bm25.get(c, 0.0) for c in candidates})
+            vector_n = _min_max({c: vector.get(c, 0.0) for c in candidates})
+            w = self.vector_weight
+            scored = sorted(
+                ((c, (1 - w) * bm25_n[c] + w * vector_n[c]) for c in candidates),
+                key=lambda x: -x[1],
+            )
+            return [SearchResult(self._chunks[c], score) for c, score in scored[:top_k] if score > 0]
+
+    def _bm25(self, tokens: list[str]) -> dict[int, float]:
+        n = len(self._chunks)
+        avgdl = self._total_len / n if n else 1.0
+        scores: dict[int, float] = {}
+        for term in set(tokens):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            lengths = self._lengths
+            for chunk_id, tf in postings.items():
+                norm = tf + self.k1 * (1 - self.b + self.b * lengths[chunk_id] / avgdl)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+        return scores
+
+    def _vector_scores(self, tokens: list[str], pool: int) -> dict[int, float]:
+        self._ensure_matrix()
+        sims = self._matrix @ hash_embed(tokens, self.dim)
+        if len(sims) > pool:
+            top = np.argpartition(-sims, pool)[:pool]
+        else:
+            top = np.arange(len(sims))
+        return {int(self._matrix_ids[i]): float(sims[i]) for i in top if sims[i] > 0}
+
+
+def _min_max(scores: dict[int, float]) -> dict[int, float]:
+    if not scores:
+        return scores
+    lo, hi = min(scores.values()), max(scores.values())
+    if hi <= lo:
+        return {k: (1.0 if hi > 0 else 0.0) for k in scores}
+    return {k: (v - lo) / (hi - lo) for k, v in scores.items()}
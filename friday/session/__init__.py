@@ -1,5 +1,10 @@
 """Session management module."""
 
 from friday.session.manager import SessionManager, Session
+from friday.session.message import Message
+from friday.session.store import SessionStore, JsonlSessionStore
+from friday.session.sqlite_store import SqliteSessionStore, migrate_jsonl
+from friday.session.search import HistoryIndex
+from friday.session.archive import SessionArchive, SessionArchiver
 
-__all__ = ["SessionManager", "Session"]
+__all__ = ["SessionManager", "Session", "Message", "SessionStore", "JsonlSessionStore", "SqliteSessionStore", "migrate_jsonl", "HistoryIndex", "SessionArchive", "SessionArchiver"]
@@ -0,0 +1,200 @@
+"""Archival tier: idle sessions compressed out of the active store."""
+
+import asyncio
+import gzip
+import hashlib
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator
+
+from loguru import logger
+
+from friday.session.message import Message
+from friday.session.types import Session
+from friday.utils import serde
+from friday.utils.helpers import ensure_dir, safe_filename
+
+if TYPE_CHECKING:
+    from friday.session.manager import SessionManager
+
+# Cron payload message that identifies the archival system event
+ARCHIVE_EVENT = "sessions.archive"
+ARCHIVE_JOB_NAME = "session-archival"
+
+
+class SessionArchive:
+    """
+    gzip-compressed session files, bucketed by key hash.
+
+    Each session is one <dir>/<2 hex chars>/<key>.jsonl.gz file in the JSONL
+    session format (metadata record, then messages), so no directory grows
+    past 1/256th of the archive.
+    """
+
+    def __init__(self, archive_dir: Path):
+        self.archive_dir = archive_dir
+
+    def _path(self, key: str) -> Path:
+        bucket = hashlib.sha1(key.encode("utf-8")).hexdigest()[:2]
+        return self.archive_dir / bucket / f"{safe_filename(key.replace(':', '_'))}.jsonl.gz"
+
+    def contains(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def write(self, session: Session) -> int:
+        """Archive a full session atomically. Returns the compressed size in bytes."""
+        path = self._path(session.key)
+        ensure_dir(path.parent)
+        tmp = path.with_suffix(".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            f.write(serde.dumps(serde.encode_session_header(session)) + "\n")
+            for msg in session.messages:
+                f.write(serde.dumps(msg.to_dict()) + "\n")
+        os.replace(tmp, path)
+        return path.stat().st_size
+
+    def read(self, key: str) -> Session | None:
+        """Read an archived session in full."""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        header: dict[str, Any] = {}
+        messages = []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                data = serde.loads(line)
+                if data.get("_type") == "metadata":
+                    header = data
+                else:
+                    messages.append(data)
+        return Session(
+            key=key,
+            messages=[Message.from_dict(m) for m in messages],
+            created_at=datetime.fromisoformat(header["created_at"]) if header.get("created_at") else datetime.now(),
+            updated_at=datetime.fromisoformat(header["updated_at"]) if header.get("updated_at") else datetime.now(),
+            metadata=header.get("metadata", {}),
+        )
+
+    def remove(self, key: str) -> bool:
+        path = self._path(key)
+        if path.exists():
+            path.unlink()
+            return True
+        return False
+
+    def entries(self) -> Iterator[tuple[Path, os.stat_result]]:
+        """Archived session files with their stat."""
+        if not self.archive_dir.exists():
+            return
+        for bucket in self.archive_dir.iterdir():
+            if bucket.is_dir():
+                for path in bucket.glob("*.jsonl.gz"):
+                    yield path, path.stat()
+
+    @staticmethod
+    def read_key(path: Path) -> str | None:
+        """Session key from an archive file's metadata record."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return serde.loads(f.readline() or "{}").get("key")
+
+
+@dataclass
+class ArchiveReport:
+    """Outcome of an archival run."""
+    archived: int = 0
+    pruned: int = 0
+    bytes_before: int = 0  # Active store size of the archived sessions
+    bytes_after: int = 0  # Their compressed size
+
+    def summary(self) -> str:
+        return (
+            f"Sessions archived: {self.archived} ({self.bytes_before} -> {self.bytes_after} bytes), "
+            f"{self.pruned} expired archives deleted"
+        )
+
+
+class SessionArchiver:
+    """
+    Moves sessions idle for idle_days out of the active store into a
+    SessionArchive, and deletes archives older than retention_days (0 keeps
+    them forever). Idleness is judged by updated_at; idle sessions still in
+    the manager's cache are written out and evicted first. Archived sessions
+    stay in the history search index and are rehydrated by
+    SessionManager.get_or_create() when the chat returns.
+    """
+
+    def __init__(
+        self,
+        manager: "SessionManager",
+        archive: SessionArchive,
+        idle_days: int = 30,
+        retention_days: int = 0,
+    ):
+        self.manager = manager
+        self.archive = archive
+        self.idle_days = idle_days
+        self.retention_days = retention_days
+
+    def run(self, now: datetime | None = None) -> ArchiveReport:
+        """Archive idle sessions and prune expired archives."""
+        now = now or datetime.now()
+        report = ArchiveReport()
+        if self.idle_days > 0:
+            cutoff = now - timedelta(days=self.idle_days)
+            for info in self.manager.list_sessions():
+                if (info.get("updated_at") or "") < cutoff.isoformat():
+                    self._archive_one(info["key"], cutoff, report)
+        if self.retention_days > 0:
+            report.pruned = self.prune(now)
+        if report.archived or report.pruned:
+            logger.info(report.summary())
+        return report
+
+    def _archive_one(self, key: str, cutoff: datetime, report: ArchiveReport) -> None:
+        with self.manager.archive_lock:
+            cached = self.manager.peek(key)
+            if cached is not None:
+                if cached.updated_at >= cutoff:
+                    return  # Changed in memory since the store's timestamp; not idle after all
+                self.manager.evict(key)  # Writes its unsaved changes first
+            self.manager.drain(key)
+            store = self.manager.store
+            session = store.load(key)
+            if session is None:
+                return
+            before = store.disk_usage(key)
+            report.bytes_after += self.archive.write(session)
+            store.delete(key)
+        report.archived += 1
+        report.bytes_before += before
+
+    def prune(self, now: datetime | None = None) -> int:
+        """Delete archives not touched for retention_days. Returns the count."""
+        cutoff = ((now or datetime.now()) - timedelta(days=self.retention_days)).timestamp()
+        pruned = 0
+        for path, st in list(self.archive.entries()):
+            if st.st_mtime >= cutoff:
+                continue
+            key = self.archive.read_key(path)
+            path.unlink()
+            if key and self.manager.index is not None:
+                self.manager.index.delete(key)
+            pruned += 1
+        return pruned
+
+    def stats(self) -> dict[str, int]:
+        count = size = 0
+        for _, st in self.archive.entries():
+            count += 1
+            size += st.st_size
+        return {"archived_sessions": count, "archived_bytes": size}
+
+
+async def run_maintenance(archiver: SessionArchiver) -> str:
+    """Maintenance job handler: archive idle sessions off the event loop."""
+    report = await asyncio.to_thread(archiver.run)
+    return report.summary()
@@ -0,0 +1,206 @@
+"""Write-behind flusher: persists session changes on a background thread."""
+
+import atexit
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from loguru import logger
+
+from friday.session.types import Session
+from friday.utils import serde
+
+# Batches slower than this are logged as warnings
+SLOW_FLUSH_MS = 500.0
+
+
+@dataclass
+class FlushStats:
+    """Flusher metrics."""
+    queue_depth: int = 0  # Sessions with changes waiting to be written
+    enqueued: int = 0  # save() calls
+    coalesced: int = 0  # save() calls merged into an already queued write
+    written: int = 0  # Session writes performed
+    failed: int = 0
+    batches: int = 0
+    last_flush_ms: float = 0.0
+    max_flush_ms: float = 0.0
+    total_flush_ms: float = 0.0
+
+    @property
+    def avg_flush_ms(self) -> float:
+        return self.total_flush_ms / self.batches if self.batches else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+            "avg_flush_ms": round(self.avg_flush_ms, 2),
+        }
+
+
+def snapshot_changes(session: Session) -> Session:
+    """
+    Capture a session's unsaved changes as a detached delta session.
+
+    The delta holds only the new messages (or all of them for a new or cleared
+    session, which SessionStore.save() then rewrites) and a copy of the
+    metadata. The live session is marked as saved, so the caller can keep
+    mutating it while the delta is written on another thread.
+    """
+    cleared = session._cleared
+    new = session._saved_metadata is None or cleared
+    delta = Session(
+        key=session.key,
+        messages=list(session.messages if new else session.messages[session._persisted:]),
+        created_at=session.created_at,
+        updated_at=session.updated_at,
+        metadata=_copy_metadata(session.metadata),
+    )
+    # None metadata means "new"
+    delta._cleared = cleared
+    delta._saved_metadata = session._saved_metadata
+
+    session._persisted = len(session.messages)
+    session._saved_metadata = serde.dumps(session.metadata, sort_keys=True)
+    session._cleared = False
+    return delta
+
+
+def is_rewrite(delta: Session) -> bool:
+    """Whether a delta replaces the stored session (new or cleared) instead of appending."""
+    return delta._saved_metadata is None or delta._cleared
+
+
+def merge_changes(older: Session, newer: Session) -> Session:
+    """Coalesce two queued deltas of the same session into one."""
+    if is_rewrite(newer):
+        # Replaces whatever the older delta would have written
+        return newer
+    older.messages.extend(newer.messages)
+    older.metadata = newer.metadata
+    older.updated_at = newer.updated_at
+    return older
+
+
+def _copy_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
+    # One level deeper than dict(): values like the rolling summary are dicts
+    return {k: (dict(v) if isinstance(v, dict) else list(v) if isinstance(v, list) else v)
+            for k, v in metadata.items()}
+
+
+class SessionFlusher:
+    """
+    Background thread that writes queued session deltas in batches.
+
+    enqueue() is cheap and never touches the disk: repeated saves of the same
+    session before the next flush are merged into one write. The thread wakes
+    up on the first enqueue, waits flush_interval_s to gather more work and
+    then writes the whole batch. A failed write goes back into the queue
+    (merged with any newer changes) and is retried with the next batch.
+    drain() writes pending work synchronously; stop() (also registered with
+    atexit) drains everything before returning.
+    """
+
+    def __init__(self, write: Callable[[Session], None], flush_interval_s: float = 0.1):
+        self._write = write
+        self.flush_interval_s = flush_interval_s
+        self.stats = FlushStats()
+        self._pending: dict[str, Session] = {}
+        self._cond = threading.Condition()
+        # Held while writing so drain() and the thread never write concurrently
+        self._write_lock = threading.Lock()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="session-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def enqueue(self, delta: Session) -> None:
+        """Queue a delta produced by snapshot_changes()."""
+        with self._cond:
+            if self._stopping:
+                raise RuntimeError("session flusher is stopped")
+            self.stats.enqueued += 1
+            queued = self._pending.get(delta.key)
+            if queued is not None:
+                self.stats.coalesced += 1
+                delta = merge_changes(queued, delta)
+            self._pending[delta.key] = delta
+            self.stats.queue_depth = len(self._pending)
+            self._cond.notify()
+
+    def discard(self, key: str) -> None:
+        """Drop queued changes of a session (it is being deleted)."""
+        with self._write_lock, self._cond:
+            self._pending.pop(key, None)
+            self.stats.queue_depth = len(self._pending)
+
+    def drain(self, key: str | None = None) -> None:
+        """Write queued changes now (of one session, or all) in the calling thread."""
+        with self._write_lock:
+            with self._cond:
+                if key is None:
+                    batch = list(self._pending.values())
+                    self._pending.clear()
+                else:
+                    batch = [self._pending.pop(key)] if key in self._pending else []
+                self.stats.queue_depth = len(self._pending)
+            if batch:
+                self._flush(batch)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                # Let more saves arrive and coalesce before writing; stop() cuts this short
+                self._cond.wait_for(lambda: self._stopping, timeout=self.flush_interval_s)
+            self.drain()
+
+    def _flush(self, batch: list[Session]) -> None:
+        start = time.perf_counter()
+        failed = []
+        for delta in batch:
+            try:
+                self._write(delta)
+                self.stats.written += 1
+            except Exception as e:
+                self.stats.failed += 1
+                failed.append(delta)
+                logger.error(f"Failed to write session {delta.key}: {e}")
+        if failed:
+            # The live sessions are already marked saved: keep the changes queued
+            with self._cond:
+                for delta in failed:
+                    newer = self._pending.get(delta.key)
+                    self._pending[delta.key] = merge_changes(delta, newer) if newer is not None else delta
+                self.stats.queue_depth = len(self._pending)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats.batches += 1
+        self.stats.last_flush_ms = elapsed
+        self.stats.max_flush_ms = max(self.stats.max_flush_ms, elapsed)
+        self.stats.total_flush_ms += elapsed
+        if elapsed > SLOW_FLUSH_MS:
+            logger.warning(f"Session flush of {len(batch)} sessions took {elapsed:.0f} ms")
+        else:
+            logger.debug(f"Flushed {len(batch)} sessions in {elapsed:.1f} ms")
+
+    def stop(self) -> None:
+        """Write everything still queued and stop the thread."""
+        with self._cond:
+            if self._stopping:
+                return
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join()
+        self.drain()
+        atexit.unregister(self.stop)
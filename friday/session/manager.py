@@ -1,202 +1,314 @@
 """Session management for conversation history."""
 
-import json
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from dataclasses import dataclass, field
-from datetime import datetime
 from typing import Any
 
 from loguru import logger
 
-from friday.utils.helpers import ensure_dir, safe_filename
+from friday.session.archive import SessionArchive
+from friday.session.flusher import SessionFlusher, is_rewrite, snapshot_changes
+from friday.session.message import Message
+from friday.session.search import HistoryIndex
+from friday.session.store import JsonlSessionStore, SessionStore
+from friday.session.types import Session
+from friday.utils import serde
 
+# Rough per-message overhead (Message record, timestamp, str header) for the cache size estimate
+_MESSAGE_OVERHEAD_BYTES = 120
 
-@dataclass
-class Session:
-    """
-    A conversation session.
-    
-    Stores messages in JSONL format for easy reading and persistence.
-    """
-    
-    key: str  # channel:chat_id
-    messages: list[dict[str, Any]] = field(default_factory=list)
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
-    metadata: dict[str, Any] = field(default_factory=dict)
-    
-    def add_message(self, role: str, content: str, **kwargs: Any) -> None:
-        """Add a message to the session."""
-        msg = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().isoformat(),
-            **kwargs
-        }
-        self.messages.append(msg)
-        self.updated_at = datetime.now()
-    
-    def get_history(self, max_messages: int = 50) -> list[dict[str, Any]]:
-        """
-        Get message history for LLM context.
-        
-        Args:
-            max_messages: Maximum messages to return.
-        
-        Returns:
-            List of messages in LLM format.
-        """
-        # Get recent messages
-        recent = self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
-        
-        # Convert to LLM format (just role and content)
-        return [{"role": m["role"], "content": m["content"]} for m in recent]
-    
-    def clear(self) -> None:
-        """Clear all messages in the session."""
-        self.messages = []
-        self.updated_at = datetime.now()
+
+def estimate_session_bytes(session: Session) -> int:
+    """Approximate in-memory size of a session's messages."""
+    total = 0
+    for msg in session.messages:
+        content = msg.get("content")
+        total += _MESSAGE_OVERHEAD_BYTES + (len(content) if isinstance(content, str) else len(serde.dumps(content)))
+    return total
 
 
 class SessionManager:
     """
     Manages conversation sessions.
-    
-    Sessions are stored as JSONL files in the sessions directory.
+
+    Sessions are persisted through a pluggable SessionStore (by default JSONL
+    files under ~/.friday/sessions) and kept in an LRU cache bounded by
+    max_sessions and max_bytes. Evicted sessions are flushed first if they have
+    unsaved changes.
+
+    Only the last tail_messages messages are loaded; older history is fetched
+    on demand with load_older(). Saved sessions are trimmed back to
+    tail_messages once they hold twice that many.
+
+    With a HistoryIndex, every saved message is also added to the full-text
+    index.
+
+    With flush_interval_s set, saving is write-behind: save() only snapshots
+    the changes and a SessionFlusher thread writes them in coalesced batches,
+    keeping disk I/O off the event loop. Reads that go to the store write the
+    session's queued changes first; close() writes everything.
+
+    With a SessionArchive, a session the SessionArchiver moved out of the
+    store is rehydrated on its next get_or_create().
     """
-    
-    def __init__(self, workspace: Path):
+
+    def __init__(
+        self,
+        workspace: Path,
+        store: SessionStore | None = None,
+        max_sessions: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        tail_messages: int = 100,
+        index: HistoryIndex | None = None,
+        flush_interval_s: float | None = None,
+        archive: SessionArchive | None = None,
+    ):
         self.workspace = workspace
-        self.sessions_dir = ensure_dir(Path.home() / ".friday" / "sessions")
-        self._cache: dict[str, Session] = {}
-    
-    def _get_session_path(self, key: str) -> Path:
-        """Get the file path for a session."""
-        safe_key = safe_filename(key.replace(":", "_"))
-        return self.sessions_dir / f"{safe_key}.jsonl"
-    
+        self.store = store or JsonlSessionStore(Path.home() / ".friday" / "sessions")
+        self.index = index
+        self.archive = archive
+        # Serializes cache misses with archival of the same sessions
+        self.archive_lock = threading.Lock()
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.tail_messages = tail_messages
+        self._cache: OrderedDict[str, Session] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._cache_bytes = 0
+        self._flusher = SessionFlusher(self._write_delta, flush_interval_s) if flush_interval_s is not None else None
+
     def get_or_create(self, key: str) -> Session:
         """
         Get an existing session or create a new one.
-        
+
         Args:
             key: Session key (usually channel:chat_id).
-        
+
         Returns:
             The session.
         """
         # Check cache
-        if key in self._cache:
-            return self._cache[key]
-        
-        # Try to load from disk
-        session = self._load(key)
+        session = self._cache.get(key)
+        if session is not None:
+            self._cache.move_to_end(key)
+            return session
+
+        # Load the recent tail from the store (or bring it back from the archive)
+        with self.archive_lock:
+            self.drain(key)
+            session = self.store.load(key, limit=self.tail_messages)
+            if session is None and self.archive is not None and self._rehydrate(key):
+                session = self.store.load(key, limit=self.tail_messages)
         if session is None:
             session = Session(key=key)
-        
-        self._cache[key] = session
+
+        self._remember(session)
         return session
-    
-    def _load(self, key: str) -> Session | None:
-        """Load a session from disk."""
-        path = self._get_session_path(key)
-        
-        if not path.exists():
-            return None
-        
+
+    def _rehydrate(self, key: str) -> bool:
+        """Move an archived session back into the store."""
         try:
-            messages = []
-            metadata = {}
-            created_at = None
-            
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    data = json.loads(line)
-                    
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                    else:
-                        messages.append(data)
-            
-            return Session(
-                key=key,
-                messages=messages,
-                created_at=created_at or datetime.now(),
-                metadata=metadata
-            )
+            session = self.archive.read(key)
+            if session is None:
+                return False
+            self.store.save(session)  # Fresh bookkeeping: written in full
+            self.archive.remove(key)
         except Exception as e:
-            logger.warning(f"Failed to load session {key}: {e}")
-            return None
-    
+            logger.error(f"Failed to rehydrate archived session {key}: {e}")
+            return False
+        logger.info(f"Rehydrated archived session {key}")
+        return True
+
+    def is_cached(self, key: str) -> bool:
+        return key in self._cache
+
+    def peek(self, key: str) -> Session | None:
+        """A cached session, without refreshing its place in the LRU order."""
+        return self._cache.get(key)
+
+    def cached_keys(self) -> list[str]:
+        return list(self._cache)
+
+    def evict(self, key: str) -> bool:
+        """
+        Write a cached session's changes and drop it from the cache, so the
+        next get_or_create() reloads it from the store.
+
+        Returns:
+            True if the session was cached.
+        """
+        session = self._cache.get(key)
+        if session is None:
+            return False
+        if self._is_dirty(session):
+            self._persist(session)
+        self.drain(key)
+        del self._cache[key]
+        self._cache_bytes -= self._sizes.pop(key, 0)
+        return True
+
+    def load_older(self, session: Session, limit: int | None = None) -> int:
+        """
+        Prepend older stored messages to a partially loaded session.
+
+        Args:
+            session: The session.
+            limit: Messages to fetch (default tail_messages).
+
+        Returns:
+            Number of messages loaded.
+        """
+        if not session.has_older:
+            return 0
+        self.drain(session.key)
+        older, has_older = self.store.load_older(session.key, session._persisted, limit or self.tail_messages)
+        session.messages[:0] = older
+        session._persisted += len(older)
+        session.has_older = has_older
+        self._remember(session)
+        return len(older)
+
     def save(self, session: Session) -> None:
-        """Save a session to disk."""
-        path = self._get_session_path(session.key)
-        
-        with open(path, "w") as f:
-            # Write metadata first
-            metadata_line = {
-                "_type": "metadata",
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata
-            }
-            f.write(json.dumps(metadata_line) + "\n")
-            
-            # Write messages
-            for msg in session.messages:
-                f.write(json.dumps(msg) + "\n")
-        
-        self._cache[session.key] = session
-    
+        """Save a session to the store."""
+        self._persist(session)
+        self._trim(session)
+        self._remember(session)
+
+    def _persist(self, session: Session) -> None:
+        """Write a session to the store (or queue it) and index its new messages."""
+        if self._flusher is not None:
+            self._flusher.enqueue(snapshot_changes(session))
+            return
+        cleared = session._cleared
+        new = session.messages[0 if cleared else session._persisted:]
+        self.store.save(session)
+        if self.index is not None and (new or cleared):
+            try:
+                self.index.add(session.key, new, replace=cleared)
+            except Exception as e:
+                logger.warning(f"Failed to index session {session.key}: {e}")
+
+    def _write_delta(self, delta: Session) -> None:
+        """Flusher callback: write a queued delta (runs on the flusher thread)."""
+        rewrite = is_rewrite(delta)
+        self.store.save(delta)
+        if self.index is not None and (delta.messages or rewrite):
+            try:
+                self.index.add(delta.key, delta.messages, replace=rewrite)
+            except Exception as e:
+                logger.warning(f"Failed to index session {delta.key}: {e}")
+
+    def drain(self, key: str) -> None:
+        """Write a session's queued changes before reading it from the store."""
+        if self._flusher is not None:
+            # Also waits for a batch in flight, which may include this session
+            self._flusher.drain(key)
+
+    def _trim(self, session: Session) -> None:
+        """Drop old persisted messages from memory; they stay in the store."""
+        excess = len(session.messages) - self.tail_messages
+        if len(session.messages) >= 2 * self.tail_messages and excess <= session._persisted:
+            del session.messages[:excess]
+            session._persisted -= excess
+            session.has_older = True
+
+    @staticmethod
+    def _is_dirty(session: Session) -> bool:
+        if session._saved_metadata is None:
+            # Never saved: only worth writing once it has content
+            return bool(session.messages or session.metadata)
+        return (
+            session._cleared
+            or session._persisted != len(session.messages)
+            or serde.dumps(session.metadata, sort_keys=True) != session._saved_metadata
+        )
+
+    def _remember(self, session: Session) -> None:
+        """Insert or refresh a session in the LRU cache and evict over the limits."""
+        key = session.key
+        cached = self._cache.get(key)
+        if cached is not None and cached is not session:
+            # A different object for the same key replaces the cached one
+            self._cache_bytes -= self._sizes.pop(key, 0)
+        self._cache[key] = session
+        self._cache.move_to_end(key)
+        size = estimate_session_bytes(session)
+        self._cache_bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+
+        # Never evict the session just touched
+        while len(self._cache) > 1 and (
+            len(self._cache) > self.max_sessions or self._cache_bytes > self.max_bytes
+        ):
+            _, oldest = self._cache.popitem(last=False)
+            self._cache_bytes -= self._sizes.pop(oldest.key, 0)
+            if self._is_dirty(oldest):
+                try:
+                    self._persist(oldest)
+                except Exception as e:
+                    logger.error(f"Failed to flush evicted session {oldest.key}: {e}")
+
+    def recent_messages(self, key: str, limit: int) -> list[Message]:
+        """Get the last `limit` messages of a session, oldest first."""
+        session = self._cache.get(key)
+        if session is not None and (len(session.messages) >= limit or not session.has_older):
+            return session.messages[-limit:] if limit > 0 else []
+        self.drain(key)
+        return self.store.recent_messages(key, limit)
+
+    def flush(self) -> None:
+        """Save every cached session with unsaved changes and write all queued changes."""
+        for session in list(self._cache.values()):
+            if self._is_dirty(session):
+                self._persist(session)
+        if self._flusher is not None:
+            self._flusher.drain()
+
+    def stats(self) -> dict[str, Any]:
+        """Cache and write-behind metrics."""
+        stats: dict[str, Any] = {
+            "cached_sessions": len(self._cache),
+            "cached_bytes": self._cache_bytes,
+        }
+        if self._flusher is not None:
+            stats.update(self._flusher.stats.as_dict())
+        return stats
+
+    def close(self) -> None:
+        """Flush dirty sessions, finish pending store work (e.g. compaction) and release it."""
+        self.flush()
+        if self._flusher is not None:
+            self._flusher.stop()
+        self.store.close()
+        if self.index is not None:
+            self.index.close()
+
     def delete(self, key: str) -> bool:
         """
         Delete a session.
-        
+
         Args:
             key: Session key.
-        
+
         Returns:
             True if deleted, False if not found.
         """
         # Remove from cache
         self._cache.pop(key, None)
-        
-        # Remove file
-        path = self._get_session_path(key)
-        if path.exists():
-            path.unlink()
-            return True
-        return False
-    
+        self._cache_bytes -= self._sizes.pop(key, 0)
+        if self._flusher is not None:
+            self._flusher.discard(key)
+        if self.index is not None:
+            self.index.delete(key)
+        archived = self.archive is not None and self.archive.remove(key)
+        return self.store.delete(key) or archived
+
     def list_sessions(self) -> list[dict[str, Any]]:
         """
         List all sessions.
-        
+
         Returns:
             List of session info dicts.
         """
-        sessions = []
-        
-        for path in self.sessions_dir.glob("*.jsonl"):
-            try:
-                # Read just the metadata line
-                with open(path) as f:
-                    first_line = f.readline().strip()
-                    if first_line:
-                        data = json.loads(first_line)
-                        if data.get("_type") == "metadata":
-                            sessions.append({
-                                "key": path.stem.replace("_", ":"),
-                                "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
-                                "path": str(path)
-                            })
-            except Exception:
-                continue
-        
-        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+        return self.store.list_sessions()
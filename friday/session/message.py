@@ -0,0 +1,128 @@
+"""Compact message records for session history."""
+
+import sys
+from collections.abc import Iterator, Mapping
+from datetime import datetime, timedelta
+from typing import Any
+
+# Keys stored in dedicated slots; anything else goes to Message.extra
+_FIELDS = ("role", "content", "timestamp")
+
+# Timestamps are naive local times (datetime.now()), so they are stored as
+# microseconds since a naive epoch rather than through datetime.timestamp(),
+# which would depend on the time zone and break exact round-trips.
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def encode_timestamp(value: str | datetime | None) -> int | str | None:
+    """
+    Integer form of an ISO-8601 timestamp.
+
+    Strings that would not format back identically (time zones, other
+    formats) are kept as they are.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            return value.isoformat()
+        return (value - _EPOCH) // _MICROSECOND
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return value
+    if parsed.tzinfo is not None or parsed.isoformat() != value:
+        return value
+    return (parsed - _EPOCH) // _MICROSECOND
+
+
+def decode_timestamp(value: int | str | None) -> str | None:
+    """ISO-8601 string of a timestamp produced by encode_timestamp()."""
+    if value is None or isinstance(value, str):
+        return value
+    return (_EPOCH + value * _MICROSECOND).isoformat()
+
+
+class Message(Mapping[str, Any]):
+    """
+    A stored session message.
+
+    Behaves like the read-only dict it replaces ({"role", "content",
+    "timestamp", **extra}), so code indexing messages keeps working, but
+    uses slots, interned role strings and an integer timestamp instead of a
+    dict and an ISO string per message. The dict and LLM forms are built on
+    demand by to_dict() and to_llm(). Messages are never mutated in place,
+    so sessions and queued writes can share them.
+    """
+
+    __slots__ = ("role", "content", "_ts", "extra")
+
+    def __init__(
+        self,
+        role: str,
+        content: Any,
+        timestamp: str | datetime | None = None,
+        extra: dict[str, Any] | None = None,
+    ):
+        self.role = sys.intern(role) if type(role) is str else role
+        self.content = content
+        self._ts = encode_timestamp(timestamp)
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Message":
+        """Build a record from a JSONL/dict message."""
+        if isinstance(data, Message):
+            return data
+        known = ("role" in data) + ("content" in data) + ("timestamp" in data)
+        extra = {k: v for k, v in data.items() if k not in _FIELDS} if len(data) > known else None
+        return cls(data.get("role"), data.get("content"), data.get("timestamp"), extra)
+
+    @property
+    def timestamp(self) -> str | None:
+        return decode_timestamp(self._ts)
+
+    def to_dict(self) -> dict[str, Any]:
+        """The message as a dict in the JSONL session format."""
+        data: dict[str, Any] = {"role": self.role, "content": self.content}
+        if self._ts is not None:
+            data["timestamp"] = decode_timestamp(self._ts)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_llm(self) -> dict[str, Any]:
+        """The message in LLM format (role and content only)."""
+        return {"role": self.role, "content": self.content}
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "role":
+            return self.role
+        if key == "content":
+            return self.content
+        if key == "timestamp" and self._ts is not None:
+            return decode_timestamp(self._ts)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __iter__(self) -> Iterator[str]:
+        yield "role"
+        yield "content"
+        if self._ts is not None:
+            yield "timestamp"
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return 2 + (self._ts is not None) + (len(self.extra) if self.extra else 0)
+
+    def __repr__(self) -> str:
+        return f"Message({self.to_dict()!r})"
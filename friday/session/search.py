@@ -0,0 +1,226 @@
+"""Full-text index over session messages (SQLite FTS5)."""
+
+import hashlib
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from friday.utils.helpers import ensure_dir
+
+if TYPE_CHECKING:
+    from friday.session.store import SessionStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    session_key TEXT NOT NULL,
+    role TEXT NOT NULL,
+    timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_docs_session_key ON docs(session_key);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    content, scope, tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TABLE IF NOT EXISTS index_meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _scope_token(session_key: str) -> str:
+    """Single FTS token identifying a session, so per-chat queries intersect a short doclist."""
+    return "s" + hashlib.sha1(session_key.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class HistoryHit:
+    """A matching message."""
+    session_key: str
+    role: str
+    timestamp: str | None
+    snippet: str
+    score: float
+
+
+def _rows(messages: list[dict[str, Any]]) -> list[tuple[str, Any, str]]:
+    """(role, timestamp, content) of the messages with text content."""
+    return [
+        (m.get("role", ""), m.get("timestamp"), m["content"])
+        for m in messages if isinstance(m.get("content"), str) and m["content"].strip()
+    ]
+
+
+class HistoryIndex:
+    """
+    Incremental FTS5 index of every session's messages.
+
+    Rows are added as sessions are saved, so the index stays current without
+    rescanning; queries are BM25-ranked FTS5 lookups, which stay fast at
+    millions of messages. The index lives in its own database so it works
+    with any SessionStore.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        ensure_dir(path.parent)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def add(self, session_key: str, messages: list[dict[str, Any]], replace: bool = False) -> int:
+        """
+        Index messages of a session.
+
+        Args:
+            session_key: Session key.
+            messages: New messages (only text content is indexed).
+            replace: Drop the session's existing rows first (cleared sessions).
+
+        Returns:
+            Number of messages indexed.
+        """
+        rows = _rows(messages)
+        if not rows and not replace:
+            return 0
+        with self._lock:
+            self._add(session_key, rows, replace)
+        return len(rows)
+
+    def _add(self, session_key: str, rows: list[tuple[str, Any, str]], replace: bool) -> None:
+        """Write rows of a session in one transaction (caller holds the lock)."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            if replace:
+                self._delete(session_key)
+            scope = _scope_token(session_key)
+            for role, timestamp, content in rows:
+                cur = self._conn.execute(
+                    "INSERT INTO docs (session_key, role, timestamp) VALUES (?, ?, ?)",
+                    (session_key, role, timestamp),
+                )
+                self._conn.execute(
+                    "INSERT INTO docs_fts (rowid, content, scope) VALUES (?, ?, ?)",
+                    (cur.lastrowid, content, scope),
+                )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, session_key: str) -> None:
+        """Remove a session from the index."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._delete(session_key)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _delete(self, session_key: str) -> None:
+        self._conn.execute(
+            "DELETE FROM docs_fts WHERE rowid IN (SELECT id FROM docs WHERE session_key = ?)", (session_key,)
+        )
+        self._conn.execute("DELETE FROM docs WHERE session_key = ?", (session_key,))
+
+    def search(self, query: str, limit: int = 10, session_key: str | None = None) -> list[HistoryHit]:
+        """
+        Find messages matching a query, best first.
+
+        All query words must match; if nothing does, any word may match.
+
+        Args:
+            query: Free-text query (FTS syntax is not interpreted).
+            limit: Maximum hits.
+            session_key: Only search this session.
+        """
+        terms = _TOKEN_RE.findall(query)
+        if not terms:
+            return []
+        quoted = ['"' + t.replace('"', '""') + '"' for t in terms]
+        hits = self._query(" ".join(quoted), limit, session_key)
+        if not hits and len(quoted) > 1:
+            hits = self._query(" OR ".join(quoted), limit, session_key)
+        return hits
+
+    def _query(self, match: str, limit: int, session_key: str | None) -> list[HistoryHit]:
+        match = f"content : ({match})"
+        if session_key is not None:
+            match = f"scope : {_scope_token(session_key)} AND {match}"
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT d.session_key, d.role, d.timestamp, "
+                "snippet(docs_fts, 0, '**', '**', '...', 16), bm25(docs_fts, 1.0, 0.0) AS score "
+                "FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid "
+                "WHERE docs_fts MATCH ? ORDER BY score LIMIT ?",
+                (match, limit),
+            ).fetchall()
+        # bm25() is lower-is-better; report higher-is-better scores
+        return [HistoryHit(key, role, ts, snippet, -score) for key, role, ts, snippet, score in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def optimize(self) -> int:
+        """
+        Merge the FTS segments and reclaim free pages.
+
+        Returns:
+            Bytes reclaimed from the index database.
+        """
+        with self._lock:
+            before = self._size()
+            self._conn.execute("INSERT INTO docs_fts (docs_fts) VALUES ('optimize')")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("VACUUM")
+            return max(before - self._size(), 0)
+
+    def _size(self) -> int:
+        wal = self.path.with_name(self.path.name + "-wal")
+        return sum(p.stat().st_size for p in (self.path, wal) if p.exists())
+
+    def backfill(self, store: "SessionStore") -> int:
+        """
+        Index every stored session once (e.g. sessions saved before the index existed).
+
+        Returns:
+            Number of sessions indexed; 0 if the backfill already ran.
+        """
+        with self._lock:
+            done = self._conn.execute("SELECT value FROM index_meta WHERE name = 'backfilled'").fetchone()
+        if done:
+            return 0
+
+        indexed = 0
+        for info in store.list_sessions():
+            # Load and replace under the lock: a live add() for the session
+            # waits, instead of landing in between and being overwritten
+            with self._lock:
+                session = store.load(info["key"])
+                if session is not None:
+                    self._add(session.key, _rows(session.messages), replace=True)
+                    indexed += 1
+
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO index_meta (name, value) VALUES ('backfilled', '1')")
+        if indexed:
+            logger.info(f"History index: backfilled {indexed} sessions")
+        return indexed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,260 @@
+"""SQLite session store."""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from friday.session.message import Message
+from friday.session.store import JsonlSessionStore, SessionStore
+from friday.session.types import Session
+from friday.utils import serde
+from friday.utils.helpers import ensure_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions(updated_at);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    session_key TEXT NOT NULL REFERENCES sessions(key) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT,
+    timestamp TEXT,
+    extra TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_messages_session_seq ON messages(session_key, seq);
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Message fields stored in their own columns; anything else goes to `extra` as JSON
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Sessions in a single SQLite database (WAL mode).
+
+    One row per session plus one row per message, keyed by (session_key, seq),
+    so saves insert only new rows and the last N messages of a session are an
+    index range scan. Listing sessions reads the sessions table only.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        ensure_dir(path.parent)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def _to_row(key: str, seq: int, msg: Message) -> tuple:
+        content = msg.content
+        extra = dict(msg.extra) if msg.extra else {}
+        if content is not None and not isinstance(content, str):
+            extra["content"] = content
+            content = None
+        return (
+            key, seq, msg.role or "", content, msg.timestamp,
+            serde.dumps(extra) if extra else None,
+        )
+
+    @staticmethod
+    def _from_row(role: str, content: str | None, timestamp: str | None, extra: str | None) -> Message:
+        fields = serde.loads(extra) if extra else None
+        if fields and "content" in fields:
+            content = fields.pop("content")
+        return Message(role, content, timestamp, fields)
+
+    def load(self, key: str, limit: int | None = None) -> Session | None:
+        """Load a session and its messages (only the last `limit` if given)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, updated_at, metadata FROM sessions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if limit is None:
+                rows = self._conn.execute(
+                    "SELECT role, content, timestamp, extra FROM messages WHERE session_key = ? ORDER BY seq",
+                    (key,),
+                ).fetchall()
+                has_older = False
+            else:
+                rows, has_older = self._select_tail(key, 0, limit)
+
+        metadata = serde.loads(row[2])
+        session = Session(
+            key=key,
+            messages=[self._from_row(*r) for r in rows],
+            created_at=datetime.fromisoformat(row[0]),
+            updated_at=datetime.fromisoformat(row[1]),
+            metadata=metadata,
+            has_older=has_older,
+        )
+        self._mark_saved(session, serde.dumps(metadata, sort_keys=True))
+        return session
+
+    def load_older(self, key: str, skip: int, limit: int) -> tuple[list[Message], bool]:
+        """Load older messages with an index range scan."""
+        if limit <= 0:
+            return [], False
+        with self._lock:
+            rows, has_older = self._select_tail(key, skip, limit)
+        return [self._from_row(*r) for r in rows], has_older
+
+    def _select_tail(self, key: str, skip: int, limit: int) -> tuple[list[tuple], bool]:
+        # One extra row tells whether older messages exist
+        rows = self._conn.execute(
+            "SELECT role, content, timestamp, extra FROM messages WHERE session_key = ? "
+            "ORDER BY seq DESC LIMIT ? OFFSET ?",
+            (key, limit + 1, skip),
+        ).fetchall()
+        has_older = len(rows) > limit
+        return list(reversed(rows[:limit])), has_older
+
+    def save(self, session: Session) -> None:
+        """Insert new messages and upsert the session row in one transaction."""
+        metadata_json = serde.dumps(session.metadata, sort_keys=True)
+        cleared = session._cleared
+        new = session.messages[0 if cleared else session._persisted:]
+        if not new and not cleared and metadata_json == session._saved_metadata:
+            return
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO sessions (key, created_at, updated_at, metadata) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET updated_at = excluded.updated_at, metadata = excluded.metadata",
+                    (session.key, session.created_at.isoformat(), session.updated_at.isoformat(),
+                     serde.dumps(session.metadata)),
+                )
+                if cleared or session._saved_metadata is None:
+                    # Cleared, or a fresh Session object replacing whatever was stored
+                    self._conn.execute("DELETE FROM messages WHERE session_key = ?", (session.key,))
+                    start, new = 0, session.messages
+                else:
+                    # Only a tail may be loaded: continue after the last stored row
+                    start = self._conn.execute(
+                        "SELECT COALESCE(MAX(seq) + 1, 0) FROM messages WHERE session_key = ?", (session.key,)
+                    ).fetchone()[0]
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO messages (session_key, seq, role, content, timestamp, extra) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [self._to_row(session.key, start + i, m) for i, m in enumerate(new)],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        self._mark_saved(session, metadata_json)
+
+    def delete(self, key: str) -> bool:
+        """Delete a session and its messages."""
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+        return cur.rowcount > 0
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """List sessions from the sessions table, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, created_at, updated_at FROM sessions ORDER BY updated_at DESC"
+            ).fetchall()
+        return [
+            {"key": key, "created_at": created_at, "updated_at": updated_at, "path": str(self.path)}
+            for key, created_at, updated_at in rows
+        ]
+
+    def disk_usage(self, key: str | None = None) -> int:
+        if key is not None:
+            # Approximate: payload bytes of the session's rows
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT COALESCE(SUM(LENGTH(content) + LENGTH(COALESCE(extra, '')) + 64), 0) "
+                    "FROM messages WHERE session_key = ?",
+                    (key,),
+                ).fetchone()
+            return row[0]
+        return sum(
+            p.stat().st_size for p in (self.path, Path(f"{self.path}-wal")) if p.exists()
+        )
+
+    def compact_all(self) -> int:
+        """Checkpoint the WAL and VACUUM the database."""
+        before = self.disk_usage()
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return before - self.disk_usage()
+
+    def get_meta(self, name: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM store_meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO store_meta (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (name, value),
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_jsonl(source: JsonlSessionStore, target: SqliteSessionStore, force: bool = False) -> int:
+    """
+    Copy JSONL sessions into a SQLite store, once.
+
+    Sessions already present in the target are left alone. The migration is
+    recorded in the target so later calls are no-ops unless force is set; the
+    JSONL files are not touched.
+
+    Returns:
+        Number of sessions migrated.
+    """
+    if not force and target.get_meta("jsonl_migrated_at"):
+        return 0
+
+    existing = {s["key"] for s in target.list_sessions()}
+    migrated = 0
+    for info in source.list_sessions():
+        key = info["key"]
+        if key in existing:
+            continue
+        session = source.load(key)
+        if session is None:
+            continue
+        # Fresh bookkeeping: the target has never seen this session
+        session._persisted = 0
+        session._saved_metadata = None
+        target.save(session)
+        migrated += 1
+
+    target.set_meta("jsonl_migrated_at", datetime.now().isoformat())
+    if migrated:
+        logger.info(f"Migrated {migrated} sessions from {source.sessions_dir} to {target.path}")
+    return migrated
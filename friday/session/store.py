@@ -0,0 +1,520 @@
+"""Session storage backends."""
+
+import os
+import queue
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+from loguru import logger
+
+from friday.session.message import Message
+from friday.session.types import Session
+from friday.utils import serde
+from friday.utils.helpers import ensure_dir, safe_filename
+
+# Metadata records are written with "_type" as their first key
+# Metadata records as written by json.dumps() and by the compact serde encoders
+_METADATA_PREFIXES = (b'{"_type": "metadata"', b'{"_type":"metadata"')
+
+# A metadata trailer is repeated once this many records follow the last one, so
+# the latest metadata is the header or among the last METADATA_INTERVAL + 1
+# records and tail loads never scan further back for it
+METADATA_INTERVAL = 256
+
+
+class SessionStore(ABC):
+    """
+    Abstract base class for session storage.
+
+    A store persists sessions and their messages. save() is called after every
+    turn and should only write what changed since the last save, using the
+    session's _persisted / _saved_metadata bookkeeping.
+    """
+
+    @abstractmethod
+    def load(self, key: str, limit: int | None = None) -> Session | None:
+        """
+        Load a session, or None if it does not exist.
+
+        Args:
+            key: Session key.
+            limit: Load only the last `limit` messages (setting has_older if
+                more exist); None loads the full history.
+        """
+        pass
+
+    @abstractmethod
+    def load_older(self, key: str, skip: int, limit: int) -> tuple[list[Message], bool]:
+        """
+        Load messages older than the newest `skip` stored messages.
+
+        Returns:
+            (up to `limit` messages, oldest first; whether even older ones exist).
+        """
+        pass
+
+    @abstractmethod
+    def save(self, session: Session) -> None:
+        """Persist a session's new messages and metadata."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete a session. Returns True if it existed."""
+        pass
+
+    @abstractmethod
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """List session info dicts (key, created_at, updated_at, path), newest first."""
+        pass
+
+    def recent_messages(self, key: str, limit: int) -> list[Message]:
+        """Get the last `limit` messages of a session, oldest first."""
+        if limit <= 0:
+            return []
+        session = self.load(key, limit=limit)
+        return session.messages if session else []
+
+    def disk_usage(self, key: str | None = None) -> int:
+        """Bytes on disk for one session, or for the whole store."""
+        return 0
+
+    def compact_all(self) -> int:
+        """Reclaim space from superseded records. Returns bytes reclaimed."""
+        return 0
+
+    def close(self) -> None:
+        """Release resources and finish background work."""
+        pass
+
+    @staticmethod
+    def _mark_saved(session: Session, metadata_json: str) -> None:
+        session._persisted = len(session.messages)
+        session._saved_metadata = metadata_json
+        session._cleared = False
+
+
+class JsonlSessionStore(SessionStore):
+    """
+    Sessions as append-only JSONL files, one per session.
+
+    Each file holds a metadata record, then one record per message. Saving
+    appends only the new messages; a metadata change appends a new metadata
+    trailer record (the last one wins on load), repeated every
+    METADATA_INTERVAL records. Files whose superseded records exceed
+    compact_ratio are rewritten atomically by a background compactor thread.
+    """
+
+    def __init__(
+        self,
+        sessions_dir: Path,
+        compact_ratio: float = 0.25,
+        compact_min_records: int = 32,
+    ):
+        self.sessions_dir = ensure_dir(sessions_dir)
+        self.compact_ratio = compact_ratio
+        self.compact_min_records = compact_min_records
+        # Per-file record counts: key -> [total records, dead records]; only
+        # known after a full read or write (the compactor counts the others)
+        self._file_stats: dict[str, list[int]] = {}
+        # Records after the last metadata trailer (None: the header is the latest)
+        self._since_trailer: dict[str, int | None] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._compact_queue: queue.Queue[str | None] = queue.Queue()
+        self._compact_pending: set[str] = set()
+        self._compactor: threading.Thread | None = None
+
+    def _get_session_path(self, key: str) -> Path:
+        """Get the file path for a session."""
+        safe_key = safe_filename(key.replace(":", "_"))
+        return self.sessions_dir / f"{safe_key}.jsonl"
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        """Per-session file lock shared by writers and the compactor."""
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def load(self, key: str, limit: int | None = None) -> Session | None:
+        """
+        Load a session from disk.
+
+        With a limit, the file is read backwards in blocks and only the last
+        `limit` messages are parsed; older records are skipped unparsed while
+        looking for the latest metadata trailer, and the header line is read
+        when there is none near the end.
+        """
+        path = self._get_session_path(key)
+
+        if not path.exists():
+            return None
+
+        try:
+            with self._lock_for(key):
+                if limit is None:
+                    messages, metadata_record, records, dead, since_trailer = self._read_records(path)
+                    self._file_stats[key] = [records, dead]
+                    has_older = False
+                else:
+                    messages, has_older, metadata_record, since_trailer = self._read_tail(path, 0, limit)
+                self._since_trailer[key] = since_trailer
+
+            metadata = metadata_record.get("metadata", {}) if metadata_record else {}
+            created_at = metadata_record.get("created_at") if metadata_record else None
+            updated_at = messages[-1].get("timestamp") if messages else None
+
+            session = Session(
+                key=key,
+                messages=messages,
+                created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(),
+                updated_at=datetime.fromisoformat(updated_at) if updated_at else datetime.now(),
+                metadata=metadata,
+                has_older=has_older,
+            )
+            self._mark_saved(session, serde.dumps(metadata, sort_keys=True))
+            return session
+        except Exception as e:
+            logger.warning(f"Failed to load session {key}: {e}")
+            return None
+
+    def load_older(self, key: str, skip: int, limit: int) -> tuple[list[Message], bool]:
+        """Read older messages backwards from the end of the file."""
+        path = self._get_session_path(key)
+        if limit <= 0 or not path.exists():
+            return [], False
+        with self._lock_for(key):
+            messages, has_older, _, _ = self._read_tail(path, skip, limit, need_metadata=False)
+        return messages, has_older
+
+    @staticmethod
+    def _reverse_lines(path: Path, block_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Yield the non-empty lines of a file, last line first."""
+        with open(path, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            partial = b""
+            while pos > 0:
+                size = min(block_size, pos)
+                pos -= size
+                f.seek(pos)
+                lines = (f.read(size) + partial).split(b"\n")
+                # The first piece may continue in the previous block
+                partial = lines.pop(0)
+                for line in reversed(lines):
+                    line = line.strip()
+                    if line:
+                        yield line
+            partial = partial.strip()
+            if partial:
+                yield partial
+
+    @classmethod
+    def _read_tail(
+        cls, path: Path, skip: int, limit: int, need_metadata: bool = True
+    ) -> tuple[list[Message], bool, dict[str, Any] | None, int | None]:
+        """
+        Read the last messages of a session file.
+
+        Skips the newest `skip` messages and collects up to `limit` before them.
+        If need_metadata, the latest metadata trailer is looked for among the
+        last METADATA_INTERVAL + 1 records (message records in between are not
+        parsed); without one there, the header line holds the metadata.
+
+        Returns:
+            (messages oldest first, whether older messages exist, latest metadata
+            record, records after the trailer or None if the header is the latest).
+        """
+        messages: list[Message] = []
+        metadata_record = None
+        since_trailer = None
+        has_older = False
+        seen = records = 0
+
+        for line in cls._reverse_lines(path):
+            records += 1
+            if line.startswith(_METADATA_PREFIXES):
+                if metadata_record is not None or not need_metadata:
+                    continue
+                try:
+                    metadata_record = serde.loads(line)
+                    since_trailer = records - 1
+                except serde.JSONDecodeError:
+                    pass
+            elif len(messages) >= limit:
+                # Older messages exist; they are not parsed
+                has_older = True
+                if metadata_record is not None or not need_metadata or records > METADATA_INTERVAL + 1:
+                    break
+            else:
+                try:
+                    data = serde.loads(line)
+                except serde.JSONDecodeError:
+                    continue
+                seen += 1
+                if seen > skip:
+                    messages.append(Message.from_dict(data))
+
+        if need_metadata and metadata_record is None and has_older:
+            metadata_record = cls._read_header(path)
+        messages.reverse()
+        return messages, has_older, metadata_record, since_trailer
+
+    @staticmethod
+    def _read_header(path: Path) -> dict[str, Any] | None:
+        """The metadata record on the first line of a session file."""
+        with open(path, "rb") as f:
+            line = f.readline().strip()
+        if not line.startswith(_METADATA_PREFIXES):
+            return None
+        try:
+            return serde.loads(line)
+        except serde.JSONDecodeError:
+            return None
+
+    @staticmethod
+    def _read_records(path: Path) -> tuple[list[Message], dict[str, Any] | None, int, int, int | None]:
+        """
+        Read a session file.
+
+        Returns:
+            (messages, latest metadata record, total records, dead records,
+            records after the latest metadata trailer or None if there is none).
+            Dead records are superseded metadata records and unparseable lines
+            (e.g. a torn final append after a crash).
+        """
+        messages = []
+        metadata_record = None
+        records = dead = 0
+        metadata_at = None
+
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                records += 1
+                try:
+                    data = serde.loads(line)
+                except serde.JSONDecodeError:
+                    dead += 1
+                    continue
+
+                if data.get("_type") == "metadata":
+                    if metadata_record is not None:
+                        dead += 1
+                    metadata_record = data
+                    metadata_at = records
+                else:
+                    messages.append(Message.from_dict(data))
+
+        since_trailer = records - metadata_at if metadata_at is not None and metadata_at > 1 else None
+        return messages, metadata_record, records, dead, since_trailer
+
+    def save(self, session: Session) -> None:
+        """
+        Save a session to disk.
+
+        Appends messages added since the last save (and a metadata trailer if the
+        metadata changed, or METADATA_INTERVAL records follow the last one). The
+        file is rewritten only for new or cleared sessions.
+        """
+        key = session.key
+        path = self._get_session_path(key)
+        metadata_json = serde.dumps(session.metadata, sort_keys=True)
+
+        with self._lock_for(key):
+            stats = self._file_stats.get(key)
+            if session._cleared or session._saved_metadata is None or not path.exists():
+                # New, cleared or replaced session: write the whole file
+                stats = self._file_stats[key] = [self._write_file(path, session), 0]
+                self._since_trailer[key] = None
+            else:
+                lines = serde.encode_session_lines(session, session._persisted)
+                # Not known if the session was never loaded here: write a trailer to be safe
+                since = self._since_trailer.get(key, METADATA_INTERVAL)
+                if metadata_json != session._saved_metadata or (
+                    lines and since is not None and since + len(lines) > METADATA_INTERVAL
+                ):
+                    lines.append(serde.dumps(serde.encode_session_header(session)))
+                    self._since_trailer[key] = 0
+                    if stats is not None:
+                        stats[1] += 1
+                elif since is not None:
+                    self._since_trailer[key] = since + len(lines)
+                if lines:
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.write("\n".join(lines) + "\n")
+                    if stats is not None:
+                        stats[0] += len(lines)
+
+            self._mark_saved(session, metadata_json)
+
+        # Files only read partially are counted by the compactor
+        if stats is None or self._compaction_due(key):
+            self._schedule_compaction(key)
+
+    def _write_file(self, path: Path, session: Session) -> int:
+        """Atomically (temp + rename) write a full session file. Returns record count."""
+        tmp = path.with_suffix(".jsonl.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            # Write metadata first
+            f.write(serde.dumps(serde.encode_session_header(session)) + "\n")
+
+            # Write messages
+            for msg in session.messages:
+                f.write(serde.dumps(msg.to_dict()) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return len(session.messages) + 1
+
+    # ========== Compaction ==========
+
+    def _compaction_due(self, key: str) -> bool:
+        stats = self._file_stats.get(key)
+        return stats is not None and stats[0] >= self.compact_min_records and stats[1] > stats[0] * self.compact_ratio
+
+    def _schedule_compaction(self, key: str) -> None:
+        """Queue a session file for background compaction."""
+        with self._locks_guard:
+            if key in self._compact_pending:
+                return
+            self._compact_pending.add(key)
+            if self._compactor is None or not self._compactor.is_alive():
+                self._compactor = threading.Thread(
+                    target=self._compaction_worker, name="session-compactor", daemon=True
+                )
+                self._compactor.start()
+        self._compact_queue.put(key)
+
+    def _compaction_worker(self) -> None:
+        while True:
+            key = self._compact_queue.get()
+            try:
+                if key is None:
+                    return
+                self._compact_until_done(key)
+            except Exception as e:
+                logger.warning(f"Failed to compact session {key}: {e}")
+            finally:
+                if key is not None:
+                    with self._locks_guard:
+                        self._compact_pending.discard(key)
+                self._compact_queue.task_done()
+
+    def _compact_until_done(self, key: str) -> None:
+        """
+        Compact a session if due, and again if saves made meanwhile crossed
+        the threshold (their requests were dropped while this one was pending).
+        Record counts of a file not read in full are taken first.
+        """
+        if key not in self._file_stats:
+            self._count_records(key)
+        while True:
+            with self._locks_guard:
+                if not self._compaction_due(key):
+                    self._compact_pending.discard(key)
+                    return
+            if not self.compact(key):
+                return
+
+    def _count_records(self, key: str) -> None:
+        path = self._get_session_path(key)
+        with self._lock_for(key):
+            if path.exists():
+                _, _, records, dead, since_trailer = self._read_records(path)
+                self._file_stats[key] = [records, dead]
+                self._since_trailer[key] = since_trailer
+
+    def compact(self, key: str) -> bool:
+        """
+        Rewrite a session file without superseded records.
+
+        Returns:
+            True if the file was rewritten.
+        """
+        path = self._get_session_path(key)
+        with self._lock_for(key):
+            if not path.exists():
+                return False
+            messages, metadata_record, records, dead, _ = self._read_records(path)
+            if not dead:
+                self._file_stats[key] = [records, 0]
+                return False
+
+            tmp = path.with_suffix(".jsonl.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                if metadata_record is not None:
+                    f.write(serde.dumps(metadata_record) + "\n")
+                for msg in messages:
+                    f.write(serde.dumps(msg.to_dict()) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+            self._file_stats[key] = [len(messages) + (metadata_record is not None), 0]
+            self._since_trailer[key] = None
+
+        logger.debug(f"Compacted session {key}: {records} -> {records - dead} records")
+        return True
+
+    def disk_usage(self, key: str | None = None) -> int:
+        if key is not None:
+            path = self._get_session_path(key)
+            return path.stat().st_size if path.exists() else 0
+        return sum(p.stat().st_size for p in self.sessions_dir.glob("*.jsonl"))
+
+    def compact_all(self) -> int:
+        """Compact every session file now."""
+        before = self.disk_usage()
+        for info in self.list_sessions():
+            self.compact(info["key"])
+        return before - self.disk_usage()
+
+    def close(self) -> None:
+        """Wait for pending compactions and stop the compactor thread."""
+        if self._compactor and self._compactor.is_alive():
+            self._compact_queue.put(None)
+            self._compactor.join()
+        self._compactor = None
+
+    def delete(self, key: str) -> bool:
+        """Delete a session file."""
+        self._file_stats.pop(key, None)
+        self._since_trailer.pop(key, None)
+        path = self._get_session_path(key)
+        with self._lock_for(key):
+            if path.exists():
+                path.unlink()
+                return True
+        return False
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """List sessions by reading the metadata line of every file."""
+        sessions = []
+
+        for path in self.sessions_dir.glob("*.jsonl"):
+            try:
+                # Read just the metadata line; the file mtime tracks appends
+                with open(path, encoding="utf-8") as f:
+                    first_line = f.readline().strip()
+                    if first_line:
+                        data = serde.loads(first_line)
+                        if data.get("_type") == "metadata":
+                            mtime = datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+                            sessions.append({
+                                # Files written before the key was recorded: channel names
+                                # have no underscores, so only the first one was a colon
+                                "key": data.get("key") or path.stem.replace("_", ":", 1),
+                                "created_at": data.get("created_at"),
+                                "updated_at": max(data.get("updated_at") or "", mtime),
+                                "path": str(path)
+                            })
+            except Exception:
+                continue
+
+        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
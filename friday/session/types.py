@@ -0,0 +1,60 @@
+"""Session types."""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from friday.session.message import Message
+
+
+@dataclass
+class Session:
+    """
+    A conversation session.
+
+    Persisted by a SessionStore (JSONL files or SQLite). Messages are compact
+    Message records that read like {"role", "content", "timestamp"} dicts.
+    """
+
+    key: str  # channel:chat_id
+    messages: list[Message] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+    metadata: dict[str, Any] = field(default_factory=dict)
+    # True when older messages exist in the store but are not loaded in `messages`
+    has_older: bool = False
+    # Persistence bookkeeping: messages already on disk, the last metadata written
+    # and whether the stored messages must be replaced (cleared since the last save)
+    _persisted: int = field(default=0, init=False, repr=False, compare=False)
+    _saved_metadata: str | None = field(default=None, init=False, repr=False, compare=False)
+    _cleared: bool = field(default=False, init=False, repr=False, compare=False)
+
+    def add_message(self, role: str, content: str, **kwargs: Any) -> None:
+        """Add a message to the session."""
+        now = datetime.now()
+        self.messages.append(Message(role, content, now, kwargs))
+        self.updated_at = now
+
+    def get_history(self, max_messages: int = 50) -> list[dict[str, Any]]:
+        """
+        Get message history for LLM context.
+
+        Args:
+            max_messages: Maximum messages to return.
+
+        Returns:
+            List of messages in LLM format.
+        """
+        # Get recent messages
+        recent = self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
+
+        # Convert to LLM format (just role and content)
+        return [m.to_llm() for m in recent]
+
+    def clear(self) -> None:
+        """Clear all messages in the session."""
+        self.messages = []
+        self.has_older = False
+        self.updated_at = datetime.now()
+        self._persisted = 0
+        self._cleared = True
@@ -59,6 +59,11 @@ def timestamp() -> str:
     return datetime.now().isoformat()
 
 
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of LLM tokens in a string (~4 chars per token)."""
+    return (len(text) + 3) // 4
+
+
 def truncate_string(s: str, max_len: int = 100, suffix: str = "...") -> str:
     """Truncate a string to max length, adding suffix if truncated."""
     if len(s) <= max_len:
@@ -0,0 +1,251 @@
+"""
+JSON serialization for sessions, the cron store, bus events, tool calls and
+LLM responses.
+
+Uses orjson when it is installed (pip install friday-ai[fast]) and the
+standard library otherwise. Both backends produce the same JSON values and
+accept the same inputs: anything orjson cannot encode (integers beyond 64
+bits, datetimes, dataclasses) falls back to the stdlib encoder, which
+encodes or rejects it as json.dumps() always did.
+"""
+
+import json
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from friday.bus.events import InboundMessage, OutboundMessage
+    from friday.cron.types import CronJob
+    from friday.providers.base import LLMResponse, ToolCallRequest
+    from friday.session.types import Session
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both backends
+JSONDecodeError = json.JSONDecodeError
+
+if orjson is not None:
+    # Match the stdlib: non-str keys become strings; datetimes and dataclasses are not
+    # serialized implicitly
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def dumps(obj: Any, sort_keys: bool = False, indent: bool = False) -> str:
+    """
+    Serialize to a JSON string (compact separators, UTF-8 text).
+
+    Args:
+        obj: Value to serialize.
+        sort_keys: Sort object keys (for stable comparisons).
+        indent: Indent with two spaces.
+    """
+    if orjson is not None:
+        option = _OPTIONS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(
+        obj,
+        sort_keys=sort_keys,
+        indent=2 if indent else None,
+        separators=(",", ": ") if indent else (",", ":"),
+        ensure_ascii=False,
+    )
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON text. Raises JSONDecodeError on invalid input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# ========== Sessions ==========
+
+def encode_session_header(session: "Session") -> dict[str, Any]:
+    """The metadata record that starts (and trails) a JSONL session file."""
+    return {
+        "_type": "metadata",
+        "key": session.key,
+        "created_at": session.created_at.isoformat(),
+        "updated_at": session.updated_at.isoformat(),
+        "metadata": session.metadata,
+    }
+
+
+def encode_session_lines(session: "Session", start: int = 0) -> list[str]:
+    """JSONL lines (without newlines) of a session's messages from `start` on."""
+    return [dumps(m.to_dict()) for m in session.messages[start:]]
+
+
+# ========== Cron ==========
+
+def encode_cron_job(job: "CronJob") -> dict[str, Any]:
+    """A cron job in the jobs.json format (camelCase keys)."""
+    return {
+        "id": job.id,
+        "name": job.name,
+        "enabled": job.enabled,
+        "schedule": {
+            "kind": job.schedule.kind,
+            "atMs": job.schedule.at_ms,
+            "everyMs": job.schedule.every_ms,
+            "expr": job.schedule.expr,
+            "tz": job.schedule.tz,
+        },
+        "payload": {
+            "kind": job.payload.kind,
+            "message": job.payload.message,
+            "deliver": job.payload.deliver,
+            "channel": job.payload.channel,
+            "to": job.payload.to,
+            "batch": job.payload.batch,
+            "noCache": job.payload.no_cache,
+        },
+        "state": {
+            "nextRunAtMs": job.state.next_run_at_ms,
+            "lastRunAtMs": job.state.last_run_at_ms,
+            "lastStatus": job.state.last_status,
+            "lastError": job.state.last_error,
+        },
+        "createdAtMs": job.created_at_ms,
+        "updatedAtMs": job.updated_at_ms,
+        "deleteAfterRun": job.delete_after_run,
+    }
+
+
+def decode_cron_job(data: dict[str, Any]) -> "CronJob":
+    """Inverse of encode_cron_job(); optional fields may be missing."""
+    from friday.cron.types import CronJob, CronJobState, CronPayload, CronSchedule
+
+    schedule = data["schedule"]
+    payload = data["payload"]
+    state = data.get("state", {})
+    return CronJob(
+        id=data["id"],
+        name=data["name"],
+        enabled=data.get("enabled", True),
+        schedule=CronSchedule(
+            kind=schedule["kind"],
+            at_ms=schedule.get("atMs"),
+            every_ms=schedule.get("everyMs"),
+            expr=schedule.get("expr"),
+            tz=schedule.get("tz"),
+        ),
+        payload=CronPayload(
+            kind=payload.get("kind", "agent_turn"),
+            message=payload.get("message", ""),
+            deliver=payload.get("deliver", False),
+            channel=payload.get("channel"),
+            to=payload.get("to"),
+            batch=payload.get("batch", False),
+            no_cache=payload.get("noCache", False),
+        ),
+        state=CronJobState(
+            next_run_at_ms=state.get("nextRunAtMs"),
+            last_run_at_ms=state.get("lastRunAtMs"),
+            last_status=state.get("lastStatus"),
+            last_error=state.get("lastError"),
+        ),
+        created_at_ms=data.get("createdAtMs", 0),
+        updated_at_ms=data.get("updatedAtMs", 0),
+        delete_after_run=data.get("deleteAfterRun", False),
+    )
+
+
+# ========== Bus events ==========
+
+def encode_inbound(msg: "InboundMessage") -> dict[str, Any]:
+    return {
+        "channel": msg.channel,
+        "sender_id": msg.sender_id,
+        "chat_id": msg.chat_id,
+        "content": msg.content,
+        "timestamp": msg.timestamp.isoformat(),
+        "media": msg.media,
+        "metadata": msg.metadata,
+    }
+
+
+def decode_inbound(data: dict[str, Any]) -> "InboundMessage":
+    from friday.bus.events import InboundMessage
+
+    return InboundMessage(
+        channel=data["channel"],
+        sender_id=data["sender_id"],
+        chat_id=data["chat_id"],
+        content=data["content"],
+        timestamp=datetime.fromisoformat(data["timestamp"]) if data.get("timestamp") else datetime.now(),
+        media=data.get("media") or [],
+        metadata=data.get("metadata") or {},
+    )
+
+
+def encode_outbound(msg: "OutboundMessage") -> dict[str, Any]:
+    return {
+        "channel": msg.channel,
+        "chat_id": msg.chat_id,
+        "content": msg.content,
+        "reply_to": msg.reply_to,
+        "media": msg.media,
+        "metadata": msg.metadata,
+    }
+
+
+def decode_outbound(data: dict[str, Any]) -> "OutboundMessage":
+    from friday.bus.events import OutboundMessage
+
+    return OutboundMessage(
+        channel=data["channel"],
+        chat_id=data["chat_id"],
+        content=data["content"],
+        reply_to=data.get("reply_to"),
+        media=data.get("media") or [],
+        metadata=data.get("metadata") or {},
+    )
+
+
+# ========== Tool calls ==========
+
+def encode_tool_call(tool_call: "ToolCallRequest") -> dict[str, Any]:
+    """A tool call in the OpenAI assistant-message format (arguments as a JSON string)."""
+    return {
+        "id": tool_call.id,
+        "type": "function",
+        "function": {
+            "name": tool_call.name,
+            "arguments": dumps(tool_call.arguments),
+        },
+    }
+
+
+def encode_llm_response(response: "LLMResponse") -> dict[str, Any]:
+    return {
+        "content": response.content,
+        "tool_calls": [
+            {"id": tc.id, "name": tc.name, "arguments": tc.arguments} for tc in response.tool_calls
+        ],
+        "finish_reason": response.finish_reason,
+        "usage": response.usage,
+    }
+
+
+def decode_llm_response(data: dict[str, Any]) -> "LLMResponse":
+    from friday.providers.base import LLMResponse, ToolCallRequest
+
+    return LLMResponse(
+        content=data.get("content"),
+        tool_calls=[ToolCallRequest(**tc) for tc in data.get("tool_calls", [])],
+        finish_reason=data.get("finish_reason", "stop"),
+        usage=data.get("usage", {}),
+    )
@@ -0,0 +1,132 @@
+import multiprocessing
+import sys
+from pathlib import Path
+
+import pytest
+
+from friday.bus.events import InboundMessage, OutboundMessage
+from friday.cluster import ClusterBus, ClusterState, HashRing, cron_claim_name
+from friday.cron.service import CronService, _compute_next_run, _now_ms
+from friday.cron.types import CronSchedule
+from friday.session.manager import SessionManager
+from friday.session.sqlite_store import SqliteSessionStore
+
+
+def test_ring_is_balanced_and_moves_only_departed_keys() -> None:
+    keys = [f"telegram:{i}" for i in range(3000)]
+    three = HashRing(["a", "b", "c"])
+    owners = {key: three.owner(key) for key in keys}
+    for node in "abc":
+        assert 600 < sum(o == node for o in owners.values()) < 1400
+
+    two = HashRing(["c", "a"])
+    moved = [key for key in keys if two.owner(key) != owners[key]]
+    assert moved and all(owners[key] == "b" for key in moved)
+
+
+def _claim_runs(path: str, owner: str, names: list[str], results) -> None:
+    state = ClusterState(Path(path))
+    results.put([name for name in names if state.acquire(name, owner, ttl_s=60)])
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses fork")
+def test_leases_are_won_by_exactly_one_process(tmp_path: Path) -> None:
+    ClusterState(tmp_path / "cluster.db").close()
+    names = [f"cron:job:{i}" for i in range(40)]
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=_claim_runs, args=(str(tmp_path / "cluster.db"), f"node{n}", names, results))
+        for n in range(4)
+    ]
+    for p in procs:
+        p.start()
+    won = [name for _ in procs for name in results.get(timeout=30)]
+    for p in procs:
+        p.join(timeout=30)
+    assert sorted(won) == sorted(names)
+
+
+async def test_messages_are_routed_to_the_owning_node(tmp_path: Path) -> None:
+    shared = tmp_path / "shared"
+    a = ClusterBus(ClusterState(shared / "cluster.db"), "node-a", shared_dir=shared)
+    b = ClusterBus(ClusterState(shared / "cluster.db"), "node-b", shared_dir=shared)
+    a.channels = ["telegram"]
+    for bus in (a, b, a):
+        bus.refresh()
+    assert a.ring.nodes == b.ring.nodes == ("node-a", "node-b")
+
+    chat_id = next(str(i) for i in range(100) if b.owns(f"telegram:{i}"))
+    photo = tmp_path / "local" / "photo.jpg"
+    photo.parent.mkdir()
+    photo.write_bytes(b"jpeg")
+    await a.publish_inbound(InboundMessage("telegram", "u1", chat_id, "hi", media=[str(photo)]))
+    assert a.inbound_size == 0 and await b.pump() == 1
+    msg = await b.consume_inbound()
+    assert msg.content == "hi" and Path(msg.media[0]).read_bytes() == b"jpeg"
+    assert Path(msg.media[0]).parent == shared / "media"
+
+    # b has no telegram connection: the reply goes through a
+    await b.publish_outbound(OutboundMessage("telegram", chat_id, "hello"))
+    assert b.outbound_size == 0 and await a.pump() == 1
+    assert (await a.consume_outbound()).content == "hello"
+
+    # a leaves: b owns everything and evicts nothing it still needs
+    a.state.leave("node-a")
+    moved = []
+    b.on_ownership_change = lambda: moved.append(True)
+    b.refresh()
+    assert b.ring.nodes == ("node-b",) and moved and b.owns("telegram:anything")
+
+
+async def test_due_cron_job_runs_on_one_node(tmp_path: Path) -> None:
+    runs = []
+
+    async def on_job(job) -> str:
+        runs.append(job.id)
+        return "ok"
+
+    def make(node: str) -> CronService:
+        state = ClusterState(tmp_path / "cluster.db")
+        return CronService(
+            tmp_path / "jobs.json", on_job=on_job,
+            claim=lambda job, now_ms: state.acquire(cron_claim_name(job, now_ms), node, 3600),
+        )
+
+    first, second = make("a"), make("b")
+    job = first.add_job("report", CronSchedule(kind="every", every_ms=3_600_000), "send it")
+    due = _now_ms() - 1  # The same scheduled run on both nodes
+    for service in (first, second):
+        stored, = service.list_jobs()
+        stored.state.next_run_at_ms = due
+        await service._on_timer()
+
+    assert runs == [job.id]
+    reloaded, = CronService(tmp_path / "jobs.json").list_jobs()
+    assert reloaded.state.last_status == "ok"
+
+
+def test_interval_runs_are_claimed_by_schedule_not_tick_time(tmp_path: Path) -> None:
+    job = CronService(tmp_path / "jobs.json").add_job("ping", CronSchedule(kind="every", every_ms=60_000), "ping")
+    a, = CronService(tmp_path / "jobs.json").list_jobs()
+    b, = CronService(tmp_path / "jobs.json").list_jobs()
+
+    # Nodes (re)compute the schedule at different times but land on the same grid
+    a.state.next_run_at_ms = _compute_next_run(a.schedule, job.created_at_ms + 59_999, a.created_at_ms)
+    b.state.next_run_at_ms = _compute_next_run(b.schedule, job.created_at_ms + 1, b.created_at_ms)
+    assert a.state.next_run_at_ms == b.state.next_run_at_ms == job.created_at_ms + 60_000
+
+    # Ticks on either side of an interval boundary claim the same run
+    due = a.state.next_run_at_ms
+    assert cron_claim_name(a, due + 10) == cron_claim_name(b, due + 59_995)
+
+
+def test_evict_writes_and_drops_a_session(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path, store=SqliteSessionStore(tmp_path / "sessions.db"), flush_interval_s=60)
+    session = manager.get_or_create("telegram:1")
+    session.add_message("user", "hi")
+    manager.save(session)
+
+    assert manager.evict("telegram:1") and not manager.is_cached("telegram:1")
+    assert [m["content"] for m in SqliteSessionStore(tmp_path / "sessions.db").load("telegram:1").messages] == ["hi"]
+    manager.close()
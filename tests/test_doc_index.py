@@ -0,0 +1,53 @@
+import os
+from pathlib import Path
+
+from friday.agent.tools.docs import SearchDocsTool
+from friday.retrieval.index import DocumentIndex
+
+
+def test_hybrid_search_returns_line_references(tmp_path: Path) -> None:
+    (tmp_path / "notes").mkdir()
+    (tmp_path / "notes" / "pricing.md").write_text(
+        "# Pricing\n\nGeneral intro.\n\nThe tile discount for Bangkok branch is 12 percent.\n"
+    )
+    (tmp_path / "todo.txt").write_text("Buy milk\nCall the plumber\n")
+    index = DocumentIndex(tmp_path, chunk_chars=40)
+
+    results = index.search("bangkok tile discount", top_k=2)
+
+    assert results[0].chunk.path == "notes/pricing.md"
+    assert "12 percent" in results[0].chunk.text
+    assert results[0].chunk.ref.startswith("notes/pricing.md:")
+    assert index.search("bangkok", path_prefix="todo.txt") == []
+
+
+def test_index_updates_incrementally(tmp_path: Path) -> None:
+    doc = tmp_path / "plan.md"
+    doc.write_text("Launch date is March\n")
+    index = DocumentIndex(tmp_path, refresh_interval_s=0)
+    assert index.refresh() == 1
+    assert index.refresh() == 0  # nothing changed -> nothing re-chunked
+
+    doc.write_text("Launch date moved to September\n")
+    os.utime(doc, ns=(doc.stat().st_mtime_ns + 10**9,) * 2)
+    assert "September" in index.search("launch date")[0].chunk.text
+
+    doc.unlink()
+    assert index.search("launch date") == []
+    assert len(index) == 0
+
+
+def test_private_memory_is_not_indexed(tmp_path: Path) -> None:
+    for rel in ("memory/MEMORY.md", "memory/users/alice/MEMORY.md", "memory/chats/42/MEMORY.md"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("The gate code is 4711\n")
+    index = DocumentIndex(tmp_path)
+
+    assert [r.chunk.path for r in index.search("gate code")] == ["memory/MEMORY.md"]
+
+
+async def test_search_docs_tool_formats_results(tmp_path: Path) -> None:
+    (tmp_path / "meeting.md").write_text("We decided to ship the beta on Friday.\n")
+    result = await SearchDocsTool(tmp_path).execute(query="when do we ship the beta")
+    assert "meeting.md:1-1" in result
+    assert "ship the beta" in result
@@ -0,0 +1,94 @@
+import threading
+import time
+from pathlib import Path
+
+from friday.agent.tools.history import SearchHistoryTool
+from friday.session.manager import SessionManager
+from friday.session.search import HistoryIndex
+from friday.session.store import JsonlSessionStore
+
+
+def _manager(tmp_path: Path) -> SessionManager:
+    return SessionManager(
+        tmp_path, store=JsonlSessionStore(tmp_path / "sessions"), index=HistoryIndex(tmp_path / "index.db"),
+    )
+
+
+def test_saved_messages_are_searchable(tmp_path: Path) -> None:
+    manager = _manager(tmp_path)
+    session = manager.get_or_create("telegram:42")
+    session.add_message("user", "Let's use Postgres for the billing service")
+    session.add_message("assistant", "Agreed, Postgres it is.")
+    manager.save(session)
+    other = manager.get_or_create("telegram:7")
+    other.add_message("user", "postgres backups are failing")
+    manager.save(other)
+
+    hits = manager.index.search("postgres billing")
+    assert [h.session_key for h in hits] == ["telegram:42"]
+    assert "**Postgres**" in hits[0].snippet and hits[0].timestamp
+
+    # No message has both words -> falls back to any word
+    assert len(manager.index.search("billing backups")) == 2
+    assert [h.session_key for h in manager.index.search("postgres", session_key="telegram:7")] == ["telegram:7"]
+
+    session.clear()
+    manager.save(session)
+    assert [h.session_key for h in manager.index.search("postgres")] == ["telegram:7"]
+    manager.delete("telegram:7")
+    assert manager.index.count() == 0
+
+
+def test_backfill_indexes_existing_sessions_once(tmp_path: Path) -> None:
+    store = JsonlSessionStore(tmp_path / "sessions")
+    legacy = SessionManager(tmp_path, store=store)
+    session = legacy.get_or_create("cli:old")
+    session.add_message("user", "the wifi password is in the drawer")
+    legacy.save(session)
+
+    index = HistoryIndex(tmp_path / "index.db")
+    assert index.backfill(store) == 1
+    assert index.backfill(store) == 0
+    assert index.search("wifi drawer")[0].session_key == "cli:old"
+
+
+async def test_tool_is_scoped_to_the_current_chat(tmp_path: Path) -> None:
+    manager = _manager(tmp_path)
+    for key in ("telegram:42", "telegram:7"):
+        session = manager.get_or_create(key)
+        session.add_message("user", f"secret launch date for {key}")
+        manager.save(session)
+
+    tool = SearchHistoryTool(manager.index)
+    tool.set_context("telegram", "42")
+    result = await tool.execute(query="launch date", scope="all")
+    assert "telegram:42" in result and "telegram:7" not in result
+    assert "scope" not in tool.parameters["properties"]
+
+    tool = SearchHistoryTool(manager.index, allow_all_chats=True)
+    tool.set_context("telegram", "42")
+    assert "telegram:7" in await tool.execute(query="launch date", scope="all")
+
+
+def test_backfill_does_not_overwrite_live_adds(tmp_path: Path) -> None:
+    index = HistoryIndex(tmp_path / "index.db")
+    live: list[threading.Thread] = []
+
+    class RacingStore(JsonlSessionStore):
+        def load(self, key: str, limit: int | None = None):
+            session = super().load(key, limit)
+            # A message saved and indexed live right after the backfill read the session
+            live.append(threading.Thread(target=index.add, args=(key, [{"role": "user", "content": "fresh tulips"}])))
+            live[-1].start()
+            time.sleep(0.05)
+            return session
+
+    store = RacingStore(tmp_path / "sessions")
+    session = SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "sessions")).get_or_create("cli:old")
+    session.add_message("user", "old roses")
+    store.save(session)
+
+    assert index.backfill(store) == 1
+    live[0].join()
+    assert [h.session_key for h in index.search("tulips")] == ["cli:old"]
+    assert [h.session_key for h in index.search("roses")] == ["cli:old"]
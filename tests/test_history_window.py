@@ -0,0 +1,103 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from friday.agent.history import SUMMARY_KEY, RollingHistory, history_budget
+from friday.agent.loop import AgentLoop
+from friday.bus.queue import MessageBus
+from friday.config.schema import HistoryConfig
+from friday.providers.base import LLMProvider, LLMResponse
+from friday.session.manager import SessionManager
+from friday.session.store import JsonlSessionStore
+from friday.session.types import Session
+
+
+class SummaryProvider(LLMProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.prompts: list[str] = []
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.prompts.append(messages[-1]["content"])
+        return LLMResponse(content=f"- summary #{len(self.prompts)}")
+
+    def get_default_model(self) -> str:
+        return "fake"
+
+
+def _session(n: int, chars: int = 400) -> Session:
+    session = Session(key="cli:test")
+    for i in range(n):
+        session.add_message("user" if i % 2 == 0 else "assistant", f"m{i} " + "x" * chars)
+    return session
+
+
+def test_window_fills_token_budget_newest_first() -> None:
+    history = RollingHistory(token_budget=1000)
+    window = history.build(_session(40))
+
+    assert window.tokens <= 1000
+    assert len(window.messages) == 9  # ~105 tokens per message
+    assert window.messages[-1]["content"].startswith("m39 ")
+    assert set(window.messages[0]) == {"role", "content"}
+
+
+def test_history_budget_prefers_longest_keyword() -> None:
+    budgets = {"gpt-4o": 20000, "gpt-4o-mini": 4000}
+    assert history_budget("openai/gpt-4o-mini", 12000, budgets) == 4000
+    assert history_budget("openai/gpt-4o", 12000, budgets) == 20000
+    assert history_budget("anthropic/claude-opus-4-5", 12000, budgets) == 12000
+
+
+async def test_folded_turns_move_into_rolling_summary() -> None:
+    provider = SummaryProvider()
+    history = RollingHistory(provider=provider, token_budget=1000, min_fold_messages=4)
+    session = _session(40)
+    saved: list[Session] = []
+
+    history.schedule(session, saved.append)
+    await history.wait()
+
+    summary = session.metadata[SUMMARY_KEY]
+    assert saved == [session] and summary["text"] == "- summary #1"
+    assert summary["messages"] == 33  # everything outside the 750-token fold window
+    assert "m0 " in provider.prompts[0] and "m39 " not in provider.prompts[0]
+
+    # Prompt size stays flat: summary + window within budget, and nothing new to fold
+    window = history.build(session)
+    assert window.summary == "- summary #1" and window.tokens <= 1000
+    assert history.pending(session) == []
+
+    for i in range(40, 46):
+        session.add_message("user", f"m{i} " + "x" * 400)
+    await history.update(session)
+    assert "m33 " in provider.prompts[1] and "m0 " not in provider.prompts[1]
+
+
+async def test_extractive_summary_without_provider_is_capped() -> None:
+    history = RollingHistory(token_budget=500, max_summary_chars=300)
+    session = _session(30)
+
+    assert await history.update(session)
+    text = session.metadata[SUMMARY_KEY]["text"]
+    assert len(text) <= 300
+    assert text.splitlines()[-1].startswith("- ")
+
+
+async def test_shutdown_waits_for_running_folds(tmp_path: Path) -> None:
+    class SlowSummaryProvider(SummaryProvider):
+        async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+            if messages[-1]["content"].startswith("Update the running summary"):
+                await asyncio.sleep(0.05)
+                return await super().chat(messages, **kwargs)
+            return LLMResponse(content="ok")
+
+    sessions = SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "sessions"))
+    loop = AgentLoop(MessageBus(), SlowSummaryProvider(), tmp_path, session_manager=sessions,
+                     history_config=HistoryConfig(token_budget=1000))
+    sessions.get_or_create("cli:direct").messages.extend(_session(40).messages)
+    await loop.process_direct("one more")  # Schedules a fold
+    await loop.aclose()
+
+    stored = JsonlSessionStore(tmp_path / "sessions").load("cli:direct")
+    assert stored.metadata[SUMMARY_KEY]["text"] == "- summary #1"
@@ -0,0 +1,167 @@
+import asyncio
+import itertools
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from friday.agent.loop import AgentLoop
+from friday.bus.queue import MessageBus
+from friday.cron.service import CronService, _now_ms
+from friday.cron.types import CronJob, CronSchedule
+from friday.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from friday.providers.batch import BatchingProvider, OpenAIBatchClient
+from friday.providers.context import call_context
+from friday.providers.openai_compat import HTTPClientPool, OpenAICompatProvider
+from friday.session.manager import SessionManager
+from friday.session.store import JsonlSessionStore
+from friday.utils import serde
+
+
+class StandInBatchAPI:
+    """A local stand-in for the OpenAI /files and /batches endpoints."""
+
+    def __init__(self, polls_until_done: int = 1, available: bool = True) -> None:
+        self.polls_until_done = polls_until_done
+        self.available = available
+        self.files: dict[str, bytes] = {}
+        self.batches: dict[str, dict[str, Any]] = {}
+        self.submitted: list[list[dict[str, Any]]] = []
+        self._ids = itertools.count(1)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if not self.available:
+            return httpx.Response(404, json={"error": {"message": "Not found"}})
+        path = request.url.path.removeprefix("/v1")
+        if path == "/files" and request.method == "POST":
+            content = request.content
+            jsonl = content[content.index(b"{"):content.rindex(b"}") + 1]
+            file_id = f"file-{next(self._ids)}"
+            self.files[file_id] = jsonl
+            return httpx.Response(200, json={"id": file_id})
+        if path == "/batches":
+            jsonl = self.files[serde.loads(request.content)["input_file_id"]]
+            lines = [serde.loads(line) for line in jsonl.splitlines()]
+            self.submitted.append(lines)
+            batch_id = f"batch-{next(self._ids)}"
+            self.batches[batch_id] = {"id": batch_id, "status": "in_progress", "polls": 0, "lines": lines}
+            return httpx.Response(200, json={"id": batch_id, "status": "in_progress"})
+        if path.startswith("/batches/"):
+            batch = self.batches[path.split("/")[2]]
+            batch["polls"] += 1
+            if batch["polls"] < self.polls_until_done:
+                return httpx.Response(200, json={"id": batch["id"], "status": "in_progress"})
+            output_id = f"file-{next(self._ids)}"
+            self.files[output_id] = b"\n".join(serde.dumps({
+                "custom_id": line["custom_id"],
+                "response": {"status_code": 200, "body": {
+                    "choices": [{"message": {"content": f"batched {line['body']['messages'][-1]['content']}"},
+                                 "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": 10, "completion_tokens": 3, "total_tokens": 13},
+                }},
+            }).encode() for line in batch["lines"])
+            return httpx.Response(200, json={"id": batch["id"], "status": "completed", "output_file_id": output_id})
+        if path.startswith("/files/") and path.endswith("/content"):
+            return httpx.Response(200, content=self.files[path.split("/")[2]])
+        return httpx.Response(404)
+
+
+class LiveProvider(LLMProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[str] = []
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.calls.append(messages[-1]["content"])
+        return LLMResponse(content=f"live {messages[-1]['content']}")
+
+    def get_default_model(self) -> str:
+        return "openai/gpt-4o-mini"
+
+
+def _batching(api: StandInBatchAPI, live: LiveProvider) -> BatchingProvider:
+    pool = HTTPClientPool()
+    pool._client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+    client = OpenAIBatchClient(OpenAICompatProvider(
+        "sk-test", "https://llm.test/v1", "openai/gpt-4o-mini", pool=pool, strip_prefixes=("openai/",), name="openai",
+    ))
+    return BatchingProvider(live, client, window_s=0.05, poll_interval_s=0.01, timeout_s=5)
+
+
+async def test_first_calls_of_batch_turns_are_submitted_together() -> None:
+    api, live = StandInBatchAPI(polls_until_done=3), LiveProvider()
+    provider = _batching(api, live)
+
+    async def turn(job: str) -> list[str]:
+        with call_context(source="cron", job_id=job, batch_turn=f"{job}:1"):
+            first = await provider.chat([{"role": "user", "content": job}])
+            second = await provider.chat([{"role": "user", "content": f"{job} again"}])
+        return [first.content, second.content]
+
+    results = await asyncio.gather(*(turn(f"job{i}") for i in range(3)))
+    interactive = await provider.chat([{"role": "user", "content": "hello"}])
+
+    assert len(api.submitted) == 1
+    assert sorted(line["custom_id"] for line in api.submitted[0]) == ["job0:1", "job1:1", "job2:1"]
+    assert api.submitted[0][0]["body"]["model"] == "gpt-4o-mini"
+    assert results == [[f"batched job{i}", f"live job{i} again"] for i in range(3)]
+    assert interactive.content == "live hello"
+    assert provider.stats["batched"] == 3 and provider.stats["fallbacks"] == 0
+
+
+async def test_unavailable_batch_api_falls_back_to_live_calls() -> None:
+    live = LiveProvider()
+    provider = _batching(StandInBatchAPI(available=False), live)
+
+    with call_context(source="cron", batch_turn="job0:1"):
+        response = await provider.chat([{"role": "user", "content": "report"}])
+    assert response.content == "live report"
+    assert live.calls == ["report"] and provider.stats["fallbacks"] == 1
+
+
+async def test_batch_jobs_run_in_the_background(tmp_path: Path) -> None:
+    release = asyncio.Event()
+    started: list[str] = []
+
+    async def on_job(job: CronJob) -> str:
+        started.append(job.name)
+        await release.wait()
+        return "ok"
+
+    service = CronService(tmp_path / "jobs.json", on_job=on_job)
+    for name in ("a", "b"):
+        service.add_job(name, CronSchedule(kind="every", every_ms=3_600_000), "report", batch=True)
+    for job in service.list_jobs():
+        job.state.next_run_at_ms = _now_ms() - 1
+
+    await asyncio.wait_for(service._on_timer(), 1)  # Does not wait for the jobs
+    await asyncio.sleep(0)
+    assert sorted(started) == ["a", "b"]
+    assert all(job.state.next_run_at_ms > _now_ms() for job in service.list_jobs())
+
+    release.set()
+    await asyncio.gather(*service._background)
+    assert [job.state.last_status for job in CronService(tmp_path / "jobs.json").list_jobs()] == ["ok", "ok"]
+
+
+async def test_concurrent_turns_keep_their_own_tool_context(tmp_path: Path) -> None:
+    class ReportingProvider(LiveProvider):
+        async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+            if messages[-1]["role"] == "tool":
+                return LLMResponse(content="done")
+            job = messages[-1]["content"]
+            await asyncio.sleep(0.05 if job == "a" else 0)  # "a" resumes after "b" has started
+            return LLMResponse(content=None, tool_calls=[
+                ToolCallRequest(id="1", name="message", arguments={"content": f"report {job}"}),
+            ])
+
+    bus = MessageBus()
+    sessions = SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "sessions"))
+    loop = AgentLoop(bus, ReportingProvider(), tmp_path, session_manager=sessions)
+    await asyncio.gather(
+        loop.process_direct("a", session_key="cron:a", channel="telegram", chat_id="chat-a"),
+        loop.process_direct("b", session_key="cron:b", channel="telegram", chat_id="chat-b"),
+    )
+    sent = sorted((m.chat_id, m.content) for m in [await bus.consume_outbound() for _ in range(2)])
+    assert sent == [("chat-a", "report a"), ("chat-b", "report b")]
+    await loop.aclose()
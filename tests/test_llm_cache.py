@@ -0,0 +1,117 @@
+import asyncio
+import datetime
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from friday.agent.loop import AgentLoop
+from friday.bus.queue import MessageBus
+from friday.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from friday.providers.cache import CachingProvider, ResponseCache, cache_key
+from friday.providers.context import call_context, current_call, task_context
+from friday.session.manager import SessionManager
+from friday.session.store import JsonlSessionStore
+
+
+class CountingProvider(LLMProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(
+            content=f"answer {self.calls}",
+            tool_calls=[ToolCallRequest("call_1", "read_file", {"path": "HEARTBEAT.md"})],
+            usage={"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+        )
+
+    def get_default_model(self) -> str:
+        return "m"
+
+
+MESSAGES = [{"role": "system", "content": "sys"}, {"role": "user", "content": "check HEARTBEAT.md"}]
+
+
+def test_cache_key_is_canonical() -> None:
+    key = cache_key("m", [{"role": "user", "content": "x"}], None, 100, 0.2)
+    assert key == cache_key("m", [{"content": "x", "role": "user"}], [], 100, 0.2)
+    assert key != cache_key("m", [{"role": "user", "content": "x"}], None, 100, 0.7)
+    assert key != cache_key("other", [{"role": "user", "content": "x"}], None, 100, 0.2)
+    assert cache_key("m", [{"role": "user", "content": object()}], None, 100, 0.2) is None
+
+
+async def test_background_turns_are_answered_from_the_cache(tmp_path: Path) -> None:
+    inner = CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "cache.db"))
+
+    await provider.chat(MESSAGES)
+    await provider.chat(MESSAGES)
+    assert inner.calls == 2  # Interactive turns are never cached
+
+    with call_context(source="heartbeat"):
+        first = await provider.chat(MESSAGES)
+        second = await provider.chat(MESSAGES)
+        assert current_call().source == "heartbeat"
+    assert current_call().source == "user"
+    assert inner.calls == 3 and not first.cached and second.cached
+    assert second.content == first.content and second.tool_calls == first.tool_calls and second.usage == first.usage
+
+    async def subagent() -> LLMResponse:
+        return await provider.chat(MESSAGES, temperature=0.1)
+
+    await asyncio.create_task(subagent(), context=task_context(source="subagent"))
+    with call_context(source="heartbeat", bypass_cache=True):
+        refreshed = await provider.chat(MESSAGES)
+    assert inner.calls == 5 and refreshed.content == "answer 5" and not refreshed.cached
+
+    stats = provider.cache.stats()
+    assert stats["entries"] == 2
+    assert stats["sources"]["heartbeat"] == {"hits": 1, "misses": 1, "bypassed": 1, "hit_rate": 0.5}
+    assert stats["sources"]["subagent"]["misses"] == 1
+
+
+async def test_runs_of_a_cron_job_a_minute_apart_hit_the_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    class AnsweringProvider(CountingProvider):
+        async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+            self.calls += 1
+            return LLMResponse(content=f"answer {self.calls}")
+
+    inner = AnsweringProvider()
+    sessions = SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "sessions"))
+    loop = AgentLoop(
+        MessageBus(), CachingProvider(inner, ResponseCache(tmp_path / "cache.db")), tmp_path, session_manager=sessions
+    )
+    replies = []
+    for minute in (0, 1):
+        class Clock(datetime.datetime):
+            @classmethod
+            def now(cls, tz: Any = None) -> datetime.datetime:
+                return datetime.datetime(2026, 3, 2, 9, minute, tzinfo=tz)
+
+        monkeypatch.setattr(datetime, "datetime", Clock)
+        with call_context(source="cron", job_id="j1"):
+            replies.append(await loop.process_direct("Summarize the open issues", channel="cli", chat_id="j1"))
+    monkeypatch.undo()
+
+    # The second run carries the first one in its history and a later clock
+    assert len(loop.sessions.get_or_create("cli:j1").messages) == 4
+    assert replies == ["answer 1", "answer 1"] and inner.calls == 1
+    await loop.aclose()
+
+
+def test_entries_expire_and_are_evicted_by_size(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "cache.db", ttl_s=60, max_bytes=2000)
+    for i in range(10):
+        cache.put(f"k{i}", "m", LLMResponse(content="x" * 300))
+        cache.get("k0")  # Keep k0 recently used
+    assert cache.stats()["bytes"] <= 2000
+    assert cache.get("k0") is not None and cache.get("k1") is None and cache.get("k9") is not None
+
+    cache.ttl_s = 0
+    time.sleep(0.01)
+    assert cache.get("k9") is None
+    reopened = ResponseCache(tmp_path / "cache.db")
+    assert reopened.stats()["bytes"] == cache.stats()["bytes"]
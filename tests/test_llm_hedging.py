@@ -0,0 +1,76 @@
+import asyncio
+from typing import Any
+
+from friday.providers.base import LLMProvider, LLMResponse
+from friday.providers.hedging import HedgedProvider, LatencyTracker
+
+
+class SleepyProvider(LLMProvider):
+    def __init__(self, name: str, delays: list[float], fail: bool = False):
+        super().__init__()
+        self.name = name
+        self.delays = delays
+        self.fail = fail
+        self.models: list[str | None] = []
+        self.cancelled = 0
+
+    async def chat(self, messages: list[dict[str, Any]], model: str | None = None, **kwargs: Any) -> LLMResponse:
+        self.models.append(model)
+        try:
+            await asyncio.sleep(self.delays.pop(0) if self.delays else 0)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return LLMResponse(content=self.name)
+
+    def get_default_model(self) -> str:
+        return "main"
+
+
+def _hedged(primary: SleepyProvider, secondary: SleepyProvider, **kwargs: Any) -> HedgedProvider:
+    options = {"initial_delay_s": 0.05, "min_delay_s": 0.01, "budget_ratio": 0.0, "burst": 1.0}
+    return HedgedProvider(primary, secondary, **{**options, **kwargs})
+
+
+async def test_slow_requests_are_hedged_and_the_loser_cancelled() -> None:
+    primary = SleepyProvider("primary", [0, 5])
+    secondary = SleepyProvider("secondary", [0])
+    provider = _hedged(primary, secondary, secondary_model="fast")
+
+    assert (await provider.chat([])).content == "primary"
+    assert secondary.models == []
+
+    assert (await provider.chat([])).content == "secondary"
+    await asyncio.sleep(0)
+    assert secondary.models == ["fast"] and primary.cancelled == 1
+    stats = provider.stats.as_dict()
+    assert stats["requests"] == 2 and stats["hedged"] == 1 and stats["hedge_wins"] == 1
+    assert stats["by_model"]["main"] == {"requests": 2, "hedged": 1, "hedge_wins": 1}
+
+
+async def test_budget_caps_hedges_and_failed_hedges_fall_back() -> None:
+    primary = SleepyProvider("primary", [0.1, 0.1])
+    secondary = SleepyProvider("secondary", [0], fail=True)
+    provider = _hedged(primary, secondary)
+
+    assert (await provider.chat([])).content == "primary"  # The hedge failed, the primary still answers
+    assert (await provider.chat([])).content == "primary"  # Budget spent: no second hedge
+    assert secondary.models == ["main"]
+    assert provider.stats.hedged == 1 and provider.stats.hedge_wins == 0 and provider.stats.budget_denied == 1
+
+
+def test_delay_follows_the_latency_percentile() -> None:
+    tracker = LatencyTracker(min_samples=10)
+    provider = HedgedProvider(
+        SleepyProvider("a", []), SleepyProvider("b", []), tracker=tracker,
+        initial_delay_s=7, min_delay_s=0.5, max_delay_s=30,
+    )
+    assert provider.hedge_delay("main") == 7
+    for i in range(1, 101):
+        tracker.record("main", i / 10)
+    assert provider.hedge_delay("main") == 9.6  # p95 of 0.1..10.0 s
+    for _ in range(200):
+        tracker.record("main", 0.01)
+    assert provider.hedge_delay("main") == 0.5
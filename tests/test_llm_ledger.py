@@ -0,0 +1,127 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from friday.providers.base import LLMProvider, LLMResponse
+from friday.providers.context import call_context
+from friday.providers.errors import BudgetExceededError, OverloadedError
+from friday.providers.hedging import HedgedProvider
+from friday.providers.ledger import Budget, LedgerProvider, UsageLedger, period_start
+from friday.providers.resilient import ProviderRoute, ResilientProvider, RetryPolicy
+
+
+class PricedProvider(LLMProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.models: list[str] = []
+
+    async def chat(self, messages: list[dict[str, Any]], model: str | None = None, **kwargs: Any) -> LLMResponse:
+        self.models.append(model)
+        return LLMResponse(
+            content="ok",
+            usage={"prompt_tokens": 1_000_000, "completion_tokens": 100_000, "total_tokens": 1_100_000,
+                   "cached_tokens": 500_000},
+        )
+
+    def get_default_model(self) -> str:
+        return "anthropic/claude-sonnet-4"
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+async def test_usage_is_attributed_and_batched(tmp_path: Path) -> None:
+    ledger = UsageLedger(tmp_path / "usage.db", flush_every=3)
+    provider = LedgerProvider(PricedProvider(), ledger)
+
+    with call_context(source="user", session_key="telegram:42", channel="telegram"):
+        await provider.chat(MESSAGES)
+    with call_context(source="cron", job_id="job1"):
+        await provider.chat(MESSAGES)
+    assert ledger._conn.execute("SELECT COUNT(*) FROM usage").fetchone()[0] == 0  # Still batched
+    with call_context(source="subagent", session_key="telegram:42", channel="telegram", subagent_id="sub1"):
+        await provider.chat(MESSAGES, model="deepseek/deepseek-chat")
+    assert ledger._conn.execute("SELECT COUNT(*) FROM usage").fetchone()[0] == 3
+
+    today = period_start("day")
+    # 500k uncached + 500k cached at 10% of $3/M, 100k at $15/M
+    sonnet = 0.5 * 3 + 0.5 * 3 * 0.1 + 0.1 * 15
+    assert ledger.spend("job", "job1", today) == pytest.approx(sonnet)
+    by_session = {r["key"]: r for r in ledger.summary(today, "session")}
+    assert by_session["telegram:42"]["calls"] == 2
+    assert by_session["telegram:42"]["cached_tokens"] == 1_000_000
+    assert {r["key"] for r in ledger.summary(today, "model")} == {"anthropic/claude-sonnet-4", "deepseek/deepseek-chat"}
+    assert ledger.summary(today, "total")[0]["calls"] == 3
+    ledger.close()
+
+
+async def test_budgets_degrade_then_refuse(tmp_path: Path) -> None:
+    ledger = UsageLedger(tmp_path / "usage.db")
+    inner = PricedProvider()
+    provider = LedgerProvider(inner, ledger, budgets={
+        "session": Budget(usd=3.0, action="degrade", degrade_to="deepseek/deepseek-chat"),
+        "session:telegram:vip": Budget(usd=100.0),
+        "job": Budget(usd=1.0),
+    })
+
+    with call_context(session_key="telegram:42"):
+        for _ in range(3):
+            await provider.chat(MESSAGES)
+    # $3.15 after the first call: the rest go to the cheaper model
+    assert inner.models == ["anthropic/claude-sonnet-4", "deepseek/deepseek-chat", "deepseek/deepseek-chat"]
+
+    with call_context(session_key="telegram:vip"):
+        await provider.chat(MESSAGES)
+        await provider.chat(MESSAGES)
+    assert inner.models[-1] == "anthropic/claude-sonnet-4"  # Its own, larger budget
+
+    with call_context(source="cron", job_id="job1"):
+        await provider.chat(MESSAGES)
+        with pytest.raises(BudgetExceededError):
+            await provider.chat(MESSAGES)
+
+    # Totals survive a restart
+    ledger.close()
+    reopened = UsageLedger(tmp_path / "usage.db")
+    assert reopened.spend("session", "telegram:vip", period_start("day")) == pytest.approx(2 * 3.15)
+    reopened.close()
+
+
+class DownProvider(LLMProvider):
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        raise OverloadedError("overloaded")
+
+    def get_default_model(self) -> str:
+        return "anthropic/claude-sonnet-4"
+
+
+class SlowProvider(PricedProvider):
+    async def chat(self, messages: list[dict[str, Any]], model: str | None = None, **kwargs: Any) -> LLMResponse:
+        await asyncio.sleep(5)
+        return await super().chat(messages, model=model, **kwargs)
+
+
+async def test_failover_and_hedges_are_priced_at_the_serving_models(tmp_path: Path) -> None:
+    ledger = UsageLedger(tmp_path / "usage.db")
+    failover = ResilientProvider(
+        [ProviderRoute("anthropic", DownProvider()), ProviderRoute("deepseek", PricedProvider(), "deepseek/deepseek-chat")],
+        retry=RetryPolicy(max_attempts=1),
+    )
+    hedged = HedgedProvider(SlowProvider(), PricedProvider(), secondary_model="openai/gpt-4o-mini",
+                            initial_delay_s=0.01, min_delay_s=0.01)
+
+    with call_context(session_key="cli:a"):
+        await LedgerProvider(failover, ledger).chat(MESSAGES)
+    with call_context(session_key="cli:b"):
+        await LedgerProvider(hedged, ledger).chat(MESSAGES)
+    ledger.flush()
+
+    rows = ledger._conn.execute("SELECT session_key, model, prompt_tokens, completion_tokens FROM usage").fetchall()
+    assert sorted(rows) == [
+        ("cli:a", "deepseek/deepseek-chat", 1_000_000, 100_000),
+        ("cli:b", "anthropic/claude-sonnet-4", 1_000_000, 0),  # The cancelled primary's prompt
+        ("cli:b", "openai/gpt-4o-mini", 1_000_000, 100_000),
+    ]
+    ledger.close()
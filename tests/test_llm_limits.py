@@ -0,0 +1,79 @@
+import asyncio
+from typing import Any
+
+from friday.providers.base import LLMProvider, LLMResponse
+from friday.providers.context import call_context
+from friday.providers.limits import (
+    AdmissionController,
+    Limits,
+    RateLimitedProvider,
+    RateLimiter,
+    TokenBucket,
+)
+
+
+class UsageProvider(LLMProvider):
+    def __init__(self, total_tokens: int | None):
+        super().__init__()
+        self.total_tokens = total_tokens
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        usage = {"total_tokens": self.total_tokens} if self.total_tokens is not None else {}
+        return LLMResponse(content="ok", usage=usage)
+
+    def get_default_model(self) -> str:
+        return "anthropic/claude-sonnet"
+
+
+def test_token_bucket_refills_and_carries_debt() -> None:
+    now = [0.0]
+    bucket = TokenBucket(600, period_s=60, clock=lambda: now[0])  # 10 tokens/s
+    bucket.take(600)
+    assert bucket.wait_time(50) == 5.0
+    bucket.take(100)  # Reconciled upwards: 100 tokens of debt
+    now[0] = 10
+    assert bucket.level == 0 and bucket.wait_time(10_000) == 60.0
+    bucket.take(-1000)
+    assert bucket.level == 600  # Refunds never exceed capacity
+
+
+async def test_interactive_turns_are_admitted_before_background_work() -> None:
+    controller = AdmissionController(Limits(max_concurrent=1))
+    await controller.acquire(10, priority=1)
+    order: list[str] = []
+
+    async def wait(name: str, priority: int) -> None:
+        await controller.acquire(10, priority)
+        order.append(name)
+        await controller.release(10)
+
+    background = asyncio.create_task(wait("cron", 1))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(wait("user", 0))
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(wait("gone", 0))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await controller.release(10)
+    await asyncio.gather(background, interactive, return_exceptions=True)
+
+    assert order == ["user", "cron"]
+    assert controller.active == 0 and controller.stats.admitted == 3 and controller.stats.queued == 2
+
+
+async def test_token_reservations_are_reconciled_from_usage() -> None:
+    limiter = RateLimiter({"anthropic": Limits(tokens_per_minute=6000), "claude-sonnet": Limits(tokens_per_minute=6000)})
+    assert limiter.controller("openai/gpt-4o") is None
+    assert limiter.controller("anthropic/claude-sonnet") is limiter.controller("openrouter/claude-sonnet-4")
+
+    reported = RateLimitedProvider(UsageProvider(total_tokens=20), RateLimiter({"anthropic": Limits(tokens_per_minute=6000)}))
+    for _ in range(3):
+        response = await reported.chat([{"role": "user", "content": "hi"}], max_tokens=3000)
+        assert response.queue_wait_s < 0.05
+
+    unreported = RateLimitedProvider(UsageProvider(total_tokens=None), RateLimiter({"anthropic": Limits(tokens_per_minute=6000)}))
+    with call_context(source="cron"):
+        await unreported.chat([{"role": "user", "content": "hi"}], max_tokens=3000)
+        response = await unreported.chat([{"role": "user", "content": "hi"}], max_tokens=3000)
+    assert 0.01 < response.queue_wait_s < 1
+    assert unreported.limiter.stats()["anthropic"]["queued"] == 1
@@ -0,0 +1,153 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from friday.providers.base import LLMProvider, LLMResponse
+from friday.providers.errors import (
+    AllProvidersFailedError,
+    AuthenticationError,
+    BadRequestError,
+    LLMTimeoutError,
+    OverloadedError,
+    RateLimitError,
+    classify_error,
+)
+from friday.providers.resilient import CircuitBreaker, ProviderRoute, ResilientProvider, RetryPolicy
+
+
+class ScriptedProvider(LLMProvider):
+    """Raises or answers from a script, one entry per call."""
+
+    def __init__(self, name: str, script: list[Any]):
+        super().__init__()
+        self.name = name
+        self.script = script
+        self.models: list[str | None] = []
+
+    async def chat(self, messages: list[dict[str, Any]], model: str | None = None, **kwargs: Any) -> LLMResponse:
+        self.models.append(model)
+        step = self.script.pop(0) if self.script else "ok"
+        if isinstance(step, Exception):
+            raise step
+        return LLMResponse(content=f"{self.name}: {step}")
+
+    def get_default_model(self) -> str:
+        return f"{self.name}-default"
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code: int, headers: dict[str, str] | None = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = type("Response", (), {"status_code": status_code, "headers": headers or {}})()
+
+
+def _resilient(*providers: ScriptedProvider, models: tuple[str | None, ...] = (), **kwargs: Any) -> tuple[ResilientProvider, list[float]]:
+    sleeps: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    routes = [ProviderRoute(p.name, p, models[i] if i < len(models) else None) for i, p in enumerate(providers)]
+    return ResilientProvider(routes, sleep=sleep, **kwargs), sleeps
+
+
+def test_provider_exceptions_are_classified() -> None:
+    assert isinstance(classify_error(HTTPError(429, {"retry-after": "3"})), RateLimitError)
+    assert classify_error(HTTPError(429, {"retry-after": "3"})).retry_after == 3.0
+    assert isinstance(classify_error(HTTPError(529)), OverloadedError)
+    assert isinstance(classify_error(HTTPError(401)), AuthenticationError)
+    assert isinstance(classify_error(HTTPError(400)), BadRequestError)
+    assert isinstance(classify_error(TimeoutError()), LLMTimeoutError)
+
+    class ContextWindowExceededError(Exception):
+        pass
+
+    error = classify_error(ContextWindowExceededError("too long"), provider="anthropic", model="m")
+    assert isinstance(error, BadRequestError) and not error.failover and error.provider == "anthropic"
+
+
+async def test_transient_errors_are_retried_with_backoff() -> None:
+    primary = ScriptedProvider("anthropic", [HTTPError(529), HTTPError(429, {"retry-after": "2"}), "answer"])
+    provider, sleeps = _resilient(primary, retry=RetryPolicy(max_attempts=3, base_delay_s=0.5, max_delay_s=8))
+
+    response = await provider.chat([{"role": "user", "content": "hi"}], model="anthropic/claude")
+
+    assert response.content == "anthropic: answer"
+    assert primary.models == ["anthropic/claude"] * 3
+    assert len(sleeps) == 2 and 0 <= sleeps[0] <= 0.5 and sleeps[1] >= 2
+    assert provider.stats()["anthropic"] == {"state": "closed", "failures": 0}
+
+
+async def test_failover_follows_the_chain_and_breakers_skip_dead_providers() -> None:
+    primary = ScriptedProvider("anthropic", [HTTPError(503)] * 10)
+    backup = ScriptedProvider("openrouter", [])
+    provider, _ = _resilient(
+        primary, backup, models=(None, "openrouter/anthropic/claude"),
+        retry=RetryPolicy(max_attempts=2), breaker_failures=3,
+    )
+
+    first = await provider.chat([{"role": "user", "content": "hi"}], model="anthropic/claude")
+    assert first.content == "openrouter: ok" and backup.models == ["openrouter/anthropic/claude"]
+
+    await provider.chat([{"role": "user", "content": "hi"}], model="anthropic/claude")
+    assert len(primary.models) == 3  # The breaker opened on the third failure
+    await provider.chat([{"role": "user", "content": "hi"}], model="anthropic/claude")
+    assert len(primary.models) == 3 and provider.stats()["anthropic"]["state"] == "open"
+
+
+async def test_invalid_requests_fail_fast_and_exhaustion_is_typed() -> None:
+    primary = ScriptedProvider("anthropic", [HTTPError(400)])
+    backup = ScriptedProvider("deepseek", [])
+    provider, sleeps = _resilient(primary, backup)
+    with pytest.raises(BadRequestError):
+        await provider.chat([{"role": "user", "content": "hi"}])
+    assert backup.models == [] and sleeps == []
+
+    dead = ScriptedProvider("anthropic", [HTTPError(401)])
+    provider, _ = _resilient(dead, ScriptedProvider("deepseek", [HTTPError(500)] * 3))
+    with pytest.raises(AllProvidersFailedError) as info:
+        await provider.chat([{"role": "user", "content": "hi"}])
+    assert [type(e) for e in info.value.errors][:2] == [AuthenticationError, type(classify_error(HTTPError(500)))]
+    assert [e.provider for e in info.value.errors] == ["anthropic", "deepseek", "deepseek", "deepseek"]
+
+
+def test_breaker_lets_one_probe_through_after_the_reset_timeout() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=10, clock=lambda: now[0])
+    assert not breaker.record_failure() and breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    now[0] = 10
+    assert breaker.allow() and not breaker.allow()  # One probe at a time
+    assert breaker.record_failure() and breaker.state == "open"
+
+    now[0] = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+async def test_cancelled_probe_does_not_leave_the_breaker_stuck() -> None:
+    hang = asyncio.Event()
+
+    class HangingProvider(ScriptedProvider):
+        async def chat(self, messages: list[dict[str, Any]], model: str | None = None, **kwargs: Any) -> LLMResponse:
+            if not hang.is_set():
+                await asyncio.Event().wait()
+            return await super().chat(messages, model=model, **kwargs)
+
+    provider, _ = _resilient(HangingProvider("anthropic", []), breaker_failures=1, breaker_reset_s=0)
+    breaker = provider.breakers["anthropic"]
+    breaker.record_failure()  # Open; half-open right away (reset 0s)
+
+    probe = asyncio.create_task(provider.chat([{"role": "user", "content": "hi"}]))
+    await asyncio.sleep(0)
+    probe.cancel()  # E.g. a hedge won on the other provider
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    hang.set()  # The provider recovered
+    assert (await provider.chat([{"role": "user", "content": "hi"}])).content == "anthropic: ok"
+    assert breaker.state == "closed"
@@ -0,0 +1,93 @@
+from typing import Any
+
+import pytest
+
+from friday.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from friday.providers.context import call_context
+from friday.providers.errors import OverloadedError
+from friday.providers.pricing import estimate_cost, model_price
+from friday.providers.routing import RouteRule, RoutingProvider, call_features, estimate_difficulty
+
+TOOLS = [{"type": "function", "function": {"name": "read_file", "parameters": {}}}]
+
+
+class ModelProvider(LLMProvider):
+    """Answers per model from a table of responses (or exceptions)."""
+
+    def __init__(self, answers: dict[str, Any]):
+        super().__init__()
+        self.answers = answers
+        self.models: list[str | None] = []
+
+    async def chat(self, messages: list[dict[str, Any]], model: str | None = None, **kwargs: Any) -> LLMResponse:
+        self.models.append(model)
+        answer = self.answers.get(model, LLMResponse(content=f"from {model}"))
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    def get_default_model(self) -> str:
+        return "anthropic/claude-opus-4-5"
+
+
+def _user(text: str) -> list[dict[str, Any]]:
+    return [{"role": "system", "content": "sys"}, {"role": "user", "content": text}]
+
+
+def test_features_score_difficulty_and_tool_needs() -> None:
+    assert estimate_difficulty(_user("hi")) < 0.1
+    assert estimate_difficulty(_user("Please debug this:\n```\nTraceback ...\n```")) >= 0.6
+
+    with call_context(source="heartbeat", channel="telegram"):
+        features = call_features(_user("thanks!"), TOOLS, 1000)
+    assert features.source == "heartbeat" and features.channel == "telegram"
+    assert not features.needs_tools and 0 < features.prompt_tokens < 50
+    assert call_features(_user("read the file notes.md"), TOOLS, 1000).needs_tools
+    assert not call_features(_user("read the file notes.md"), None, 1000).needs_tools
+    assert call_features([*_user("ok"), {"role": "tool", "content": "..."}], TOOLS, 1000).needs_tools
+
+
+async def test_rules_route_by_source_and_record_spend() -> None:
+    inner = ModelProvider({"anthropic/claude-haiku-4-5": LLMResponse(
+        content="HEARTBEAT_OK", usage={"prompt_tokens": 1_000_000, "completion_tokens": 0},
+    )})
+    provider = RoutingProvider(inner, [
+        RouteRule("heartbeat", "anthropic/claude-haiku-4-5", sources=["heartbeat"]),
+        RouteRule("short", "deepseek/deepseek-chat", max_difficulty=0.2, tools="no"),
+    ])
+
+    with call_context(source="heartbeat"):
+        assert (await provider.chat(_user("check HEARTBEAT.md"), TOOLS)).content == "HEARTBEAT_OK"
+    await provider.chat(_user("thanks!"), TOOLS)
+    await provider.chat(_user("Design a migration plan for our database"), TOOLS)
+
+    assert inner.models == ["anthropic/claude-haiku-4-5", "deepseek/deepseek-chat", "anthropic/claude-opus-4-5"]
+    assert provider.stats["heartbeat"].cost_usd == pytest.approx(1.0)
+    assert {name: s.calls for name, s in provider.stats.items()} == {"heartbeat": 1, "short": 1, "default": 1}
+
+
+async def test_failed_cheap_calls_escalate() -> None:
+    rules = [RouteRule("cheap", "cheap", escalate_to="strong")]
+    cases = {
+        "empty": LLMResponse(content="  "),
+        "unknown tool": LLMResponse(content=None, tool_calls=[ToolCallRequest("1", "rm_rf", {})]),
+        "bad arguments": LLMResponse(content=None, tool_calls=[ToolCallRequest("1", "read_file", {"raw": "{path:"})]),
+        "error": OverloadedError("busy"),
+    }
+    for answer in cases.values():
+        inner = ModelProvider({"cheap": answer})
+        provider = RoutingProvider(inner, rules)
+        assert (await provider.chat(_user("hi"), TOOLS)).content == "from strong"
+        assert inner.models == ["cheap", "strong"] and provider.stats["cheap"].escalations == 1
+
+    good = ModelProvider({"cheap": LLMResponse(content=None, tool_calls=[ToolCallRequest("1", "read_file", {"path": "a"})])})
+    assert (await RoutingProvider(good, rules).chat(_user("hi"), TOOLS)).has_tool_calls
+    assert good.models == ["cheap"]
+
+
+def test_prices_match_the_longest_keyword() -> None:
+    assert model_price("anthropic/claude-opus-4-5") == (5.0, 25.0)
+    assert model_price("anthropic/claude-opus-4-1") == (15.0, 75.0)
+    assert model_price("hosted_vllm/my-model") is None
+    assert model_price("hosted_vllm/my-model", {"my-model": (1.0, 1.0)}) == (1.0, 1.0)
+    assert estimate_cost("gpt-4o", 1_000_000, 100_000, cached_tokens=500_000) == pytest.approx(1.25 + 0.125 + 1.0)
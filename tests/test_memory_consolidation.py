@@ -0,0 +1,77 @@
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+from friday.agent.consolidation import MemoryConsolidator
+from friday.agent.memory import MemoryStore
+from friday.providers.base import LLMProvider, LLMResponse
+
+
+class BatchSummaryProvider(LLMProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.calls += 1
+        prompt = messages[-1]["content"]
+        keys = [line[4:-4] for line in prompt.splitlines() if line.startswith("=== ") and line.endswith(" ===")]
+        return LLMResponse(content="\n".join(f"=== {k} ===\n- digest of {k}" for k in keys if k != "2026-W41"))
+
+    def get_default_model(self) -> str:
+        return "fake"
+
+
+def _write_days(store: MemoryStore, start: date, n: int) -> None:
+    for i in range(n):
+        day = start + timedelta(days=i)
+        (store.memory_dir / f"{day:%Y-%m-%d}.md").write_text(f"# {day}\n\n- note {i}\n" + "filler\n" * 50)
+
+
+async def test_rolls_daily_notes_into_capped_weekly_digests(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    _write_days(store, date(2026, 9, 28), 21)  # 2026-W40 .. 2026-W42
+    provider = BatchSummaryProvider()
+    consolidator = MemoryConsolidator(store, provider=provider, keep_days=7, keep_weeks=52,
+                                      max_digest_chars=200, batch_size=8)
+
+    report = await consolidator.run(today=date(2026, 10, 26))
+
+    assert provider.calls == 1  # all weeks summarized in a single batched call
+    assert sorted(report.weekly) == ["2026-W40", "2026-W41", "2026-W42"]
+    assert [p.stem for p in store.list_memory_files()] == []  # all older than 7 days -> archived
+    assert report.archived == 21
+    w40 = (store.digests_dir / "weekly" / "2026-W40.md").read_text()
+    assert "digest of 2026-W40" in w40
+    # W41 missing from the LLM reply -> extractive fallback, hard-capped
+    w41 = (store.digests_dir / "weekly" / "2026-W41.md").read_text()
+    assert len(w41) <= 200 + len("# Week 2026-W41\n\n") + 3
+    assert report.notes_tokens_after < report.notes_tokens_before
+
+
+async def test_rolls_old_weekly_digests_into_monthly(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    _write_days(store, date(2026, 8, 3), 7)
+    consolidator = MemoryConsolidator(store, keep_days=7, keep_weeks=4)
+
+    report = await consolidator.run(today=date(2026, 10, 19))
+
+    assert report.monthly == ["2026-08"]
+    assert store.list_digests("weekly") == []
+    assert "note 0" in (store.digests_dir / "monthly" / "2026-08.md").read_text()
+
+
+def test_prune_long_term_drops_duplicates_and_superseded(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    store.write_long_term(
+        "# Memory\n\n## User\n\n- Timezone: UTC+7\n- Likes tea\n- likes  tea\n- Timezone: UTC+1\n"
+        "\n## Projects\n\n- Timezone: not a user fact\n"
+    )
+
+    removed = MemoryConsolidator(store).prune_long_term()
+
+    text = store.read_long_term()
+    assert removed == 2
+    assert "UTC+7" not in text and "UTC+1" in text
+    assert text.count("tea") == 1
+    assert "not a user fact" in text
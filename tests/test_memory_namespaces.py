@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from friday.agent.context import ContextBuilder
+from friday.agent.memory import MemoryStore, memory_namespaces
+
+
+def test_namespaces_for_direct_and_group_chats() -> None:
+    assert memory_namespaces("telegram", "42", "42|alice") == ["global", "user:telegram:42"]
+    assert memory_namespaces("whatsapp", "66812@s.whatsapp.net", "66812") == ["global", "user:whatsapp:66812"]
+    assert memory_namespaces("telegram", "-100", "42|alice") == [
+        "global", "user:telegram:42", "chat:telegram:-100",
+    ]
+
+
+def test_namespace_storage_is_isolated(tmp_path: Path) -> None:
+    MemoryStore(tmp_path).write_long_term("shared fact")
+    MemoryStore(tmp_path, "user:telegram:42").write_long_term("alice fact")
+    MemoryStore(tmp_path, "user:telegram:7").write_long_term("bob fact")
+
+    assert MemoryStore(tmp_path, "user:telegram:42").memory_dir == tmp_path / "memory" / "users" / "telegram" / "42"
+    assert MemoryStore(tmp_path).list_memory_files() == []
+    assert [s.namespace for s in MemoryStore.list_namespaces(tmp_path)] == [
+        "global", "user:telegram:42", "user:telegram:7",
+    ]
+    # Reading a namespace that was never written creates nothing on disk
+    assert MemoryStore(tmp_path, "chat:telegram:-1").read_long_term() == ""
+    assert not (tmp_path / "memory" / "chats").exists()
+
+
+def test_prompt_only_includes_relevant_namespaces(tmp_path: Path) -> None:
+    builder = ContextBuilder(tmp_path)
+    builder.memory.write_long_term("shared fact")
+    MemoryStore(tmp_path, "user:telegram:42").write_long_term("alice fact")
+    MemoryStore(tmp_path, "user:telegram:7").write_long_term("bob fact")
+
+    messages = builder.build_messages([], "hi", channel="telegram", chat_id="42", sender_id="42|alice")
+
+    prompt = messages[0]["content"]
+    assert "shared fact" in prompt and "alice fact" in prompt
+    assert "bob fact" not in prompt
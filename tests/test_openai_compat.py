@@ -0,0 +1,79 @@
+import subprocess
+import sys
+
+import httpx
+import pytest
+
+from friday.providers.errors import RateLimitError
+from friday.providers.openai_compat import HTTPClientPool, OpenAICompatProvider
+from friday.utils import serde
+
+
+def _provider(handler) -> OpenAICompatProvider:
+    pool = HTTPClientPool()
+    pool._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return OpenAICompatProvider(
+        "sk-test", "https://llm.test/v1/", "openrouter/anthropic/claude-sonnet-4",
+        pool=pool, strip_prefixes=("openrouter/",), name="openrouter",
+    )
+
+
+async def test_chat_parses_tool_calls_and_usage() -> None:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={
+            "choices": [{
+                "message": {
+                    "content": None,
+                    "tool_calls": [{"id": "c1", "type": "function",
+                                    "function": {"name": "read_file", "arguments": '{"path": "a.txt"}'}}],
+                },
+                "finish_reason": "tool_calls",
+            }],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 5, "total_tokens": 105,
+                      "prompt_tokens_details": {"cached_tokens": 80}},
+        })
+
+    provider = _provider(handler)
+    tools = [{"type": "function", "function": {"name": "read_file", "parameters": {}}}]
+    response = await provider.chat([{"role": "user", "content": "hi"}], tools=tools, max_tokens=64)
+
+    body = serde.loads(requests[0].content)
+    assert str(requests[0].url) == "https://llm.test/v1/chat/completions"
+    assert requests[0].headers["Authorization"] == "Bearer sk-test"
+    assert body["model"] == "anthropic/claude-sonnet-4"
+    assert body["max_tokens"] == 64 and body["tool_choice"] == "auto"
+    assert response.finish_reason == "tool_calls"
+    assert response.tool_calls[0].name == "read_file"
+    assert response.tool_calls[0].arguments == {"path": "a.txt"}
+    assert response.usage == {"prompt_tokens": 100, "completion_tokens": 5, "total_tokens": 105, "cached_tokens": 80}
+
+
+async def test_http_errors_are_classified() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, headers={"Retry-After": "7"}, json={"error": {"message": "slow down"}})
+
+    with pytest.raises(RateLimitError) as info:
+        await _provider(handler).chat([{"role": "user", "content": "hi"}])
+    assert info.value.retryable
+    assert info.value.retry_after == 7
+    assert info.value.provider == "openrouter"
+    assert "slow down" in str(info.value)
+
+
+def test_native_clients_do_not_import_litellm() -> None:
+    code = (
+        "import sys\n"
+        "from friday.config.schema import Config, FailoverTarget\n"
+        "from friday.cli.commands import _make_provider\n"
+        "config = Config()\n"
+        "config.providers.openrouter.api_key = 'sk-or-test'\n"
+        "config.llm.failover = [FailoverTarget(provider='deepseek', model='deepseek/deepseek-chat')]\n"
+        "config.providers.deepseek.api_key = 'sk-ds'\n"
+        "_make_provider(config, cache=False)\n"
+        "print('litellm' in sys.modules)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,77 @@
+from typing import Any
+
+from friday.cli.commands import _make_provider_pool
+from friday.config.schema import Config, ModelSettingsConfig
+from friday.providers.base import LLMProvider, LLMResponse
+from friday.providers.openai_compat import OpenAICompatProvider
+from friday.providers.pool import ModelSettings, ProviderPool
+
+
+class RecordingProvider(LLMProvider):
+    def __init__(self, name: str) -> None:
+        super().__init__(api_key=f"key-{name}")
+        self.name = name
+        self.calls: list[dict[str, Any]] = []
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.calls.append(kwargs)
+        return LLMResponse(content=self.name)
+
+    def get_default_model(self) -> str:
+        return "a/default"
+
+
+async def test_models_go_to_their_endpoint_resolved_once() -> None:
+    created: list[str] = []
+    resolved: list[str] = []
+
+    def factory(name: str):
+        def make() -> LLMProvider | None:
+            created.append(name)
+            return RecordingProvider(name) if name != "missing" else None
+        return make
+
+    def resolve(model: str) -> str | None:
+        resolved.append(model)
+        return model.split("/", 1)[0] if "/" in model else None
+
+    pool = ProviderPool(
+        {name: factory(name) for name in ("a", "b", "missing")},
+        resolve=resolve,
+        default_endpoint="a",
+        default_model="a/default",
+        settings={"b/": ModelSettings(max_tokens=1000), "b/kimi": ModelSettings(max_tokens=2000, temperature=1.0)},
+    )
+    assert created == ["a"]  # Other endpoints are created when first needed
+
+    for _ in range(3):
+        assert (await pool.chat([], model="b/small", max_tokens=8192)).content == "b"
+    assert (await pool.chat([], model="b/kimi", max_tokens=8192, temperature=0.2)).content == "b"
+    assert (await pool.chat([], model="missing/x")).content == "a"
+    assert (await pool.chat([])).content == "a"
+
+    assert created == ["a", "b", "missing"]
+    assert resolved == ["b/small", "b/kimi", "missing/x", "a/default"]
+    b = pool.clients["b"]
+    assert b.calls[0]["max_tokens"] == 1000 and b.calls[0]["temperature"] == 0.7
+    assert b.calls[-1]["max_tokens"] == 2000 and b.calls[-1]["temperature"] == 1.0
+
+
+def test_config_pool_keeps_each_provider_isolated() -> None:
+    config = Config()
+    config.agents.defaults.model = "openrouter/anthropic/claude-sonnet-4"
+    config.providers.openrouter.api_key = "sk-or-test"
+    config.providers.deepseek.api_key = "sk-deepseek"
+    config.llm.models = {"deepseek": ModelSettingsConfig(max_tokens=4096)}
+
+    pool = _make_provider_pool(config)
+    default = pool.resolve("openrouter/anthropic/claude-sonnet-4")
+    deepseek = pool.resolve("deepseek/deepseek-chat")
+
+    assert isinstance(default.client, OpenAICompatProvider) and isinstance(deepseek.client, OpenAICompatProvider)
+    assert (default.endpoint, default.client.api_key) == ("openrouter", "sk-or-test")
+    assert (deepseek.endpoint, deepseek.client.api_key) == ("deepseek", "sk-deepseek")
+    assert deepseek.client.api_base == "https://api.deepseek.com/v1"
+    assert deepseek.client.wire_model("deepseek/deepseek-chat") == "deepseek-chat"
+    assert deepseek.settings.max_tokens == 4096
+    assert default.client.pool is deepseek.client.pool  # One connection pool for all native clients
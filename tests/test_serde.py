@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from friday.bus.events import InboundMessage, OutboundMessage
+from friday.cron.service import CronService
+from friday.cron.types import CronSchedule
+from friday.session.store import JsonlSessionStore
+from friday.utils import serde
+
+
+@pytest.fixture(params=["fast", "stdlib"])
+def backend(request, monkeypatch) -> str:
+    if request.param == "stdlib":
+        monkeypatch.setattr(serde, "orjson", None)
+    elif serde.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def test_backends_agree_with_json(backend: str) -> None:
+    value = {"b": [1, 2.5, None, True], "a": "héllo ✓", 3: {"nested": "x"}, "big": 2**70}
+    assert json.loads(serde.dumps(value)) == json.loads(json.dumps(value))
+    assert serde.dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+    assert serde.loads(b'{"x": [1]}') == serde.loads('{"x":[1]}') == {"x": [1]}
+    with pytest.raises(serde.JSONDecodeError):
+        serde.loads('{"torn": ')
+    with pytest.raises(TypeError):
+        serde.dumps({"when": object()})
+
+
+def test_cron_store_round_trip(tmp_path: Path, backend: str) -> None:
+    service = CronService(tmp_path / "jobs.json")
+    service.add_job(name="daily", schedule=CronSchedule(kind="cron", expr="0 9 * * *"), message="report",
+                        no_cache=True)
+    job, = CronService(tmp_path / "jobs.json").list_jobs()
+    assert job.name == "daily" and job.schedule.expr == "0 9 * * *" and job.payload.message == "report"
+    assert job.payload.no_cache
+    assert serde.decode_cron_job(serde.encode_cron_job(job)) == job
+
+
+def test_bus_events_round_trip() -> None:
+    inbound = InboundMessage("telegram", "42|alice", "42", "hi", media=["a.jpg"], metadata={"id": 7})
+    outbound = OutboundMessage("telegram", "42", "hello", reply_to="7")
+    assert serde.decode_inbound(serde.loads(serde.dumps(serde.encode_inbound(inbound)))) == inbound
+    assert serde.decode_outbound(serde.loads(serde.dumps(serde.encode_outbound(outbound)))) == outbound
+
+
+def test_jsonl_store_reads_files_written_by_json_dumps(tmp_path: Path, backend: str) -> None:
+    path = tmp_path / "cli_old.jsonl"
+    records = [
+        {"_type": "metadata", "key": "cli:old", "created_at": "2025-01-01T10:00:00", "metadata": {}},
+        {"role": "user", "content": "hi", "timestamp": "2025-01-01T10:00:01"},
+        {"_type": "metadata", "key": "cli:old", "created_at": "2025-01-01T10:00:00", "metadata": {"n": 1}},
+    ]
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+    store = JsonlSessionStore(tmp_path)
+    session = store.load("cli:old", limit=10)
+    assert session.metadata == {"n": 1} and [m["content"] for m in session.messages] == ["hi"]
+    session.add_message("assistant", "hello ✓")
+    session.metadata["n"] = 2
+    store.save(session)
+    reloaded = store.load("cli:old", limit=10)
+    assert reloaded.metadata == {"n": 2} and reloaded.messages[-1]["content"] == "hello ✓"
@@ -0,0 +1,126 @@
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from friday.cron.maintenance import MaintenanceJobs
+from friday.cron.service import CronService
+from friday.cron.types import CronJob, CronPayload, CronSchedule
+from friday.session.archive import ARCHIVE_EVENT, ARCHIVE_JOB_NAME, SessionArchive, SessionArchiver
+from friday.session.manager import SessionManager
+from friday.session.search import HistoryIndex
+from friday.session.sqlite_store import SqliteSessionStore
+from friday.session.store import JsonlSessionStore
+
+
+def _make_manager(tmp_path: Path, store=None) -> SessionManager:
+    return SessionManager(
+        tmp_path,
+        store=store or JsonlSessionStore(tmp_path / "sessions"),
+        index=HistoryIndex(tmp_path / "index.db"),
+        archive=SessionArchive(tmp_path / "archive"),
+    )
+
+
+def test_idle_session_is_archived_and_rehydrated(tmp_path: Path) -> None:
+    manager = _make_manager(tmp_path)
+    session = manager.get_or_create("telegram:1")
+    for i in range(150):
+        session.add_message("user", f"message {i}")
+    session.metadata["lang"] = "en"
+    manager.save(session)
+    manager.close()
+
+    manager = _make_manager(tmp_path)
+    report = SessionArchiver(manager, manager.archive, idle_days=30).run(datetime.now() + timedelta(days=31))
+    assert report.archived == 1 and report.bytes_after < report.bytes_before
+    assert manager.list_sessions() == []
+    assert manager.archive.contains("telegram:1")
+    # Archived messages remain searchable
+    assert manager.index.search("message 7", session_key="telegram:1")
+
+    session = manager.get_or_create("telegram:1")
+    assert not manager.archive.contains("telegram:1")
+    assert session.metadata == {"lang": "en"} and session.has_older
+    manager.load_older(session, limit=1000)
+    assert [m["content"] for m in session.messages] == [f"message {i}" for i in range(150)]
+    manager.close()
+
+
+def test_idle_sessions_are_archived_even_when_cached(tmp_path: Path) -> None:
+    manager = _make_manager(tmp_path, store=SqliteSessionStore(tmp_path / "sessions.db"))
+    active = manager.get_or_create("cli:active")
+    active.add_message("user", "still here")
+    manager.save(active)
+    active.metadata["lang"] = "en"  # Unsaved
+
+    archiver = SessionArchiver(manager, manager.archive, idle_days=30)
+    assert archiver.run().archived == 0
+    assert [s["key"] for s in manager.list_sessions()] == ["cli:active"] and manager.is_cached("cli:active")
+
+    assert archiver.run(datetime.now() + timedelta(days=31)).archived == 1
+    assert not manager.is_cached("cli:active") and manager.list_sessions() == []
+    assert manager.archive.read("cli:active").metadata == {"lang": "en"}
+    manager.close()
+
+
+def test_retention_prunes_archives_and_index(tmp_path: Path) -> None:
+    manager = _make_manager(tmp_path)
+    archive = manager.archive
+    session = manager.get_or_create("cli:old")
+    session.add_message("user", "ancient history")
+    manager.save(session)
+    manager.close()
+
+    manager = _make_manager(tmp_path)
+    archiver = SessionArchiver(manager, archive, idle_days=30, retention_days=365)
+    archiver.run(datetime.now() + timedelta(days=31))
+    assert archiver.stats()["archived_sessions"] == 1
+
+    (path, _), = archive.entries()
+    old = (datetime.now() - timedelta(days=400)).timestamp()
+    os.utime(path, (old, old))
+    assert archiver.prune() == 1
+    assert archiver.stats() == {"archived_sessions": 0, "archived_bytes": 0}
+    assert manager.index.search("ancient") == []
+    manager.close()
+
+
+def test_compact_all_reclaims_dead_records(tmp_path: Path) -> None:
+    store = JsonlSessionStore(tmp_path / "sessions", compact_ratio=10.0)
+    manager = SessionManager(tmp_path, store=store)
+    session = manager.get_or_create("cli:a")
+    for i in range(20):
+        session.metadata["n"] = i
+        session.add_message("user", f"m{i}")
+        manager.save(session)
+
+    before = store.disk_usage()
+    assert store.compact_all() > 0
+    assert store.disk_usage() < before
+    assert len(store.load("cli:a").messages) == 20
+    manager.close()
+
+
+async def test_maintenance_jobs_are_registered_once_and_dispatched(tmp_path: Path) -> None:
+    cron = CronService(tmp_path / "jobs.json")
+    runs: list[str] = []
+
+    async def archive() -> str:
+        runs.append("archive")
+        return "archived 0"
+
+    for _ in range(2):
+        job = MaintenanceJobs(cron).register(ARCHIVE_EVENT, ARCHIVE_JOB_NAME, "30 3 * * *", archive)
+    maintenance = MaintenanceJobs(cron)
+    assert maintenance.register("memory.consolidate", "memory-consolidation", "0 3 * * *", archive,
+                                schedule=False) is None
+    maintenance.register(ARCHIVE_EVENT, ARCHIVE_JOB_NAME, "30 3 * * *", archive)
+
+    assert [j.name for j in cron.list_jobs()] == [ARCHIVE_JOB_NAME]
+    assert await maintenance.run(job) == "archived 0" and runs == ["archive"]
+    unknown = CronJob(id="x", name="x", schedule=CronSchedule(kind="every", every_ms=1000),
+                      payload=CronPayload(kind="system_event", message="nope"))
+    with pytest.raises(ValueError, match="nope"):
+        await maintenance.run(unknown)
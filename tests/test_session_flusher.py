@@ -0,0 +1,110 @@
+import time
+from pathlib import Path
+
+from friday.session.manager import SessionManager
+from friday.session.search import HistoryIndex
+from friday.session.sqlite_store import SqliteSessionStore
+from friday.session.store import JsonlSessionStore
+
+
+class CountingStore(JsonlSessionStore):
+    def __init__(self, sessions_dir: Path) -> None:
+        super().__init__(sessions_dir)
+        self.writes = 0
+
+    def save(self, session) -> None:
+        self.writes += 1
+        super().save(session)
+
+
+def test_repeated_saves_coalesce_into_one_write(tmp_path: Path) -> None:
+    store = CountingStore(tmp_path / "sessions")
+    manager = SessionManager(tmp_path, store=store, flush_interval_s=60)
+    session = manager.get_or_create("cli:a")
+    for i in range(5):
+        session.add_message("user", f"m{i}")
+        session.metadata["n"] = i
+        manager.save(session)
+
+    assert store.writes == 0 and manager.stats()["queue_depth"] == 1
+    manager.close()
+
+    stats = manager.stats()
+    assert store.writes == 1 and stats["coalesced"] == 4 and stats["queue_depth"] == 0
+    loaded = JsonlSessionStore(tmp_path / "sessions").load("cli:a")
+    assert [m["content"] for m in loaded.messages] == [f"m{i}" for i in range(5)]
+    assert loaded.metadata == {"n": 4}
+
+
+def test_failed_writes_are_retried(tmp_path: Path) -> None:
+    class FlakyStore(JsonlSessionStore):
+        fail = True
+
+        def save(self, session) -> None:
+            if self.fail:
+                raise OSError("disk full")
+            super().save(session)
+
+    store = FlakyStore(tmp_path / "sessions")
+    manager = SessionManager(tmp_path, store=store, flush_interval_s=60)
+    session = manager.get_or_create("cli:f")
+    session.add_message("user", "first")
+    manager.save(session)
+    manager.flush()
+    assert manager.stats()["failed"] == 1 and manager.stats()["queue_depth"] == 1
+
+    session.add_message("user", "second")
+    manager.save(session)
+    store.fail = False
+    manager.close()
+
+    loaded = JsonlSessionStore(tmp_path / "sessions").load("cli:f")
+    assert [m["content"] for m in loaded.messages] == ["first", "second"]
+
+
+def test_clear_after_queued_appends_rewrites(tmp_path: Path) -> None:
+    store = SqliteSessionStore(tmp_path / "sessions.db")
+    manager = SessionManager(tmp_path, store=store, flush_interval_s=60,
+                             index=HistoryIndex(tmp_path / "index.db"))
+    session = manager.get_or_create("cli:b")
+    session.add_message("user", "old words")
+    manager.save(session)
+    manager.flush()
+    session.add_message("user", "more old words")
+    manager.save(session)
+    session.clear()
+    session.add_message("user", "fresh start")
+    manager.save(session)
+    session.add_message("assistant", "ok")
+    manager.save(session)
+    manager.flush()
+
+    assert [m["content"] for m in store.load("cli:b").messages] == ["fresh start", "ok"]
+    assert manager.index.search("old") == []
+    manager.close()
+
+
+def test_store_reads_see_queued_changes(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "s"), flush_interval_s=60, max_sessions=1)
+    a = manager.get_or_create("cli:a")
+    a.add_message("user", "hello")
+    manager.save(a)
+    manager.get_or_create("cli:b")  # evicts cli:a while its write is still queued
+
+    again = manager.get_or_create("cli:a")
+    assert again is not a and [m["content"] for m in again.messages] == ["hello"]
+    manager.close()
+
+
+def test_background_thread_flushes_without_close(tmp_path: Path) -> None:
+    store = CountingStore(tmp_path / "sessions")
+    manager = SessionManager(tmp_path, store=store, flush_interval_s=0.01)
+    session = manager.get_or_create("cli:c")
+    session.add_message("user", "hi")
+    manager.save(session)
+
+    deadline = time.monotonic() + 5
+    while manager.stats()["batches"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert store.writes == 1 and manager.stats()["written"] == 1
+    manager.close()
@@ -0,0 +1,188 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from friday.session import store as store_module
+from friday.session.manager import SessionManager
+from friday.session.sqlite_store import SqliteSessionStore
+from friday.session.store import JsonlSessionStore
+
+
+@pytest.fixture
+def manager(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> SessionManager:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return SessionManager(tmp_path / "workspace")
+
+
+def _records(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+def test_save_appends_only_new_messages(manager: SessionManager) -> None:
+    session = manager.get_or_create("telegram:42")
+    session.add_message("user", "hi")
+    manager.save(session)
+    path = manager.store._get_session_path("telegram:42")
+    first = path.read_text()
+
+    session.add_message("assistant", "hello")
+    session.metadata["sender_id"] = "42"
+    manager.save(session)
+    manager.save(session)  # nothing new -> no write
+
+    text = path.read_text()
+    assert text.startswith(first)
+    assert [r.get("_type", r.get("role")) for r in _records(path)] == ["metadata", "user", "assistant", "metadata"]
+
+    manager._cache.clear()
+    loaded = manager.get_or_create("telegram:42")
+    assert [m["content"] for m in loaded.messages] == ["hi", "hello"]
+    assert loaded.metadata == {"sender_id": "42"}
+
+
+def test_clear_rewrites_and_torn_lines_are_skipped(manager: SessionManager) -> None:
+    session = manager.get_or_create("cli:x")
+    session.add_message("user", "a")
+    manager.save(session)
+    path = manager.store._get_session_path("cli:x")
+    with open(path, "a") as f:
+        f.write('{"role": "user", "cont')  # torn append
+
+    manager._cache.clear()
+    session = manager.get_or_create("cli:x")
+    assert [m["content"] for m in session.messages] == ["a"]
+
+    session.clear()
+    manager.save(session)
+    assert [r["_type"] for r in _records(path)] == ["metadata"]
+
+
+@pytest.mark.parametrize("backend", ["jsonl", "sqlite", "flusher"])
+def test_clear_then_longer_conversation_replaces_history(tmp_path: Path, backend: str) -> None:
+    store = SqliteSessionStore(tmp_path / "s.db") if backend == "sqlite" else JsonlSessionStore(tmp_path / "s")
+    manager = SessionManager(tmp_path, store=store, flush_interval_s=60 if backend == "flusher" else None)
+    session = manager.get_or_create("cli:new")
+    for i in range(3):
+        session.add_message("user", f"old{i}")
+    manager.save(session)
+    manager.flush()
+
+    session.clear()  # /new
+    for i in range(4):  # At least as many messages as before the clear
+        session.add_message("user", f"new{i}")
+    manager.save(session)
+    manager.flush()
+
+    assert [m["content"] for m in store.load("cli:new").messages] == [f"new{i}" for i in range(4)]
+    manager.close()
+
+
+def test_compaction_drops_superseded_metadata(manager: SessionManager) -> None:
+    manager.store.compact_min_records = 4
+    session = manager.get_or_create("cli:y")
+    for i in range(6):
+        session.add_message("user", f"m{i}")
+        session.metadata["summary"] = f"s{i}"
+        manager.save(session)
+    manager.close()  # waits for the background compactor
+    manager.store.compact("cli:y")  # Whatever the compactor's timing, nothing superseded is left
+
+    records = _records(manager.store._get_session_path("cli:y"))
+    assert sum(1 for r in records if r.get("_type") == "metadata") == 1
+    assert records[0]["metadata"] == {"summary": "s5"}
+    assert len(records) == 7
+
+
+def test_tail_load_reads_latest_metadata_and_older_on_demand(manager: SessionManager) -> None:
+    session = manager.get_or_create("cli:long")
+    for i in range(50):
+        session.add_message("user", f"m{i}")
+        if i == 10:
+            session.metadata["summary"] = "early"
+        manager.save(session)
+    manager.tail_messages = 8
+    manager._cache.clear()
+
+    session = manager.get_or_create("cli:long")
+    assert [m["content"] for m in session.messages] == [f"m{i}" for i in range(42, 50)]
+    assert session.has_older and session.metadata == {"summary": "early"}
+
+    assert manager.load_older(session, 40) == 40
+    assert session.messages[0]["content"] == "m2" and session.has_older
+    assert manager.load_older(session) == 2
+    assert not session.has_older and len(session.messages) == 50
+
+    session.add_message("user", "m50")
+    manager.save(session)
+    assert manager.store.load("cli:long").messages[-1]["content"] == "m50"
+    assert len(manager.store.load("cli:long").messages) == 51
+
+
+def test_tail_load_scans_only_the_end_of_the_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(store_module, "METADATA_INTERVAL", 8)
+    store = JsonlSessionStore(tmp_path / "sessions")
+    manager = SessionManager(tmp_path, store=store, tail_messages=4)
+    header_only = manager.get_or_create("cli:a")
+    header_only.metadata["sender_id"] = "a"
+    for i in range(40):
+        header_only.add_message("user", f"a{i}")
+    manager.save(header_only)  # One write: header, then the messages
+    trailer = manager.get_or_create("cli:b")
+    for i in range(40):
+        trailer.add_message("user", f"b{i}")
+        if i == 2:
+            trailer.metadata["summary"] = "early"
+        manager.save(trailer)  # The trailer is repeated every 8 records
+    manager.close()
+
+    scanned = []
+    reverse_lines = JsonlSessionStore._reverse_lines
+    monkeypatch.setattr(JsonlSessionStore, "_reverse_lines",
+                        staticmethod(lambda path: (scanned.append(line) or line for line in reverse_lines(path))))
+    fresh = JsonlSessionStore(tmp_path / "sessions")
+    for key, metadata in (("cli:a", {"sender_id": "a"}), ("cli:b", {"summary": "early"})):
+        scanned.clear()
+        session = fresh.load(key, limit=4)
+        assert session.metadata == metadata and len(session.messages) == 4 and session.has_older
+        assert len(scanned) <= 8 + 2
+    assert fresh._file_stats == {}  # Not counted from a partial scan
+
+    session.add_message("user", "b40")
+    fresh.save(session)
+    fresh.close()  # The compactor counts the file
+    records = _records(fresh._get_session_path("cli:b"))
+    dead = sum(1 for r in records if r.get("_type") == "metadata") - 1
+    assert fresh._file_stats["cli:b"] == [len(records), dead]
+
+
+def test_reverse_lines_across_blocks(tmp_path: Path) -> None:
+    path = tmp_path / "f.jsonl"
+    path.write_text("".join(f"line-{i:03d}\n" for i in range(100)))
+    lines = list(SessionManager(tmp_path).store._reverse_lines(path, block_size=7))
+    assert lines == [f"line-{i:03d}".encode() for i in reversed(range(100))]
+
+
+def test_lru_eviction_flushes_dirty_sessions(manager: SessionManager) -> None:
+    manager.max_sessions = 2
+    a = manager.get_or_create("cli:a")
+    a.add_message("user", "unsaved")  # dirty, never saved
+    manager.get_or_create("cli:b")
+    manager.get_or_create("cli:c")  # evicts a
+
+    assert list(manager._cache) == ["cli:b", "cli:c"]
+    assert [m["content"] for m in manager.store.load("cli:a").messages] == ["unsaved"]
+    # Untouched empty sessions are not written out
+    assert manager.store.load("cli:b") is None
+
+
+def test_saved_sessions_are_trimmed_to_the_tail(manager: SessionManager) -> None:
+    manager.tail_messages = 5
+    session = manager.get_or_create("cli:t")
+    for i in range(10):
+        session.add_message("user", f"m{i}")
+    manager.save(session)
+
+    assert len(session.messages) == 5 and session.has_older
+    assert session.get_history(5)[0]["content"] == "m5"
+    assert len(manager.store.load("cli:t").messages) == 10
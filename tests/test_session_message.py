@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+
+from friday.session.message import Message
+from friday.session.sqlite_store import SqliteSessionStore
+from friday.session.store import JsonlSessionStore
+from friday.session.types import Session
+
+
+def test_message_reads_like_the_stored_dict() -> None:
+    data = {"role": "assistant", "content": "done", "timestamp": "2025-03-01T09:15:02.123456", "tools_used": ["exec"]}
+    msg = Message.from_dict(json.loads(json.dumps(data)))
+
+    assert msg == data and dict(msg) == data and msg.to_dict() == data
+    assert list(msg) == list(data) and len(msg) == 4
+    assert msg["tools_used"] == ["exec"] and msg.get("missing") is None and "timestamp" in msg
+    assert isinstance(msg._ts, int)
+    assert msg.role is Message("assistant", "x").role  # interned
+    assert msg.to_llm() == {"role": "assistant", "content": "done"}
+
+
+def test_unusual_timestamps_round_trip_unchanged() -> None:
+    for ts in ("2025-03-01T09:15:02", "2025-03-01T09:15:02+07:00", "2025-03-01 09:15", "yesterday"):
+        assert Message.from_dict({"role": "user", "content": "x", "timestamp": ts})["timestamp"] == ts
+    assert "timestamp" not in Message.from_dict({"role": "user", "content": "x"})
+
+
+def test_stores_round_trip_the_jsonl_format(tmp_path: Path) -> None:
+    session = Session(key="cli:a")
+    session.add_message("user", "hi")
+    session.add_message("assistant", "hello", tools_used=["web_search"])
+    expected = [m.to_dict() for m in session.messages]
+
+    jsonl = JsonlSessionStore(tmp_path / "sessions")
+    jsonl.save(session)
+    lines = jsonl._get_session_path("cli:a").read_text().splitlines()
+    assert [json.loads(line) for line in lines[1:]] == expected
+    assert [m.to_dict() for m in jsonl.load("cli:a").messages] == expected
+
+    sqlite = SqliteSessionStore(tmp_path / "sessions.db")
+    session.add_message("user", [{"type": "text", "text": "multi-part"}])
+    session._saved_metadata = None
+    sqlite.save(session)
+    loaded = sqlite.load("cli:a").messages
+    assert [m.to_dict() for m in loaded] == [m.to_dict() for m in session.messages]
+    sqlite.close()
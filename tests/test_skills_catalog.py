@@ -0,0 +1,80 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from friday.agent import skills as skills_module
+from friday.agent.skills import SkillsLoader
+
+
+def _write_skill(root: Path, name: str, frontmatter: str, body: str = "Body") -> Path:
+    skill_dir = root / name
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    path = skill_dir / "SKILL.md"
+    path.write_text(f"---\n{frontmatter}\n---\n\n{body}\n")
+    return path
+
+
+def test_catalog_parses_once_and_invalidates_on_change(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    builtin = tmp_path / "builtin"
+    path = _write_skill(builtin, "alpha", "name: alpha\ndescription: First")
+    loader = SkillsLoader(tmp_path / "ws", builtin_skills_dir=builtin)
+
+    builds = 0
+    original = loader._build_catalog
+
+    def counting_build():
+        nonlocal builds
+        builds += 1
+        return original()
+
+    monkeypatch.setattr(loader, "_build_catalog", counting_build)
+
+    for _ in range(3):
+        loader.build_skills_summary()
+        loader.get_always_skills()
+        loader.list_skills()
+    assert builds == 1
+
+    path.write_text("---\nname: alpha\ndescription: Changed description\n---\n\nNew body\n")
+    os.utime(path, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+    assert "Changed description" in loader.build_skills_summary()
+    assert builds == 2
+
+    _write_skill(tmp_path / "ws" / "skills", "alpha", "name: alpha\ndescription: Workspace override")
+    assert loader.get_entry("alpha").source == "workspace"
+    assert loader.load_skills_for_context(["alpha"]) == "### Skill: alpha\n\nBody"
+    assert builds == 3
+
+
+def test_which_results_are_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    monkeypatch.setattr(skills_module, "_which_cache", {})
+    monkeypatch.setattr(skills_module.shutil, "which", lambda b: calls.append(b) or None)
+
+    for _ in range(5):
+        assert skills_module.cached_which("nope") is None
+    assert calls == ["nope"]
+
+    skills_module.cached_which("nope", ttl=0)
+    assert calls == ["nope", "nope"]
+
+
+def test_summary_ranks_relevant_skills_and_stays_flat(tmp_path: Path) -> None:
+    builtin = tmp_path / "builtin"
+    _write_skill(builtin, "weather", "name: weather\ndescription: Get current weather and forecasts\ntriggers: forecast, rain")
+    _write_skill(builtin, "github", "name: github\ndescription: Interact with GitHub issues\ntriggers: pull request, pr")
+    loader = SkillsLoader(tmp_path / "ws", builtin_skills_dir=builtin)
+
+    summary = loader.build_skills_summary("will it rain tomorrow?", max_full=1)
+    assert "<name>weather</name>" in summary
+    assert "<other-skills>github</other-skills>" in summary
+
+    # Whole-word trigger matching: "pr" must not match "price"
+    assert "<skills>" not in loader.build_skills_summary("what's the price?")
+    assert "<name>github</name>" in loader.build_skills_summary("", context="can you review my pull request")
+
+    small = len(loader.build_skills_summary("thanks!"))
+    for i in range(50):
+        _write_skill(builtin, f"extra-{i}", f"name: extra-{i}\ndescription: Extra skill number {i} " + "words " * 30)
+    assert len(loader.build_skills_summary("thanks!", token_budget=200)) < small + 800
@@ -0,0 +1,64 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from friday.session.manager import SessionManager
+from friday.session.sqlite_store import SqliteSessionStore, migrate_jsonl
+from friday.session.store import JsonlSessionStore
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> Iterator[SqliteSessionStore]:
+    store = SqliteSessionStore(tmp_path / "sessions.db")
+    yield store
+    store.close()
+
+
+def test_round_trip_and_incremental_saves(store: SqliteSessionStore, tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path, store=store)
+    session = manager.get_or_create("telegram:-100_5")
+    session.add_message("user", "hi")
+    session.add_message("assistant", "hello", tools_used=["exec"])
+    manager.save(session)
+    session.add_message("user", "again")
+    session.metadata["sender_id"] = "42"
+    manager.save(session)
+
+    assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert store._conn.execute("SELECT seq FROM messages ORDER BY seq").fetchall() == [(0,), (1,), (2,)]
+
+    loaded = store.load("telegram:-100_5")
+    assert [m["content"] for m in loaded.messages] == ["hi", "hello", "again"]
+    assert loaded.messages[1]["tools_used"] == ["exec"]
+    assert loaded.metadata == {"sender_id": "42"}
+    assert [s["key"] for s in manager.list_sessions()] == ["telegram:-100_5"]
+
+
+def test_recent_messages_and_clear(store: SqliteSessionStore) -> None:
+    manager = SessionManager(Path("."), store=store)
+    session = manager.get_or_create("cli:x")
+    for i in range(10):
+        session.add_message("user", f"m{i}")
+    manager.save(session)
+
+    assert [m["content"] for m in store.recent_messages("cli:x", 3)] == ["m7", "m8", "m9"]
+
+    session.clear()
+    session.add_message("user", "fresh")
+    manager.save(session)
+    assert [m["content"] for m in store.load("cli:x").messages] == ["fresh"]
+    assert manager.delete("cli:x")
+    assert store.recent_messages("cli:x", 3) == []
+
+
+def test_migrates_jsonl_sessions_once(tmp_path: Path, store: SqliteSessionStore) -> None:
+    jsonl = JsonlSessionStore(tmp_path / "jsonl")
+    legacy = SessionManager(tmp_path, store=jsonl)
+    session = legacy.get_or_create("whatsapp:66812@s.whatsapp.net")
+    session.add_message("user", "old")
+    legacy.save(session)
+
+    assert migrate_jsonl(jsonl, store) == 1
+    assert migrate_jsonl(jsonl, store) == 0
+    assert [m["content"] for m in store.load("whatsapp:66812@s.whatsapp.net").messages] == ["old"]
@@ -0,0 +1,96 @@
+import asyncio
+import base64
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from friday.bus.queue import MessageBus
+from friday.channels.whatsapp import WhatsAppChannel
+from friday.config.schema import WhatsAppConfig
+from friday.providers.transcription import TranscriptionPipeline, TranscriptionProvider
+from friday.utils import serde
+
+
+class SlowTranscriber(TranscriptionProvider):
+    def __init__(self, text: str = "hello") -> None:
+        self.text = text
+        self.calls: list[Path] = []
+
+    async def transcribe(self, file_path: str | Path) -> str:
+        self.calls.append(Path(file_path))
+        await asyncio.sleep(0.02)
+        return self.text if Path(file_path).stat().st_size else ""
+
+
+def _pipeline(provider: TranscriptionProvider, tmp_path: Path) -> TranscriptionPipeline:
+    pipeline = TranscriptionPipeline(provider, cache_dir=tmp_path / "cache")
+    pipeline.ffmpeg = None  # Send files as they are
+    return pipeline
+
+
+async def test_same_audio_is_transcribed_once(tmp_path: Path) -> None:
+    provider = SlowTranscriber()
+    first, copy, empty = tmp_path / "a.ogg", tmp_path / "b.ogg", tmp_path / "empty.ogg"
+    first.write_bytes(b"voice")
+    copy.write_bytes(b"voice")  # Same content under another name
+    empty.write_bytes(b"")
+
+    pipeline = _pipeline(provider, tmp_path)
+    assert await asyncio.gather(pipeline.transcribe(first), pipeline.transcribe(copy)) == ["hello", "hello"]
+    assert await pipeline.transcribe(copy) == "hello"
+    assert await _pipeline(provider, tmp_path).transcribe(first) == "hello"  # Cache survives restarts
+    assert len(provider.calls) == 1
+
+    assert await pipeline.transcribe(empty) == "" and await pipeline.transcribe(empty) == ""
+    assert len(provider.calls) == 3  # Failures are not cached
+
+
+async def test_whatsapp_voice_messages_are_transcribed(tmp_path: Path) -> None:
+    bus = MessageBus()
+    channel = WhatsAppChannel(WhatsAppConfig(), bus, transcriber=_pipeline(SlowTranscriber("see you at 5"), tmp_path))
+    channel.media_dir = tmp_path / "media"
+
+    await channel._handle_bridge_message(serde.dumps({
+        "type": "message", "id": "ABC123", "sender": "15550001@s.whatsapp.net", "content": "[Voice Message]",
+        "timestamp": 1, "isGroup": False,
+        "audio": {"mimetype": "audio/ogg; codecs=opus", "data": base64.b64encode(b"opus").decode()},
+    }))
+    await channel._handle_bridge_message(serde.dumps({
+        "type": "message", "id": "ABC124", "sender": "15550002@s.whatsapp.net", "content": "hi", "timestamp": 2,
+    }))
+    assert (await bus.consume_inbound()).content == "hi"  # Not held up by the transcription
+
+    msg = await bus.consume_inbound()
+    assert msg.content == "[transcription: see you at 5]"
+    assert msg.media == [str(tmp_path / "media" / "wa_ABC123.ogg")]
+    assert Path(msg.media[0]).read_bytes() == b"opus"
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+async def test_long_audio_is_split_into_16k_mono_chunks(tmp_path: Path) -> None:
+    audio = tmp_path / "long.wav"
+    subprocess.run(
+        ["ffmpeg", "-loglevel", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=25:sample_rate=44100",
+         "-ac", "2", str(audio)],
+        check=True,
+    )
+    seen: list[tuple[int, int]] = []
+
+    class ProbingTranscriber(TranscriptionProvider):
+        async def transcribe(self, file_path: str | Path) -> str:
+            probe = subprocess.run(
+                ["ffprobe", "-v", "error", "-show_entries", "stream=sample_rate,channels", "-of", "csv=p=0",
+                 str(file_path)],
+                capture_output=True, text=True, check=True,
+            )
+            rate, channels = probe.stdout.strip().split(",")
+            seen.append((int(rate), int(channels)))
+            return f"part{len(seen)}"
+
+    pipeline = TranscriptionPipeline(ProbingTranscriber(), chunk_s=10, trim_silence=False)
+    text = await pipeline.transcribe(audio)
+
+    assert len(seen) == 3 and set(seen) == {(16000, 1)}
+    assert sorted(text.split()) == ["part1", "part2", "part3"]